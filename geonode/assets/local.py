@@ -14,6 +14,7 @@ from pathlib import Path
 from geonode.assets.handlers import asset_handler_registry, AssetHandlerInterface, AssetDownloadHandlerInterface
 from geonode.assets.models import LocalAsset
 from geonode.storage.manager import FileSystemStorageManager, StorageManager
+from geonode.storage.utils import clone_file, clone_tree
 from geonode.utils import build_absolute_uri, mkdtemp
 
 logger = logging.getLogger(__name__)
@@ -123,11 +124,11 @@ class LocalAssetHandler(AssetHandlerInterface):
             if os.path.isdir(file):
                 dst = os.path.join(new_path, os.path.basename(file))
                 logging.info(f"Copying into {dst} directory {file}")
-                new_dir = shutil.copytree(file, dst)
+                new_dir = clone_tree(file, dst)
                 new_files.append(new_dir)
             elif os.path.isfile(file):
                 logging.info(f"Copying into {new_path} file {os.path.basename(file)}")
-                new_file = shutil.copy2(file, new_path)
+                new_file = clone_file(file, new_path)
                 new_files.append(new_file)
             else:
                 logger.warning(f"Not copying path {file}")
@@ -143,7 +144,7 @@ class LocalAssetHandler(AssetHandlerInterface):
             # https://docs.djangoproject.com/en/3.2/ref/settings/#file-upload-directory-permissions
             os.chmod(new_path, settings.FILE_UPLOAD_DIRECTORY_PERMISSIONS)
 
-        shutil.copytree(source_dir, new_path, dirs_exist_ok=True)
+        clone_tree(source_dir, new_path, dirs_exist_ok=True)
 
         # fixing in case the permissions on the newly clonsed files:
         if settings.FILE_UPLOAD_PERMISSIONS is not None:
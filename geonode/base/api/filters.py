@@ -20,11 +20,12 @@ import ast
 import logging
 from itertools import groupby
 
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, BaseFilterBackend
 
 from django.db.models import Subquery
 
-from geonode.base.bbox_utils import filter_bbox
+from geonode.base.spatial_search import spatial_search_backend
 from geonode.base.models import ThesaurusKeyword
 from geonode.favorite.models import Favorite
 from geonode.utils import strtobool
@@ -39,12 +40,18 @@ class DynamicSearchFilter(SearchFilter):
 
 class ExtentFilter(BaseFilterBackend):
     """
-    Filter that only allows users to see their own objects.
+    Filter the resources intersecting the ``extent`` param;
+    with ``extent_rank=true`` the resources are ordered by their overlap with the extent.
     """
 
     def filter_queryset(self, request, queryset, view):
-        if request.query_params.get("extent"):
-            return filter_bbox(queryset, request.query_params.get("extent"))
+        if extent := request.query_params.get("extent"):
+            try:
+                return spatial_search_backend.filter(
+                    queryset, extent, rank=strtobool(request.query_params.get("extent_rank", "False"))
+                )
+            except ValueError as e:
+                raise ValidationError({"extent": str(e)})
         return queryset
 
 
@@ -16,21 +16,99 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+import json
+import base64
+import logging
+import binascii
+import datetime
+
 from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_PAGE = getattr(settings, "REST_API_DEFAULT_PAGE", 1)
 DEFAULT_PAGE_SIZE = getattr(settings, "REST_API_DEFAULT_PAGE_SIZE", 10)
 DEFAULT_PAGE_QUERY_PARAM = getattr(settings, "REST_API_DEFAULT_PAGE_QUERY_PARAM", "page_size")
+DEFAULT_CURSOR_QUERY_PARAM = getattr(settings, "REST_API_DEFAULT_CURSOR_QUERY_PARAM", "cursor")
+DEFAULT_TOTAL_QUERY_PARAM = getattr(settings, "REST_API_DEFAULT_TOTAL_QUERY_PARAM", "total")
+DEFAULT_CURSOR_TOTAL = getattr(settings, "REST_API_DEFAULT_CURSOR_TOTAL", "exact")
+
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+TOTAL_SKIP = "skip"
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_SKIP)
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    Keeps the full precision of the datetimes, which must match exactly the stored values
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
 
 
 class GeoNodeApiPagination(PageNumberPagination):
+    """
+    Page number pagination, with an opt-in keyset (cursor) mode.
+
+    The keyset mode is enabled by passing the ``cursor`` query param (empty for the first page)
+    and it is available when the queryset is ordered by concrete fields only;
+    the primary key is always appended to the ordering as tie breaker.
+    As in the PostgreSQL default ordering, NULLs sort after any other value.
+    Instead of counting the whole queryset and scanning it with an OFFSET, every page is read
+    with an indexable "after the last seen row" condition, so deep pages cost as much as the first one.
+    The ``total`` query param tells how to compute the total in keyset mode:
+    ``exact`` (default), ``estimate`` (planner estimate on PostgreSQL) or ``skip`` (``null``).
+    """
+
     page = DEFAULT_PAGE
     page_size = DEFAULT_PAGE_SIZE
     page_size_query_param = DEFAULT_PAGE_QUERY_PARAM
+    cursor_query_param = DEFAULT_CURSOR_QUERY_PARAM
+    total_query_param = DEFAULT_TOTAL_QUERY_PARAM
+
+    cursor_mode = False
+    nullable = frozenset()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = isinstance(queryset, QuerySet) and self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.cursor_page_size = int(self.get_page_size(request) or DEFAULT_PAGE_SIZE)
+        self.model = queryset.model
+        self.ordering = self._get_keyset_ordering(queryset)
+        values, self.reverse = self._decode_cursor(request.query_params.get(self.cursor_query_param))
+        self.has_cursor = values is not None
+        self.total = self._get_total(queryset, request.query_params.get(self.total_query_param, DEFAULT_CURSOR_TOTAL))
+
+        queryset = queryset.order_by(*self._get_keyset_order_by(self.reverse))
+        if self.has_cursor:
+            queryset = queryset.filter(self._get_keyset_filter(values, self.reverse))
+
+        results = list(queryset[: self.cursor_page_size + 1])
+        self.has_more = len(results) > self.cursor_page_size
+        results = results[: self.cursor_page_size]
+        if self.reverse:
+            results.reverse()
+        self.results = results
+        return results
 
     def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return self._get_cursor_paginated_response(data)
         _paginated_response = {
             "links": {"next": self.get_next_link(), "previous": self.get_previous_link()},
             "total": self.page.paginator.count,
@@ -39,3 +117,153 @@ class GeoNodeApiPagination(PageNumberPagination):
         }
         _paginated_response.update(data)
         return Response(_paginated_response)
+
+    def _get_cursor_paginated_response(self, data):
+        _paginated_response = {
+            "links": {"next": self._get_cursor_link(forward=True), "previous": self._get_cursor_link(forward=False)},
+            "total": self.total,
+            DEFAULT_PAGE_QUERY_PARAM: self.cursor_page_size,
+        }
+        _paginated_response.update(data)
+        return Response(_paginated_response)
+
+    def _get_cursor_link(self, forward):
+        if not self.results:
+            return None
+        if forward:
+            # going forward there is a next page if more rows were found, or if we came back from it
+            if not (self.reverse or self.has_more):
+                return None
+            row = self.results[-1]
+        else:
+            if not (self.has_cursor and (self.has_more or not self.reverse)):
+                return None
+            row = self.results[0]
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, self._encode_cursor(row, reverse=not forward))
+
+    def _get_keyset_ordering(self, queryset):
+        """
+        Returns the ordering of the queryset as a list of (attname, descending) tuples,
+        making sure it ends with the primary key.
+        Raises a ValidationError if the ordering cannot be used for keyset pagination.
+        """
+        opts = queryset.model._meta
+        order_by = list(queryset.query.order_by) or list(opts.ordering or [])
+        ordering = []
+        self.nullable = set()
+        for item in order_by:
+            field = self._get_ordering_field(opts, item)
+            if field is None:
+                raise ValidationError(
+                    {self.cursor_query_param: f"Cursor pagination is not supported by this ordering: {item}"}
+                )
+            desc = item.startswith("-")
+            ordering.append((field.attname, desc))
+            if field.null:
+                self.nullable.add(field.attname)
+            if field.primary_key:
+                # the primary key is unique, any following ordering is irrelevant
+                return ordering
+        ordering.append((opts.pk.attname, ordering[-1][1] if ordering else False))
+        return ordering
+
+    @staticmethod
+    def _get_ordering_field(opts, item):
+        """
+        Returns the model field of the ordering item if it is a concrete field, None otherwise
+        """
+        if not isinstance(item, str) or "__" in item or item == "?":
+            return None
+        name = item.lstrip("-+")
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.concrete else None
+
+    def _get_keyset_order_by(self, reverse):
+        order_by = []
+        for name, desc in self.ordering:
+            descending = desc != reverse
+            if name in self.nullable:
+                # NULLs are the greatest values, whatever the database default is
+                order_by.append(F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True))
+            else:
+                order_by.append(("-" if descending else "") + name)
+        return order_by
+
+    def _get_keyset_filter(self, values, reverse):
+        """
+        Builds the "row after the cursor" condition:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... with the comparison flipped for descending fields.
+        """
+        condition = Q()
+        for i, (name, desc) in enumerate(self.ordering):
+            term = self._get_after_condition(name, values[i], descending=desc != reverse)
+            if term is None:
+                # nothing comes after NULL
+                continue
+            for j, (prev_name, _) in enumerate(self.ordering[:i]):
+                term &= Q(**{f"{prev_name}__isnull": True} if values[j] is None else {prev_name: values[j]})
+            condition |= term
+        return condition
+
+    def _get_after_condition(self, name, value, descending):
+        """
+        Returns the condition of the rows following the value in the ordering of the field,
+        None if there are none
+        """
+        if value is None:
+            # NULLs come last going up and first going down
+            return Q(**{f"{name}__isnull": False}) if descending else None
+        term = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+        if name in self.nullable and not descending:
+            term |= Q(**{f"{name}__isnull": True})
+        return term
+
+    def _encode_cursor(self, row, reverse=False):
+        payload = {
+            "o": [("-" if desc else "") + name for name, desc in self.ordering],
+            "v": [getattr(row, name) for name, _ in self.ordering],
+        }
+        if reverse:
+            payload["r"] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload, cls=CursorJSONEncoder).encode("utf-8")).decode("ascii")
+
+    def _decode_cursor(self, cursor):
+        """
+        Returns the (values, reverse) encoded in the cursor; values is None for the first page
+        """
+        if not cursor:
+            return None, False
+        invalid = ValidationError({self.cursor_query_param: "Invalid cursor"})
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+            if payload["o"] != [("-" if desc else "") + name for name, desc in self.ordering]:
+                raise invalid
+            values = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, payload["v"], strict=True)
+            ]
+        except (ValueError, KeyError, TypeError, UnicodeError, binascii.Error, DjangoValidationError):
+            raise invalid
+        return values, bool(payload.get("r"))
+
+    def _get_total(self, queryset, mode):
+        if mode not in TOTAL_MODES:
+            raise ValidationError({self.total_query_param: f"Valid values are: {', '.join(TOTAL_MODES)}"})
+        if mode == TOTAL_SKIP:
+            return None
+        if mode == TOTAL_ESTIMATE and connections[queryset.db].vendor == "postgresql":
+            try:
+                sql, params = queryset.order_by().query.sql_with_params()
+                with connections[queryset.db].cursor() as cursor:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                    plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+            except Exception as e:
+                logger.debug(f"Could not estimate the queryset count: {e}")
+        return queryset.count()
@@ -21,14 +21,17 @@ import logging
 from slugify import slugify
 from urllib.parse import urljoin
 import json
+import hashlib
 
-from django.db.models import Q
+from django.db.models import Count, F, Q
+from django.core.cache import cache
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.forms.models import model_to_dict
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 
-from geonode.assets.utils import get_default_asset, is_asset_deletable
+from geonode.assets.utils import is_asset_deletable
 from geonode.metadata.multilang.serializers import MultiLangOutputMixin
 from geonode.people import Roles
 from django.http import QueryDict
@@ -47,6 +50,7 @@ from geonode.base.api.exceptions import InvalidResourceException
 
 from geonode.favorite.models import Favorite
 from geonode.base.models import (
+    ContactRole,
     Link,
     ResourceBase,
     HierarchicalKeyword,
@@ -249,6 +253,118 @@ class SpatialRepresentationTypeSerializer(DynamicModelSerializer):
         fields = ("identifier",)
 
 
+PRELOAD_CONTEXT_KEY = "_preloaded"
+
+# ContactRole.role values which differ from the related ResourceBase property name
+CONTACT_ROLE_DB_VALUES = {Roles.POC.name: "pointOfContact", Roles.METADATA_AUTHOR.name: "author"}
+
+
+def _bulk_load_real_instances(resources, context):
+    """
+    Load the concrete instances of the resources with one query per polymorphic content type
+    """
+    by_ctype = {}
+    for resource in resources:
+        by_ctype.setdefault(resource.polymorphic_ctype_id, []).append(resource)
+
+    ret = {}
+    for ctype_id, group in by_ctype.items():
+        model = ContentType.objects.get_for_id(ctype_id).model_class()
+        if model is None or all(isinstance(r, model) for r in group):
+            ret.update({r.pk: r for r in group})
+            continue
+        real = model.objects.in_bulk([r.pk for r in group])
+        # fallback to the polymorphic lookup for anything which could not be loaded in bulk
+        ret.update({r.pk: real.get(r.pk) or r.get_real_instance() for r in group})
+    return ret
+
+
+def _bulk_load_default_assets(resources, context):
+    """
+    Load the default asset (the first one linked) of each resource
+    """
+    from geonode.assets.models import Asset
+
+    ret = {r.pk: None for r in resources}
+    assets = (
+        Asset.objects.filter(link__resource_id__in=ret.keys())
+        .annotate(resource_id=F("link__resource_id"))
+        .order_by("resource_id", "pk")
+    )
+    for asset in assets:
+        if ret[asset.resource_id] is None:
+            ret[asset.resource_id] = asset
+    real = _bulk_load_real_instances([a for a in ret.values() if a is not None], context)
+    return {pk: real.get(asset.pk) if asset is not None else None for pk, asset in ret.items()}
+
+
+def _bulk_load_favorites(resources, context):
+    ret = {r.pk: False for r in resources}
+    request = context.get("request")
+    if request and not request.user.is_anonymous:
+        for object_id in Favorite.objects.filter(object_id__in=ret.keys(), user=request.user).values_list(
+            "object_id", flat=True
+        ):
+            ret[object_id] = True
+    return ret
+
+
+def _bulk_load_contact_roles(resources, context):
+    ret = {r.pk: {} for r in resources}
+    for cr in ContactRole.objects.filter(resource_id__in=ret.keys()).select_related("contact").order_by("pk"):
+        ret[cr.resource_id].setdefault(cr.role, []).append(cr.contact)
+    return ret
+
+
+def _bulk_load_perms(resources, context):
+    request = context.get("request")
+    if not request or not request.user:
+        return {r.pk: [] for r in resources}
+    return permissions_registry.get_perms_for_resources(resources, request.user)
+
+
+def _bulk_load_links(resources, context):
+    ret = {r.pk: [] for r in resources}
+    for link in Link.objects.filter(resource_id__in=ret.keys()).select_related("asset", "resource").order_by("pk"):
+        ret[link.resource_id].append(link)
+    return ret
+
+
+class BulkPreloadMixin:
+    """
+    Mixin for serializers and computed fields which can compute their values in bulk
+    for all the resources being serialized in the current request.
+
+    A bulk loader is a callable ``loader(resources, context)`` returning a dict ``resource pk -> value``
+    for all the given resources. Each loader runs once for the whole page of resources; its results
+    are shared through the serializer context, so the same loader can be used by many fields.
+    """
+
+    def preload(self, key, loader, pk, default=None):
+        preloaded = self.context.setdefault(PRELOAD_CONTEXT_KEY, {})
+        values = preloaded.setdefault(key, {})
+        if pk not in values:
+            values.update(loader(self._get_page_resources(pk), self.context))
+            values.setdefault(pk, default)
+        return values[pk]
+
+    def _get_page_resources(self, pk):
+        page = getattr(self.root, "instance", None)
+        if isinstance(page, ResourceBase):
+            page = [page]
+        try:
+            resources = [r for r in page if isinstance(r, ResourceBase)]
+        except TypeError:
+            resources = []
+        if pk not in {r.pk for r in resources}:
+            # not serializing a page of resources (e.g. nested serializer): only load the requested one
+            resources = list(ResourceBase.objects.filter(pk=pk))
+        return resources
+
+    def get_real_instance(self, instance):
+        return self.preload("real_instance", _bulk_load_real_instances, instance.pk) or instance.get_real_instance()
+
+
 class AvatarUrlField(DynamicComputedField):
     def __init__(self, avatar_size, **kwargs):
         self.avatar_size = avatar_size
@@ -258,13 +374,13 @@ class AvatarUrlField(DynamicComputedField):
         return build_absolute_uri(avatar_url(instance, self.avatar_size))
 
 
-class EmbedUrlField(DynamicComputedField):
+class EmbedUrlField(BulkPreloadMixin, DynamicComputedField):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def get_attribute(self, instance):
         try:
-            _instance = instance.get_real_instance()
+            _instance = self.get_real_instance(instance)
         except Exception as e:
             logger.exception(e)
             _instance = None
@@ -292,7 +408,7 @@ class ThumbnailUrlField(DynamicComputedField):
         return build_absolute_uri(thumbnail_url)
 
 
-class DownloadLinkField(DynamicComputedField):
+class DownloadLinkField(BulkPreloadMixin, DynamicComputedField):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -302,25 +418,25 @@ class DownloadLinkField(DynamicComputedField):
             logger.info(
                 f"Field {self.field_name} is deprecated and will be removed in the future GeoNode version. Please refer to download_urls"
             )
-            _instance = instance.get_real_instance()
+            _instance = self.get_real_instance(instance)
             return _instance.download_url if hasattr(_instance, "download_url") else None
         except Exception as e:
             logger.exception(e)
             return None
 
 
-class DownloadArrayLinkField(DynamicComputedField):
+class DownloadArrayLinkField(BulkPreloadMixin, DynamicComputedField):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def get_attribute(self, instance):
         try:
-            _instance = instance.get_real_instance()
+            _instance = self.get_real_instance(instance)
         except Exception as e:
             logger.exception(e)
             raise e
 
-        asset = get_default_asset(_instance)
+        asset = self.preload("default_asset", _bulk_load_default_assets, instance.pk)
         if asset is not None:
             asset_url = asset_handler_registry.get_handler(asset).create_download_url(asset)
 
@@ -358,14 +474,14 @@ class DownloadArrayLinkField(DynamicComputedField):
             return []
 
 
-class FavoriteField(DynamicComputedField):
+class FavoriteField(BulkPreloadMixin, DynamicComputedField):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def get_attribute(self, instance):
         _user = self.context.get("request")
         if _user and not _user.user.is_anonymous:
-            return Favorite.objects.filter(object_id=instance.pk, user=_user.user).exists()
+            return self.preload("favorite", _bulk_load_favorites, instance.pk, default=False)
         return False
 
 
@@ -398,7 +514,7 @@ class AutoLinkField(DynamicComputedField):
             return None
 
 
-class ContactRoleField(DynamicComputedField):
+class ContactRoleField(BulkPreloadMixin, DynamicComputedField):
     default_error_messages = {
         "required": ("ContactRoleField This field is required."),
     }
@@ -408,7 +524,10 @@ class ContactRoleField(DynamicComputedField):
         super().__init__(**kwargs)
 
     def get_attribute(self, instance):
-        return getattr(instance, self.contact_type)
+        if not isinstance(instance, ResourceBase) or instance.pk is None:
+            return getattr(instance, self.contact_type)
+        roles = self.preload("contact_roles", _bulk_load_contact_roles, instance.pk, default={})
+        return roles.get(CONTACT_ROLE_DB_VALUES.get(self.contact_type, self.contact_type), [])
 
     def to_representation(self, value):
         return [user_serializer()(embed=True, many=False).to_representation(v) for v in value]
@@ -549,16 +668,14 @@ class PermsSerializer(DynamicModelSerializer):
         )
 
 
-class LinksSerializer(DynamicModelSerializer):
+class LinksSerializer(BulkPreloadMixin, DynamicModelSerializer):
     class Meta:
         model = ResourceBase
 
     def to_representation(self, instance):
         ret = []
         link_fields = ["extension", "link_type", "name", "mime", "url"]
-        links = Link.objects.filter(
-            resource_id=instance,  # link_type__in=["OGC:WMS", "OGC:WFS", "OGC:WCS", "image", "metadata"]
-        )
+        links = self.preload("links", _bulk_load_links, instance, default=[])
         request = self.context.get("request", None)
         for lnk in links:
             formatted_link = model_to_dict(lnk, fields=link_fields)
@@ -581,7 +698,7 @@ class LinksSerializer(DynamicModelSerializer):
         return ret
 
 
-class ResourceBaseSerializer(MultiLangOutputMixin, DynamicModelSerializer):
+class ResourceBaseSerializer(BulkPreloadMixin, MultiLangOutputMixin, DynamicModelSerializer):
     pk = serializers.CharField(read_only=True)
     uuid = serializers.CharField(read_only=True)
     resource_type = serializers.CharField(required=False)
@@ -783,13 +900,9 @@ class ResourceBaseSerializer(MultiLangOutputMixin, DynamicModelSerializer):
         """
         Returns the permissions for the resource instance using Django cache.
         """
-        request = self.context.get("request")
-        permissions = (
-            permissions_registry.get_perms(instance=instance, user=request.user, use_cache=True)
-            if request and request.user and instance
-            else []
-        )
-        return permissions
+        if not instance:
+            return []
+        return self.preload("perms", _bulk_load_perms, instance.pk, default=[])
 
     def save(self, **kwargs):
         extent = self.validated_data.pop("extent", None)
@@ -833,6 +946,43 @@ class FavoriteSerializer(DynamicModelSerializer):
         return ResourceBaseSerializer(resource).data
 
 
+def _bulk_load_resource_counts(count_type, pks, request, filter_options):
+    """
+    Returns a dict pk -> number of resources visible by the user referencing the object,
+    for all the objects of the given count type (e.g. keywords, regions) with one grouped query.
+    The counts are cached per visibility class for RESOURCE_COUNT_CACHE_TIMEOUT seconds.
+    """
+    from geonode.facets.engine import facet_engine
+
+    timeout = getattr(settings, "RESOURCE_COUNT_CACHE_TIMEOUT", 0)
+    ret = {pk: 0 for pk in pks}
+    keys = {}
+    if timeout > 0:
+        signature = hashlib.md5(repr(sorted(filter_options.items())).encode("utf-8")).hexdigest()
+        visibility = facet_engine.get_visibility_class(request.user)
+        keys = {pk: f"resource_count:{count_type}:{visibility}:{signature}:{pk}" for pk in pks}
+        cached = cache.get_many(keys.values())
+        for pk, key in keys.items():
+            if key in cached:
+                ret[pk] = cached[key]
+        pks = [pk for pk, key in keys.items() if key not in cached]
+
+    if pks:
+        counts = (
+            get_resources_with_perms(request.user, filter_options)
+            .filter(**{f"{count_type}__in": pks})
+            .order_by()
+            .values(count_type)
+            .annotate(count=Count("pk", distinct=True))
+        )
+        computed = {pk: 0 for pk in pks}
+        computed.update({row[count_type]: row["count"] for row in counts})
+        ret.update(computed)
+        if timeout > 0:
+            cache.set_many({keys[pk]: count for pk, count in computed.items()}, timeout)
+    return ret
+
+
 class BaseResourceCountSerializer(BaseDynamicModelSerializer):
     def to_representation(self, instance):
         request = self.context.get("request")
@@ -845,12 +995,28 @@ class BaseResourceCountSerializer(BaseDynamicModelSerializer):
         data = super().to_representation(instance)
         if not isinstance(data, int):
             try:
-                count_filter = {self.Meta.count_type: instance}
-                data["count"] = get_resources_with_perms(request.user, filter_options).filter(**count_filter).count()
+                data["count"] = self.get_resource_count(instance, request, filter_options)
             except (TypeError, NoReverseMatch) as e:
                 logger.exception(e)
         return data
 
+    def get_resource_count(self, instance, request, filter_options):
+        """
+        Returns the number of resources referencing the instance; the counts are computed at once
+        for all the objects of the page being serialized
+        """
+        preloaded = self.context.setdefault(PRELOAD_CONTEXT_KEY, {})
+        counts = preloaded.setdefault(f"resource_count:{self.Meta.count_type}", {})
+        if instance.pk not in counts:
+            page = getattr(self.root, "instance", None)
+            try:
+                pks = {obj.pk for obj in page if isinstance(obj, self.Meta.model)}
+            except TypeError:
+                pks = set()
+            pks = [pk for pk in pks | {instance.pk} if pk not in counts]
+            counts.update(_bulk_load_resource_counts(self.Meta.count_type, pks, request, filter_options))
+        return counts[instance.pk]
+
 
 class HierarchicalKeywordSerializer(BaseResourceCountSerializer):
     class Meta:
@@ -94,6 +94,7 @@ from geonode.base.populate_test_data import (
 from geonode.resource.api.tasks import resouce_service_dispatcher
 from guardian.shortcuts import assign_perm
 from geonode.security.registry import permissions_registry
+from geonode.security.utils import get_resources_with_perms
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
@@ -727,6 +728,83 @@ class BaseApiTests(APITestCase):
             resource.tkeywords.set(ThesaurusKeyword.objects.none())
             self.assertEqual(0, resource.tkeywords.count())
 
+    def test_base_resources_cursor_pagination(self):
+        """
+        Walking the resources with the keyset pagination must return the same resources, in the same order,
+        of the page number pagination
+        """
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        url = reverse("base-resources-list")
+        response = self.client.get(f"{url}?page_size=100", format="json")
+        self.assertEqual(response.status_code, 200)
+        expected = [r["pk"] for r in response.data["resources"]]
+        total = response.data["total"]
+
+        found = []
+        next_url = f"{url}?page_size=7&cursor="
+        while next_url:
+            response = self.client.get(next_url, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["total"], total)
+            self.assertNotIn("page", response.data)
+            found.extend(r["pk"] for r in response.data["resources"])
+            next_url = response.data["links"]["next"]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertCountEqual(expected, found)
+
+        # the previous link walks back the same pages
+        response = self.client.get(f"{url}?page_size=7&cursor=", format="json")
+        first_page = [r["pk"] for r in response.data["resources"]]
+        self.assertIsNone(response.data["links"]["previous"])
+        response = self.client.get(response.data["links"]["next"], format="json")
+        response = self.client.get(response.data["links"]["previous"], format="json")
+        self.assertListEqual(first_page, [r["pk"] for r in response.data["resources"]])
+
+        # total can be skipped
+        response = self.client.get(f"{url}?page_size=7&cursor=&total=skip", format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["total"])
+
+        # bad input
+        response = self.client.get(f"{url}?cursor=not-a-cursor", format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f"{url}?cursor=&total=wrong", format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_base_resources_cursor_pagination_nullable_ordering(self):
+        """
+        The keyset pagination walks the resources with a NULL creation date too
+        """
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        null_pks = list(ResourceBase.objects.order_by("pk").values_list("pk", flat=True)[:3])
+        ResourceBase.objects.filter(pk__in=null_pks).update(created=None)
+        url = reverse("base-resources-list")
+        response = self.client.get(f"{url}?page_size=1000", format="json")
+        expected = [r["pk"] for r in response.data["resources"]]
+        null_pks = [pk for pk in null_pks if pk in expected]
+
+        pages = []
+        next_url = f"{url}?page_size=2&cursor=&total=skip"
+        while next_url:
+            response = self.client.get(next_url, format="json")
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            next_url = response.data["links"]["next"]
+        found = [r["pk"] for page in pages for r in page["resources"]]
+        self.assertCountEqual(found, expected)
+        # the NULLs come first with the default "-created" ordering
+        self.assertCountEqual(found[: len(null_pks)], null_pks)
+
+        # walking back from the last page
+        found_back = [r["pk"] for r in pages[-1]["resources"]]
+        previous_url = pages[-1]["links"]["previous"]
+        while previous_url:
+            response = self.client.get(previous_url, format="json")
+            self.assertEqual(response.status_code, 200)
+            found_back = [r["pk"] for r in response.data["resources"]] + found_back
+            previous_url = response.data["links"]["previous"]
+        self.assertListEqual(found_back, found)
+
     def test_write_resources(self):
         """
         Ensure we can perform write operation against the Resource Bases.
@@ -1911,6 +1989,25 @@ class BaseApiTests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["total"], Region.objects.count())
 
+    def test_regions_resource_counts_in_bulk(self):
+        """
+        The resource counts of a page of regions are computed with a single query
+        """
+        regions = list(Region.objects.order_by("pk")[:3])
+        resource = ResourceBase.objects.first()
+        resource.regions.add(regions[0], regions[1])
+
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        ids = "&".join(f"filter{{id.in}}={r.pk}" for r in regions)
+        with patch(
+            "geonode.base.api.serializers.get_resources_with_perms", wraps=get_resources_with_perms
+        ) as mocked_resources:
+            response = self.client.get(f"{reverse('regions-list')}?{ids}", format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mocked_resources.call_count, 1)
+        counts = {r["id"]: r["count"] for r in response.data["regions"]}
+        self.assertDictEqual(counts, {regions[0].pk: 1, regions[1].pk: 1, regions[2].pk: 0})
+
     def test_keywords_list(self):
         """
         Ensure we can access the list of keywords.
@@ -4550,3 +4647,48 @@ class DeprecatedExtraMetadataApiTest(GeoNodeBaseTestSupport):
         if metadata:
             self.assertIn("id", metadata[0])
             self.assertIn("field_name", metadata[0])
+
+
+class ResourceListQueryCountTest(GeoNodeBaseTestSupport):
+    """
+    Query count regression benchmark for the resources list: the computed fields
+    must be loaded in bulk for the whole page, not once per resource.
+    """
+
+    PAGE_SIZES = (10, 50, 200)
+    BULK_LOADED_TABLES = ("favorite_favorite", "base_contactrole", "base_link", "assets_asset")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.get(username="admin")
+        for i in range(max(cls.PAGE_SIZES)):
+            resource = ResourceBase.objects.create(
+                title=f"query_count_{i:03d}", uuid=str(uuid4()), owner=cls.admin, is_approved=True, is_published=True
+            )
+            if i % 2:
+                Favorite.objects.create_favorite(resource, cls.admin)
+
+    def _run(self, page_size):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"{reverse('base-resources-list')}?page_size={page_size}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(page_size, len(response.json()["resources"]))
+        return ctx.captured_queries
+
+    def test_resources_list_query_count(self):
+        self.client.login(username="admin", password="admin")
+        counts = {}
+        for page_size in self.PAGE_SIZES:
+            queries = self._run(page_size)
+            counts[page_size] = {
+                table: len([q for q in queries if f'"{table}"' in q["sql"]]) for table in self.BULK_LOADED_TABLES
+            }
+            logger.info(f"Resources list, page size {page_size}: {len(queries)} queries {counts[page_size]}")
+
+        # the bulk loaded tables are queried a constant number of times whatever the page size
+        for page_size in self.PAGE_SIZES[1:]:
+            self.assertDictEqual(counts[self.PAGE_SIZES[0]], counts[page_size])
@@ -23,7 +23,6 @@ import json
 import re
 import logging
 
-from decimal import Decimal
 from typing import Union, List, Generator
 
 from pyproj import CRS
@@ -77,28 +76,9 @@ def filter_bbox(queryset, bbox):
 
     :param bbox: Comma-separated coordinates as "xmin,ymin,xmax,ymax"
     """
-    assert queryset.model.__class__.__name__ == "PolymorphicModelBase"
-
-    bboxes = []
-    _bbox_index = -1
-    for _x, _y in enumerate(bbox.split(",")):
-        if _x % 4 == 0:
-            bboxes.append([])
-            _bbox_index += 1
-        bboxes[_bbox_index].append(_y)
-
-    search_queryset = None
-    for _bbox in bboxes:
-        _bbox = list(map(Decimal, _bbox))
-        search_polygon = polygon_from_bbox((_bbox[0], _bbox[1], _bbox[2], _bbox[3]))
-        for search_polygon_dl in [
-            DjangoPolygon.from_ewkt(_p.wkt)
-            for _p in split_polygon(json.loads(search_polygon.json), output_format="polygons")
-        ]:
-            _qs = queryset.filter(ll_bbox_polygon__intersects=search_polygon_dl)
-            search_queryset = _qs if search_queryset is None else search_queryset | _qs
-
-    return search_queryset
+    from geonode.base.spatial_search import spatial_search_backend
+
+    return spatial_search_backend.filter(queryset, bbox)
 
 
 def check_crossing(lon1: float, lon2: float, validate: bool = False, dlon_threshold: float = 180.0):
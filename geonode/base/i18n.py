@@ -2,6 +2,8 @@ import logging
 import threading
 import time
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
 from django.utils.translation import get_language, gettext as _
 
@@ -11,6 +13,9 @@ logger = logging.getLogger(__name__)
 
 I18N_THESAURUS_IDENTIFIER = "labels-i18n"
 OVR_SUFFIX = "__ovr"
+# key of the shared i18n cache version in the default Django cache
+I18N_CACHE_VERSION_KEY = "geonode:i18n_cache_version"
+_MISSING = object()
 
 
 def get_localized_tkeywords(lang, thesaurus_identifier: str):
@@ -66,96 +71,98 @@ def get_localized_label(lang, about):
     )
 
 
-class I18nCacheEntry:
-    def __init__(self):
-        # the date field of the thesaurus when it was last loaded, it's used for the expiration check
-        self.date: str = "init"
-        self.caches: dict = {}  # the caches for this language
-
-    def __str__(self):
-        return f"I18nCacheEntry {self.date} [{list(self.caches.keys())}]"
-
-
 class I18nCache:
     """
     Caches language related data.
-    Synch is performed via date field in the "labels-i18n" thesaurus.
+    Synch is performed via date field in the "labels-i18n" thesaurus, which is used as cache version.
+    The version is shared by all the processes through the default Django cache: it's published there when
+    the thesaurus changes, and read from the DB only when missing or expired.
+    The cached data are kept in an immutable snapshot, replaced as a whole on updates, so reads take no lock.
     """
 
     CHECK_INTERVAL = 5  # seconds
 
     def __init__(self):
-        # the cache has the lang as key, and I18nCacheEntry as a value:
-        self.lang_cache = {}
+        # (version, {lang: {data_key: data}}), never modified in place
+        self._snapshot = ("init", {})
         self._last_check = 0
+        # serializes the writers only
         self._lock = threading.Lock()
 
+    @staticmethod
+    def _load_version():
+        # may be none if thesaurus does not exist
+        return Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).values_list("date", flat=True).first()
+
+    def get_version(self):
+        """Returns the current version of the cached data, shared by all the processes"""
+        version = cache.get(I18N_CACHE_VERSION_KEY, _MISSING)
+        if version is _MISSING:
+            version = self._load_version()
+            cache.set(I18N_CACHE_VERSION_KEY, version, timeout=settings.I18N_CACHE_VERSION_TIMEOUT)
+        return version
+
+    @staticmethod
+    def publish_version(version):
+        """Makes all the processes drop the data cached for a previous version"""
+        logger.debug(f"Publishing i18n cache version {version}")
+        cache.set(I18N_CACHE_VERSION_KEY, version, timeout=settings.I18N_CACHE_VERSION_TIMEOUT)
+
     def get_entry(self, lang, data_key):
         """
         returns date:str, data
         date is needed for checking the entry freshness when setting info
         data may be None if not cached or expired
         """
-        with self._lock:
-            cached_entry: I18nCacheEntry = self.lang_cache.get(lang, None)
-
-            time_now = time.time()
-            needs_check = time_now - self._last_check > I18nCache.CHECK_INTERVAL
-
-            # if not needs_check:
-            #     logger.debug(f"No cache check needed {lang}:{data_key} @ {cached_entry}")
-            # else:
-            #     logger.debug(f"Cache check needed {lang}:{data_key} @ {cached_entry}")
-
-            if needs_check or not cached_entry:
-                self._last_check = time_now
-                thesaurus_date = (  # may be none if thesaurus does not exist
-                    Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER)
-                    .values_list("date", flat=True)
-                    .first()
-                )
-                if cached_entry and cached_entry.date != thesaurus_date:
+        version, caches = self._snapshot
+
+        time_now = time.time()
+        if time_now - self._last_check > I18nCache.CHECK_INTERVAL or lang not in caches:
+            self._last_check = time_now
+            latest_version = self.get_version()
+            if latest_version != version:
+                if caches:
                     logger.info(f"Cache for {lang}:{data_key} dirty, clearing all caches")
-                    self.lang_cache.clear()
-                    return thesaurus_date, None
-                if not cached_entry:
-                    logger.info(f"Cache for {lang}:{data_key} needs to be created")
-                    return thesaurus_date, None
+                    with self._lock:
+                        if self._snapshot[0] == version:
+                            self._snapshot = (latest_version, {})
+                return latest_version, None
+            if lang not in caches:
+                logger.info(f"Cache for {lang}:{data_key} needs to be created")
+                return latest_version, None
 
-            # logger.debug(f"Returning cached entry for {lang}:{data_key} @ {cached_entry.date}")
-            return cached_entry.date, cached_entry.caches.get(data_key, None)
+        return version, caches.get(lang, {}).get(data_key, None)
 
     def set(self, lang: str, data_key: str, data, request_date: str):
         # TODO: check if lang is allowed
-        # Perform DB query outside the lock to avoid holding it during I/O
-        latest_date = (
-            Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).values_list("date", flat=True).first()
-        )
+        # Read the version outside the lock to avoid holding it during I/O
+        latest_version = self.get_version()
+
+        if request_date != latest_version:
+            logger.warning(
+                f"Cache will not be updated for lang:{lang} key:{data_key} reqdate:{request_date} latest:{latest_version}"
+            )
+            return False
 
         with self._lock:
-            cached_entry: I18nCacheEntry = self.lang_cache.setdefault(lang, I18nCacheEntry())
-
-            if request_date == latest_date:
-                # no changes after processing, set the info right away
-                logger.debug(f"Caching lang:{lang} key:{data_key} date:{request_date}")
-                cached_entry.date = latest_date
-                cached_entry.caches[data_key] = data
-                return True
-            else:
-                logger.warning(
-                    f"Cache will not be updated for lang:{lang} key:{data_key} reqdate:{request_date} latest:{latest_date}"
-                )
-                return False
+            version, caches = self._snapshot
+            if version != latest_version:
+                # data cached for a previous version are dropped
+                caches = {}
+            logger.debug(f"Caching lang:{lang} key:{data_key} date:{request_date}")
+            self._snapshot = (latest_version, {**caches, lang: {**caches.get(lang, {}), data_key: data}})
+            return True
 
     def clear(self):
         logger.info("Clearing i18n cache")
         with self._lock:
-            self.lang_cache.clear()
+            self._snapshot = ("init", {})
+        cache.delete(I18N_CACHE_VERSION_KEY)
 
     def force_check(self):
         """For testing: forces a check against the DB on the next get_entry call."""
-        with self._lock:
-            self._last_check = 0
+        cache.delete(I18N_CACHE_VERSION_KEY)
+        self._last_check = 0
 
 
 class LabelResolver:
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+import time
+import uuid
+import random
+import logging
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.gis.geos import Polygon
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from geonode.base.management import command_utils
+from geonode.base.models import ResourceBase
+from geonode.base.spatial_search import spatial_search_backend
+
+logger = logging.getLogger(__name__)
+
+# typical map viewports widths, in degrees: world, continent, country, region, city
+VIEWPORT_WIDTHS = (360.0, 90.0, 20.0, 5.0, 0.5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the extent search: the previous per piece OR of intersects querysets "
+        "against the single MultiPolygon search with && prefilter"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-p",
+            "--populate",
+            dest="populate",
+            type=int,
+            default=0,
+            help="Number of synthetic resources to create for the benchmark, e.g. 500000. "
+            "They are created in a transaction which is rolled back at the end.",
+        )
+        parser.add_argument(
+            "-q", "--queries", dest="queries", type=int, default=50, help="Number of random viewports to search"
+        )
+        parser.add_argument("--page-size", dest="page_size", type=int, default=20, help="Page size of every search")
+        parser.add_argument("--seed", dest="seed", type=int, default=42, help="Seed of the random generator")
+        parser.add_argument(
+            "--skip-logger-setup",
+            action="store_false",
+            dest="setup_logger",
+            help="Skips setup of the logger",
+        )
+
+    def handle(self, **options):
+        logger = logging.getLogger(__name__)
+        if options.get("setup_logger"):
+            logger = command_utils.setup_logger()
+
+        rnd = random.Random(options.get("seed"))
+        viewports = [self._random_viewport(rnd) for _ in range(options.get("queries"))]
+
+        logger.info(f"==== Running command {__name__}")
+        logger.info(f"{self.help}")
+        logger.info("")
+
+        with transaction.atomic():
+            if options.get("populate"):
+                self._populate(options.get("populate"), rnd, logger)
+            logger.info(f"Catalogue size: {ResourceBase.objects.count()} resources")
+            for name, search in (("legacy", self._legacy_search), ("backend", spatial_search_backend.filter)):
+                timings = []
+                for extent in viewports:
+                    start = time.perf_counter()
+                    queryset = search(ResourceBase.objects.all(), extent)
+                    queryset.count()
+                    list(queryset.order_by("-pk").values_list("pk", flat=True)[: options.get("page_size")])
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                logger.info(
+                    f"- {name:8}: avg {statistics.mean(timings):8.2f} ms | "
+                    f"p50 {timings[len(timings) // 2]:8.2f} ms | p95 {timings[int(len(timings) * 0.95) - 1]:8.2f} ms"
+                )
+            # never keep the synthetic resources
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _legacy_search(queryset, extent):
+        search_queryset = None
+        for polygon in spatial_search_backend.get_search_polygons(extent):
+            _qs = queryset.filter(ll_bbox_polygon__intersects=polygon)
+            search_queryset = _qs if search_queryset is None else search_queryset | _qs
+        return search_queryset
+
+    @staticmethod
+    def _random_viewport(rnd):
+        width = rnd.choice(VIEWPORT_WIDTHS)
+        height = min(170.0, width / 2)
+        x = rnd.uniform(-180.0, 180.0)
+        y = rnd.uniform(-85.0 + height / 2, 85.0 - height / 2)
+        # viewports may cross the antimeridian, as web maps report them
+        return f"{x - width / 2},{y - height / 2},{x + width / 2},{y + height / 2}"
+
+    @staticmethod
+    def _populate(total, rnd, logger, batch_size=10000):
+        owner = get_user_model().objects.filter(is_superuser=True).first()
+        ctype = ContentType.objects.get_for_model(ResourceBase)
+        created = 0
+        while created < total:
+            batch = []
+            for i in range(min(batch_size, total - created)):
+                width, height = rnd.uniform(0.01, 20.0), rnd.uniform(0.01, 10.0)
+                x, y = rnd.uniform(-180.0, 180.0 - width), rnd.uniform(-90.0, 90.0 - height)
+                bbox = Polygon.from_bbox((x, y, x + width, y + height))
+                bbox.srid = 4326
+                batch.append(
+                    ResourceBase(
+                        uuid=str(uuid.uuid4()),
+                        title=f"spatial_search_benchmark_{created + i}",
+                        owner=owner,
+                        polymorphic_ctype=ctype,
+                        bbox_polygon=bbox,
+                        ll_bbox_polygon=bbox,
+                        srid="EPSG:4326",
+                    )
+                )
+            ResourceBase.objects.bulk_create(batch)
+            created += len(batch)
+            logger.info(f"Created {created} synthetic resources")
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_thumbnail_signatures(apps, schema_editor):
+    """
+    The signatures were stored as SparseFields, which are part of the editable metadata
+    """
+    SparseField = apps.get_model("metadata", "SparseField")
+    ThumbnailSignature = apps.get_model("base", "ThumbnailSignature")
+
+    signatures = SparseField.objects.filter(name="_thumbnail_signature")
+    ThumbnailSignature.objects.bulk_create(
+        [
+            ThumbnailSignature(resource_id=resource_id, signature=value)
+            for resource_id, value in signatures.exclude(value=None).values_list("resource_id", "value")
+        ],
+        ignore_conflicts=True,
+    )
+    signatures.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0100_migrate_extrametadata_to_sparsefields"),
+        ("metadata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThumbnailSignature",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("signature", models.CharField(max_length=64)),
+                (
+                    "resource",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="base.resourcebase"
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(move_thumbnail_signatures, migrations.RunPython.noop),
+    ]
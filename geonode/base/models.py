@@ -2167,3 +2167,13 @@ class GroupGeoLimit(models.Model):
     group = models.ForeignKey(GroupProfile, null=False, blank=False, on_delete=models.CASCADE)
     resource = models.ForeignKey(ResourceBase, null=False, blank=False, on_delete=models.CASCADE)
     wkt = models.TextField(db_column="wkt", blank=True)
+
+
+class ThumbnailSignature(models.Model):
+    """
+    Hash of everything the current thumbnail of a resource was generated from,
+    used by the bulk regeneration of the thumbnails to skip the unchanged resources
+    """
+
+    resource = models.OneToOneField(ResourceBase, null=False, on_delete=models.CASCADE, related_name="+")
+    signature = models.CharField(max_length=64, null=False, blank=False)
@@ -1,9 +1,10 @@
 import logging
 from datetime import datetime, timedelta
 
+from django.db import transaction
 from django.db.models.signals import post_save
 
-from geonode.base.i18n import I18N_THESAURUS_IDENTIFIER
+from geonode.base.i18n import I18N_THESAURUS_IDENTIFIER, i18nCache
 from geonode.base.models import Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
 
 logger = logging.getLogger(__name__)
@@ -68,3 +69,5 @@ def _update_thesaurus_date():
     i18n_thesaurus.date = resolved_date
     i18n_thesaurus._signal_handled = True
     i18n_thesaurus.save()
+    # let the other processes know, once the new labels are visible to them
+    transaction.on_commit(lambda: i18nCache.publish_version(resolved_date))
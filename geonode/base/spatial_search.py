@@ -0,0 +1,134 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import math
+import logging
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
+
+EXTENT_OVERLAP_ANNOTATION = "extent_overlap"
+
+
+class _Area(Func):
+    # planar area in the units of the srid, to compare areas in the same reference system
+    function = "ST_Area"
+    output_field = FloatField()
+
+
+class _Intersection(Func):
+    function = "ST_Intersection"
+    output_field = GeometryField(srid=4326)
+
+
+class SpatialSearchBackend:
+    """
+    Spatial search of resources by extent.
+
+    The requested bounding boxes are normalized to the [-180, 180] longitude range,
+    split at the antimeridian and merged into a single MultiPolygon.
+    Resources are selected with a ``&&`` bounding box prefilter on every piece, which can use
+    the spatial index, followed by the exact intersection with the whole search geometry.
+    Optionally the resources can be ranked by the overlap ratio (intersection over union)
+    between their extent and the search geometry.
+    """
+
+    field = "ll_bbox_polygon"
+    srid = 4326
+
+    def parse_extent(self, extent):
+        """
+        Parse a string of comma separated coordinates "xmin,ymin,xmax,ymax[,xmin,ymin,xmax,ymax...]"
+        into a list of (xmin, ymin, xmax, ymax) tuples. Raises a ValueError if it is not valid.
+        """
+        coords = [float(c) for c in str(extent).split(",")]
+        if not coords or len(coords) % 4 or not all(math.isfinite(c) for c in coords):
+            raise ValueError(f"Invalid extent: {extent}")
+        return [tuple(coords[i : i + 4]) for i in range(0, len(coords), 4)]
+
+    def split_bbox(self, bbox):
+        """
+        Returns the list of (xmin, ymin, xmax, ymax) pieces covering the bbox in the [-180, 180] longitude range.
+        A bbox with xmin > xmax, or exceeding the [-180, 180] range, crosses the antimeridian.
+        """
+        xmin, ymin, xmax, ymax = bbox
+        ymin, ymax = max(-90.0, min(ymin, ymax)), min(90.0, max(ymin, ymax))
+        if xmin > xmax:
+            xmax += 360.0
+        if xmax - xmin >= 360.0:
+            return [(-180.0, ymin, 180.0, ymax)]
+        # bring xmin in [-180, 180)
+        shift = math.floor((xmin + 180.0) / 360.0) * 360.0
+        xmin, xmax = xmin - shift, xmax - shift
+        if xmax <= 180.0:
+            return [(xmin, ymin, xmax, ymax)]
+        return [(xmin, ymin, 180.0, ymax), (-180.0, ymin, xmax - 360.0, ymax)]
+
+    def get_search_polygons(self, extent):
+        polygons = []
+        for bbox in self.parse_extent(extent):
+            for piece in self.split_bbox(bbox):
+                polygon = Polygon.from_bbox(piece)
+                polygon.srid = self.srid
+                polygons.append(polygon)
+        return polygons
+
+    def get_search_geometry(self, polygons):
+        """
+        Returns the MultiPolygon covering all the polygons, without overlaps
+        """
+        geometry = MultiPolygon(polygons, srid=self.srid).unary_union
+        if isinstance(geometry, Polygon):
+            geometry = MultiPolygon(geometry, srid=self.srid)
+        geometry.srid = self.srid
+        return geometry
+
+    def filter(self, queryset, extent, rank=False):
+        """
+        Filters the queryset by the resources intersecting the extent.
+        If rank is True, the resources are annotated with their ``extent_overlap`` ratio and ordered by it.
+        """
+        polygons = self.get_search_polygons(extent)
+        geometry = self.get_search_geometry(polygons)
+
+        prefilter = Q()
+        for polygon in polygons:
+            prefilter |= Q(**{f"{self.field}__bboverlaps": polygon})
+        queryset = queryset.filter(prefilter).filter(**{f"{self.field}__intersects": geometry})
+
+        if rank:
+            intersection = _Area(
+                _Intersection(F(self.field), Value(geometry, output_field=GeometryField(srid=self.srid)))
+            )
+            union = _Area(F(self.field)) + Value(geometry.area) - intersection
+            queryset = queryset.annotate(
+                **{
+                    EXTENT_OVERLAP_ANNOTATION: Coalesce(
+                        intersection / Func(union, Value(0.0), function="NULLIF", output_field=FloatField()),
+                        Value(0.0),
+                    )
+                }
+            ).order_by(f"-{EXTENT_OVERLAP_ANNOTATION}", "-pk")
+        return queryset
+
+
+spatial_search_backend = SpatialSearchBackend()
@@ -789,6 +789,76 @@ class TestGetVisibleResource(TestCase):
             if _ll:
                 _ll.delete()
 
+    def test_extent_filter_rank_by_overlap(self):
+        from .spatial_search import spatial_search_backend, EXTENT_OVERLAP_ANNOTATION
+
+        _small = _large = None
+        try:
+            _small = Dataset.objects.create(
+                uuid=str(uuid4()),
+                owner=self.user,
+                name="test_extent_filter_rank_small",
+                title="test_extent_filter_rank_small",
+                ll_bbox_polygon=Polygon.from_bbox([10, 10, 12, 12]),
+            )
+            _large = Dataset.objects.create(
+                uuid=str(uuid4()),
+                owner=self.user,
+                name="test_extent_filter_rank_large",
+                title="test_extent_filter_rank_large",
+                ll_bbox_polygon=Polygon.from_bbox([0, 0, 40, 40]),
+            )
+            _qs = spatial_search_backend.filter(
+                Dataset.objects.filter(pk__in=[_small.pk, _large.pk]), "-1,-1,41,41", rank=True
+            )
+            self.assertListEqual([_large.pk, _small.pk], list(_qs.values_list("pk", flat=True)))
+            self.assertGreater(getattr(_qs.first(), EXTENT_OVERLAP_ANNOTATION), 0.9)
+            # the extent crossing the antimeridian does not match any of them
+            _qs = spatial_search_backend.filter(Dataset.objects.filter(pk__in=[_small.pk, _large.pk]), "170,0,-170,40")
+            self.assertFalse(_qs.exists())
+        finally:
+            for _resource in (_small, _large):
+                if _resource:
+                    _resource.delete()
+
+
+class TestSpatialSearchBackend(SimpleTestCase):
+    def test_parse_extent(self):
+        from .spatial_search import spatial_search_backend
+
+        self.assertListEqual(
+            [(-10.0, -5.0, 10.0, 5.0), (20.0, 0.0, 30.0, 10.0)],
+            spatial_search_backend.parse_extent("-10,-5,10,5,20,0,30,10"),
+        )
+        for extent in ("", "1,2,3", "a,b,c,d", "nan,0,1,1"):
+            with self.assertRaises(ValueError):
+                spatial_search_backend.parse_extent(extent)
+
+    def test_split_bbox(self):
+        from .spatial_search import spatial_search_backend
+
+        self.assertListEqual([(-10.0, -5.0, 10.0, 5.0)], spatial_search_backend.split_bbox((-10.0, -5.0, 10.0, 5.0)))
+        # crossing the antimeridian, either with xmin > xmax or out of the [-180, 180] range
+        expected = [(170.0, -5.0, 180.0, 5.0), (-180.0, -5.0, -170.0, 5.0)]
+        self.assertListEqual(expected, spatial_search_backend.split_bbox((170.0, -5.0, -170.0, 5.0)))
+        self.assertListEqual(expected, spatial_search_backend.split_bbox((170.0, -5.0, 190.0, 5.0)))
+        self.assertListEqual(expected, spatial_search_backend.split_bbox((-190.0, -5.0, -170.0, 5.0)))
+        # whole world
+        self.assertListEqual(
+            [(-180.0, -90.0, 180.0, 90.0)], spatial_search_backend.split_bbox((-200.0, -100.0, 200.0, 100.0))
+        )
+
+    def test_search_geometry_is_a_single_multipolygon(self):
+        from .spatial_search import spatial_search_backend
+
+        polygons = spatial_search_backend.get_search_polygons("170,-5,-170,5,0,0,10,10,5,5,15,15")
+        self.assertEqual(4, len(polygons))
+        geometry = spatial_search_backend.get_search_geometry(polygons)
+        self.assertEqual("MultiPolygon", geometry.geom_type)
+        self.assertEqual(4326, geometry.srid)
+        # the overlapping boxes are merged
+        self.assertEqual(3, len(geometry))
+
 
 class TestHtmlTagRemoval(SimpleTestCase):
     def test_not_tags_in_attribute(self):
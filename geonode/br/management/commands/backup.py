@@ -25,16 +25,19 @@ import requests
 import re
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
+
 from geonode.assets.local import LocalAssetHandler
 from geonode.assets.models import LocalAsset
 
-from .utils import utils
+from .utils import utils, engine
 
 from requests.auth import HTTPBasicAuth
 from xmltodict import parse as parse_xml
 from urllib.parse import urlparse, urljoin
 
 from django.conf import settings
+from django.db import connections
 from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 
@@ -81,6 +84,31 @@ class Command(BaseCommand):
             help="Destination folder where to store the backup archive. It must be writable.",
         )
 
+        parser.add_argument(
+            "--archive-format",
+            dest="archive_format",
+            choices=engine.ARCHIVE_FORMATS,
+            default=engine.ARCHIVE_FORMAT_ZIP,
+            help="Format of the backup archive: 'zip' or 'zstd', a zstd compressed tar streamed without "
+            "copying the media, assets and raster data to a temporary folder first.",
+        )
+
+        parser.add_argument(
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="Number of parallel jobs dumping the fixtures and the vector data, and compressing a zstd archive.",
+        )
+
+        parser.add_argument(
+            "--incremental-from",
+            dest="incremental_from",
+            default=None,
+            help="Archive or manifest of a previous zstd backup: the media, assets and raster files which did not "
+            "change since then are not stored again, they are restored from the previous archives.",
+        )
+
         parser.add_argument(
             "--skip-read-only",
             action="store_true",
@@ -130,6 +158,18 @@ class Command(BaseCommand):
         if not backup_dir or len(backup_dir) == 0:
             raise CommandError("Destination folder '--backup-dir' is mandatory")
 
+        archive_format = options.get("archive_format") or engine.ARCHIVE_FORMAT_ZIP
+        jobs = max(1, options.get("jobs") or 1)
+        incremental_from = options.get("incremental_from")
+        if incremental_from and archive_format != engine.ARCHIVE_FORMAT_ZSTD:
+            raise CommandError("'--incremental-from' requires '--archive-format zstd'")
+        previous_manifest = None
+        if incremental_from:
+            try:
+                previous_manifest = engine.read_manifest(incremental_from)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read the manifest of the previous backup '{incremental_from}': {e}")
+
         if not force_exec:
             print("Before proceeding with the Backup, please ensure that:")
             print(" 1. The backend (DB or whatever) is accessible and you have rights")
@@ -146,79 +186,126 @@ class Command(BaseCommand):
             # Temporary folder to store backup files. It will be deleted at the end.
             os.chmod(target_folder, 0o777)
 
-            if not skip_geoserver:
-                self.create_geoserver_backup(config, settings, target_folder, ignore_errors)
-                self.dump_geoserver_raster_data(config, settings, target_folder)
-                self.dump_geoserver_vector_data(config, settings, target_folder)
-                self.dump_geoserver_externals(config, settings, target_folder)
+            archive = None
+            if archive_format == engine.ARCHIVE_FORMAT_ZSTD:
+                backup_archive = os.path.join(backup_dir, f"{dir_time_suffix}{engine.ZSTD_ARCHIVE_SUFFIX}")
+                logger.info(f"Streaming backup into {backup_archive}...")
+                archive = engine.StreamingArchive(backup_archive, threads=jobs, previous_manifest=previous_manifest)
             else:
-                logger.info("Skipping geoserver backup")
-
-            # Deactivate GeoNode Signals
-            with DisableDjangoSignals():
-                # Dump Fixtures
-                logger.info("*** Dumping GeoNode fixtures...")
-
-                fixtures_target = os.path.join(target_folder, "fixtures")
-                os.makedirs(fixtures_target, exist_ok=True)
-
-                for app_name, dump_name in zip(config.app_names, config.dump_names):
-                    # prevent dumping BackupRestore application
-                    if app_name == "br":
-                        continue
-
-                    logger.info(f" - Dumping '{app_name}' into '{dump_name}.json'")
-                    # Point stdout at a file for dumping data to.
-                    output_file = os.path.join(fixtures_target, f"{dump_name}.json")
-                    call_command("dumpdata", app_name, output=output_file)
-
-                # Store Media Root
-
-                media_folder = os.path.join(target_folder, utils.MEDIA_ROOT)
-                logger.info("*** Dumping GeoNode media folder...")
-                self.backup_folder(folder=media_folder, root=settings.MEDIA_ROOT, config=config)
-
-                logger.info("*** Dumping GeoNode assets folder...")
-                assets_folder = os.path.join(target_folder, utils.ASSETS_ROOT)
-                self.backup_folder(folder=assets_folder, root=settings.ASSETS_ROOT, config=config)
-                for instance in LocalAsset.objects.iterator():
-                    if not LocalAssetHandler._are_files_managed(instance):
-                        logger.warning(f"The file for the asset with id {instance.pk} were not backup since is not managed by GeoNode")
-
-                # Create Final ZIP Archive
-                logger.info("*** Creating final ZIP archive...")
-
                 backup_archive = os.path.join(backup_dir, f"{dir_time_suffix}.zip")
-                logger.info(f"Creating zip {backup_archive}...")
-
-                zip_dir(target_folder, backup_archive)
-
-                # Generate a md5 hash of a backup archive and save it
-                backup_md5_file = os.path.join(backup_dir, f"{dir_time_suffix}.md5")
-                zip_archive_md5 = utils.md5_file_hash(backup_archive)
-                with open(backup_md5_file, "w") as md5_file:
-                    md5_file.write(zip_archive_md5)
 
-                # Generate the ini file with the current settings used by the backup command
-                backup_ini_file = os.path.join(backup_dir, f"{dir_time_suffix}.ini")
-                with open(backup_ini_file, "w") as configfile:
-                    config.config_parser.write(configfile)
+            try:
+                if not skip_geoserver:
+                    self.create_geoserver_backup(config, settings, target_folder, ignore_errors)
+                    self.dump_geoserver_raster_data(config, settings, target_folder, archive=archive)
+                    self.dump_geoserver_vector_data(config, settings, target_folder, jobs=jobs)
+                    self.dump_geoserver_externals(config, settings, target_folder)
+                else:
+                    logger.info("Skipping geoserver backup")
+
+                # Deactivate GeoNode Signals
+                with DisableDjangoSignals():
+                    # Dump Fixtures
+                    logger.info("*** Dumping GeoNode fixtures...")
+                    self.dump_fixtures(config, os.path.join(target_folder, "fixtures"), jobs=jobs)
+
+                    # Store Media Root
+                    media_folder = os.path.join(target_folder, utils.MEDIA_ROOT)
+                    logger.info("*** Dumping GeoNode media folder...")
+                    self.backup_folder(folder=media_folder, root=settings.MEDIA_ROOT, config=config, archive=archive)
+
+                    logger.info("*** Dumping GeoNode assets folder...")
+                    assets_folder = os.path.join(target_folder, utils.ASSETS_ROOT)
+                    self.backup_folder(folder=assets_folder, root=settings.ASSETS_ROOT, config=config, archive=archive)
+                    for instance in LocalAsset.objects.iterator():
+                        if not LocalAssetHandler._are_files_managed(instance):
+                            logger.warning(
+                                f"The file for the asset with id {instance.pk} were not backup since is not managed by GeoNode"
+                            )
+
+                    if archive:
+                        # the files dumped into the temp folder complete the archive
+                        archive.add_tree(target_folder, "", track=False)
+                        archive_md5 = archive.close()
+                        logger.info(
+                            f"Archived {archive.stats['files']} files ({archive.stats['bytes']} bytes), "
+                            f"{archive.stats['unchanged']} unchanged files stored in previous archives"
+                        )
+                    else:
+                        # Create Final ZIP Archive
+                        logger.info("*** Creating final ZIP archive...")
+                        logger.info(f"Creating zip {backup_archive}...")
+
+                        zip_dir(target_folder, backup_archive)
+                        archive_md5 = utils.md5_file_hash(backup_archive)
+            except Exception:
+                if archive:
+                    archive.abort()
+                raise
+
+            # Save the md5 hash of the backup archive
+            backup_md5_file = os.path.join(backup_dir, f"{dir_time_suffix}.md5")
+            with open(backup_md5_file, "w") as md5_file:
+                md5_file.write(archive_md5)
+
+            # Generate the ini file with the current settings used by the backup command
+            backup_ini_file = os.path.join(backup_dir, f"{dir_time_suffix}.ini")
+            with open(backup_ini_file, "w") as configfile:
+                config.config_parser.write(configfile)
+
+            # Clean-up Temp Folder
+            logger.info("*** Final cleanup...")
+            try:
+                shutil.rmtree(target_folder)
+            except Exception:
+                logger.warning(f"WARNING: Could not be possible to delete the temp folder: '{target_folder}'")
 
-                # Clean-up Temp Folder
-                logger.info("*** Final cleanup...")
-                try:
-                    shutil.rmtree(target_folder)
-                except Exception:
-                    logger.warning(f"WARNING: Could not be possible to delete the temp folder: '{target_folder}'")
+            logger.info("Backup Finished. Archive generated.")
 
-                logger.info("Backup Finished. Archive generated.")
+            return str(backup_archive)
 
-                return str(os.path.join(backup_dir, f"{dir_time_suffix}.zip"))
+    def dump_fixtures(self, config, fixtures_target, jobs=1):
+        os.makedirs(fixtures_target, exist_ok=True)
 
-    def backup_folder(self, folder, root, config):
+        def dump(app):
+            app_name, dump_name = app
+            logger.info(f" - Dumping '{app_name}' into '{dump_name}.json'")
+            # Point stdout at a file for dumping data to.
+            output_file = os.path.join(fixtures_target, f"{dump_name}.json")
+            try:
+                call_command("dumpdata", app_name, output=output_file)
+            finally:
+                if jobs > 1:
+                    # every thread opens its own db connections
+                    connections.close_all()
+
+        # prevent dumping BackupRestore application
+        apps = [
+            (app_name, dump_name)
+            for app_name, dump_name in zip(config.app_names, config.dump_names)
+            if app_name != "br"
+        ]
+        if jobs > 1 and len(apps) > 1:
+            with ThreadPoolExecutor(max_workers=min(jobs, len(apps))) as executor:
+                list(executor.map(dump, apps))
+        else:
+            for app in apps:
+                dump(app)
+
+    def backup_folder(self, folder, root, config, archive=None):
         if not os.path.exists(folder):
             os.makedirs(root, exist_ok=True)
 
+        if archive:
+            # streamed from the root, the path in the archive is the one of the folder in the temp folder
+            archive.add_tree(
+                root,
+                os.path.basename(folder),
+                ignore=utils.ignore_time(config.gs_data_dt_filter[0], config.gs_data_dt_filter[1]),
+            )
+            logger.info(f"Archived files from '{root}'")
+            return
+
         copy_tree(
             root,
             folder,
@@ -320,7 +407,7 @@ class Command(BaseCommand):
             else:
                 raise ValueError(error_backup.format(url, r.status_code, r.text))
 
-    def dump_geoserver_raster_data(self, config, settings, target_folder):
+    def dump_geoserver_raster_data(self, config, settings, target_folder, archive=None):
         if config.gs_data_dir and config.gs_dump_raster_data:
             logger.info("*** Dump GeoServer raster data")
 
@@ -337,7 +424,14 @@ class Command(BaseCommand):
                 if not os.path.isabs(source_root):
                     source_root = os.path.join(settings.PROJECT_ROOT, "..", source_root)
                 logger.info(f"Dumping raster data from '{source_root}'...")
-                if os.path.exists(source_root):
+                if os.path.exists(source_root) and archive:
+                    archive.add_tree(
+                        source_root,
+                        os.path.relpath(dest_folder, target_folder).replace(os.sep, "/"),
+                        ignore=utils.ignore_time(config.gs_data_dt_filter[0], config.gs_data_dt_filter[1]),
+                    )
+                    logger.info(f"Archived raster data from '{source_root}'")
+                elif os.path.exists(source_root):
                     if not os.path.exists(dest_folder):
                         os.makedirs(dest_folder, exist_ok=True)
                     copy_tree(
@@ -349,7 +443,7 @@ class Command(BaseCommand):
                 else:
                     logger.info(f"Skipped raster data directory '{source_root}' because it does not exist")
 
-    def dump_geoserver_vector_data(self, config, settings, target_folder):
+    def dump_geoserver_vector_data(self, config, settings, target_folder, jobs=1):
         if config.gs_dump_vector_data:
             logger.info("*** Dump GeoServer vector data")
 
@@ -370,6 +464,7 @@ class Command(BaseCommand):
                     datastore["HOST"],
                     datastore["PASSWORD"],
                     gs_data_folder,
+                    jobs=jobs,
                 )
 
     def dump_geoserver_externals(self, config, settings, target_folder):
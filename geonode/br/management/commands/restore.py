@@ -31,14 +31,14 @@ import pathlib
 from typing import Union
 from datetime import datetime
 
-from .utils import utils
+from .utils import utils, engine
 
 from requests.auth import HTTPBasicAuth
 from urllib.parse import urlparse, urljoin
 
 from geonode.br.models import RestoredBackup
 from geonode.br.tasks import restore_notification
-from geonode.utils import DisableDjangoSignals, copy_tree, extract_archive, chmod_tree
+from geonode.utils import DisableDjangoSignals, copy_tree, chmod_tree
 from geonode.base.models import Configuration
 
 from django.conf import settings
@@ -58,11 +58,7 @@ class Command(BaseCommand):
         # Named (optional) arguments
         utils.option(parser)
 
-        parser.add_argument(
-            "--geoserver-data-dir",
-            dest="gs_data_dir",
-            default=None,
-            help="Geoserver data directory")
+        parser.add_argument("--geoserver-data-dir", dest="gs_data_dir", default=None, help="Geoserver data directory")
 
         parser.add_argument(
             "-i",
@@ -157,6 +153,14 @@ class Command(BaseCommand):
             help="If True, preserve geoserver resources and tables",
         )
 
+        parser.add_argument(
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="Number of parallel jobs restoring the vector data tables.",
+        )
+
         parser.add_argument(
             "--skip-logger-setup",
             action="store_false",
@@ -200,6 +204,7 @@ class Command(BaseCommand):
         with_logs = options.get("with_logs")
         notify = options.get("notify")
         soft_reset = options.get("soft_reset")
+        jobs = max(1, options.get("jobs") or 1)
 
         # choose backup_file from backup_files_dir, if --backup-files-dir was provided
         if backup_files_dir:
@@ -259,7 +264,7 @@ class Command(BaseCommand):
             try:
                 # Extract ZIP Archive to Target Folder
                 logger.info("*** Unzipping backup file...")
-                target_folder = extract_archive(backup_file, restore_folder)
+                target_folder = self.extract_backup_archive(backup_file, restore_folder)
 
                 # Write Checks
                 media_root = settings.MEDIA_ROOT
@@ -303,7 +308,9 @@ class Command(BaseCommand):
                         )
                         self.prepare_geoserver_gwc_config(config, settings)
                         self.restore_geoserver_raster_data(config, settings, target_folder)
-                        self.restore_geoserver_vector_data(config, settings, target_folder, soft_reset)
+                        self.restore_geoserver_vector_data(
+                            config, settings, target_folder, soft_reset, jobs=jobs, backup_file=backup_file
+                        )
                         self.restore_geoserver_externals(config, settings, target_folder)
                         logger.info("*** Recreate GWC tile layers")
                     except Exception as e:
@@ -311,7 +318,7 @@ class Command(BaseCommand):
                         if recovery_file:
                             logger.warning("*** Trying to restore from recovery file...")
                             with tempfile.TemporaryDirectory(dir=temp_dir_path) as restore_folder:
-                                recovery_folder = extract_archive(recovery_file, restore_folder)
+                                recovery_folder = self.extract_backup_archive(recovery_file, restore_folder)
                                 self.restore_geoserver_backup(
                                     config,
                                     settings,
@@ -322,7 +329,9 @@ class Command(BaseCommand):
                                     soft_reset,
                                 )
                                 self.restore_geoserver_raster_data(config, settings, recovery_folder)
-                                self.restore_geoserver_vector_data(config, settings, recovery_folder, soft_reset)
+                                self.restore_geoserver_vector_data(
+                                    config, settings, recovery_folder, soft_reset, jobs=jobs, backup_file=recovery_file
+                                )
                                 self.restore_geoserver_externals(config, settings, recovery_folder)
                         if notify:
                             restore_notification.apply_async(
@@ -472,12 +481,40 @@ class Command(BaseCommand):
             raise CommandError("Exclusive option (--backup-file|--backup-dir|--backup-files-dir)")
 
         if backup_file:
-            if not os.path.isfile(backup_file) or not zipfile.is_zipfile(backup_file):
-                raise CommandError("Provided '--backup-file' is not a .zip file")
+            if not os.path.isfile(backup_file) or not self.is_backup_archive(backup_file):
+                raise CommandError("Provided '--backup-file' is not a .zip file nor a .tar.zst archive")
 
         if backup_files_dir and not os.path.isdir(backup_files_dir):
             raise CommandError("Provided '--backup-files-dir' is not a directory")
 
+    @staticmethod
+    def is_backup_archive(backup_file: str) -> bool:
+        return (engine.is_zstd_archive(backup_file) and os.path.isfile(backup_file)) or zipfile.is_zipfile(backup_file)
+
+    @staticmethod
+    def get_backup_file_stem(backup_file: str) -> str:
+        """
+        Method returning the backup file's path without its extension, shared by the *.md5 and *.ini files
+
+        :param backup_file: path to the backup_file
+        :return: backup_file path without extension
+        """
+        return os.path.join(os.path.dirname(backup_file), engine.get_archive_stem(backup_file))
+
+    @staticmethod
+    def extract_backup_archive(backup_file: str, restore_folder: str) -> str:
+        """
+        Method extracting the backup archive, the zstd ones being streamed.
+        The vector data dumps of the zip archives are not extracted, they are read straight out of the archive.
+
+        :param backup_file: path to the backup_file
+        :param restore_folder: folder where the archive is extracted
+        :return: path of the folder containing the backup files
+        """
+        if engine.is_zstd_archive(backup_file):
+            return engine.extract_backup(backup_file, restore_folder)
+        return engine.extract_zip_archive(backup_file, restore_folder, exclude=engine.is_dump_member)
+
     def parse_backup_files_dir(self, backup_files_dir: str) -> Union[str, None]:
         """
         Method picking the Backup Archive to be restored from the Backup Files Directory.
@@ -491,7 +528,7 @@ class Command(BaseCommand):
 
         for file_name in os.listdir(backup_files_dir):
             file = os.path.join(backup_files_dir, file_name)
-            if zipfile.is_zipfile(file):
+            if self.is_backup_archive(file):
                 backup_file = (
                     file
                     if backup_file is None or os.path.getmtime(file) > os.path.getmtime(backup_file)
@@ -534,7 +571,7 @@ class Command(BaseCommand):
         backup_hash = utils.md5_file_hash(backup_file)
 
         # check md5 hash for backup archive, if the md5 file is in place
-        archive_md5_file = f"{backup_file.rsplit('.', 1)[0]}.md5"
+        archive_md5_file = f"{self.get_backup_file_stem(backup_file)}.md5"
 
         if os.path.exists(archive_md5_file):
             with open(archive_md5_file) as md5_file:
@@ -563,7 +600,7 @@ class Command(BaseCommand):
         :return: backup_ini_file_path original settings used by the backup file
         """
         # check if the ini file is in place
-        backup_ini_file_path = f"{backup_file.rsplit('.', 1)[0]}.ini"
+        backup_ini_file_path = f"{self.get_backup_file_stem(backup_file)}.ini"
 
         if os.path.exists(backup_ini_file_path):
             return backup_ini_file_path
@@ -711,13 +748,19 @@ class Command(BaseCommand):
                 else:
                     logger.info(f"Skipping raster data directory '{source_root}' because it does not exist")
 
-    def restore_geoserver_vector_data(self, config, settings, target_folder, soft_reset):
+    def restore_geoserver_vector_data(self, config, settings, target_folder, soft_reset, jobs=1, backup_file=None):
         """Restore Vectorial Data from DB"""
         if config.gs_dump_vector_data:
             logger.info("*** Restore vector data")
 
             gs_data_folder = os.path.join(target_folder, "gs_data_dir", "geonode")
-            if not os.path.exists(gs_data_folder):
+            source = None
+            if backup_file and not engine.is_zstd_archive(backup_file) and zipfile.is_zipfile(backup_file):
+                # the dumps were not extracted
+                source = engine.ZipDumpSource(backup_file)
+            if not os.path.exists(gs_data_folder) and not (source and source.list()):
+                if source:
+                    source.close()
                 logger.info(f'Skipping vector data restore: directory "{gs_data_folder}" not found')
                 return
             logger.info(f'Restoring vector data from "{gs_data_folder}" not found')
@@ -743,6 +786,8 @@ class Command(BaseCommand):
                     ogc_db_passwd,
                     gs_data_folder,
                     soft_reset,
+                    jobs=jobs,
+                    source=source,
                 )
 
     def restore_geoserver_externals(self, config, settings, target_folder):
@@ -0,0 +1,582 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+"""Streaming backup archives and parallel restore of the database dumps.
+
+The files are streamed into a zstd compressed tar, the MD5 of the archive being computed
+while it is written. Next to the archive a manifest records size, modification time, MD5 and
+containing archive of every file of the tracked trees (media, assets, raster data): an incremental
+backup only stores the files changed since the manifest of a previous backup and refers to the
+previous archives for the others.
+
+The per table dumps of the vector data are restored by ``ParallelTableLoader``, reading them straight
+out of zip archives.
+"""
+
+import io
+import os
+import re
+import json
+import time
+import shlex
+import shutil
+import tarfile
+import hashlib
+import logging
+import zipfile
+import tempfile
+import subprocess
+
+from threading import Lock
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_ZIP = "zip"
+ARCHIVE_FORMAT_ZSTD = "zstd"
+ARCHIVE_FORMATS = (ARCHIVE_FORMAT_ZIP, ARCHIVE_FORMAT_ZSTD)
+
+ZSTD_ARCHIVE_SUFFIX = ".tar.zst"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# folder of the backups containing the per table dumps of the vector data
+DUMP_FOLDER = "gs_data_dir/geonode"
+DUMP_EXTENSIONS = (".dump", ".sql")
+
+
+class _HashingWriter(io.RawIOBase):
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self.md5 = hashlib.md5()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.md5.update(data)
+        return self._fileobj.write(data)
+
+
+class _HashingReader:
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self.md5 = hashlib.md5()
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self.md5.update(data)
+        return data
+
+
+def _get_file_md5(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def is_zstd_archive(path: str) -> bool:
+    return path.endswith(ZSTD_ARCHIVE_SUFFIX)
+
+
+def get_archive_stem(path: str) -> str:
+    """Return the name of the archive without its extension, e.g. the time suffix of the backup"""
+    name = os.path.basename(path)
+    return name[: -len(ZSTD_ARCHIVE_SUFFIX)] if is_zstd_archive(name) else os.path.splitext(name)[0]
+
+
+def get_manifest_path(archive_path: str) -> str:
+    return os.path.join(os.path.dirname(archive_path), f"{get_archive_stem(archive_path)}{MANIFEST_SUFFIX}")
+
+
+def read_manifest(path: str) -> dict:
+    """Read a manifest, either the one next to an archive or the manifest file itself"""
+    if not path.endswith(MANIFEST_SUFFIX):
+        path = get_manifest_path(path)
+    with open(path) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported backup manifest version in {path}: {manifest.get('version')}")
+    return manifest
+
+
+class StreamingArchive:
+    """
+    A zstd compressed tar written in a single pass.
+
+    Nothing is staged on disk: the files are read from their original location, compressed with
+    ``threads`` zstd workers and written to the archive, whose MD5 is computed on the fly.
+    When the manifest of a previous backup is given, the files of the tracked trees whose size and
+    modification time did not change are not stored again.
+    """
+
+    def __init__(self, path: str, level: int = 3, threads: int = -1, previous_manifest: dict = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.previous_manifest = previous_manifest
+        self.manifest = {
+            "version": MANIFEST_VERSION,
+            "archive": self.name,
+            "base": previous_manifest["archive"] if previous_manifest else None,
+            "files": {},
+        }
+        self.stats = {"files": 0, "unchanged": 0, "bytes": 0}
+        self.md5 = None
+
+        self._file = open(path, "wb")
+        self._writer = _HashingWriter(self._file)
+        self._compressor = zstandard.ZstdCompressor(level=level, threads=threads).stream_writer(
+            self._writer, closefd=False
+        )
+        self._tar = tarfile.open(fileobj=self._compressor, mode="w|", format=tarfile.PAX_FORMAT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_file(self, path: str, arcname: str) -> str:
+        """Add a file to the archive and return its MD5"""
+        tarinfo = self._tar.gettarinfo(os.path.realpath(path), arcname)
+        with open(path, "rb") as f:
+            reader = _HashingReader(f)
+            self._tar.addfile(tarinfo, reader)
+        self.stats["files"] += 1
+        self.stats["bytes"] += tarinfo.size
+        return reader.md5.hexdigest()
+
+    def add_bytes(self, content: bytes, arcname: str):
+        tarinfo = tarfile.TarInfo(arcname)
+        tarinfo.size = len(content)
+        self._tar.addfile(tarinfo, io.BytesIO(content))
+
+    def add_tree(self, root: str, arcname: str, ignore=None, track: bool = True):
+        """
+        Add the content of ``root`` under ``arcname``, ``ignore`` having the semantics of the
+        ``copytree`` one. The files of the tracked trees are recorded in the manifest.
+        """
+        arcname = arcname.strip("/")
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            if ignore:
+                ignored = set(ignore(dirpath, dirnames + filenames) or [])
+                dirnames[:] = [name for name in dirnames if name not in ignored]
+                filenames = [name for name in filenames if name not in ignored]
+            dirnames.sort()
+
+            relpath = os.path.relpath(dirpath, root)
+            dir_arcname = arcname if relpath == os.curdir else "/".join(filter(None, (arcname, *relpath.split(os.sep))))
+            if dir_arcname:
+                tarinfo = tarfile.TarInfo(dir_arcname)
+                tarinfo.type = tarfile.DIRTYPE
+                tarinfo.mode = 0o755
+                self._tar.addfile(tarinfo)
+
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                name = "/".join(filter(None, (dir_arcname, filename)))
+                try:
+                    stat = os.stat(path)
+                except OSError as e:
+                    logger.warning(f"Skipping '{path}': {e}")
+                    continue
+                if not track:
+                    self.add_file(path, name)
+                    continue
+                previous = (self.previous_manifest or {}).get("files", {}).get(name)
+                # a file touched without changing its content is hashed, and still taken from the previous archives
+                if (
+                    previous
+                    and previous["size"] == stat.st_size
+                    and (previous["mtime_ns"] == stat.st_mtime_ns or previous["md5"] == _get_file_md5(path))
+                ):
+                    self.manifest["files"][name] = dict(previous, mtime_ns=stat.st_mtime_ns)
+                    self.stats["unchanged"] += 1
+                    continue
+                self.manifest["files"][name] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "md5": self.add_file(path, name),
+                    "archive": self.name,
+                }
+
+    def close(self) -> str:
+        """Finalize the archive, write its manifest next to it and return its MD5"""
+        manifest = json.dumps(self.manifest, sort_keys=True).encode("utf-8")
+        self.add_bytes(manifest, MANIFEST_NAME)
+        self._tar.close()
+        self._compressor.close()
+        self._file.close()
+        self.md5 = self._writer.md5.hexdigest()
+        with open(get_manifest_path(self.path), "wb") as manifest_file:
+            manifest_file.write(manifest)
+        return self.md5
+
+    def abort(self):
+        """Discard the archive written so far"""
+        try:
+            self._file.close()
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def extract_zstd_archive(path: str, dst: str, members: set = None) -> int:
+    """Extract the archive, or only the given members, into ``dst`` in a single streaming pass"""
+    extracted = 0
+    with open(path, "rb") as archive_file:
+        with zstandard.ZstdDecompressor().stream_reader(archive_file) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                for member in tar:
+                    if members is not None and member.name not in members:
+                        continue
+                    if hasattr(tarfile, "data_filter"):
+                        tar.extract(member, dst, filter="data")
+                    else:
+                        tar.extract(member, dst)
+                    extracted += 1
+    return extracted
+
+
+def extract_backup(path: str, dst: str) -> str:
+    """
+    Extract a zstd backup archive into ``dst/<archive stem>`` and return the folder.
+
+    The files of an incremental backup stored in previous archives are extracted from them, the
+    previous archives are looked up in the folder of ``path``.
+    """
+    target_folder = os.path.join(dst, get_archive_stem(path))
+    os.makedirs(target_folder, exist_ok=True)
+    extract_zstd_archive(path, target_folder)
+
+    manifest_path = os.path.join(target_folder, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return target_folder
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    name = os.path.basename(path)
+    by_archive = {}
+    for file_name, entry in manifest.get("files", {}).items():
+        if entry["archive"] != name:
+            by_archive.setdefault(entry["archive"], set()).add(file_name)
+    for archive_name, members in by_archive.items():
+        archive_path = os.path.join(os.path.dirname(path), archive_name)
+        if not os.path.exists(archive_path):
+            raise FileNotFoundError(f"The incremental backup {name} needs the previous archive {archive_path}")
+        logger.info(f"Extracting {len(members)} unchanged files from {archive_name}...")
+        extract_zstd_archive(archive_path, target_folder, members=members)
+    return target_folder
+
+
+def is_dump_member(name: str) -> bool:
+    """Whether the archive member is a per table dump of the vector data"""
+    folder, filename = os.path.split(name.replace(os.sep, "/"))
+    return folder == DUMP_FOLDER and filename.endswith(DUMP_EXTENSIONS)
+
+
+def extract_zip_archive(path: str, dst: str, exclude=None) -> str:
+    """Extract a zip backup archive into ``dst/<archive stem>``, skipping the members matching ``exclude``"""
+    target_folder = os.path.join(dst, get_archive_stem(path))
+    os.makedirs(target_folder, exist_ok=True)
+    with zipfile.ZipFile(path, "r", allowZip64=True) as z:
+        members = [name for name in z.namelist() if not exclude or not exclude(name)]
+        z.extractall(target_folder, members=members)
+    return target_folder
+
+
+class DumpSource:
+    """The per table dumps found in a folder"""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def list(self) -> dict:
+        """Return the dump files as a dict name -> size"""
+        if not os.path.isdir(self.folder):
+            return {}
+        return {
+            name: os.path.getsize(os.path.join(self.folder, name))
+            for name in os.listdir(self.folder)
+            if name.endswith(DUMP_EXTENSIONS) and os.path.isfile(os.path.join(self.folder, name))
+        }
+
+    def open(self, name: str):
+        return open(os.path.join(self.folder, name), "rb")
+
+    def get_path(self, name: str) -> str:
+        """Return a path of the dump on disk, for the tools which cannot read it from a stream"""
+        return os.path.join(self.folder, name)
+
+    def close(self):
+        pass
+
+
+class ZipDumpSource(DumpSource):
+    """The per table dumps read straight out of a zip archive, without extracting them"""
+
+    def __init__(self, archive_path: str, folder: str = DUMP_FOLDER):
+        super().__init__(folder)
+        self._zip = zipfile.ZipFile(archive_path, "r", allowZip64=True)
+        self._tmp_dir = None
+        self._lock = Lock()
+
+    def list(self) -> dict:
+        return {
+            os.path.basename(info.filename): info.file_size
+            for info in self._zip.infolist()
+            if is_dump_member(info.filename) and os.path.dirname(info.filename) == self.folder
+        }
+
+    @contextmanager
+    def open(self, name: str):
+        # every call opens an independent stream, so that the dumps can be read concurrently
+        with zipfile.ZipFile(self._zip.filename, "r", allowZip64=True) as z:
+            with z.open(f"{self.folder}/{name}") as dump:
+                yield dump
+
+    def get_path(self, name: str) -> str:
+        with self._lock:
+            if self._tmp_dir is None:
+                self._tmp_dir = tempfile.mkdtemp(prefix="br_dumps_")
+        path = os.path.join(self._tmp_dir, name)
+        if not os.path.exists(path):
+            with self.open(name) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        return path
+
+    def close(self):
+        self._zip.close()
+        if self._tmp_dir:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+
+# header of the entries of a plain pg_dump, e.g. "-- Name: roads_pkey; Type: CONSTRAINT; Schema: public; Owner: geonode"
+SQL_TOC_ENTRY = re.compile(rb"^-- (?:Data for )?Name: .*; Type: (?P<type>[^;]+); Schema: ")
+SQL_POST_DATA_TYPES = {
+    b"INDEX",
+    b"INDEX ATTACH",
+    b"CONSTRAINT",
+    b"FK CONSTRAINT",
+    b"CHECK CONSTRAINT",
+    b"TRIGGER",
+    b"EVENT TRIGGER",
+    b"RULE",
+    b"POLICY",
+    b"ACL",
+}
+FK_CONSTRAINT = b"FK CONSTRAINT"
+
+
+class ParallelTableLoader:
+    """
+    Restores the per table dumps in three phases, each one run by ``jobs`` parallel workers.
+
+    - load: the definition and the data of every table, the largest tables first
+    - post-data: the indexes, constraints and triggers, created once the data is loaded
+    - foreign keys: last, since they may reference the primary keys of any other table
+
+    The plain SQL dumps are streamed into ``psql`` while being split in the three phases, the
+    custom format ones are restored by ``pg_restore`` one section at a time.
+    The time spent on every table is reported by ``run()``.
+    """
+
+    def __init__(
+        self,
+        source: DumpSource,
+        psql_cmd: str,
+        pg_restore_cmd: str,
+        db_name: str,
+        db_user: str,
+        db_port,
+        db_host: str,
+        db_passwd: str,
+        preserve_tables: bool = False,
+        jobs: int = 1,
+    ):
+        self.source = source
+        self.psql_cmd = shlex.split(psql_cmd)
+        self.pg_restore_cmd = shlex.split(pg_restore_cmd)
+        self.connection = ["-h", str(db_host), "-p", str(db_port), "-d", db_name, "-U", db_user]
+        self.db_user = db_user
+        self.env = {**os.environ, "PGPASSWORD": db_passwd or ""}
+        self.preserve_tables = preserve_tables
+        self.jobs = max(1, jobs)
+        self.report = {}
+        self._deferred = {}
+
+    def run(self) -> dict:
+        """Restore the dumps and return a dict table -> {"bytes", "seconds", "failed"}"""
+        dumps = self.source.list()
+        names = sorted(dumps, key=lambda name: (-dumps[name], name))
+        for name in names:
+            self.report[self._get_table(name)] = {"bytes": dumps[name], "seconds": 0.0, "failed": False}
+
+        logger.info(f"Restoring {len(names)} tables with {self.jobs} jobs")
+        self._map(self._load, names)
+        logger.info("Creating the indexes and constraints")
+        self._map(lambda name: self._run_deferred(name, "post_data"), names)
+        logger.info("Creating the foreign keys")
+        self._map(lambda name: self._run_deferred(name, "foreign_keys"), names)
+
+        for table, stats in sorted(self.report.items(), key=lambda item: -item[1]["seconds"]):
+            megabytes = stats["bytes"] / 1024 / 1024
+            throughput = megabytes / stats["seconds"] if stats["seconds"] else 0
+            logger.info(
+                f" - {table}: {megabytes:.2f} MB in {stats['seconds']:.2f} s ({throughput:.2f} MB/s)"
+                f"{' FAILED' if stats['failed'] else ''}"
+            )
+        return self.report
+
+    def _map(self, func, names):
+        if self.jobs > 1 and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(names))) as executor:
+                list(executor.map(func, names))
+        else:
+            for name in names:
+                func(name)
+
+    @staticmethod
+    def _get_table(name):
+        return os.path.splitext(name)[0]
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            logger.error(f"RESTORE FAILED FOR FILE {name}: {e}")
+            self.report[self._get_table(name)]["failed"] = True
+        finally:
+            self.report[self._get_table(name)]["seconds"] += time.perf_counter() - start
+
+    def _check(self, name, returncode, stderr):
+        if returncode:
+            self.report[self._get_table(name)]["failed"] = True
+            logger.error(f"RESTORE FAILED FOR FILE {name}")
+            if stderr:
+                logger.error(
+                    f"ERR:: {stderr.decode('utf-8', errors='replace') if isinstance(stderr, bytes) else stderr}"
+                )
+
+    def _load(self, name):
+        logger.info(f" - restoring data table: {self._get_table(name)}")
+        with self._timed(name):
+            if name.endswith(".sql"):
+                self._load_sql(name)
+            else:
+                self._load_custom(name)
+
+    def _run_deferred(self, name, phase):
+        command = self._deferred.get(name, {}).get(phase)
+        if command:
+            with self._timed(name):
+                command()
+
+    # plain SQL dumps
+
+    def _psql(self):
+        return [*self.psql_cmd, *self.connection, "-q", "-b"]
+
+    def _load_sql(self, name):
+        preamble, post_data, foreign_keys = [], [], []
+        bucket = None
+        with self.source.open(name) as dump, tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                self._psql(), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr, env=self.env
+            )
+            in_preamble = True
+            try:
+                for line in dump:
+                    match = SQL_TOC_ENTRY.match(line)
+                    if match:
+                        in_preamble = False
+                        entry_type = match.group("type")
+                        if bucket is None and entry_type in SQL_POST_DATA_TYPES:
+                            bucket = post_data
+                        if bucket is not None and entry_type != b"COMMENT":
+                            bucket = foreign_keys if entry_type == FK_CONSTRAINT else post_data
+                    if bucket is not None:
+                        bucket.append(line)
+                        continue
+                    if in_preamble:
+                        preamble.append(line)
+                    process.stdin.write(line)
+            except BrokenPipeError:
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = process.wait()
+            stderr.seek(0)
+            self._check(name, returncode, stderr.read())
+
+        self._deferred[name] = {
+            "post_data": post_data and (lambda: self._run_sql(name, preamble + post_data)),
+            "foreign_keys": foreign_keys and (lambda: self._run_sql(name, preamble + foreign_keys)),
+        }
+
+    def _run_sql(self, name, lines):
+        process = subprocess.run(
+            self._psql(), input=b"".join(lines), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=self.env
+        )
+        self._check(name, process.returncode, process.stderr)
+
+    # custom format dumps
+
+    def _pg_restore(self, *args):
+        return [*self.pg_restore_cmd, *self.connection, f"--role={self.db_user}", *args]
+
+    def _load_custom(self, name):
+        path = self.source.get_path(name)
+        args = ["--section=pre-data", "--section=data", "-t", self._get_table(name)]
+        if not self.preserve_tables:
+            args.append("-c")
+        process = subprocess.run(self._pg_restore(*args, path), capture_output=True, env=self.env)
+        self._check(name, process.returncode, process.stderr)
+
+        listing = subprocess.run([*self.pg_restore_cmd, "-l", path], capture_output=True, env=self.env)
+        entries = listing.stdout.decode("utf-8").splitlines()
+        foreign_keys = [entry for entry in entries if " FK CONSTRAINT " in entry]
+        post_data = [entry for entry in entries if entry not in foreign_keys]
+        self._deferred[name] = {
+            "post_data": lambda: self._restore_list(name, path, post_data),
+            "foreign_keys": foreign_keys and (lambda: self._restore_list(name, path, foreign_keys)),
+        }
+
+    def _restore_list(self, name, path, entries):
+        with tempfile.NamedTemporaryFile("w", suffix=".list") as list_file:
+            list_file.write("\n".join(entries))
+            list_file.flush()
+            process = subprocess.run(
+                self._pg_restore("--section=post-data", "-L", list_file.name, path), capture_output=True, env=self.env
+            )
+        self._check(name, process.returncode, process.stderr)
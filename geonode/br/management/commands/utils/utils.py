@@ -35,6 +35,8 @@ from configparser import ConfigParser
 from django.conf import settings
 from django.core.management.base import CommandError
 
+from .engine import DumpSource, ParallelTableLoader
+
 
 MEDIA_ROOT = "uploaded"
 STATIC_ROOT = "static_root"
@@ -43,6 +45,7 @@ TEMPLATE_DIRS = "template_dirs"
 LOCALE_PATHS = "locale_dirs"
 EXTERNAL_ROOT = "external"
 ASSETS_ROOT = "assets"
+DB_DUMP_DIR = "pg_dump"
 
 
 logger = logging.getLogger(__name__)
@@ -227,8 +230,12 @@ def truncate_tables(db_name, db_user, db_port, db_host, db_passwd):
         conn.close()
 
 
-def dump_db(config, db_name, db_user, db_port, db_host, db_passwd, target_folder):
-    """Dump Full DB into target folder"""
+def dump_db(config, db_name, db_user, db_port, db_host, db_passwd, target_folder, jobs=1):
+    """Dump Full DB into target folder
+
+    With more than one job the tables are dumped by a single parallel ``pg_dump``,
+    in directory format, into the ``DB_DUMP_DIR`` sub-folder.
+    """
     db_host = db_host if db_host is not None else "localhost"
     db_port = db_port if db_port is not None else 5432
 
@@ -255,6 +262,21 @@ def dump_db(config, db_name, db_user, db_port, db_host, db_passwd, target_folder
 
     logger.debug(f"Cleaning up destination folder {target_folder}...")
     empty_folder(target_folder)
+    if jobs > 1 and pg_tables:
+        tables = " ".join(f"-t '\"{str(table)}\"'" for table in sorted(pg_tables))
+        logger.info(f" - Dumping {len(pg_tables)} data tables with {jobs} jobs: {db_name}")
+        command = (
+            f"{config.pg_dump_cmd} "
+            f" -h {db_host} -p {str(db_port)} -U {db_user} -d {db_name} "
+            f" -b -Fd -j {jobs} "
+            f" {tables} "
+            f" -f {os.path.join(target_folder, DB_DUMP_DIR)}"
+        )
+        ret = subprocess.call(command, shell=True, env={"PGPASSWORD": db_passwd})
+        if ret != 0:
+            logger.error(f"PARALLEL DUMP FAILED FOR DB {db_name}")
+        return
+
     for table in sorted(pg_tables):
         logger.info(f" - Dumping data table: {db_name}:{table}")
         command = (
@@ -269,48 +291,52 @@ def dump_db(config, db_name, db_user, db_port, db_host, db_passwd, target_folder
             logger.error(f"DUMP FAILED FOR TABLE {table}")
 
 
-def restore_db(config, db_name, db_user, db_port, db_host, db_passwd, source_folder, preserve_tables):
-    """Restore Full DB into target folder"""
+def restore_db(
+    config, db_name, db_user, db_port, db_host, db_passwd, source_folder, preserve_tables, jobs=1, source=None
+):
+    """Restore Full DB into target folder
+
+    The per table dumps are read from ``source``, by default the dumps found in ``source_folder``,
+    and loaded by ``jobs`` parallel workers, the indexes and constraints being created once all the data is loaded.
+    Returns the per table report of ``ParallelTableLoader``.
+    """
     db_host = db_host if db_host is not None else "localhost"
     db_port = db_port if db_port is not None else 5432
 
     logger.info("Restoring data tables")
 
-    dump_extensions = ["dump", "sql"]
-    file_names = [fn for fn in os.listdir(source_folder) if any(fn.endswith(ext) for ext in dump_extensions)]
-    for filename in sorted(file_names):
-        table_name = os.path.splitext(filename)[0]
-        logger.info(f" - restoring data table: {db_name}:{table_name} ")
-        if filename.endswith("dump"):
-            command = (
-                f"{config.pg_restore_cmd} "
-                f" -h {db_host} -p {str(db_port)} -d {db_name}"
-                f" -U {db_user} --role={db_user} "
-                f' -t "{table_name}" '
-                f' {"-c" if not preserve_tables else ""} '
-                f" {os.path.join(source_folder, filename)} "
-            )
-            ret = subprocess.call(command, env={"PGPASSWORD": db_passwd}, shell=True)
-            if ret:
-                logger.error(f"RESTORE FAILED FOR FILE {filename}")
-
-        elif filename.endswith("sql"):
-            args = (
-                f"{config.psql_cmd} "
-                f" -h {db_host} "
-                f" -p {str(db_port)} "
-                f" -d {db_name} "
-                f" -U {db_user} "
-                f" -f {os.path.join(source_folder, filename)} "
-                " -q -b "
-            )
-            cproc = subprocess.run(args, env={"PGPASSWORD": db_passwd}, shell=True, capture_output=True, text=True)
-            ret = cproc.returncode
-            if ret:
-                logger.error(f"RESTORE FAILED FOR FILE {filename}")
-                logger.error(f'CMD:: {" ".join(args)}')
-                # logger.error(f'OUT:: {cproc.stdout}')
-                logger.error(f"ERR:: {cproc.stderr}")
+    dump_dir = os.path.join(source_folder, DB_DUMP_DIR)
+    if os.path.isfile(os.path.join(dump_dir, "toc.dat")):
+        # directory format, dumped by a parallel pg_dump
+        logger.info(f" - restoring data tables with {jobs} jobs: {db_name}")
+        command = (
+            f"{config.pg_restore_cmd} "
+            f" -h {db_host} -p {str(db_port)} -d {db_name}"
+            f" -U {db_user} --role={db_user} "
+            f" -Fd -j {jobs} "
+            f' {"-c --if-exists" if not preserve_tables else ""} '
+            f" {dump_dir} "
+        )
+        ret = subprocess.call(command, env={"PGPASSWORD": db_passwd}, shell=True)
+        if ret:
+            logger.error(f"RESTORE FAILED FOR DIRECTORY {dump_dir}")
+
+    source = source or DumpSource(source_folder)
+    try:
+        return ParallelTableLoader(
+            source,
+            config.psql_cmd,
+            config.pg_restore_cmd,
+            db_name,
+            db_user,
+            db_port,
+            db_host,
+            db_passwd,
+            preserve_tables=preserve_tables,
+            jobs=jobs,
+        ).run()
+    finally:
+        source.close()
 
 
 def remove_existing_tables(db_name, db_user, db_port, db_host, db_passwd):
@@ -0,0 +1,216 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+import os
+import sys
+import shlex
+import zipfile
+import tempfile
+
+from django.test import SimpleTestCase
+
+from geonode.br.management.commands.utils import engine
+from geonode.br.management.commands.utils.utils import md5_file_hash
+from geonode.br.management.commands.restore import Command as RestoreCommand
+
+
+class StreamingArchiveTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.media = os.path.join(self.tmp_dir.name, "media")
+        self.staging = os.path.join(self.tmp_dir.name, "staging")
+        self.backups = os.path.join(self.tmp_dir.name, "backups")
+        for folder in (os.path.join(self.media, "thumbs"), os.path.join(self.staging, "fixtures"), self.backups):
+            os.makedirs(folder)
+        self._write(os.path.join(self.media, "thumbs", "thumb.png"), "thumbnail")
+        self._write(os.path.join(self.media, "doc.pdf"), "document")
+        self._write(os.path.join(self.staging, "fixtures", "base.json"), "[]")
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    @staticmethod
+    def _read(path):
+        with open(path) as f:
+            return f.read()
+
+    def _backup(self, name, previous_manifest=None):
+        path = os.path.join(self.backups, f"{name}{engine.ZSTD_ARCHIVE_SUFFIX}")
+        with engine.StreamingArchive(path, previous_manifest=previous_manifest) as archive:
+            archive.add_tree(self.media, "uploaded")
+            archive.add_tree(self.staging, "", track=False)
+        return path, archive
+
+    def test_full_backup_round_trip(self):
+        path, archive = self._backup("full")
+
+        self.assertEqual(archive.md5, md5_file_hash(path))
+        self.assertEqual(archive.stats["files"], 3)
+        manifest = engine.read_manifest(path)
+        self.assertEqual(set(manifest["files"]), {"uploaded/doc.pdf", "uploaded/thumbs/thumb.png"})
+        self.assertIsNone(manifest["base"])
+
+        target_folder = engine.extract_backup(path, os.path.join(self.tmp_dir.name, "restore"))
+        self.assertEqual(os.path.basename(target_folder), "full")
+        self.assertEqual(self._read(os.path.join(target_folder, "uploaded", "thumbs", "thumb.png")), "thumbnail")
+        self.assertEqual(self._read(os.path.join(target_folder, "fixtures", "base.json")), "[]")
+
+    def test_incremental_backup(self):
+        full_path, _ = self._backup("full")
+        self._write(os.path.join(self.media, "doc.pdf"), "updated document")
+
+        path, archive = self._backup("incremental", previous_manifest=engine.read_manifest(full_path))
+
+        # only the changed media file and the staged fixture are stored again
+        self.assertEqual(archive.stats["files"], 2)
+        self.assertEqual(archive.stats["unchanged"], 1)
+        manifest = engine.read_manifest(path)
+        self.assertEqual(manifest["base"], os.path.basename(full_path))
+        self.assertEqual(manifest["files"]["uploaded/thumbs/thumb.png"]["archive"], os.path.basename(full_path))
+
+        target_folder = engine.extract_backup(path, os.path.join(self.tmp_dir.name, "restore"))
+        self.assertEqual(self._read(os.path.join(target_folder, "uploaded", "thumbs", "thumb.png")), "thumbnail")
+        self.assertEqual(self._read(os.path.join(target_folder, "uploaded", "doc.pdf")), "updated document")
+
+    def test_incremental_backup_touched_files(self):
+        full_path, _ = self._backup("full")
+        thumb = os.path.join(self.media, "thumbs", "thumb.png")
+        doc = os.path.join(self.media, "doc.pdf")
+        mtime_ns = os.stat(doc).st_mtime_ns + 10**9
+        # same content, and same size with a different content
+        self._write(thumb, "thumbnail")
+        self._write(doc, "DOCUMENT")
+        for path in (thumb, doc):
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        path, archive = self._backup("incremental", previous_manifest=engine.read_manifest(full_path))
+
+        self.assertEqual(archive.stats["files"], 2)
+        self.assertEqual(archive.stats["unchanged"], 1)
+        manifest = engine.read_manifest(path)
+        self.assertEqual(manifest["files"]["uploaded/thumbs/thumb.png"]["archive"], os.path.basename(full_path))
+        # the new modification time is recorded, the file is not hashed again by the next backup
+        self.assertEqual(manifest["files"]["uploaded/thumbs/thumb.png"]["mtime_ns"], mtime_ns)
+        self.assertEqual(manifest["files"]["uploaded/doc.pdf"]["archive"], os.path.basename(path))
+
+        target_folder = engine.extract_backup(path, os.path.join(self.tmp_dir.name, "restore"))
+        self.assertEqual(self._read(os.path.join(target_folder, "uploaded", "doc.pdf")), "DOCUMENT")
+
+    def test_incremental_backup_missing_base(self):
+        full_path, _ = self._backup("full")
+        path, _ = self._backup("incremental", previous_manifest=engine.read_manifest(full_path))
+        os.remove(full_path)
+
+        with self.assertRaises(FileNotFoundError):
+            engine.extract_backup(path, os.path.join(self.tmp_dir.name, "restore"))
+
+    def test_restore_accepts_zstd_archives(self):
+        path, archive = self._backup("full")
+        with open(os.path.join(self.backups, "full.md5"), "w") as md5_file:
+            md5_file.write(archive.md5)
+
+        RestoreCommand().validate_backup_file_options(backup_file=path)
+        self.assertEqual(RestoreCommand().validate_backup_file_hash(path), archive.md5)
+        self.assertEqual(RestoreCommand.get_backup_file_stem(path), os.path.join(self.backups, "full"))
+
+
+SQL_DUMP = b"""--
+-- PostgreSQL database dump
+--
+SELECT pg_catalog.set_config('search_path', '', false);
+--
+-- Name: roads; Type: TABLE; Schema: public; Owner: geonode
+--
+CREATE TABLE public.roads (fid integer, river integer);
+--
+-- Data for Name: roads; Type: TABLE DATA; Schema: public; Owner: geonode
+--
+COPY public.roads (fid, river) FROM stdin;
+1\t1
+\\.
+--
+-- Name: roads roads_pkey; Type: CONSTRAINT; Schema: public; Owner: geonode
+--
+ALTER TABLE ONLY public.roads ADD CONSTRAINT roads_pkey PRIMARY KEY (fid);
+--
+-- Name: roads roads_river_fk; Type: FK CONSTRAINT; Schema: public; Owner: geonode
+--
+ALTER TABLE ONLY public.roads ADD CONSTRAINT roads_river_fk FOREIGN KEY (river) REFERENCES public.rivers(fid);
+"""
+
+
+class ParallelTableLoaderTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.output = os.path.join(self.tmp_dir.name, "psql.out")
+        # a fake psql appending the statements it receives to a file
+        script = f"import sys; open({self.output!r}, 'ab').write(sys.stdin.buffer.read() + b'@@@')"
+        self.psql_cmd = shlex.join([sys.executable, "-c", script])
+
+    def _run(self, source):
+        loader = engine.ParallelTableLoader(
+            source, self.psql_cmd, "pg_restore", "geonode_data", "geonode", 5432, "localhost", "geonode", jobs=2
+        )
+        report = loader.run()
+        with open(self.output, "rb") as f:
+            return report, f.read().split(b"@@@")[:-1]
+
+    def test_sql_dumps_are_loaded_before_constraints(self):
+        folder = os.path.join(self.tmp_dir.name, "dumps")
+        os.makedirs(folder)
+        for table in ("roads", "rivers"):
+            with open(os.path.join(folder, f"{table}.sql"), "wb") as f:
+                f.write(SQL_DUMP)
+
+        report, statements = self._run(engine.DumpSource(folder))
+
+        self.assertEqual(set(report), {"roads", "rivers"})
+        self.assertFalse(any(stats["failed"] for stats in report.values()))
+        self.assertEqual(len(statements), 6)
+        # data, then indexes and constraints, then the foreign keys
+        for data in statements[:2]:
+            self.assertIn(b"COPY public.roads", data)
+            self.assertNotIn(b"PRIMARY KEY", data)
+        for constraints in statements[2:4]:
+            self.assertIn(b"PRIMARY KEY", constraints)
+            self.assertIn(b"set_config('search_path'", constraints)
+            self.assertNotIn(b"FOREIGN KEY", constraints)
+        for foreign_keys in statements[4:]:
+            self.assertIn(b"FOREIGN KEY", foreign_keys)
+
+    def test_sql_dumps_are_streamed_from_zip_archives(self):
+        archive_path = os.path.join(self.tmp_dir.name, "backup.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr(f"{engine.DUMP_FOLDER}/roads.sql", SQL_DUMP)
+            archive.writestr("uploaded/thumb.png", "thumbnail")
+
+        source = engine.ZipDumpSource(archive_path)
+        self.addCleanup(source.close)
+        report, statements = self._run(source)
+
+        self.assertEqual(report["roads"]["bytes"], len(SQL_DUMP))
+        self.assertEqual(len(statements), 3)
+
+        target_folder = engine.extract_zip_archive(archive_path, self.tmp_dir.name, exclude=engine.is_dump_member)
+        self.assertTrue(os.path.exists(os.path.join(target_folder, "uploaded", "thumb.png")))
+        self.assertFalse(os.path.exists(os.path.join(target_folder, engine.DUMP_FOLDER, "roads.sql")))
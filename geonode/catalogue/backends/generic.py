@@ -130,7 +130,7 @@ class Catalogue(CatalogueServiceWeb):
         ctx = {
             "CATALOG_METADATA_TEMPLATE": settings.CATALOG_METADATA_TEMPLATE,
             "layer": layer,
-            "metadata": metadata_manager.build_schema_instance(layer),
+            "metadata": metadata_manager.get_schema_instance(layer),
             "SITEURL": site_url,
             "id_pname": id_pname,
             "LICENSES_METADATA": getattr(settings, "LICENSES", dict()).get("METADATA", "never"),
@@ -0,0 +1,126 @@
+#########################################################################
+#
+# Copyright (C) 2026 Open Source Geospatial Foundation - all rights reserved
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+FACETS_CACHE_PREFIX = "facets"
+
+
+class FacetEngine:
+    """
+    Computes the topics of many facet providers in one go.
+
+    The counts for all the providers are computed over the same prefiltered queryset;
+    the providers queries may run concurrently on a bounded thread pool
+    (``FACETS_MAX_WORKERS``), unless the caller is in a transaction, and their results are cached for a short time
+    (``FACETS_CACHE_TIMEOUT``) per filter signature and user visibility class.
+    """
+
+    # query params not affecting the topics: any other param, e.g. search or extent, may filter the resources
+    # counted by the providers; the pagination and the language are passed explicitly to get_signature()
+    UNSIGNED_PARAMS = frozenset(("page", "page_size", "lang"))
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, getattr(settings, "FACETS_MAX_WORKERS", 4))
+
+    @property
+    def cache_timeout(self) -> int:
+        return getattr(settings, "FACETS_CACHE_TIMEOUT", 60)
+
+    @staticmethod
+    def get_visibility_class(user) -> str:
+        """
+        Return a key identifying the set of resources visible by the user
+        """
+        if not user or user.is_anonymous:
+            return "anonymous"
+        if user.is_superuser:
+            return "superuser"
+        return f"user:{user.pk}"
+
+    def get_signature(self, request, **kwargs) -> str:
+        """
+        Return a key identifying the query params of the request and any other param affecting the topics
+        """
+        filters = sorted(
+            (k, sorted(vlist)) for k, vlist in request.query_params.lists() if k not in self.UNSIGNED_PARAMS
+        )
+        params = sorted((k, str(v)) for k, v in kwargs.items())
+        digest = hashlib.md5(repr((filters, params)).encode("utf-8")).hexdigest()
+        return f"{self.get_visibility_class(request.user)}:{digest}"
+
+    def get_topics(self, providers, compute, signature: str = None) -> dict:
+        """
+        Return a dict provider name -> topics for all the given providers.
+        :param providers: the facet providers
+        :param compute: a callable taking a provider and returning its topics
+        :param signature: the request signature as returned by get_signature(); if None the cache is not used
+        """
+        providers = list(providers)
+        use_cache = signature is not None and self.cache_timeout > 0
+
+        results = {}
+        if use_cache:
+            keys = {provider.name: self._cache_key(signature, provider.name) for provider in providers}
+            cached = cache.get_many(keys.values())
+            for name, key in keys.items():
+                if key in cached:
+                    results[name] = cached[key]
+            logger.debug("Found %d cached facets out of %d", len(results), len(providers))
+
+        missing = [provider for provider in providers if provider.name not in results]
+        # the connections of the threads would not see the changes of a transaction still open
+        if len(missing) > 1 and self.max_workers > 1 and not transaction.get_connection().in_atomic_block:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                computed = dict(
+                    zip((p.name for p in missing), executor.map(lambda p: self._compute_in_thread(compute, p), missing))
+                )
+        else:
+            computed = {provider.name: compute(provider) for provider in missing}
+
+        if use_cache and computed:
+            cache.set_many({self._cache_key(signature, name): v for name, v in computed.items()}, self.cache_timeout)
+
+        results.update(computed)
+        # same order of the providers
+        return {provider.name: results[provider.name] for provider in providers}
+
+    @staticmethod
+    def _compute_in_thread(compute, provider):
+        try:
+            return compute(provider)
+        finally:
+            # every thread opens its own db connections
+            connections.close_all()
+
+    @staticmethod
+    def _cache_key(signature, name):
+        return f"{FACETS_CACHE_PREFIX}:{signature}:{name}"
+
+
+facet_engine = FacetEngine()
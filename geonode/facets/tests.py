@@ -17,15 +17,22 @@
 #
 #########################################################################
 
-import logging
 import json
+import time
+import logging
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
 from tastypie.test import TestApiClient
 from uuid import uuid4
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.http import JsonResponse
-from django.test import RequestFactory
+from django.test import RequestFactory, SimpleTestCase, override_settings
 from django.urls import reverse
+from rest_framework.request import Request
 
 from geonode.base.models import (
     Thesaurus,
@@ -38,6 +45,7 @@ from geonode.base.models import (
     HierarchicalKeyword,
     GroupProfile,
 )
+from geonode.facets.engine import facet_engine
 from geonode.facets.models import facet_registry
 from geonode.facets.providers.baseinfo import FeaturedFacetProvider
 from geonode.facets.providers.category import CategoryFacetProvider
@@ -736,3 +744,108 @@ class TestFacets(GeoNodeBaseTestSupport):
             c0_item["count"],
             "Facet count must match resources list count for anonymous users when no facet filters are applied.",
         )
+
+    @override_settings(FACETS_CACHE_TIMEOUT=60)
+    def test_facet_engine_cache(self):
+        providers = [facet_registry.get_provider("category"), facet_registry.get_provider("featured")]
+        computed = []
+
+        def compute(provider):
+            computed.append(provider.name)
+            return {"total": 0, "items": []}
+
+        req = Request(self.rf.get(reverse("list_facets"), data={"include_topics": 1, "filter{featured}": "true"}))
+        req.user = self.user
+        signature = facet_engine.get_signature(req, lang="en")
+
+        topics = facet_engine.get_topics(providers, compute, signature=signature)
+        self.assertSetEqual({"category", "featured"}, set(topics))
+        self.assertEqual(2, len(computed))
+
+        # same filters and visibility: served from the cache
+        facet_engine.get_topics(providers, compute, signature=signature)
+        self.assertEqual(2, len(computed))
+
+        # a different user visibility class does not share the cached topics
+        req.user = self.admin
+        facet_engine.get_topics(providers, compute, signature=facet_engine.get_signature(req, lang="en"))
+        self.assertEqual(4, len(computed))
+
+    @override_settings(FACETS_CACHE_TIMEOUT=60)
+    def test_facet_engine_cache_by_visibility_class(self):
+        cache.clear()
+        providers = [facet_registry.get_provider("category")]
+        other_user = get_user_model().objects.create(username="user_01")
+        other_admin = get_user_model().objects.create(username="admin_01", is_superuser=True)
+        computed = []
+
+        def compute(provider):
+            computed.append(provider.name)
+            return {"total": 0, "items": []}
+
+        def get_topics(user):
+            req = Request(self.rf.get(reverse("list_facets"), data={"include_topics": 1}))
+            req.user = user
+            facet_engine.get_topics(providers, compute, signature=facet_engine.get_signature(req, lang="en"))
+            return len(computed)
+
+        self.assertEqual(1, get_topics(AnonymousUser()))
+        self.assertEqual(1, get_topics(AnonymousUser()))
+        self.assertEqual(2, get_topics(self.admin))
+        # all the superusers see the same resources
+        self.assertEqual(2, get_topics(other_admin))
+        self.assertEqual(3, get_topics(self.user))
+        self.assertEqual(3, get_topics(self.user))
+        self.assertEqual(4, get_topics(other_user))
+
+    @override_settings(FACETS_MAX_WORKERS=4)
+    def test_facet_engine_no_threads_in_transaction(self):
+        # the threads connections would not see the resources created by the open transaction
+        providers = [facet_registry.get_provider("category"), facet_registry.get_provider("featured")]
+        threads = set()
+
+        def compute(provider):
+            threads.add(threading.get_ident())
+            return provider.name
+
+        topics = facet_engine.get_topics(providers, compute)
+        self.assertDictEqual({"category": "category", "featured": "featured"}, topics)
+        self.assertSetEqual({threading.get_ident()}, threads)
+
+    @override_settings(FACETS_CACHE_TIMEOUT=60)
+    def test_facet_cache_by_search(self):
+        url = reverse("get_facet", args=["category"])
+
+        def c0_count(search):
+            response = self.client.get(url, data={"search": search, "search_fields": "title"})
+            self.assertEqual(200, response.status_code, response.json())
+            items = response.json()["topics"]["items"]
+            return next((item["count"] for item in items if item["key"] == "C0"), 0)
+
+        # RB02 is the only C0 resource among the matching ones, none of RB10-RB19 is C0
+        self.assertEqual(1, c0_count("dataset_02"))
+        self.assertEqual(0, c0_count("dataset_1"))
+
+
+class TestFacetEngine(SimpleTestCase):
+    @override_settings(FACETS_MAX_WORKERS=4, FACETS_CACHE_TIMEOUT=0)
+    @patch("geonode.facets.engine.connections")
+    def test_topics_computed_in_threads(self, connections):
+        providers = [SimpleNamespace(name=f"provider_{i}") for i in range(6)]
+        threads = set()
+
+        def compute(provider):
+            threads.add(threading.get_ident())
+            # the first providers are the slowest ones
+            time.sleep(0.01 * (6 - int(provider.name[-1])))
+            return provider.name.upper()
+
+        topics = facet_engine.get_topics(providers, compute)
+
+        # same order of the providers, whatever the order they are computed in
+        self.assertListEqual([p.name for p in providers], list(topics))
+        self.assertListEqual([p.name.upper() for p in providers], list(topics.values()))
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertLessEqual(len(threads), 4)
+        # every thread closes its own db connections
+        self.assertEqual(len(providers), connections.close_all.call_count)
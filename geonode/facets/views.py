@@ -27,6 +27,7 @@ from django.urls import reverse
 from django.conf import settings
 
 from geonode.base.api.views import ResourceBaseViewSet
+from geonode.facets.engine import facet_engine
 from geonode.facets.models import FacetProvider, DEFAULT_FACET_PAGE_SIZE, facet_registry
 from geonode.security.utils import get_visible_resources
 
@@ -83,7 +84,7 @@ class BaseFacetingView(APIView):
         """
         logger.debug("Filtering by user '%s'", request.user)
         filters = {k: vlist for k, vlist in request.query_params.lists() if k.startswith("filter{")}
-        logger.warning(f"FILTERING BY  {filters}")
+        logger.debug(f"FILTERING BY  {filters}")
         # kwargs will be {} if no filter applied
         viewset = ResourceBaseViewSet(request=request, format_kwarg={}, kwargs=filters)
         viewset.initial(request)
@@ -129,9 +130,19 @@ class ListFacetsView(BaseFacetingView):
         include_config = self._resolve_boolean(request, PARAM_INCLUDE_CONFIG, False)
 
         facets = []
-        prefiltered = None
-
-        for provider in facet_registry.get_providers():
+        providers = list(facet_registry.get_providers())
+
+        topics = {}
+        if include_topics:
+            # the prefiltered queryset is built once and shared by all the providers
+            prefiltered = self._prefilter_topics(request)
+            topics = facet_engine.get_topics(
+                providers,
+                lambda provider: self._get_topics(provider, queryset=prefiltered, lang=lang, user=request.user),
+                signature=facet_engine.get_signature(request, lang=lang),
+            )
+
+        for provider in providers:
             logger.debug("Fetching data from provider %r", provider)
             info = provider.get_info(lang=lang)
 
@@ -145,8 +156,7 @@ class ListFacetsView(BaseFacetingView):
                 info["link"] = f"{reverse('get_facet', args=[info['name']])}?{urlencode(link_args)}"
 
             if include_topics:
-                prefiltered = prefiltered or self._prefilter_topics(request)
-                info["topics"] = self._get_topics(provider, queryset=prefiltered, lang=lang, user=request.user)
+                info["topics"] = topics[provider.name]
 
             facets.append(info)
 
@@ -178,17 +188,23 @@ class GetFacetView(BaseFacetingView):
         if include_config:
             info["config"] = provider.config
 
-        qs = self._prefilter_topics(request)
-        topics = self._get_topics(
-            provider,
-            queryset=qs,
-            page=page,
-            page_size=page_size,
-            lang=lang,
-            topic_contains=topic_contains,
-            keys=keys,
-            user=request.user,
+        signature = facet_engine.get_signature(
+            request, lang=lang, page=page, page_size=page_size, topic_contains=topic_contains
         )
+        topics = facet_engine.get_topics(
+            [provider],
+            lambda provider: self._get_topics(
+                provider,
+                queryset=self._prefilter_topics(request),
+                page=page,
+                page_size=page_size,
+                lang=lang,
+                topic_contains=topic_contains,
+                keys=keys,
+                user=request.user,
+            ),
+            signature=signature,
+        )[provider.name]
 
         if add_link:
             exist_prev = page > 0
@@ -79,3 +79,9 @@ class GeoserverAppConfig(NotificationsAppConfigBase, AppConfig):
         from django.db.models import signals
 
         signals.post_migrate.connect(set_resource_links, sender=self)
+
+        if getattr(settings, "GEOFENCE_RULES_MIRROR_ENABLED", False):
+            settings.CELERY_BEAT_SCHEDULE["reconcile-geofence-rules-mirror"] = {
+                "task": "geonode.geoserver.tasks.reconcile_geofence_rules_mirror",
+                "schedule": settings.GEOFENCE_RULES_MIRROR_TTL,
+            }
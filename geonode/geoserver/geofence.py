@@ -17,13 +17,22 @@
 #
 #########################################################################
 
+import re
+import math
 import itertools
 import logging
 import requests
+from datetime import timedelta
 from requests.auth import HTTPBasicAuth
 import traceback
 import urllib
 
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from geonode.geoserver.models import GeoFenceRule, GeoFenceRulesMirrorState, GeoFenceStaleLayer
+
 logger = logging.getLogger(__name__)
 
 
@@ -229,6 +238,268 @@ class AutoPriorityBatch(Batch):
         super().add_insert_rule(rule)
 
 
+class RulesCollector(Batch):
+    """
+    A Batch only collecting the Rules to be inserted, without any priority.
+    Used to compute the rules a layer should have.
+    """
+
+    def __init__(self, log_name=None) -> None:
+        super().__init__(log_name)
+        self.rules = []
+
+    def add_insert_rule(self, rule: Rule):
+        self.rules.append(rule)
+        super().add_insert_rule(rule)
+
+
+RULE_KEY_FIELDS = ("userName", "roleName", "service", "request", "subfield", "workspace", "layer", "access")
+
+
+def get_rule_key(rule: dict) -> tuple:
+    """
+    Identity of a rule, regardless of its id and priority.
+    Accepts both the rules returned by GeoFence and the fields of a Rule.
+    """
+    limits = rule.get("limits") or {}
+    allowed_area = limits.get("allowedArea")
+    if allowed_area:
+        # GeoFence returns the area as EWKT
+        allowed_area = re.sub(r"^SRID=\d+;", "", allowed_area).strip()
+    return tuple(rule.get(field) or None for field in RULE_KEY_FIELDS) + (
+        allowed_area or None,
+        limits.get("catalogMode") or None,
+    )
+
+
+class RulesSnapshot:
+    """
+    A set of GeoFence rules sorted by priority and indexed by (workspace, layer), workspace, user and role,
+    along with the first priority available for new rules.
+    """
+
+    def __init__(self, rules: list, first_available_priority: int = None) -> None:
+        self.rules = sorted(rules, key=lambda r: int(r.get("priority") or 0))
+        self.layers = {}
+        self.indexes = {"workspace": {}, "userName": {}, "roleName": {}}
+        max_priority = -1
+        for rule in self.rules:
+            max_priority = max(max_priority, int(rule.get("priority") or 0))
+            if rule.get("layer"):
+                self.layers.setdefault((rule.get("workspace"), rule["layer"]), []).append(rule)
+            for field, index in self.indexes.items():
+                index.setdefault(rule.get(field), []).append(rule)
+        self.first_available_priority = (
+            first_available_priority if first_available_priority is not None else max_priority + 1
+        )
+
+    def get_layer_rules(self, workspace: str, layer: str) -> list:
+        return self.layers.get((workspace, layer), [])
+
+    def find_rules(self, workspace: str = None, layer: str = None, user: str = None, group: str = None) -> list:
+        """Rules matching all the given values, sorted by priority"""
+        if layer is not None:
+            rules = self.get_layer_rules(workspace, layer)
+        elif workspace is not None:
+            rules = self.indexes["workspace"].get(workspace, [])
+        else:
+            rules = self.rules
+        if user is not None:
+            rules = [r for r in rules if r.get("userName") == user]
+        if group is not None:
+            rules = [r for r in rules if r.get("roleName") == f"ROLE_{group.upper()}"]
+        return rules
+
+
+def fetch_all_rules(client, page_size: int = 1000) -> list:
+    """Fetch all the rules from GeoFence, in pages of `page_size` rules"""
+    rules_count = client.get_rules_count()
+    pages = math.ceil(rules_count / page_size) if rules_count else 0
+    rules = []
+    for page in range(pages):
+        rules.extend(client.get_rules(page=page, entries=page_size).get("rules", []))
+    logger.debug(f"Fetched {len(rules)} GeoFence rules in {pages} pages")
+    return rules
+
+
+def fetch_layer_rules(client, workspace: str, layer: str) -> list:
+    """Fetch the rules related to a layer from GeoFence"""
+    gs_rules = client.get_rules(workspace=workspace, workspace_any=False, layer=layer, layer_any=False)
+    rules = []
+    for r in (gs_rules or {}).get("rules") or []:
+        if r.get("layer") and r["layer"] == layer:
+            rules.append(r)
+        else:
+            logger.warning(f"Bad rule retrieved for dataset '{workspace or ''}:{layer}': {r}")
+    return rules
+
+
+class GeoFenceRulesMirror:
+    """
+    A local copy of the GeoFence rules, stored in the GeoNode DB and indexed by workspace, layer, user and role.
+
+    Rule lookups and priority allocation are served from the copy, which is updated with the batches run
+    through GeoFenceUtils and reconciled against GeoFence once older than `ttl` seconds.
+    GeoFence does not return the ids of the inserted rules, so the layers they belong to are marked as stale
+    and fetched again on their next lookup.
+    The updates of the copy are serialized by locking the row of its state; the rules of the stale layers
+    are fetched before taking the lock.
+    """
+
+    STATE_ID = 1
+
+    def __init__(self, client, ttl: int = 3600, page_size: int = 1000) -> None:
+        self.geofence = client
+        self.ttl = ttl
+        self.page_size = page_size
+
+    def _lock_state(self) -> GeoFenceRulesMirrorState:
+        GeoFenceRulesMirrorState.objects.get_or_create(id=self.STATE_ID)
+        return GeoFenceRulesMirrorState.objects.select_for_update().get(id=self.STATE_ID)
+
+    @staticmethod
+    def _to_model(rule: dict) -> GeoFenceRule:
+        return GeoFenceRule(
+            id=rule["id"],
+            priority=int(rule.get("priority") or 0),
+            workspace=rule.get("workspace"),
+            layer=rule.get("layer"),
+            user_name=rule.get("userName"),
+            role_name=rule.get("roleName"),
+            rule=rule,
+        )
+
+    def reconcile(self) -> list:
+        """Replace the local copy with the rules currently stored in GeoFence, and return them"""
+        with transaction.atomic():
+            # the rules are fetched while holding the lock, so that no batch is applied to an outdated copy
+            state = self._lock_state()
+            rules = fetch_all_rules(self.geofence, self.page_size)
+            GeoFenceRule.objects.all().delete()
+            GeoFenceRule.objects.bulk_create(
+                (self._to_model(rule) for rule in rules), batch_size=self.page_size, ignore_conflicts=True
+            )
+            GeoFenceStaleLayer.objects.all().delete()
+            state.next_priority = max((int(rule.get("priority") or 0) for rule in rules), default=-1) + 1
+            state.synced_at = timezone.now()
+            state.save()
+        logger.debug(f"GeoFence rules mirror reconciled with {len(rules)} rules")
+        return rules
+
+    def invalidate(self):
+        """Mark the local copy as outdated, the next lookup will reconcile it"""
+        GeoFenceRulesMirrorState.objects.filter(id=self.STATE_ID).update(synced_at=None)
+
+    def _load(self) -> GeoFenceRulesMirrorState:
+        state = GeoFenceRulesMirrorState.objects.filter(id=self.STATE_ID).first()
+        if state is None or state.synced_at is None or timezone.now() - state.synced_at > timedelta(seconds=self.ttl):
+            self.reconcile()
+            state = GeoFenceRulesMirrorState.objects.get(id=self.STATE_ID)
+        return state
+
+    def _refresh_layers(self, layers: set = None):
+        """Fetch again the stale layers among the given (workspace, layer) pairs, or all of them when not given"""
+        stale_layers = GeoFenceStaleLayer.objects.all()
+        if layers is not None:
+            if not layers:
+                return
+            stale_layers = stale_layers.filter(layer__in={layer for _, layer in layers})
+        fetched = {
+            stale_layer.id: (
+                stale_layer,
+                fetch_layer_rules(self.geofence, stale_layer.workspace or None, stale_layer.layer),
+            )
+            for stale_layer in stale_layers
+            if layers is None or (stale_layer.workspace or None, stale_layer.layer) in layers
+        }
+        if not fetched:
+            return
+        with transaction.atomic():
+            self._lock_state()
+            # the layers refreshed meanwhile have no marker anymore, the ones updated by a later batch
+            # have a new one: their rules are fetched again on the next lookup
+            unchanged = set(GeoFenceStaleLayer.objects.filter(id__in=fetched).values_list("id", flat=True))
+            for stale_layer, rules in (fetched[marker_id] for marker_id in unchanged):
+                GeoFenceRule.objects.filter(workspace=stale_layer.workspace or None, layer=stale_layer.layer).delete()
+                GeoFenceRule.objects.bulk_create((self._to_model(rule) for rule in rules), ignore_conflicts=True)
+            GeoFenceStaleLayer.objects.filter(id__in=unchanged).delete()
+
+    def get_snapshot(self, layers: list = None) -> RulesSnapshot:
+        """
+        The rules of the given (workspace, layer) pairs, or all the rules when not given.
+        The stale layers among them are fetched again.
+        """
+        state = self._load()
+        layers = set(layers) if layers is not None else None
+        self._refresh_layers(layers)
+        if layers is None:
+            rules = [r.rule for r in GeoFenceRule.objects.all()]
+        else:
+            rules = [
+                r.rule
+                for r in GeoFenceRule.objects.filter(layer__in={layer for _, layer in layers})
+                if (r.workspace, r.layer) in layers
+            ]
+        return RulesSnapshot(rules, state.next_priority)
+
+    def get_layer_rules(self, workspace: str, layer: str) -> list:
+        return self.find_rules(workspace, layer)
+
+    def find_rules(self, workspace: str = None, layer: str = None, user: str = None, group: str = None) -> list:
+        """Rules matching all the given values, sorted by priority"""
+        self._load()
+        self._refresh_layers({(workspace, layer)} if layer is not None else None)
+        rules = GeoFenceRule.objects.all()
+        if layer is not None:
+            rules = rules.filter(workspace=workspace, layer=layer)
+        elif workspace is not None:
+            rules = rules.filter(workspace=workspace)
+        if user is not None:
+            rules = rules.filter(user_name=user)
+        if group is not None:
+            rules = rules.filter(role_name=f"ROLE_{group.upper()}")
+        return [r.rule for r in rules]
+
+    def get_first_available_priority(self) -> int:
+        return self._load().next_priority
+
+    def apply_batch(self, batch: Batch):
+        """Update the local copy with the operations of a batch executed by GeoFence"""
+        deleted = []
+        stale_layers = set()
+        next_priority = None
+        reconcile = False
+        for operation in batch.operations:
+            if operation["@type"] == "delete":
+                deleted.append(operation["@id"])
+            elif operation["@type"] == "insert":
+                rule = operation["Rule"]
+                if rule.get("priority") is not None:
+                    next_priority = max(next_priority or 0, int(rule["priority"]) + 1)
+                if rule.get("layer"):
+                    stale_layers.add((rule.get("workspace") or "", rule["layer"]))
+                else:
+                    # rules not bound to a layer can only be found with a full reconciliation
+                    reconcile = True
+        with transaction.atomic():
+            state = self._lock_state()
+            GeoFenceRule.objects.filter(id__in=deleted).delete()
+            if stale_layers:
+                # new markers, so that the rules fetched before this batch are not stored
+                GeoFenceStaleLayer.objects.filter(
+                    Q(*(Q(workspace=workspace, layer=layer) for workspace, layer in stale_layers), _connector=Q.OR)
+                ).delete()
+            GeoFenceStaleLayer.objects.bulk_create(
+                (GeoFenceStaleLayer(workspace=workspace, layer=layer) for workspace, layer in stale_layers),
+                ignore_conflicts=True,
+            )
+            if next_priority is not None:
+                state.next_priority = max(state.next_priority, next_priority)
+            if reconcile:
+                state.synced_at = None
+            state.save()
+
+
 class GeoFenceClient:
     """_summary_
     A GeoFence REST client allowing to interact with the embedded GeoFence API (which is slightly incompatible
@@ -390,46 +661,66 @@ class GeoFenceClient:
 
 
 class GeoFenceUtils:
-    def __init__(self, client: GeoFenceClient):
+    def __init__(self, client: GeoFenceClient, mirror: GeoFenceRulesMirror = None):
         self.geofence = client
+        self.mirror = mirror
+
+    def run_batch(self, batch: Batch) -> bool:
+        """Run a batch in GeoFence, keeping the rules mirror in sync"""
+        try:
+            executed = self.geofence.run_batch(batch)
+        except Exception:
+            if self.mirror:
+                # the outcome of the batch is unknown
+                self.mirror.invalidate()
+            raise
+        if executed and self.mirror:
+            self.mirror.apply_batch(batch)
+        return executed
+
+    def insert_rule(self, rule: Rule):
+        batch = Batch()
+        batch.add_insert_rule(rule)
+        self.geofence.insert_rule(rule)
+        if self.mirror:
+            self.mirror.apply_batch(batch)
+
+    def get_layer_rules(self, workspace_name: str, layer_name: str) -> list:
+        """Rules related to a layer, sorted by priority"""
+        if self.mirror:
+            return self.mirror.get_layer_rules(workspace_name, layer_name)
+
+        return fetch_layer_rules(self.geofence, workspace_name, layer_name)
 
     def delete_all_rules(self):
         """purge all existing GeoFence Cache Rules"""
-        rules_objs = self.geofence.get_rules()
-        rules = rules_objs["rules"]
+        if self.mirror:
+            rules = self.mirror.reconcile()
+        else:
+            rules = fetch_all_rules(self.geofence)
 
         batch = Batch("Purge All")
         for rule in rules:
             batch.add_delete_rule(rule["id"])
 
-        logger.debug(f"Going to remove all {len(rules)} rules in geofence")
-        self.geofence.run_batch(batch)
+        logger.debug(f"Going to remove all {batch.length()} rules in geofence")
+        self.run_batch(batch)
 
     def collect_delete_layer_rules(self, workspace_name: str, layer_name: str, batch: Batch = None) -> Batch:
         """Collect delete operations in a Batch for all rules related to a layer"""
 
         try:
             # Scan GeoFence Rules associated to the Dataset
-            gs_rules = self.geofence.get_rules(
-                workspace=workspace_name, workspace_any=False, layer=layer_name, layer_any=False
-            )
+            rules = self.get_layer_rules(workspace_name, layer_name)
 
             if not batch:
                 batch = Batch(f"Delete {workspace_name}:{layer_name}")
 
-            cnt = 0
-            if gs_rules and gs_rules["rules"]:
-                logger.debug(
-                    f"Going to collect {len(gs_rules['rules'])} rules for layer '{workspace_name}:{layer_name}'"
-                )
-                for r in gs_rules["rules"]:
-                    if r["layer"] and r["layer"] == layer_name:
-                        batch.add_delete_rule(r["id"])
-                        cnt += 1
-                    else:
-                        logger.warning(f"Bad rule retrieved for dataset '{workspace_name or ''}:{layer_name}': {r}")
-
-            logger.debug(f"Adding {cnt} rule deletion operations for '{workspace_name or ''}:{layer_name}")
+            logger.debug(f"Going to collect {len(rules)} rules for layer '{workspace_name}:{layer_name}'")
+            for r in rules:
+                batch.add_delete_rule(r["id"])
+
+            logger.debug(f"Adding {len(rules)} rule deletion operations for '{workspace_name or ''}:{layer_name}")
             return batch
 
         except Exception as e:
@@ -446,7 +737,7 @@ class GeoFenceUtils:
                 return False
 
             logger.debug(f"Going to remove {batch.length()} rules for layer {workspace_name}:{layer_name}")
-            return self.geofence.run_batch(batch)
+            return self.run_batch(batch)
 
         except Exception as e:
             logger.error(f"Error removing rules for {workspace_name}:{layer_name}", exc_info=e)
@@ -454,8 +745,49 @@ class GeoFenceUtils:
             logger.debug(tb)
             return False
 
+    def get_rules_snapshot(self, layers: list = None, page_size: int = 1000) -> RulesSnapshot:
+        """
+        Fetch the rules of the given (workspace, layer) pairs, or of all the layers.
+
+        The rules are fetched in pages of ``page_size`` rules, unless fetching the rules of every layer
+        takes less requests. When the rules mirror is enabled, they are read from it.
+        """
+        if self.mirror:
+            return self.mirror.get_snapshot(layers)
+
+        rules_count = self.geofence.get_rules_count()
+        pages = math.ceil(rules_count / page_size) if rules_count else 0
+        if layers is not None and len(layers) < pages:
+            rules = []
+            for workspace, layer in layers:
+                rules.extend(fetch_layer_rules(self.geofence, workspace, layer))
+            return RulesSnapshot(rules, self.get_first_available_priority())
+
+        return RulesSnapshot(fetch_all_rules(self.geofence, page_size))
+
+    def get_layer_rules_diff(self, snapshot: RulesSnapshot, workspace_name: str, layer_name: str, rules: list):
+        """
+        Compute the operations turning the current rules of a layer into the given ones.
+        Returns the ids of the rules to be deleted and the Rules to be inserted.
+
+        The current rules matching the given ones in the same order are kept, the remaining current rules
+        are deleted and the remaining given rules are inserted after them, so that their order is preserved.
+        """
+        current = snapshot.get_layer_rules(workspace_name, layer_name)
+        common = 0
+        for current_rule, rule in zip(current, rules):
+            if get_rule_key(current_rule) != get_rule_key(rule.fields):
+                break
+            common += 1
+        return [current_rule["id"] for current_rule in current[common:]], rules[common:]
+
     def get_first_available_priority(self):
         """Get the highest Rules priority"""
+        if self.mirror:
+            try:
+                return self.mirror.get_first_available_priority()
+            except Exception as e:
+                logger.warning(f"Could not read the first available priority from the GeoFence rules mirror: {e}")
         try:
             rules_count = self.geofence.get_rules_count()
             rules_objs = self.geofence.get_rules(page=rules_count - 1, entries=1)
@@ -78,7 +78,7 @@ from geonode.utils import (
     normalize_bbox_to_float_list,
 )
 
-from .geofence import GeoFenceClient, GeoFenceUtils
+from .geofence import GeoFenceClient, GeoFenceRulesMirror, GeoFenceUtils
 
 logger = logging.getLogger(__name__)
 
@@ -1876,8 +1876,18 @@ def _create_geofence_client():
     return client
 
 
+def _create_geofence_rules_mirror(client):
+    if not getattr(settings, "GEOFENCE_RULES_MIRROR_ENABLED", False):
+        return None
+    return GeoFenceRulesMirror(
+        client,
+        ttl=settings.GEOFENCE_RULES_MIRROR_TTL,
+        page_size=settings.GEOFENCE_SYNC_PAGE_SIZE,
+    )
+
+
 geofence = _create_geofence_client()
-gf_utils = GeoFenceUtils(geofence)
+gf_utils = GeoFenceUtils(geofence, _create_geofence_rules_mirror(geofence))
 
 _punc = re.compile(r"[\.:]")  # regex for punctuation that confuses restconfig
 _foregrounds = ["#ffbbbb", "#bbffbb", "#bbbbff", "#ffffbb", "#bbffff", "#ffbbff"]
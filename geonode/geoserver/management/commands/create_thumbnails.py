@@ -0,0 +1,124 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import logging
+
+from django.core.management.base import BaseCommand
+from geonode.base.management.command_utils import setup_logger
+
+from geonode.base.models import ResourceBase
+from geonode.thumbs.bulk import BulkThumbnailPipeline, STAGES
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Regenerate the thumbnails of the Datasets and Maps in bulk, skipping the ones which did not change"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-t",
+            "--type",
+            dest="resource_type",
+            choices=("dataset", "map"),
+            default=None,
+            help="Only regenerate the thumbnails of the given resource type.",
+        )
+        parser.add_argument(
+            "-f",
+            "--filter",
+            dest="filter",
+            default=None,
+            help="Only regenerate the thumbnails of the resources whose title matches the given filter.",
+        )
+        parser.add_argument(
+            "-u",
+            "--username",
+            dest="username",
+            default=None,
+            help="Only regenerate the thumbnails of the resources owned by the specified username.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            dest="force",
+            default=False,
+            help="Regenerate the thumbnails even when their BBOX, styles and datasets did not change.",
+        )
+        parser.add_argument("--batch-size", dest="batch_size", type=int, default=None, help="Resources per batch.")
+        parser.add_argument(
+            "--workers", dest="max_workers", type=int, default=None, help="Concurrent GetMap requests per OGC server."
+        )
+        parser.add_argument(
+            "--processes", dest="processes", type=int, default=None, help="Processes composing the thumbnails."
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="asynchronous",
+            default=False,
+            help="Send the batches to the celery workers instead of processing them here.",
+        )
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            dest="log_debug",
+            default=False,
+            help="Enable debug logging.",
+        )
+
+    def handle(self, **options):
+        log_level = logging.DEBUG if options.get("log_debug") else logging.INFO
+        setup_logger(__name__, level=log_level)
+        import geonode.thumbs.bulk as bulk
+
+        setup_logger(bulk.__name__, level=log_level)
+
+        queryset = ResourceBase.objects.filter(resource_type__in=("dataset", "map"))
+        if options.get("resource_type"):
+            queryset = queryset.filter(resource_type=options.get("resource_type"))
+        if options.get("filter"):
+            queryset = queryset.filter(title__icontains=options.get("filter"))
+        if options.get("username"):
+            queryset = queryset.filter(owner__username=options.get("username"))
+
+        pipeline = BulkThumbnailPipeline(
+            force=options.get("force"),
+            batch_size=options.get("batch_size"),
+            max_workers=options.get("max_workers"),
+            processes=options.get("processes"),
+        )
+
+        if options.get("asynchronous"):
+            from geonode.geoserver.tasks import geoserver_create_thumbnails
+
+            resource_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+            for i in range(0, len(resource_ids), pipeline.batch_size):
+                geoserver_create_thumbnails.apply_async(
+                    args=(resource_ids[i : i + pipeline.batch_size],), kwargs={"force": options.get("force")}
+                )
+            logger.info(f"Sent {len(resource_ids)} resources to the workers")
+            return
+
+        report = pipeline.run(queryset)
+        logger.info(
+            f"Processed {report['processed']} resources: {report['created']} thumbnails created, "
+            f"{report['skipped']} skipped, {report['missing']} missing, {report['failed']} failed"
+        )
+        for stage in STAGES:
+            logger.info(f"- {stage:10}: {report['timings'][stage]:10.2f} s")
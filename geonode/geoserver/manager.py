@@ -275,7 +275,7 @@ class GeoServerResourceManager(ResourceManagerInterface):
                                 logger.info(
                                     f"Pushing {batch.length()} " f"changes into GeoFence for resource {_resource.name}"
                                 )
-                                executed = geofence.run_batch(batch)
+                                executed = gf_utils.run_batch(batch)
                                 if executed:
                                     geofence.invalidate_cache()
                             except Exception as e:
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="GeoFenceRule",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("priority", models.BigIntegerField(default=0)),
+                ("workspace", models.CharField(blank=True, max_length=255, null=True)),
+                ("layer", models.CharField(blank=True, max_length=255, null=True)),
+                ("user_name", models.CharField(blank=True, max_length=255, null=True)),
+                ("role_name", models.CharField(blank=True, max_length=255, null=True)),
+                ("rule", models.JSONField()),
+            ],
+            options={
+                "ordering": ("priority", "id"),
+                "indexes": [
+                    models.Index(fields=["layer", "workspace"], name="geoserver_gfrule_layer_idx"),
+                    models.Index(fields=["workspace"], name="geoserver_gfrule_ws_idx"),
+                    models.Index(fields=["user_name"], name="geoserver_gfrule_user_idx"),
+                    models.Index(fields=["role_name"], name="geoserver_gfrule_role_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="GeoFenceStaleLayer",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("workspace", models.CharField(blank=True, default="", max_length=255)),
+                ("layer", models.CharField(max_length=255)),
+            ],
+            options={
+                "unique_together": {("workspace", "layer")},
+            },
+        ),
+        migrations.CreateModel(
+            name="GeoFenceRulesMirrorState",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("next_priority", models.BigIntegerField(default=0)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -16,3 +16,63 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+
+from django.db import models
+
+
+class GeoFenceRule(models.Model):
+    """
+    Local copy of a GeoFence rule, see geonode.geoserver.geofence.GeoFenceRulesMirror
+    """
+
+    # the id of the rule in GeoFence
+    id = models.BigIntegerField(primary_key=True)
+    priority = models.BigIntegerField(default=0)
+    workspace = models.CharField(max_length=255, null=True, blank=True)
+    layer = models.CharField(max_length=255, null=True, blank=True)
+    user_name = models.CharField(max_length=255, null=True, blank=True)
+    role_name = models.CharField(max_length=255, null=True, blank=True)
+    # the rule as returned by GeoFence
+    rule = models.JSONField()
+
+    def __str__(self):
+        return f"{self.id}@{self.priority}"
+
+    class Meta:
+        ordering = ("priority", "id")
+        indexes = [
+            models.Index(fields=["layer", "workspace"], name="geoserver_gfrule_layer_idx"),
+            models.Index(fields=["workspace"], name="geoserver_gfrule_ws_idx"),
+            models.Index(fields=["user_name"], name="geoserver_gfrule_user_idx"),
+            models.Index(fields=["role_name"], name="geoserver_gfrule_role_idx"),
+        ]
+
+
+class GeoFenceStaleLayer(models.Model):
+    """
+    A layer whose rules in the local copy must be fetched again from GeoFence
+    """
+
+    # rules not bound to a workspace are stored with an empty one
+    workspace = models.CharField(max_length=255, blank=True, default="")
+    layer = models.CharField(max_length=255)
+
+    def __str__(self):
+        return f"{self.workspace}:{self.layer}"
+
+    class Meta:
+        unique_together = (("workspace", "layer"),)
+
+
+class GeoFenceRulesMirrorState(models.Model):
+    """
+    State of the local copy of the GeoFence rules, stored in a single row.
+    Its lock serializes the updates of the copy.
+    """
+
+    next_priority = models.BigIntegerField(default=0)
+    # None when the copy must be reconciled with GeoFence
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.next_priority}@{self.synced_at}"
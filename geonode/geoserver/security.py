@@ -31,9 +31,8 @@ from requests.auth import HTTPBasicAuth
 from guardian.shortcuts import get_anonymous_user
 
 from django.conf import settings
-from django.contrib.auth.models import Group
 from django.contrib.auth import get_user_model
-from geonode.geoserver.geofence import Batch, Rule, AutoPriorityBatch
+from geonode.geoserver.geofence import Batch, Rule, AutoPriorityBatch, RulesCollector
 from geonode.geoserver.helpers import geofence, gf_utils, gs_catalog
 from geonode.groups.models import GroupProfile
 from geonode.utils import get_dataset_workspace
@@ -247,7 +246,7 @@ def allow_layer_to_all(instance):
     logger.debug(f"Allowing {workspace}:{dataset_name} access to everybody")
     try:
         priority = gf_utils.get_first_available_priority()
-        geofence.insert_rule(Rule(Rule.ALLOW, priority=priority, workspace=workspace, layer=dataset_name))
+        gf_utils.insert_rule(Rule(Rule.ALLOW, priority=priority, workspace=workspace, layer=dataset_name))
     except Exception as e:
         tb = traceback.format_exc()
         logger.debug(tb)
@@ -327,10 +326,37 @@ def create_geofence_rules(layer, perms, user=None, group=None, batch: Batch = No
     return batch
 
 
+def _get_perm_spec_principals(perm_spec, anonymous_username):
+    """
+    Principals of a perm spec as (user, group, perms), in a stable order:
+    named users and groups first, sorted by name, then the anonymous ones.
+    """
+    principals = []
+    anonymous = []
+    for username, perms in sorted(perm_spec.get("users", {}).items(), key=lambda item: str(item[0])):
+        username = str(username)
+        if "AnonymousUser" in username or username == anonymous_username:
+            anonymous.append((None, None, perms))
+        else:
+            principals.append((username, None, perms))
+    for groupname, perms in sorted(perm_spec.get("groups", {}).items(), key=lambda item: str(item[0])):
+        groupname = str(groupname)
+        if groupname == "anonymous":
+            anonymous.append((None, None, perms))
+        else:
+            principals.append((None, groupname, perms))
+    return principals + anonymous
+
+
 def sync_resources_with_guardian(resource=None, force=False):
     """
     Sync resources with Guardian and clear their dirty state
+
+    The current GeoFence rules are fetched once and compared with the ones computed from the permissions:
+    only the rules which actually changed are deleted and inserted, in batches of at most
+    GEOFENCE_SYNC_BATCH_SIZE operations.
     """
+    from geonode.base.models import ResourceBase
     from geonode.layers.models import Dataset
 
     if resource:
@@ -343,39 +369,65 @@ def sync_resources_with_guardian(resource=None, force=False):
     if datasets and datasets.exists():
         logger.debug(" --------------------------- synching with guardian!")
 
+        datasets = list(datasets)
+        layers = [(get_dataset_workspace(dataset), dataset.name) for dataset in datasets]
+        snapshot = gf_utils.get_rules_snapshot(layers, page_size=settings.GEOFENCE_SYNC_PAGE_SIZE)
+        anonymous_username = str(get_anonymous_user())
+        priority = snapshot.first_available_priority
+
         rules_committed = False
+        batch = AutoPriorityBatch(priority, "Sync resources")
+        batch_datasets = []
+        clean_ids = []
 
-        for dataset in datasets:
+        def _run_batch():
+            nonlocal batch, batch_datasets, priority, rules_committed
             try:
-                batch = AutoPriorityBatch(gf_utils.get_first_available_priority(), f"Sync resources {dataset}")
+                if batch.length():
+                    logger.info(f"Going to synch permissions in GeoFence for {len(batch_datasets)} resources")
+                    rules_committed = gf_utils.run_batch(batch) or rules_committed
+                clean_ids.extend(dataset.id for dataset in batch_datasets)
+            except Exception as e:
+                logger.exception(e)
+                logger.warning(
+                    f"!WARNING! - Failure Synching-up Security Rules for Resources {[str(d) for d in batch_datasets]}"
+                )
+            priority = next(batch.pri)
+            batch = AutoPriorityBatch(priority, "Sync resources")
+            batch_datasets = []
 
-                gf_utils.collect_delete_layer_rules(get_dataset_workspace(dataset), dataset.name, batch)
+        for dataset, (workspace_name, layer_name) in zip(datasets, layers):
+            try:
+                rules = RulesCollector(f"Sync resource {dataset}")
                 perm_spec = permissions_registry.get_perms(instance=dataset)
-                # All the other users
-                if "users" in perm_spec:
-                    for user, perms in perm_spec["users"].items():
-                        user = get_user_model().objects.get(username=user)
-                        # Set the GeoFence User Rules
-                        geofence_user = str(user)
-                        if "AnonymousUser" in geofence_user or str(get_anonymous_user()) in geofence_user:
-                            geofence_user = None
-                        create_geofence_rules(dataset, perms, user=geofence_user, batch=batch)
-                # All the other groups
-                if "groups" in perm_spec:
-                    for group, perms in perm_spec["groups"].items():
-                        group = Group.objects.get(name=group)
-                        if group and group.name and group.name == "anonymous":
-                            group = None
-                        # Set the GeoFence Group Rules
-                        create_geofence_rules(dataset, perms, group=group, batch=batch)
-
-                logger.info(f"Going to synch permissions in GeoFence for resource {dataset}")
-                rules_committed = geofence.run_batch(batch)
-                dataset.clear_dirty_state()
+                for user, group, perms in _get_perm_spec_principals(perm_spec, anonymous_username):
+                    create_geofence_rules(dataset, perms, user=user, group=group, batch=rules)
+
+                delete_ids, insert_rules = gf_utils.get_layer_rules_diff(
+                    snapshot, workspace_name, layer_name, rules.rules
+                )
             except Exception as e:
                 logger.exception(e)
                 logger.warning(f"!WARNING! - Failure Synching-up Security Rules for Resource [{dataset}]")
-
+                continue
+
+            # the operations of a layer are never split across batches
+            operations = len(delete_ids) + len(insert_rules)
+            if batch.length() and batch.length() + operations > settings.GEOFENCE_SYNC_BATCH_SIZE:
+                _run_batch()
+            for rule_id in delete_ids:
+                batch.add_delete_rule(rule_id)
+            for rule in insert_rules:
+                batch.add_insert_rule(rule)
+            batch_datasets.append(dataset)
+
+        _run_batch()
+
+        if clean_ids:
+            ResourceBase.objects.filter(id__in=clean_ids).update(dirty_state=False)
+            for dataset in datasets:
+                if dataset.id in clean_ids:
+                    dataset.dirty_state = False
         if rules_committed:
             invalidate_geofence_cache()
 
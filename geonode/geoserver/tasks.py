@@ -41,6 +41,7 @@ from .helpers import (
     cascading_delete,
     create_gs_thumbnail,
     sync_instance_with_geoserver,
+    gf_utils,
 )
 
 logger = get_task_logger(__name__)
@@ -292,6 +293,24 @@ def geoserver_create_thumbnail(self, instance_id, overwrite=True, check_bbox=Tru
                 log_lock.debug(f"geoserver_create_thumbnail: Released lock {lock_id} for {instance.name}")
 
 
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.geoserver.tasks.geoserver_create_thumbnails",
+    queue="geoserver.events",
+    time_limit=3600,
+    acks_late=False,
+)
+def geoserver_create_thumbnails(self, resource_ids, force=False):
+    """
+    Regenerates the thumbnails of many resources with the bulk thumbnail pipeline,
+    returning its report with the timings of every stage.
+    """
+    from geonode.thumbs.bulk import BulkThumbnailPipeline
+
+    return BulkThumbnailPipeline(force=force).run(ResourceBase.objects.filter(id__in=resource_ids))
+
+
 @app.task(
     bind=True,
     base=FaultTolerantTask,
@@ -372,3 +391,19 @@ def synch_guardian():
     """
     if getattr(settings, "DELAYED_SECURITY_SIGNALS", False):
         sync_resources_with_guardian()
+
+
+@shared_task(
+    bind=True,
+    name="geonode.geoserver.tasks.reconcile_geofence_rules_mirror",
+    queue="security",
+    expires=30,
+    time_limit=600,
+    acks_late=False,
+)
+def reconcile_geofence_rules_mirror(self):
+    """
+    Reconcile the local copy of the GeoFence rules with GeoFence
+    """
+    if gf_utils.mirror:
+        gf_utils.mirror.reconcile()
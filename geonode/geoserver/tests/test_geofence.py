@@ -0,0 +1,186 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase, TestCase
+
+from geonode.geoserver.geofence import (
+    AutoPriorityBatch,
+    GeoFenceRulesMirror,
+    GeoFenceUtils,
+    Rule,
+    RulesSnapshot,
+    get_rule_key,
+)
+
+
+def _rule(id, priority, access="ALLOW", layer="roads", **kwargs):
+    rule = {"id": id, "priority": priority, "workspace": "geonode", "layer": layer, "access": access}
+    rule.update(kwargs)
+    return rule
+
+
+class GeoFenceRulesDiffTests(SimpleTestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.gf_utils = GeoFenceUtils(self.client)
+
+    def test_rule_key(self):
+        rule = Rule(
+            Rule.LIMIT, workspace="geonode", layer="roads", user="admin", geo_limit="POLYGON((0 0,1 1,1 0,0 0))"
+        )
+        gs_rule = _rule(
+            12, 3, access="LIMIT", userName="admin", limits={"allowedArea": "SRID=4326;POLYGON((0 0,1 1,1 0,0 0))"}
+        )
+
+        self.assertEqual(get_rule_key(rule.fields), get_rule_key(gs_rule))
+        self.assertNotEqual(get_rule_key(rule.fields), get_rule_key(_rule(12, 3, access="LIMIT", userName="admin")))
+
+    def test_snapshot(self):
+        snapshot = RulesSnapshot(
+            [_rule(2, 7, access="DENY"), _rule(1, 4), _rule(3, 9, layer="rivers"), {"priority": 10}]
+        )
+
+        self.assertEqual([r["id"] for r in snapshot.get_layer_rules("geonode", "roads")], [1, 2])
+        self.assertEqual(snapshot.get_layer_rules("geonode", "lakes"), [])
+        self.assertEqual(snapshot.first_available_priority, 11)
+
+    def test_unchanged_rules(self):
+        snapshot = RulesSnapshot([_rule(1, 4, userName="admin"), _rule(2, 7, access="DENY")])
+        rules = [
+            Rule(True, workspace="geonode", layer="roads", user="admin"),
+            Rule(False, workspace="geonode", layer="roads"),
+        ]
+
+        self.assertEqual(self.gf_utils.get_layer_rules_diff(snapshot, "geonode", "roads", rules), ([], []))
+
+    def test_changed_rules_keep_the_common_prefix(self):
+        snapshot = RulesSnapshot(
+            [_rule(1, 4, userName="admin"), _rule(2, 5, userName="bobby"), _rule(3, 7, access="DENY")]
+        )
+        rules = [
+            Rule(True, workspace="geonode", layer="roads", user="admin"),
+            Rule(True, workspace="geonode", layer="roads", group="editors"),
+            Rule(False, workspace="geonode", layer="roads"),
+        ]
+
+        delete_ids, insert_rules = self.gf_utils.get_layer_rules_diff(snapshot, "geonode", "roads", rules)
+
+        self.assertEqual(delete_ids, [2, 3])
+        self.assertEqual(insert_rules, rules[1:])
+
+    def test_snapshot_fetches_rules_per_layer_or_per_page(self):
+        self.client.get_rules_count.return_value = 5
+        self.client.get_rules.return_value = {"rules": [_rule(1, 4)]}
+
+        self.gf_utils.get_rules_snapshot([("geonode", "roads")], page_size=2)
+        self.client.get_rules.assert_any_call(workspace="geonode", workspace_any=False, layer="roads", layer_any=False)
+
+        self.client.get_rules.reset_mock()
+        snapshot = self.gf_utils.get_rules_snapshot([("geonode", f"layer_{i}") for i in range(5)], page_size=2)
+        self.assertEqual(self.client.get_rules.call_count, 3)
+        self.client.get_rules.assert_called_with(page=2, entries=2)
+        self.assertEqual(snapshot.first_available_priority, 5)
+
+
+class GeoFenceRulesMirrorTests(TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.get_rules_count.return_value = 3
+        self.client.get_rules.return_value = {
+            "rules": [_rule(1, 4, userName="admin"), _rule(2, 5, roleName="ROLE_EDITORS"), _rule(3, 9, layer="rivers")]
+        }
+        self.client.run_batch.return_value = True
+        self.mirror = GeoFenceRulesMirror(self.client, page_size=10)
+        self.gf_utils = GeoFenceUtils(self.client, self.mirror)
+
+    def test_lookups_are_served_locally(self):
+        self.assertEqual(self.gf_utils.get_first_available_priority(), 10)
+        self.assertEqual([r["id"] for r in self.gf_utils.get_layer_rules("geonode", "roads")], [1, 2])
+        self.assertEqual([r["id"] for r in self.mirror.find_rules(user="admin")], [1])
+        self.assertEqual([r["id"] for r in self.mirror.find_rules(workspace="geonode", group="editors")], [2])
+        batch = self.gf_utils.collect_delete_layer_rules("geonode", "rivers")
+        self.assertEqual(batch.operations, [{"@service": "rules", "@type": "delete", "@id": 3}])
+
+        # a single reconciliation, fetching a single page
+        self.assertEqual(self.client.get_rules_count.call_count, 1)
+        self.assertEqual(self.client.get_rules.call_count, 1)
+
+    def test_batches_update_the_mirror(self):
+        batch = AutoPriorityBatch(self.gf_utils.get_first_available_priority())
+        self.gf_utils.collect_delete_layer_rules("geonode", "roads", batch)
+        batch.add_insert_rule(Rule(True, workspace="geonode", layer="roads", user="bobby"))
+        self.gf_utils.run_batch(batch)
+
+        self.assertEqual(self.gf_utils.get_first_available_priority(), 11)
+        self.assertEqual(self.mirror.get_layer_rules("geonode", "rivers"), [_rule(3, 9, layer="rivers")])
+        self.client.get_rules.assert_called_once_with(page=0, entries=10)
+
+        # the inserted rules are fetched again
+        self.client.get_rules.return_value = {"rules": [_rule(4, 10, userName="bobby")]}
+        self.assertEqual([r["id"] for r in self.mirror.get_layer_rules("geonode", "roads")], [4])
+        self.client.get_rules.assert_called_with(
+            workspace="geonode", workspace_any=False, layer="roads", layer_any=False
+        )
+
+    def test_rules_updated_while_fetching_a_layer_stay_stale(self):
+        self.gf_utils.get_first_available_priority()
+
+        def run_batch(**kwargs):
+            # the rules are fetched out of the lock, a batch can be applied meanwhile
+            batch = AutoPriorityBatch(self.gf_utils.get_first_available_priority())
+            batch.add_insert_rule(Rule(True, workspace="geonode", layer="roads", user="alice"))
+            self.gf_utils.run_batch(batch)
+            return {"rules": [_rule(4, 10, userName="bobby")]}
+
+        batch = AutoPriorityBatch(self.gf_utils.get_first_available_priority())
+        batch.add_insert_rule(Rule(True, workspace="geonode", layer="roads", user="bobby"))
+        self.gf_utils.run_batch(batch)
+
+        self.client.get_rules.side_effect = run_batch
+        self.mirror.get_layer_rules("geonode", "roads")
+
+        # the outdated rules are not stored, the layer is fetched again
+        self.client.get_rules.side_effect = None
+        self.client.get_rules.return_value = {"rules": [_rule(4, 10, userName="bobby"), _rule(5, 11, userName="alice")]}
+        self.assertEqual([r["id"] for r in self.mirror.get_layer_rules("geonode", "roads")], [4, 5])
+        self.assertEqual([r["id"] for r in self.mirror.get_layer_rules("geonode", "roads")], [4, 5])
+        self.assertEqual(self.client.get_rules.call_count, 3)
+
+    def test_the_mirror_is_shared(self):
+        self.gf_utils.get_first_available_priority()
+        batch = self.gf_utils.collect_delete_layer_rules("geonode", "rivers")
+        self.gf_utils.run_batch(batch)
+
+        # e.g. the mirror of another process
+        other_mirror = GeoFenceRulesMirror(self.client, page_size=10)
+        self.assertEqual(other_mirror.get_layer_rules("geonode", "rivers"), [])
+        self.assertEqual(other_mirror.get_first_available_priority(), 10)
+        self.assertEqual(self.client.get_rules_count.call_count, 1)
+
+    def test_failed_batches_invalidate_the_mirror(self):
+        self.gf_utils.get_first_available_priority()
+        self.client.run_batch.side_effect = Exception("timeout")
+        batch = self.gf_utils.collect_delete_layer_rules("geonode", "roads")
+
+        with self.assertRaises(Exception):
+            self.gf_utils.run_batch(batch)
+        self.gf_utils.get_first_available_priority()
+        self.assertEqual(self.client.get_rules_count.call_count, 2)
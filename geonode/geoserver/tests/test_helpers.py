@@ -23,6 +23,8 @@ import logging
 from urllib.parse import urljoin
 
 from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.test import override_settings
 from django.urls import reverse
 
 from geonode import geoserver
@@ -214,6 +216,35 @@ xlink:href="{settings.GEOSERVER_LOCATION}ows?service=WMS&amp;request=GetLegendGr
         )
         self.assertEqual(response.status_code, 200)
 
+    @on_ogc_backend(geoserver.BACKEND_PACKAGE)
+    @override_settings(PROXY_STREAMING_ENABLED=True)
+    def test_geoserver_proxy_streams_data(self):
+        body = b'{"type": "FeatureCollection", "features": []}' * 100000
+
+        class Raw:
+            def stream(self, chunk_size, decode_content=True):
+                for i in range(0, len(body), chunk_size):
+                    yield body[i : i + chunk_size]
+
+        class Response:
+            status_code = 200
+            raw = Raw()
+            headers = {"Content-Type": "application/json;charset=UTF-8"}
+
+            @property
+            def content(self):
+                raise AssertionError("The body must not be read in memory")
+
+            def close(self):
+                pass
+
+        with patch("geonode.proxy.views.http_client.request", return_value=(Response(), None)):
+            response = self.client.get(
+                f"{reverse('ows_endpoint')}?service=WFS&version=1.1.0&request=GetFeature&typeName=geonode:tipi_forestali&outputFormat=application/json"
+            )
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(b"".join(response.streaming_content), body)
+
     @on_ogc_backend(geoserver.BACKEND_PACKAGE)
     def test_ows_links(self):
         ows_url = "http://foo.org/ows"
@@ -22,6 +22,7 @@ import re
 import json
 import logging
 import warnings
+from functools import partial
 from lxml import etree
 from owslib.etree import etree as dlxml
 
@@ -47,7 +48,7 @@ from geonode.decorators import logged_in_or_basicauth
 from geonode.layers.models import Dataset, Style
 from geonode.layers.views import _resolve_dataset, _PERMISSION_MSG_MODIFY
 from geonode.maps.models import Map
-from geonode.proxy.views import proxy, fetch_response_headers
+from geonode.proxy.views import proxy, fetch_response_headers, get_streaming_response
 from .tasks import geoserver_update_datasets
 from geonode.utils import (
     _get_basic_auth_info,
@@ -298,6 +299,7 @@ def geoserver_proxy(request, proxy_path, downstream_path, workspace=None, layern
         request,
         url=raw_url,
         response_callback=_response_callback,
+        buffer_content=partial(_response_needs_content, ows_request=_get_ows_request(request, url)),
         timeout=timeout,
         allowed_hosts=allowed_hosts,
         headers=headers,
@@ -307,12 +309,44 @@ def geoserver_proxy(request, proxy_path, downstream_path, workspace=None, layern
     return response
 
 
+# content types whose GeoServer URLs are replaced with the GeoNode proxy ones
+PROXY_REWRITE_CONTENT_TYPES = ["application/xml", "text/xml", "text/plain", "application/json", "text/json"]
+# OWS requests returning data rather than metadata, whose responses are never rewritten
+PROXY_DATA_OWS_REQUESTS = ["getfeature", "getmap", "getcoverage", "gettile"]
+
+
+def _get_ows_request(request, url):
+    """The lowercase OWS operation of a proxied request, from its params or from the root element of its XML body"""
+    for name, value in parse_qsl(url.query):
+        if name.lower() == "request":
+            return value.lower()
+    if request.method == "POST":
+        try:
+            root = re.search(rb"<(?![?!])(?:[\w.-]+:)?([\w.-]+)", request.body[:4096])
+        except Exception:
+            root = None
+        if root:
+            return root.group(1).decode("UTF-8").lower()
+    return None
+
+
+def _response_needs_content(content_type, ows_request=None):
+    """
+    The body is only needed when its URLs must be replaced, or to guess the missing content type.
+    The data, e.g. the GetFeature and GetMap outputs or any GML, are always streamed.
+    """
+    if ows_request in PROXY_DATA_OWS_REQUESTS or (content_type and "subtype=gml" in content_type.lower()):
+        return False
+    return not content_type or bool(re.findall(f"(?=(\\b{'|'.join(PROXY_REWRITE_CONTENT_TYPES)}\\b))", content_type))
+
+
 def _response_callback(**kwargs):
     status = kwargs.get("status")
     content = kwargs.get("content")
     content_type = kwargs.get("content_type")
     response_headers = kwargs.get("response_headers", None)
-    content_type_list = ["application/xml", "text/xml", "text/plain", "application/json", "text/json"]
+    streaming_content = kwargs.get("streaming_content", None)
+    content_type_list = PROXY_REWRITE_CONTENT_TYPES
 
     if content:
         if not content_type:
@@ -348,6 +382,9 @@ def _response_callback(**kwargs):
         for layer in kwargs["affected_datasets"]:
             geoserver_post_save_local(layer)
 
+    if streaming_content is not None:
+        return get_streaming_response(streaming_content, status, content_type, response_headers)
+
     _response = HttpResponse(content=content, status=status, content_type=content_type)
     return fetch_response_headers(_response, response_headers)
 
@@ -286,6 +286,8 @@ class AsynchronousHarvestingSessionAdmin(admin.ModelAdmin):
         "harvester",
         "total_records_to_process",
         "records_done",
+        "records_failed",
+        "records_skipped",
         "get_progress_percentage",
     )
     readonly_fields = (
@@ -298,6 +300,8 @@ class AsynchronousHarvestingSessionAdmin(admin.ModelAdmin):
         "harvester",
         "total_records_to_process",
         "records_done",
+        "records_failed",
+        "records_skipped",
         "get_progress_percentage",
         "details",
     )
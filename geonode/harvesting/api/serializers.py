@@ -237,6 +237,22 @@ class BriefAsynchronousHarvestingSessionSerializer(DynamicModelSerializer):
             "ended",
             "total_records_to_process",
             "records_done",
+            "records_failed",
+            "records_skipped",
+        )
+
+
+class HarvestingEventSerializer(DynamicModelSerializer):
+    class Meta:
+        model = models.HarvestingEvent
+        fields = (
+            "id",
+            "created",
+            "status",
+            "harvestable_resource_id",
+            "execution_id",
+            "message",
+            "error",
         )
 
 
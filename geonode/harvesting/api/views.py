@@ -21,6 +21,7 @@ import rest_framework.permissions
 from dynamic_rest.viewsets import DynamicModelViewSet, WithDynamicViewSetMixin
 from rest_framework import mixins
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework_extensions.mixins import NestedViewSetMixin
 from geonode.base.api.pagination import GeoNodeApiPagination
 
@@ -84,3 +85,19 @@ class AsynchronousHarvestingSessionViewSet(WithDynamicViewSetMixin, viewsets.Rea
     queryset = models.AsynchronousHarvestingSession.objects.all()
     serializer_class = serializers.BriefAsynchronousHarvestingSessionSerializer
     pagination_class = GeoNodeApiPagination
+
+    @action(detail=True, methods=["get"], url_path="events", url_name="events")
+    def events(self, request, pk=None):
+        """Return the log of the session, oldest events first.
+
+        Pass the ``cursor`` query param to page through the events with keyset pagination,
+        e.g. for following the log of a running session.
+        """
+        session = self.get_object()
+        queryset = session.events.order_by("id")
+        status = request.query_params.get("status")
+        if status:
+            queryset = queryset.filter(status=status)
+        page = self.paginate_queryset(queryset)
+        serializer = serializers.HarvestingEventSerializer(page, many=True)
+        return self.get_paginated_response({"events": serializer.data})
@@ -21,11 +21,16 @@ import abc
 import dataclasses
 import io
 import logging
+import threading
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
 from django.core.files import uploadedfile
+from django.db import connections
 
 from geonode.base import enumerations
 from geonode.base.models import ResourceBase
@@ -40,10 +45,58 @@ from .. import (
 logger = logging.getLogger(__name__)
 
 
+PAGINATION_OFFSET = "offset"
+PAGINATION_CURSOR = "cursor"
+
+
 class HarvestingException(Exception):
     pass
 
 
+class RemoteFetchLimiter:
+    """Cap the concurrent fetches towards a remote service and their rate.
+
+    Used as a context manager around every fetch: at most `max_concurrency` fetches are
+    in flight at once and, when `rate_limit` is set, at most `rate_limit` of them start every second.
+
+    """
+
+    def __init__(self, max_concurrency: int, rate_limit: typing.Optional[float] = None):
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._interval = 1.0 / rate_limit if rate_limit else 0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        if self._interval:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._interval
+            if delay > 0:
+                time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+
+
+_remote_limiters: typing.Dict[typing.Tuple, RemoteFetchLimiter] = {}
+_remote_limiters_lock = threading.Lock()
+
+
+def get_remote_limiter(remote_url: str) -> RemoteFetchLimiter:
+    """Return the limiter shared by all the workers of the process fetching from the same remote host."""
+    max_concurrency = int(config.get_setting("HARVESTING_FETCH_MAX_WORKERS") or 1)
+    rate_limit = float(config.get_setting("HARVESTING_FETCH_RATE_LIMIT") or 0)
+    key = (urlparse(remote_url).netloc, max_concurrency, rate_limit)
+    with _remote_limiters_lock:
+        if key not in _remote_limiters:
+            _remote_limiters[key] = RemoteFetchLimiter(max_concurrency, rate_limit)
+        return _remote_limiters[key]
+
+
 @dataclasses.dataclass()
 class BriefRemoteResource:
     unique_identifier: str
@@ -72,6 +125,14 @@ class BaseHarvesterWorker(abc.ABC):
     remote_url: str
     harvester_id: int
 
+    # workers using cursor pagination list the remote resources with `get_resource_pages()`
+    # instead of requesting concurrent pages by offset with `list_resources()`
+    pagination_mode: str = PAGINATION_OFFSET
+
+    # number of remote resources returned by `list_resources()` for every offset, `None` when
+    # all of them are returned at once for `offset=0`
+    page_size: typing.Optional[int] = 10
+
     def __init__(self, remote_url: str, harvester_id: int):
         self.remote_url = remote_url
         self.harvester_id = harvester_id
@@ -99,6 +160,26 @@ class BaseHarvesterWorker(abc.ABC):
 
         """
 
+    def get_resource_pages(self) -> typing.Iterator[typing.List[BriefRemoteResource]]:
+        """Yield the remote resources page by page, following the remote cursors.
+
+        Only used when `pagination_mode` is `PAGINATION_CURSOR`. If there is a problem
+        listing resources, this method shall raise `HarvestingException`.
+
+        The default implementation falls back to listing the resources by offset.
+
+        """
+        offset = 0
+        while True:
+            found_resources = self.list_resources(offset)
+            if not found_resources:
+                break
+            yield found_resources
+            if not self.page_size:
+                # all the resources are returned at once
+                break
+            offset += self.page_size
+
     @abc.abstractmethod
     def check_availability(self, timeout_seconds: typing.Optional[int] = 5) -> bool:
         """Check whether the remote service is online"""
@@ -125,6 +206,60 @@ class BaseHarvesterWorker(abc.ABC):
 
         """
 
+    def get_resources(
+        self,
+        harvestable_resources: typing.List["HarvestableResource"],  # noqa
+    ) -> typing.Dict[int, typing.Union[typing.Optional[HarvestedResourceInfo], Exception]]:
+        """Harvest several resources from the remote service.
+
+        Return a dict with the id of every harvestable resource as key and, as value, what
+        `get_resource()` would return for it, or the exception raised while fetching it.
+
+        The default implementation calls `get_resource()` concurrently. Workers may override it
+        in order to use the multi-record endpoints of the remote service.
+
+        """
+        return self.fetch_concurrently(self.get_resource, harvestable_resources)
+
+    def fetch_concurrently(
+        self,
+        fetch: typing.Callable,
+        items: typing.List,
+        key: typing.Callable = lambda item: item.pk,
+    ) -> typing.Dict[typing.Any, typing.Any]:
+        """Call `fetch` on every item with a pool of threads and return the results keyed by `key(item)`.
+
+        At most `HARVESTING_FETCH_MAX_WORKERS` fetches are in flight towards the remote host and,
+        when `HARVESTING_FETCH_RATE_LIMIT` is set, at most that many fetches start every second.
+        The exceptions raised by `fetch` are returned as the result of their item.
+
+        """
+
+        limiter = get_remote_limiter(self.remote_url)
+
+        def _fetch(item):
+            try:
+                with limiter:
+                    return fetch(item)
+            except Exception as exc:
+                logger.exception(f"Could not fetch {key(item)!r} from {self.remote_url!r}")
+                return exc
+
+        def _fetch_in_thread(item):
+            try:
+                return _fetch(item)
+            finally:
+                # every thread opens its own db connections
+                connections.close_all()
+
+        max_workers = min(int(config.get_setting("HARVESTING_FETCH_MAX_WORKERS") or 1), len(items))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_fetch_in_thread, items))
+        else:
+            results = [_fetch(item) for item in items]
+        return {key(item): result for item, result in zip(items, results)}
+
     @classmethod
     def get_extra_config_schema(cls) -> typing.Optional[typing.Dict]:
         """Return a jsonschema schema to be used to validate models.Harvester objects"""
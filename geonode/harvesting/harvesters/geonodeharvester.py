@@ -19,6 +19,7 @@
 
 """Harvesters GeoNode remote servers."""
 
+import collections
 import datetime as dt
 import enum
 import json
@@ -104,12 +105,16 @@ class GeonodeCurrentHarvester(base.BaseHarvesterWorker):
         end_date_filter: typing.Optional[str] = None,
         keywords_filter: typing.Optional[typing.List[str]] = None,
         categories_filter: typing.Optional[typing.List[str]] = None,
+        use_cursor_pagination: typing.Optional[bool] = False,
+        page_size: typing.Optional[int] = None,
         **kwargs,
     ):
         """A harvester for remote GeoNode instances."""
         super().__init__(*args, **kwargs)
         self.remote_url = self.remote_url.rstrip("/")
         self.http_session = requests.Session()
+        if page_size:
+            self.page_size = int(page_size)
         self.harvest_documents = bool(harvest_documents)
         self.harvest_datasets = bool(harvest_datasets)
         self.resource_title_filter = resource_title_filter
@@ -117,6 +122,9 @@ class GeonodeCurrentHarvester(base.BaseHarvesterWorker):
         self.end_date_filter = end_date_filter
         self.keywords_filter = keywords_filter
         self.categories_filter = categories_filter
+        self.use_cursor_pagination = bool(use_cursor_pagination)
+        if self.use_cursor_pagination:
+            self.pagination_mode = base.PAGINATION_CURSOR
 
     @property
     def base_api_url(self):
@@ -155,22 +163,52 @@ class GeonodeCurrentHarvester(base.BaseHarvesterWorker):
                 logger.exception("Could not decode response as a JSON object")
                 raise base.HarvestingException(str(exc))
             else:
-                for raw_resource in payload.get("resources", []):
-                    try:
-                        brief_resource = base.BriefRemoteResource(
-                            unique_identifier=raw_resource["pk"],
-                            title=raw_resource["title"],
-                            abstract=raw_resource["abstract"],
-                            resource_type=raw_resource["resource_type"],
-                        )
-                        result.append(brief_resource)
-                    except KeyError as exc:
-                        logger.exception(f"Could not decode resource: {raw_resource!r}")
-                        raise base.HarvestingException(str(exc))
+                result = self._get_brief_resources(payload)
         else:
             logger.error(f"Got back invalid response from {url!r}: {response.status_code}")
         return result
 
+    def get_resource_pages(self) -> typing.Iterator[typing.List[base.BriefRemoteResource]]:
+        """Walk the remote resources following the `next` links of the keyset pagination.
+
+        Remote instances not supporting the keyset pagination ignore the `cursor` param
+        and are walked page by page following the same links.
+
+        """
+        url = f"{self.base_api_url}/resources/"
+        params = self._get_resource_list_params()
+        params.pop("page")
+        params.update({"cursor": "", "total": "skip"})
+        while url:
+            response = self.http_session.get(url, params=params)
+            if response.status_code != requests.codes.ok:
+                raise base.HarvestingException(f"Got back invalid response from {url!r}: {response.status_code}")
+            try:
+                payload = response.json()
+            except json.JSONDecodeError as exc:
+                logger.exception("Could not decode response as a JSON object")
+                raise base.HarvestingException(str(exc))
+            yield self._get_brief_resources(payload)
+            # the next link already carries all the query params
+            url = payload.get("links", {}).get("next")
+            params = None
+
+    def _get_brief_resources(self, payload: typing.Dict) -> typing.List[base.BriefRemoteResource]:
+        result = []
+        for raw_resource in payload.get("resources", []):
+            try:
+                brief_resource = base.BriefRemoteResource(
+                    unique_identifier=raw_resource["pk"],
+                    title=raw_resource["title"],
+                    abstract=raw_resource["abstract"],
+                    resource_type=raw_resource["resource_type"],
+                )
+                result.append(brief_resource)
+            except KeyError as exc:
+                logger.exception(f"Could not decode resource: {raw_resource!r}")
+                raise base.HarvestingException(str(exc))
+        return result
+
     def check_availability(self, timeout_seconds: typing.Optional[int] = 5) -> bool:
         return _check_availability(self.http_session, f"{self.base_api_url}/datasets", "datasets", timeout_seconds)
 
@@ -209,6 +247,62 @@ class GeonodeCurrentHarvester(base.BaseHarvesterWorker):
             )
         return result
 
+    def get_resources(
+        self,
+        harvestable_resources: typing.List[models.HarvestableResource],
+    ) -> typing.Dict[int, typing.Union[typing.Optional[base.HarvestedResourceInfo], Exception]]:
+        """Harvest several resources with a request to the list endpoints of the remote GeoNode.
+
+        The resources which are not found in the list responses, e.g. because the remote
+        list serializers omit some fields, are fetched one by one.
+
+        """
+        result = {}
+        by_type = collections.defaultdict(list)
+        for harvestable_resource in harvestable_resources:
+            by_type[harvestable_resource.remote_resource_type].append(harvestable_resource)
+        for remote_resource_type, resources in by_type.items():
+            url_fragment = {
+                GeoNodeResourceTypeCurrent.DATASET.value: "/datasets/",
+                GeoNodeResourceTypeCurrent.DOCUMENT.value: "/documents/",
+            }[remote_resource_type]
+            with base.get_remote_limiter(self.remote_url):
+                response = self.http_session.get(
+                    f"{self.base_api_url}{url_fragment}",
+                    params={
+                        "filter{pk.in}": [resource.unique_identifier for resource in resources],
+                        "page_size": len(resources),
+                    },
+                )
+            records = {}
+            if response.status_code == requests.codes.ok:
+                try:
+                    payload = response.json()
+                except json.JSONDecodeError:
+                    logger.exception("Could not decode response payload as valid JSON")
+                else:
+                    records = {str(record.get("pk")): record for record in payload.get(f"{remote_resource_type}s", [])}
+            else:
+                logger.warning(f"Got invalid response from {response.request.url}: {response.status_code}")
+            for resource in resources:
+                record = records.get(str(resource.unique_identifier))
+                if record is None:
+                    continue
+                try:
+                    resource_descriptor = self._get_resource_descriptor(
+                        {remote_resource_type: record}, remote_resource_type
+                    )
+                except Exception:
+                    logger.debug(f"Incomplete record for {resource.unique_identifier!r}, fetching it again")
+                else:
+                    result[resource.pk] = base.HarvestedResourceInfo(
+                        resource_descriptor=resource_descriptor, additional_information=None
+                    )
+        missing = [resource for resource in harvestable_resources if resource.pk not in result]
+        if missing:
+            result.update(self.fetch_concurrently(self.get_resource, missing))
+        return result
+
     def get_geonode_resource_defaults(
         self,
         harvested_info: base.HarvestedResourceInfo,
@@ -455,12 +549,16 @@ class GeonodeLegacyHarvester(base.BaseHarvesterWorker):
         end_date_filter: typing.Optional[str] = None,
         keywords_filter: typing.Optional[list] = None,
         categories_filter: typing.Optional[list] = None,
+        use_cursor_pagination: typing.Optional[bool] = False,
+        page_size: typing.Optional[int] = None,
         **kwargs,
     ):
         """A harvester for remote GeoNode instances."""
         super().__init__(*args, **kwargs)
         self.remote_url = self.remote_url.rstrip("/")
         self.http_session = requests.Session()
+        if page_size:
+            self.page_size = int(page_size)
         self.harvest_documents = harvest_documents if harvest_documents is not None else True
         self.harvest_datasets = harvest_datasets if harvest_datasets is not None else True
         self.resource_title_filter = resource_title_filter
@@ -540,24 +638,46 @@ class GeonodeLegacyHarvester(base.BaseHarvesterWorker):
         self,
         harvestable_resource: models.HarvestableResource,
     ) -> typing.Optional[base.HarvestedResourceInfo]:
-        resource_unique_identifier = harvestable_resource.unique_identifier
-        local_resource_type = self.get_geonode_resource_type(harvestable_resource.remote_resource_type)
-        endpoint_suffix = {
-            Document: (f"/documents/{resource_unique_identifier}/"),
-            Dataset: f"/layers/{resource_unique_identifier}/",
-            Map: f"/maps/{resource_unique_identifier}/",
-        }[local_resource_type]
-        url = f"{self.base_api_url}{endpoint_suffix}"
-        response = self.http_session.get(url)
+        api_record = self._get_api_record(harvestable_resource)
         result = None
-        if response.status_code == requests.codes.ok:
-            api_record = response.json()
+        if api_record is not None:
             resource_descriptor = self._get_resource_details(api_record, harvestable_resource)
             result = base.HarvestedResourceInfo(resource_descriptor=resource_descriptor, additional_information=None)
-        else:
-            logger.error(
-                f"Could not retrieve remote resource with unique " f"identifier {resource_unique_identifier!r}"
+        return result
+
+    def get_resources(
+        self,
+        harvestable_resources: typing.List[models.HarvestableResource],
+    ) -> typing.Dict[int, typing.Union[typing.Optional[base.HarvestedResourceInfo], Exception]]:
+        """Harvest several resources, with a single CSW GetRecordById request for all of them.
+
+        The API records are fetched concurrently, the CSW records the remote catalogue does not return
+        in the batch response are requested one by one.
+
+        """
+        resources_by_pk = {resource.pk: resource for resource in harvestable_resources}
+        result = {}
+
+        api_records = {}
+        for pk, api_record in self.fetch_concurrently(self._get_api_record, harvestable_resources).items():
+            if api_record is None or isinstance(api_record, Exception):
+                result[pk] = api_record
+            else:
+                api_records[pk] = api_record
+
+        uuids = [api_record["uuid"] for api_record in api_records.values() if api_record.get("uuid")]
+        with base.get_remote_limiter(self.remote_url):
+            csw_records = self._get_csw_records(uuids) if uuids else {}
+
+        def _get_resource_info(pk):
+            api_record = api_records[pk]
+            resource_descriptor = self._get_resource_details(
+                api_record, resources_by_pk[pk], csw_record=csw_records.get(api_record.get("uuid"))
             )
+            return base.HarvestedResourceInfo(resource_descriptor=resource_descriptor, additional_information=None)
+
+        # the distribution info may need further requests, e.g. for the thumbnails of the documents
+        result.update(self.fetch_concurrently(_get_resource_info, list(api_records), key=lambda pk: pk))
         return result
 
     def get_geonode_resource_defaults(
@@ -652,39 +772,72 @@ class GeonodeLegacyHarvester(base.BaseHarvesterWorker):
         return raw_remote_resource["id"]
 
     def _get_resource_details(
-        self, api_record: typing.Dict, harvestable_resource: models.HarvestableResource
+        self,
+        api_record: typing.Dict,
+        harvestable_resource: models.HarvestableResource,
+        csw_record: typing.Optional[etree.Element] = None,
     ) -> typing.Optional[resourcedescriptor.RecordDescription]:
         """
         Produce a record description from the response provided by the remote GeoNode.
         """
         result = None
-        # query CSW endpoint and parse its response in order to get more information
-        # about the resource
+        if csw_record is None:
+            # query CSW endpoint and parse its response in order to get more information
+            # about the resource
+            csw_record = self._get_csw_records([api_record["uuid"]]).get(api_record["uuid"])
+        if csw_record is not None:
+            try:
+                result = self._get_resource_descriptor(csw_record, api_record, harvestable_resource)
+            except TypeError:
+                logger.exception("Could not retrieve metadata details to generate resource descriptor, skipping...")
+            else:
+                logger.debug(f"Found details for resource {result.uuid!r} - {result.identification.title!r}")
+        return result
+
+    def _get_api_record(self, harvestable_resource: models.HarvestableResource) -> typing.Optional[typing.Dict]:
+        resource_unique_identifier = harvestable_resource.unique_identifier
+        local_resource_type = self.get_geonode_resource_type(harvestable_resource.remote_resource_type)
+        endpoint_suffix = {
+            Document: (f"/documents/{resource_unique_identifier}/"),
+            Dataset: f"/layers/{resource_unique_identifier}/",
+            Map: f"/maps/{resource_unique_identifier}/",
+        }[local_resource_type]
+        url = f"{self.base_api_url}{endpoint_suffix}"
+        response = self.http_session.get(url)
+        result = None
+        if response.status_code == requests.codes.ok:
+            result = response.json()
+        else:
+            logger.error(
+                f"Could not retrieve remote resource with unique " f"identifier {resource_unique_identifier!r}"
+            )
+        return result
+
+    def _get_csw_records(self, uuids: typing.List[str]) -> typing.Dict[str, etree.Element]:
+        """Return the `gmd:MD_Metadata` elements of the input uuids, with a single GetRecordById request."""
+        result = {}
         get_record_by_id_response = self.http_session.get(
             f"{self.remote_url}/catalogue/csw",
             params={
                 "service": "CSW",
                 "version": "2.0.2",
                 "request": "GetRecordById",
-                "id": api_record["uuid"],
+                "id": ",".join(uuids),
                 "elementsetname": "full",
                 "outputschema": "http://www.isotc211.org/2005/gmd",
             },
         )
         if get_record_by_id_response.status_code == requests.codes.ok:
             xml_root = etree.fromstring(get_record_by_id_response.content, parser=XML_PARSER)
-            try:
-                metadata_element = xml_root.xpath("./gmd:MD_Metadata", namespaces=xml_root.nsmap)[0]
-            except IndexError:
+            metadata_elements = xml_root.xpath("./gmd:MD_Metadata", namespaces=xml_root.nsmap)
+            if not metadata_elements:
                 logger.warning("Unable to retrieve a metadata element from the CSW GetRecordById response, skipping...")
                 logger.debug(f"Original response content: {get_record_by_id_response.content}")
+            elif len(uuids) == 1:
+                result[uuids[0]] = metadata_elements[0]
             else:
-                try:
-                    result = self._get_resource_descriptor(metadata_element, api_record, harvestable_resource)
-                except TypeError:
-                    logger.exception("Could not retrieve metadata details to generate resource descriptor, skipping...")
-                else:
-                    logger.debug(f"Found details for resource {result.uuid!r} - {result.identification.title!r}")
+                for metadata_element in metadata_elements:
+                    result[get_xpath_value(metadata_element, "gmd:fileIdentifier")] = metadata_element
         else:
             logger.warning(f"Got invalid response from {get_record_by_id_response.request.url}")
         return result
@@ -948,10 +1101,13 @@ class GeonodeUnifiedHarvesterWorker(base.BaseHarvesterWorker):
         end_date_filter: typing.Optional[str] = None,
         keywords_filter: typing.Optional[typing.List[str]] = None,
         categories_filter: typing.Optional[typing.List[str]] = None,
+        use_cursor_pagination: typing.Optional[bool] = False,
+        page_size: typing.Optional[int] = None,
         **kwargs,
     ):
         """A harvester for remote GeoNode instances."""
         self._concrete_harvester_worker = None
+        self._page_size = page_size
         super().__init__(*args, **kwargs)
         self.remote_url = self.remote_url.rstrip("/")
         self.http_session = requests.Session()
@@ -962,6 +1118,7 @@ class GeonodeUnifiedHarvesterWorker(base.BaseHarvesterWorker):
         self.end_date_filter = end_date_filter
         self.keywords_filter = keywords_filter
         self.categories_filter = categories_filter
+        self.use_cursor_pagination = bool(use_cursor_pagination)
 
     @property
     def concrete_worker(self) -> typing.Union[GeonodeCurrentHarvester, GeonodeLegacyHarvester]:
@@ -983,6 +1140,17 @@ class GeonodeUnifiedHarvesterWorker(base.BaseHarvesterWorker):
     def list_resources(self, offset: typing.Optional[int] = 0) -> typing.List[base.BriefRemoteResource]:
         return self.concrete_worker.list_resources(offset)
 
+    @property
+    def pagination_mode(self) -> str:
+        return self.concrete_worker.pagination_mode
+
+    @property
+    def page_size(self) -> typing.Optional[int]:
+        return self.concrete_worker.page_size
+
+    def get_resource_pages(self) -> typing.Iterator[typing.List[base.BriefRemoteResource]]:
+        return self.concrete_worker.get_resource_pages()
+
     def check_availability(self, timeout_seconds: typing.Optional[int] = 5) -> bool:
         return self.concrete_worker.check_availability(timeout_seconds)
 
@@ -995,6 +1163,12 @@ class GeonodeUnifiedHarvesterWorker(base.BaseHarvesterWorker):
     ) -> typing.Optional[base.HarvestedResourceInfo]:
         return self.concrete_worker.get_resource(harvestable_resource)
 
+    def get_resources(
+        self,
+        harvestable_resources: typing.List[models.HarvestableResource],
+    ) -> typing.Dict[int, typing.Union[typing.Optional[base.HarvestedResourceInfo], Exception]]:
+        return self.concrete_worker.get_resources(harvestable_resources)
+
     def get_geonode_resource_defaults(
         self,
         harvested_info: base.HarvestedResourceInfo,
@@ -1014,6 +1188,8 @@ class GeonodeUnifiedHarvesterWorker(base.BaseHarvesterWorker):
             "end_date_filter": self.end_date_filter,
             "keywords_filter": self.keywords_filter,
             "categories_filter": self.categories_filter,
+            "use_cursor_pagination": self.use_cursor_pagination,
+            "page_size": self._page_size,
         }
         current = GeonodeCurrentHarvester(**kwargs)
         return current if current.check_availability() else GeonodeLegacyHarvester(**kwargs)
@@ -1163,6 +1339,8 @@ def _get_extra_config_schema() -> typing.Dict:
             "end_date_filter": {"type": "string", "format": "date-time"},
             "keywords_filter": {"type": "array", "items": {"type": "string"}},
             "categories_filter": {"type": "array", "items": {"type": "string"}},
+            "use_cursor_pagination": {"type": "boolean", "default": False},
+            "page_size": {"type": "integer", "minimum": 1},
         },
         "additionalProperties": False,
     }
@@ -1180,6 +1358,8 @@ def _from_django_record(target_class: typing.Type, record: models.Harvester):
         end_date_filter=record.harvester_type_specific_configuration.get("end_date_filter"),
         keywords_filter=record.harvester_type_specific_configuration.get("keywords_filter"),
         categories_filter=record.harvester_type_specific_configuration.get("categories_filter"),
+        use_cursor_pagination=record.harvester_type_specific_configuration.get("use_cursor_pagination", False),
+        page_size=record.harvester_type_specific_configuration.get("page_size"),
     )
 
 
@@ -121,6 +121,8 @@ class OgcWmsHarvester(base.BaseHarvesterWorker):
     """Harvester for resources coming from OGC WMS web services"""
 
     dataset_title_filter: typing.Optional[str]
+    # GetCapabilities lists all the layers at once
+    page_size = None
     _base_wms_parameters: typing.Dict = {
         "service": "WMS",
         "version": "1.3.0",
@@ -293,13 +295,38 @@ class OgcWmsHarvester(base.BaseHarvesterWorker):
         self,
         harvestable_resource: models.HarvestableResource,
     ) -> typing.Optional[base.HarvestedResourceInfo]:
-        resource_unique_identifier = harvestable_resource.unique_identifier
         data = self._get_data()
+        layers = {layer["name"]: layer for layer in reversed(data["layers"])}
+        return self._get_resource_info(harvestable_resource, layers, data["contact"])
+
+    def get_resources(
+        self,
+        harvestable_resources: typing.List[models.HarvestableResource],
+    ) -> typing.Dict[int, typing.Union[typing.Optional[base.HarvestedResourceInfo], Exception]]:
+        """Harvest several layers with a single GetCapabilities request."""
+        with base.get_remote_limiter(self.remote_url):
+            data = self._get_data()
+        layers = {layer["name"]: layer for layer in reversed(data["layers"])}
+        result = {}
+        for harvestable_resource in harvestable_resources:
+            try:
+                result[harvestable_resource.pk] = self._get_resource_info(harvestable_resource, layers, data["contact"])
+            except Exception as exc:
+                logger.exception(f"Could not harvest resource {harvestable_resource.unique_identifier!r}")
+                result[harvestable_resource.pk] = exc
+        return result
+
+    def _get_resource_info(
+        self,
+        harvestable_resource: models.HarvestableResource,
+        layers: typing.Dict[str, typing.Dict],
+        contact_data: typing.Dict,
+    ) -> typing.Optional[base.HarvestedResourceInfo]:
+        resource_unique_identifier = harvestable_resource.unique_identifier
         result = None
-        try:
-            relevant_layer = [layer for layer in data["layers"] if layer["name"] == resource_unique_identifier][0]
-        except IndexError:
-            logger.exception(f"Could not find resource {resource_unique_identifier!r}")
+        relevant_layer = layers.get(resource_unique_identifier)
+        if relevant_layer is None:
+            logger.error(f"Could not find resource {resource_unique_identifier!r}")
         else:
             # WMS does not provide uuid, so needs to generated on the first time
             # for update, use uuid from geonode resource
@@ -310,7 +337,7 @@ class OgcWmsHarvester(base.BaseHarvesterWorker):
             # Use current time for the date stamp and resource time.
             time = datetime.now()
             service_name = slugify(self.remote_url)[:255]
-            contact = resourcedescriptor.RecordDescriptionContact(**data["contact"])
+            contact = resourcedescriptor.RecordDescriptionContact(**contact_data)
             result = base.HarvestedResourceInfo(
                 resource_descriptor=resourcedescriptor.RecordDescription(
                     uuid=resource_uuid,
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("harvesting", "0050_alter_harvester_harvester_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asynchronousharvestingsession",
+            name="records_failed",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Number of records that could not be processed"
+            ),
+        ),
+        migrations.AddField(
+            model_name="asynchronousharvestingsession",
+            name="records_skipped",
+            field=models.IntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of records that have been skipped, e.g. after an abort",
+            ),
+        ),
+        migrations.CreateModel(
+            name="HarvestingEvent",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("execution_id", models.UUIDField(blank=True, editable=False, null=True)),
+                ("harvestable_resource_id", models.IntegerField(blank=True, editable=False, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("info", "info"),
+                            ("success", "success"),
+                            ("failed", "failed"),
+                            ("skipped", "skipped"),
+                        ],
+                        default="info",
+                        editable=False,
+                        max_length=20,
+                    ),
+                ),
+                ("message", models.TextField(blank=True, editable=False)),
+                ("error", models.TextField(blank=True, editable=False)),
+                ("created", models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="harvesting.asynchronousharvestingsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("id",),
+                "indexes": [
+                    models.Index(fields=["session", "id"], name="harvesting_event_session_idx"),
+                    models.Index(fields=["execution_id", "status"], name="harvesting_event_exec_idx"),
+                ],
+            },
+        ),
+    ]
@@ -331,6 +331,12 @@ class AsynchronousHarvestingSession(models.Model):
         default=0, editable=False, help_text=_("Number of records being processed in this session")
     )
     records_done = models.IntegerField(default=0, help_text=_("Number of records that have already been processed"))
+    records_failed = models.IntegerField(
+        default=0, editable=False, help_text=_("Number of records that could not be processed")
+    )
+    records_skipped = models.IntegerField(
+        default=0, editable=False, help_text=_("Number of records that have been skipped, e.g. after an abort")
+    )
 
     @admin.display(description="Progress (%)")
     def get_progress_percentage(self) -> int:
@@ -390,6 +396,44 @@ class AsynchronousHarvestingSession(models.Model):
         self.save()
 
 
+class HarvestingEvent(models.Model):
+    """An entry of the log of an asynchronous session.
+
+    Events are only ever inserted, so that the workers processing the records of a session
+    in parallel do not contend on the session (or execution request) row.
+
+    """
+
+    STATUS_INFO = "info"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+    STATUS_SKIPPED = "skipped"
+    STATUS_CHOICES = [
+        (STATUS_INFO, _("info")),
+        (STATUS_SUCCESS, _("success")),
+        (STATUS_FAILED, _("failed")),
+        (STATUS_SKIPPED, _("skipped")),
+    ]
+
+    session = models.ForeignKey(AsynchronousHarvestingSession, on_delete=models.CASCADE, related_name="events")
+    execution_id = models.UUIDField(null=True, blank=True, editable=False)
+    harvestable_resource_id = models.IntegerField(null=True, blank=True, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_INFO, editable=False)
+    message = models.TextField(blank=True, editable=False)
+    error = models.TextField(blank=True, editable=False)
+    created = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(fields=("session", "id"), name="harvesting_event_session_idx"),
+            models.Index(fields=("execution_id", "status"), name="harvesting_event_exec_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.created.isoformat()}] {self.message}"
+
+
 class HarvestableResource(models.Model):
     STATUS_READY = "ready"
     STATUS_UPDATING_HARVESTABLE_RESOURCE = "updating-harvestable-resource"
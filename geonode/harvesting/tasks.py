@@ -31,7 +31,7 @@ from django.db.models import (
 from django.db.models.functions import Concat
 from django.utils import timezone
 from django.conf import settings
-from django.db import transaction, IntegrityError
+from django.db import transaction
 
 from geonode.resource.models import ExecutionRequest
 from geonode.resource.enumerator import ExecutionRequestAction
@@ -262,10 +262,9 @@ def harvest_resources(
 
     if len(harvestable_resource_ids) <= harvestable_resources_limit:
         # No chunking, just one chord for all resources
-        resource_tasks = [
-            _harvest_resource.signature((rid, harvesting_session_id, execution_id)).set(expires=task_dynamic_expiration)
-            for rid in harvestable_resource_ids
-        ]
+        resource_tasks = get_harvesting_signatures(
+            harvestable_resource_ids, harvesting_session_id, execution_id, task_dynamic_expiration
+        )
         finalizer = (
             _finish_harvesting.signature((harvesting_session_id, execution_id), immutable=True)
             .on_error(_handle_harvesting_error.signature(kwargs={"harvesting_session_id": harvesting_session_id}))
@@ -318,122 +317,182 @@ def _harvest_resource(self, harvestable_resource_id: int, harvesting_session_id:
     try:
         session = models.AsynchronousHarvestingSession.objects.get(pk=harvesting_session_id)
         harvestable_resource = models.HarvestableResource.objects.get(pk=harvestable_resource_id)
-        now_ = timezone.now()
-        timestamp = now_.isoformat()
-
-        # Retrieve the execution id of this session
-        exec_req = ExecutionRequest.objects.get(exec_id=execution_id)
-        output = exec_req.output_params or {}
 
         if session.status == session.STATUS_ABORTING:
-            message = (
-                f"Skipping harvesting of resource {harvestable_resource_id} since the " f"session has been aborted"
-            )
-            update_asynchronous_session(harvesting_session_id, additional_details=message)
-            logger.debug(message)
-
-            log_message = f"[{timestamp}] Skipped harvesting resource {harvestable_resource_id} due to aborted session {harvesting_session_id}."
-            exec_req.log = (exec_req.log or "") + log_message + "\n"
-            exec_req.last_updated = now_
-            exec_req.save(update_fields=["last_updated", "log"])
-
+            _skip_harvestable_resource(harvestable_resource_id, harvesting_session_id, execution_id)
             return
 
         worker: base.BaseHarvesterWorker = harvestable_resource.harvester.get_harvester_worker()
         harvested_resource_info = worker.get_resource(harvestable_resource)
+        return _update_harvested_resource(
+            worker, harvestable_resource, harvested_resource_info, harvesting_session_id, execution_id
+        )
 
-        if harvested_resource_info is not None:
+    except Exception as exc:
+        return _record_harvesting_error(harvestable_resource_id, harvesting_session_id, execution_id, exc)
 
-            try:
-                worker.update_geonode_resource(
-                    harvested_resource_info,
-                    harvestable_resource,
-                )
-                result = True
-                details = "Harvest succeeded"
-            except (RuntimeError, ValidationError) as exc:
-                logger.error(msg="Unable to update geonode resource")
-                result = False
-                details = str(exc)
-        else:
-            result = False
-            details = "Harvesting failed (no resource info returned)"
 
-        harvesting_message = f"{harvestable_resource.title}({harvestable_resource_id}) - {details}"
-        update_asynchronous_session(
-            harvesting_session_id,
-            additional_processed_records=1 if result else 0,
-            additional_details=harvesting_message,
+@app.task(
+    bind=True,
+    queue="harvesting",
+    time_limit=600,
+    acks_late=False,
+    ignore_result=False,
+)
+def _harvest_resources_batch(
+    self, harvestable_resource_ids: typing.List[int], harvesting_session_id: int, execution_id: str
+):
+    """
+    Harvest a batch of resources of the same harvester
+
+    The remote resources are fetched concurrently by the harvester worker with `get_resources()`,
+    then the GeoNode resources are updated one by one.
+
+    NOTE:
+    The expiration time (`expires`) and the `time_limit` of this task are set dynamically
+    when the task is created, depending on the size of the batch.
+    """
+    try:
+        session = models.AsynchronousHarvestingSession.objects.get(pk=harvesting_session_id)
+        harvestable_resources = list(
+            models.HarvestableResource.objects.filter(pk__in=harvestable_resource_ids)
+            .select_related("harvester", "geonode_resource")
+            .order_by("pk")
         )
-        harvestable_resource.last_harvesting_message = f"{now_} - {harvesting_message}"
-        harvestable_resource.last_harvesting_succeeded = result
-        harvestable_resource.last_harvested = now_
-        harvestable_resource.save()
-
-        # Update execution request
-        if not result:
-            with transaction.atomic():
-                # Lock the row to prevent concurrent overwrites
-                exec_req = ExecutionRequest.objects.select_for_update().get(exec_id=execution_id)
-                output = exec_req.output_params or {}
-                failures = output.get("failures", [])
-                failures.append(
-                    {
-                        "resource_id": harvestable_resource_id,
-                        "status": "failed",
-                        "details": harvesting_message,
-                        "timestamp": timestamp,
-                    }
-                )
-                output["failures"] = failures
-                exec_req.output_params = output
-                exec_req.log = (exec_req.log or "") + f"[{timestamp}] {harvesting_message}\n"
-                exec_req.last_updated = now_
-                exec_req.save(update_fields=["output_params", "last_updated", "log"])
-
-        return {
-            "resource_id": harvestable_resource_id,
-            "status": "success" if result else "failed",
-            "details": harvesting_message,
-        }
+    except Exception as exc:
+        return [
+            _record_harvesting_error(harvestable_resource_id, harvesting_session_id, execution_id, exc)
+            for harvestable_resource_id in harvestable_resource_ids
+        ]
+
+    if session.status == session.STATUS_ABORTING:
+        for harvestable_resource_id in harvestable_resource_ids:
+            _skip_harvestable_resource(harvestable_resource_id, harvesting_session_id, execution_id)
+        return []
+
+    results = []
+    found_ids = {harvestable_resource.pk for harvestable_resource in harvestable_resources}
+    for harvestable_resource_id in harvestable_resource_ids:
+        if harvestable_resource_id not in found_ids:
+            exc = models.HarvestableResource.DoesNotExist(
+                f"HarvestableResource {harvestable_resource_id} does not exist"
+            )
+            results.append(_record_harvesting_error(harvestable_resource_id, harvesting_session_id, execution_id, exc))
+    if not harvestable_resources:
+        return results
 
+    try:
+        worker: base.BaseHarvesterWorker = harvestable_resources[0].harvester.get_harvester_worker()
+        harvested_resources_info = worker.get_resources(harvestable_resources)
     except Exception as exc:
-        logger.error(f"Unexpected error harvesting resource {harvestable_resource_id}", exc_info=True)
+        logger.exception(f"Could not fetch the remote resources {harvestable_resource_ids}")
+        harvested_resources_info = {harvestable_resource.pk: exc for harvestable_resource in harvestable_resources}
 
-        now_ = timezone.now()
-        timestamp = now_.isoformat()
-        error_msg = str(exc)[:1000]  # truncate long errors
-        details_msg = f"Unexpected error while harvesting resource {harvestable_resource_id}"
+    for harvestable_resource in harvestable_resources:
+        harvested_resource_info = harvested_resources_info.get(harvestable_resource.pk)
+        try:
+            if isinstance(harvested_resource_info, Exception):
+                raise harvested_resource_info
+            result = _update_harvested_resource(
+                worker, harvestable_resource, harvested_resource_info, harvesting_session_id, execution_id
+            )
+        except Exception as exc:
+            result = _record_harvesting_error(harvestable_resource.pk, harvesting_session_id, execution_id, exc)
+        results.append(result)
+    return results
+
+
+def _update_harvested_resource(
+    worker: base.BaseHarvesterWorker,
+    harvestable_resource: models.HarvestableResource,
+    harvested_resource_info: typing.Optional[base.HarvestedResourceInfo],
+    harvesting_session_id: int,
+    execution_id: str,
+) -> typing.Dict:
+    """Update the GeoNode resource with the info fetched from the remote service and record the outcome."""
+    now_ = timezone.now()
+    harvestable_resource_id = harvestable_resource.pk
+    if harvested_resource_info is not None:
 
         try:
-            with transaction.atomic():
-                exec_req = ExecutionRequest.objects.select_for_update().get(exec_id=execution_id)
-                output = exec_req.output_params or {}
-                failures = output.get("failures", [])
-                failures.append(
-                    {
-                        "resource_id": harvestable_resource_id,
-                        "status": "failed",
-                        "details": details_msg,
-                        "error": error_msg,
-                        "timestamp": timestamp,
-                    }
-                )
-                output["failures"] = failures
-                exec_req.output_params = output
-                exec_req.log = (exec_req.log or "") + f"[{timestamp}] {details_msg}: {error_msg}\n"
-                exec_req.last_updated = now_
-                exec_req.save(update_fields=["output_params", "last_updated", "log"])
-
-        except Exception:
-            logger.exception("Failed to update execution request during final error handling")
-
-        return {
-            "resource_id": harvestable_resource_id,
-            "status": "failed",
-            "details": details_msg,
-            "error": error_msg,
-        }
+            worker.update_geonode_resource(
+                harvested_resource_info,
+                harvestable_resource,
+            )
+            result = True
+            details = "Harvest succeeded"
+        except (RuntimeError, ValidationError) as exc:
+            logger.error(msg="Unable to update geonode resource")
+            result = False
+            details = str(exc)
+    else:
+        result = False
+        details = "Harvesting failed (no resource info returned)"
+
+    harvesting_message = f"{harvestable_resource.title}({harvestable_resource_id}) - {details}"
+    # the failures are only appended to the session events, the execution request is
+    # updated once by `_finish_harvesting`
+    update_asynchronous_session(
+        harvesting_session_id,
+        additional_processed_records=1 if result else 0,
+        additional_failed_records=0 if result else 1,
+        additional_details=harvesting_message,
+        details_status=models.HarvestingEvent.STATUS_SUCCESS if result else models.HarvestingEvent.STATUS_FAILED,
+        harvestable_resource_id=harvestable_resource_id,
+        execution_id=execution_id,
+    )
+    harvestable_resource.last_harvesting_message = f"{now_} - {harvesting_message}"
+    harvestable_resource.last_harvesting_succeeded = result
+    harvestable_resource.last_harvested = now_
+    harvestable_resource.save()
+
+    return {
+        "resource_id": harvestable_resource_id,
+        "status": "success" if result else "failed",
+        "details": harvesting_message,
+    }
+
+
+def _skip_harvestable_resource(harvestable_resource_id: int, harvesting_session_id: int, execution_id: str):
+    message = f"Skipping harvesting of resource {harvestable_resource_id} since the " f"session has been aborted"
+    update_asynchronous_session(
+        harvesting_session_id,
+        additional_skipped_records=1,
+        additional_details=message,
+        details_status=models.HarvestingEvent.STATUS_SKIPPED,
+        harvestable_resource_id=harvestable_resource_id,
+        execution_id=execution_id,
+    )
+    logger.debug(message)
+
+
+def _record_harvesting_error(
+    harvestable_resource_id: int, harvesting_session_id: int, execution_id: str, exc: Exception
+) -> typing.Dict:
+    logger.error(f"Unexpected error harvesting resource {harvestable_resource_id}", exc_info=exc)
+
+    error_msg = str(exc)[:1000]  # truncate long errors
+    details_msg = f"Unexpected error while harvesting resource {harvestable_resource_id}"
+
+    try:
+        update_asynchronous_session(
+            harvesting_session_id,
+            additional_failed_records=1,
+            additional_details=details_msg,
+            details_status=models.HarvestingEvent.STATUS_FAILED,
+            harvestable_resource_id=harvestable_resource_id,
+            execution_id=execution_id,
+            error=error_msg,
+        )
+    except Exception:
+        logger.exception("Failed to update harvesting session during final error handling")
+
+    return {
+        "resource_id": harvestable_resource_id,
+        "status": "failed",
+        "details": details_msg,
+        "error": error_msg,
+    }
 
 
 @app.task(
@@ -463,8 +522,7 @@ def _finish_harvesting(self, harvesting_session_id: int, execution_id: str, forc
         # Get the execution request and failures
         exec_req = ExecutionRequest.objects.get(exec_id=execution_id)
         output = exec_req.output_params or {}
-        failures = output.get("failures", [])
-        # we exclude the faiures with status: skipped
+        failures = get_execution_failures(execution_id)
         failed_tasks_count = len(failures)
 
         if force_failure:
@@ -485,9 +543,11 @@ def _finish_harvesting(self, harvesting_session_id: int, execution_id: str, forc
 
         # Update execution request status and log
         exec_req.status = ExecutionRequest.STATUS_FINISHED
-        log_entry = f"[{timestamp}] {message}"
+        log_entry = "".join(f"[{failure['timestamp']}] {failure['details']}\n" for failure in failures)
+        log_entry += f"[{timestamp}] {message}"
         exec_req.log = (exec_req.log or "") + log_entry + "\n"
         exec_req.last_updated = now_
+        output["failures"] = failures
         exec_req.output_params = output
         exec_req.save(update_fields=["status", "log", "last_updated", "output_params"])
 
@@ -547,10 +607,7 @@ def queue_next_chunk_batch(
     chords_in_batch = []
 
     for chunk in current_chunk_group:
-        resource_tasks = [
-            _harvest_resource.s(rid, harvesting_session_id, execution_id).set(expires=dynamic_expiration)
-            for rid in chunk
-        ]
+        resource_tasks = get_harvesting_signatures(chunk, harvesting_session_id, execution_id, dynamic_expiration)
 
         chunk_finalizer = _finish_harvesting_chunk.s(harvesting_session_id).set(expires=dynamic_expiration)
         chords_in_batch.append(chord(resource_tasks, body=chunk_finalizer))
@@ -689,15 +746,31 @@ def update_harvestable_resources(self, refresh_session_id: int):
         harvester.save()
         session.total_records_to_process = num_resources
         session.save()
-        page_size = 10
-        total_pages = math.ceil(num_resources / page_size)
-        batches = []
-        for page in range(total_pages):
-            batches.append(
-                _update_harvestable_resources_batch.signature(
-                    args=(refresh_session_id, page, page_size),
-                ).set(expires=task_expiration_time)
-            )
+        if worker.pagination_mode == base.PAGINATION_CURSOR:
+            # the worker walks the remote resources with a cursor, so they must be listed sequentially
+            batches = [
+                _update_harvestable_resources_sequential.signature(
+                    args=(refresh_session_id,),
+                ).set(expires=task_expiration_time, time_limit=task_expiration_time)
+            ]
+        else:
+            # workers listing all their resources at once (page_size is None) need a single page
+            page_size = worker.page_size or max(num_resources, 1)
+            total_pages = math.ceil(num_resources / page_size)
+            # a handful of tasks, each one walking a range of pages
+            max_tasks = max(1, getattr(settings, "HARVESTING_DISCOVERY_MAX_TASKS", 8))
+            pages_per_task = max(1, math.ceil(total_pages / max_tasks))
+            batches = []
+            for page in range(0, total_pages, pages_per_task):
+                num_pages = min(pages_per_task, total_pages - page)
+                options = {"expires": task_expiration_time}
+                if num_pages > 1:
+                    options["time_limit"] = task_expiration_time
+                batches.append(
+                    _update_harvestable_resources_batch.signature(
+                        args=(refresh_session_id, page, page_size, num_pages),
+                    ).set(**options)
+                )
         update_finalizer = (
             _finish_harvestable_resources_update.signature(args=(refresh_session_id,), immutable=True)
             .on_error(
@@ -728,52 +801,87 @@ def update_harvestable_resources(self, refresh_session_id: int):
     acks_late=False,
     ignore_result=False,
 )
-def _update_harvestable_resources_batch(self, refresh_session_id: int, page: int, page_size: int):
+def _update_harvestable_resources_batch(
+    self, refresh_session_id: int, page: int, page_size: int, num_pages: typing.Optional[int] = 1
+):
+    """Update the harvestable resources listed in `num_pages` consecutive pages, starting from `page`"""
     session = models.AsynchronousHarvestingSession.objects.get(pk=refresh_session_id)
-    if session.status == session.STATUS_ON_GOING:
-        harvester = session.harvester
-        worker = harvester.get_harvester_worker()
-        offset = page * page_size
+    if session.status != session.STATUS_ON_GOING:
+        logger.info("The refresh session has been asked to abort, so skipping...")
+        return
+    harvester = session.harvester
+    worker = harvester.get_harvester_worker()
+    for current_page in range(page, page + num_pages):
+        if current_page != page:
+            session.refresh_from_db()
+            if session.status != session.STATUS_ON_GOING:
+                logger.info("The refresh session has been asked to abort, so skipping...")
+                break
+        offset = current_page * page_size
         try:
             found_resources = worker.list_resources(offset)
         except base.HarvestingException:
             logger.exception("Could not retrieve list of remote resources.")
-        else:
-            processed = 0
-            for remote_resource in found_resources:
-                try:
-                    resource, created = models.HarvestableResource.objects.get_or_create(
-                        harvester=harvester,
-                        unique_identifier=remote_resource.unique_identifier,
-                        defaults={
-                            "title": remote_resource.title,
-                            "should_be_harvested": harvester.harvest_new_resources_by_default,
-                            "remote_resource_type": remote_resource.resource_type,
-                            "last_refreshed": timezone.now(),
-                        },
-                    )
-                except IntegrityError:
-                    # RACE CONDITION: Another worker created this between our SELECT and INSERT.
-                    # We catch the error and simply fetch the one they created.
-                    resource = models.HarvestableResource.objects.get(
-                        harvester=harvester, unique_identifier=remote_resource.unique_identifier
-                    )
-                    created = False
-                # If the resource wasn't just created, check if the title changed
-                # (e.g. from 'copy title' to '28409') and update it.
-                if not created:
-                    resource.title = remote_resource.title
-                    resource.remote_resource_type = remote_resource.resource_type
-
-                processed += 1
-                # NOTE: make sure to save the resource because we need to have its
-                # `last_updated` property be refreshed - this is done in order to be able
-                # to compare when a resource has been found
-                resource.last_refreshed = timezone.now()
-                resource.save()
+            continue
+        if not found_resources:
+            # the remote service has fewer resources than expected
+            break
+        processed = _upsert_harvestable_resources(harvester, found_resources)
+        update_asynchronous_session(refresh_session_id, additional_processed_records=processed)
+
+
+@app.task(
+    bind=True,
+    queue="harvesting",
+    acks_late=False,
+    ignore_result=False,
+)
+def _update_harvestable_resources_sequential(self, refresh_session_id: int):
+    """Update the harvestable resources of workers which list the remote resources by following cursors"""
+    session = models.AsynchronousHarvestingSession.objects.get(pk=refresh_session_id)
+    harvester = session.harvester
+    worker = harvester.get_harvester_worker()
+    try:
+        for found_resources in worker.get_resource_pages():
+            session.refresh_from_db()
+            if session.status != session.STATUS_ON_GOING:
+                logger.info("The refresh session has been asked to abort, so skipping...")
+                break
+            processed = _upsert_harvestable_resources(harvester, found_resources)
             update_asynchronous_session(refresh_session_id, additional_processed_records=processed)
-    else:
-        logger.info("The refresh session has been asked to abort, so skipping...")
+    except base.HarvestingException:
+        logger.exception("Could not retrieve list of remote resources.")
+
+
+def _upsert_harvestable_resources(harvester: models.Harvester, found_resources: typing.List) -> int:
+    """Create or update the harvestable resources of a page with a single upsert.
+
+    New resources are created with the harvester's default `should_be_harvested`, the existing ones
+    get their title and type updated. All of them get their `last_refreshed` property refreshed - this is
+    done in order to be able to compare when a resource has been found.
+
+    """
+    now_ = timezone.now()
+    resources = {}
+    for remote_resource in found_resources:
+        unique_identifier = str(remote_resource.unique_identifier)
+        # the last occurrence wins, as when saving them one by one
+        resources[unique_identifier] = models.HarvestableResource(
+            harvester=harvester,
+            unique_identifier=unique_identifier,
+            title=remote_resource.title,
+            should_be_harvested=harvester.harvest_new_resources_by_default,
+            remote_resource_type=remote_resource.resource_type,
+            last_refreshed=now_,
+        )
+    if resources:
+        models.HarvestableResource.objects.bulk_create(
+            resources.values(),
+            update_conflicts=True,
+            unique_fields=["harvester", "unique_identifier"],
+            update_fields=["title", "remote_resource_type", "last_refreshed", "last_updated"],
+        )
+    return len(found_resources)
 
 
 @app.task(
@@ -869,6 +977,30 @@ def _delete_stale_harvestable_resources(harvester: models.Harvester):
         harvestable_resource.delete()
 
 
+def get_harvesting_signatures(
+    harvestable_resource_ids: typing.List[int], harvesting_session_id: int, execution_id: str, expires: int
+) -> typing.List:
+    """Return the signatures of the tasks harvesting the input resources.
+
+    When `HARVESTING_BATCH_SIZE` is greater than one every task harvests a batch of resources,
+    fetching them concurrently from the remote service, otherwise every resource gets its own task.
+
+    """
+
+    batch_size = max(1, int(getattr(settings, "HARVESTING_BATCH_SIZE", 1)))
+    if batch_size == 1:
+        return [
+            _harvest_resource.signature((rid, harvesting_session_id, execution_id)).set(expires=expires)
+            for rid in harvestable_resource_ids
+        ]
+    return [
+        _harvest_resources_batch.signature((batch, harvesting_session_id, execution_id)).set(
+            expires=expires, time_limit=calculate_dynamic_expiration(len(batch))
+        )
+        for batch in chunked(list(harvestable_resource_ids), size=batch_size)
+    ]
+
+
 def finish_asynchronous_session(
     session_id: int,
     final_status: str,
@@ -883,8 +1015,11 @@ def finish_asynchronous_session(
     if additional_processed_records is not None:
         update_kwargs["records_done"] = F("records_done") + additional_processed_records
     if final_details is not None:
+        # the session details only keep the final messages, the whole log is in the session events
         update_kwargs["details"] = Concat("details", Value(f"\n{final_details}"))
-    models.AsynchronousHarvestingSession.objects.filter(id=session_id).update(**update_kwargs)
+    updated = models.AsynchronousHarvestingSession.objects.filter(id=session_id).update(**update_kwargs)
+    if updated and final_details is not None:
+        models.HarvestingEvent.objects.create(session_id=session_id, message=final_details)
     models.Harvester.objects.filter(sessions__pk=session_id).update(status=models.Harvester.STATUS_READY)
 
 
@@ -893,15 +1028,60 @@ def update_asynchronous_session(
     total_records_to_process: typing.Optional[int] = None,
     additional_processed_records: typing.Optional[int] = None,
     additional_details: typing.Optional[str] = None,
+    additional_failed_records: typing.Optional[int] = None,
+    additional_skipped_records: typing.Optional[int] = None,
+    details_status: str = models.HarvestingEvent.STATUS_INFO,
+    harvestable_resource_id: typing.Optional[int] = None,
+    execution_id: typing.Optional[str] = None,
+    error: str = "",
 ) -> None:
+    """Update the counters of the asynchronous session.
+
+    The details are not stored in the session row, they are appended to its events instead,
+    together with the status of the record they refer to.
+
+    """
+
     update_kwargs = {}
     if total_records_to_process is not None:
         update_kwargs["total_records_to_process"] = total_records_to_process
-    if additional_processed_records is not None:
-        update_kwargs["records_done"] = F("records_done") + additional_processed_records
+    for field, increment in (
+        ("records_done", additional_processed_records),
+        ("records_failed", additional_failed_records),
+        ("records_skipped", additional_skipped_records),
+    ):
+        if increment:
+            update_kwargs[field] = F(field) + increment
+    if update_kwargs:
+        models.AsynchronousHarvestingSession.objects.filter(id=session_id).update(**update_kwargs)
     if additional_details is not None:
-        update_kwargs["details"] = Concat("details", Value(f"\n{additional_details}"))
-    models.AsynchronousHarvestingSession.objects.filter(id=session_id).update(**update_kwargs)
+        models.HarvestingEvent.objects.create(
+            session_id=session_id,
+            execution_id=execution_id,
+            harvestable_resource_id=harvestable_resource_id,
+            status=details_status,
+            message=additional_details,
+            error=error,
+        )
+
+
+def get_execution_failures(execution_id: str) -> typing.List[typing.Dict]:
+    """Return the failures recorded in the session events of the execution request."""
+    return [
+        {
+            "resource_id": event["harvestable_resource_id"],
+            "status": event["status"],
+            "details": event["message"],
+            **({"error": event["error"]} if event["error"] else {}),
+            "timestamp": event["created"].isoformat(),
+        }
+        for event in models.HarvestingEvent.objects.filter(
+            execution_id=execution_id, status=models.HarvestingEvent.STATUS_FAILED
+        )
+        .order_by("id")
+        .values("harvestable_resource_id", "status", "message", "error", "created")
+        .iterator()
+    ]
 
 
 def calculate_dynamic_expiration(
@@ -93,3 +93,32 @@ class HarvesterViewSetTestCase(GeoNodeBaseTestSupport):
                 response.data["asynchronous_harvesting_sessions"][index]["records_done"],
                 self.sessions[index].records_done,
             )
+
+    def test_get_harvester_session_events(self):
+        session = self.sessions[0]
+        for index in range(5):
+            models.HarvestingEvent.objects.create(
+                session=session,
+                harvestable_resource_id=index,
+                status=models.HarvestingEvent.STATUS_FAILED if index % 2 else models.HarvestingEvent.STATUS_SUCCESS,
+                message=f"event {index}",
+            )
+        models.HarvestingEvent.objects.create(session=self.sessions[1], message="another session")
+
+        response = self.client.get(f"/api/v2/harvesting-sessions/{session.pk}/events/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 5)
+        self.assertEqual([event["message"] for event in response.data["events"]], [f"event {i}" for i in range(5)])
+
+        response = self.client.get(f"/api/v2/harvesting-sessions/{session.pk}/events/", {"status": "failed"})
+        self.assertEqual([event["harvestable_resource_id"] for event in response.data["events"]], [1, 3])
+
+        # follow the log with the keyset pagination
+        messages = []
+        url = f"/api/v2/harvesting-sessions/{session.pk}/events/?cursor=&page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            messages.extend(event["message"] for event in response.data["events"])
+            url = response.data["links"]["next"]
+        self.assertEqual(messages, [f"event {i}" for i in range(5)])
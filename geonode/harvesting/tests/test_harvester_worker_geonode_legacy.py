@@ -82,3 +82,84 @@ class GeoNodeHarvesterWorkerTestCase(GeoNodeBaseSimpleTestSupport):
         worker = geonodeharvester.GeonodeLegacyHarvester(base_url, harvester_id=None)
         result = worker.check_availability()
         self.assertEqual(result, False)
+
+    @mock.patch("geonode.harvesting.harvesters.geonodeharvester.requests.Session")
+    def test_current_harvester_follows_cursor_links(self, mock_requests_session):
+        first_page = mock.MagicMock(status_code=200)
+        first_page.json.return_value = {
+            "links": {"next": "http://fake-url1/api/v2/resources/?cursor=abc"},
+            "resources": [{"pk": 1, "title": "one", "abstract": "", "resource_type": "dataset"}],
+        }
+        last_page = mock.MagicMock(status_code=200)
+        last_page.json.return_value = {
+            "links": {"next": None},
+            "resources": [{"pk": 2, "title": "two", "abstract": "", "resource_type": "document"}],
+        }
+        mock_get = mock_requests_session.return_value.get
+        mock_get.side_effect = [first_page, last_page]
+
+        worker = geonodeharvester.GeonodeCurrentHarvester(
+            "http://fake-url1", harvester_id=None, use_cursor_pagination=True
+        )
+        self.assertEqual(worker.pagination_mode, "cursor")
+        pages = list(worker.get_resource_pages())
+        self.assertEqual([[r.unique_identifier for r in page] for page in pages], [[1], [2]])
+        first_params = mock_get.call_args_list[0].kwargs["params"]
+        self.assertEqual(first_params["cursor"], "")
+        self.assertEqual(first_params["total"], "skip")
+        self.assertNotIn("page", first_params)
+        self.assertEqual(mock_get.call_args_list[1].args[0], "http://fake-url1/api/v2/resources/?cursor=abc")
+
+    def test_resource_pages_fall_back_to_offset_listing(self):
+        worker = geonodeharvester.GeonodeLegacyHarvester("http://fake-url1", harvester_id=None)
+        worker.page_size = 2
+        with mock.patch.object(worker, "list_resources", side_effect=[["a", "b"], ["c"], []]) as mock_list:
+            pages = list(worker.get_resource_pages())
+        self.assertEqual(pages, [["a", "b"], ["c"]])
+        self.assertEqual([c.args[0] for c in mock_list.call_args_list], [0, 2, 4])
+
+    @mock.patch("geonode.harvesting.harvesters.geonodeharvester.requests.Session")
+    def test_current_harvester_fetches_a_batch_of_resources_from_the_list_endpoint(self, mock_requests_session):
+        list_response = mock.MagicMock(status_code=200)
+        list_response.json.return_value = {"datasets": [{"pk": 1, "title": "one"}]}
+        mock_get = mock_requests_session.return_value.get
+        mock_get.return_value = list_response
+        harvestable_resources = [
+            models.HarvestableResource(pk=10, unique_identifier="1", remote_resource_type="dataset"),
+            models.HarvestableResource(pk=20, unique_identifier="2", remote_resource_type="dataset"),
+        ]
+        worker = geonodeharvester.GeonodeCurrentHarvester("http://fake-url1", harvester_id=None)
+        with (
+            mock.patch.object(worker, "_get_resource_descriptor", return_value="descriptor-1"),
+            mock.patch.object(worker, "get_resource", return_value="fetched-2") as mock_get_resource,
+        ):
+            result = worker.get_resources(harvestable_resources)
+
+        self.assertEqual(result[10].resource_descriptor, "descriptor-1")
+        # the resources missing from the list response are fetched one by one
+        self.assertEqual(result[20], "fetched-2")
+        mock_get_resource.assert_called_once_with(harvestable_resources[1])
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.args[0], "http://fake-url1/api/v2/datasets/")
+        self.assertEqual(mock_get.call_args.kwargs["params"], {"filter{pk.in}": ["1", "2"], "page_size": 2})
+
+    @mock.patch("geonode.harvesting.harvesters.geonodeharvester.requests.Session")
+    def test_legacy_harvester_gets_the_csw_records_of_a_batch_at_once(self, mock_requests_session):
+        csw_response = mock.MagicMock(status_code=200)
+        csw_response.content = b"""<?xml version="1.0" encoding="UTF-8"?>
+<csw:GetRecordByIdResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2"
+    xmlns:gmd="http://www.isotc211.org/2005/gmd" xmlns:gco="http://www.isotc211.org/2005/gco">
+  <gmd:MD_Metadata><gmd:fileIdentifier><gco:CharacterString>uuid-1</gco:CharacterString></gmd:fileIdentifier>
+  </gmd:MD_Metadata>
+  <gmd:MD_Metadata><gmd:fileIdentifier><gco:CharacterString>uuid-2</gco:CharacterString></gmd:fileIdentifier>
+  </gmd:MD_Metadata>
+</csw:GetRecordByIdResponse>"""
+        mock_get = mock_requests_session.return_value.get
+        mock_get.return_value = csw_response
+
+        worker = geonodeharvester.GeonodeLegacyHarvester("http://fake-url1", harvester_id=None)
+        records = worker._get_csw_records(["uuid-1", "uuid-2"])
+
+        self.assertEqual(sorted(records), ["uuid-1", "uuid-2"])
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["params"]["id"], "uuid-1,uuid-2")
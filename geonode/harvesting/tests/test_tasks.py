@@ -30,6 +30,7 @@ from .. import (
     models,
     tasks,
 )
+from ..harvesters import base
 
 
 class TasksTestCase(GeoNodeBaseTestSupport):
@@ -290,6 +291,78 @@ class TasksTestCase(GeoNodeBaseTestSupport):
         # Verify no new records were created (count should still be 3 from setUpTestData)
         self.assertEqual(models.HarvestableResource.objects.count(), 3)
 
+    @mock.patch("geonode.harvesting.tasks.update_asynchronous_session")
+    @mock.patch("geonode.harvesting.models.Harvester.get_harvester_worker")
+    def test_update_batch_walks_pages_with_bulk_upserts(self, mock_get_worker, mock_update_session):
+        self.harvesting_session.status = models.AsynchronousHarvestingSession.STATUS_ON_GOING
+        self.harvesting_session.save()
+        pages = {
+            0: [
+                base.BriefRemoteResource(
+                    unique_identifier="fake-identifier-0",
+                    title="new-title-0",
+                    resource_type="fake-remote-resource-type",
+                ),
+                base.BriefRemoteResource(
+                    unique_identifier="new-identifier-0",
+                    title="new-resource-0",
+                    resource_type="fake-remote-resource-type",
+                ),
+            ],
+            2: [
+                base.BriefRemoteResource(
+                    unique_identifier="new-identifier-1",
+                    title="new-resource-1",
+                    resource_type="fake-remote-resource-type",
+                )
+            ],
+            4: [],
+        }
+        mock_worker = mock.MagicMock()
+        mock_worker.list_resources.side_effect = lambda offset: pages[offset]
+        mock_get_worker.return_value = mock_worker
+        before = now()
+
+        with self.assertNumQueries(6):
+            # for every page one upsert, the first page does not refresh the session
+            tasks._update_harvestable_resources_batch(self.harvesting_session.pk, page=0, page_size=2, num_pages=5)
+
+        # the empty page stops the walk
+        self.assertEqual(3, mock_worker.list_resources.call_count)
+        self.assertEqual(2, mock_update_session.call_count)
+        self.assertEqual(5, models.HarvestableResource.objects.count())
+        self.assertEqual(
+            "new-title-0", models.HarvestableResource.objects.get(unique_identifier="fake-identifier-0").title
+        )
+        self.assertEqual(
+            3, models.HarvestableResource.objects.filter(harvester=self.harvester, last_refreshed__gte=before).count()
+        )
+
+    @mock.patch("geonode.harvesting.tasks.calculate_dynamic_expiration", return_value=123)
+    @mock.patch("geonode.harvesting.tasks._finish_harvestable_resources_update")
+    @mock.patch("geonode.harvesting.tasks._update_harvestable_resources_batch")
+    @mock.patch("geonode.harvesting.tasks.chord")
+    @mock.patch("geonode.harvesting.tasks.models")
+    @override_settings(HARVESTING_DISCOVERY_MAX_TASKS=4)
+    def test_update_harvestable_resources_sends_a_handful_of_tasks(self, mock_models, mock_chord, mock_batch, *args):
+        mock_worker = mock.MagicMock()
+        mock_worker.get_num_available_resources.return_value = 200000
+        mock_worker.page_size = 100
+        mock_harvester = mock.MagicMock()
+        mock_harvester.get_harvester_worker.return_value = mock_worker
+        mock_session = mock.MagicMock()
+        mock_session.harvester = mock_harvester
+        mock_models.AsynchronousHarvestingSession.objects.get.return_value = mock_session
+
+        tasks.update_harvestable_resources("fake_session_id")
+
+        calls = mock_batch.signature.call_args_list
+        self.assertEqual(4, len(calls))
+        self.assertListEqual(
+            [(page, 100, 500) for page in range(0, 2000, 500)], [call.kwargs["args"][1:] for call in calls]
+        )
+        mock_batch.signature.return_value.set.assert_called_with(expires=123, time_limit=123)
+
     def test_harvesting_scheduler(self):
         mock_harvester = mock.MagicMock(spec=models.Harvester).return_value
         mock_harvester.scheduling_enabled = True
@@ -570,9 +643,12 @@ class TasksTestCase(GeoNodeBaseTestSupport):
             assert result["status"] == "failed"
             assert "Test failure" in result["details"] or "Test failure" in result.get("error", "")
 
-            exec_req.refresh_from_db()
-            failures = exec_req.output_params.get("failures", [])
+            failures = tasks.get_execution_failures(execution_id)
             assert any(f["resource_id"] == resource_fail.pk and f["status"] == "failed" for f in failures)
+            # the failures are stored in the session events, the execution request is updated when finishing
+            exec_req.refresh_from_db()
+            assert exec_req.output_params == {}
+            assert exec_req.log == ""
 
         # Success case
         resource_success = models.HarvestableResource.objects.create(
@@ -600,10 +676,65 @@ class TasksTestCase(GeoNodeBaseTestSupport):
             result = tasks._harvest_resource(resource_success.pk, harvesting_session.pk, execution_id)
             assert result["status"] == "success"
 
-            exec_req.refresh_from_db()
-            failures = exec_req.output_params.get("failures", [])
+            failures = tasks.get_execution_failures(execution_id)
             assert all(f["resource_id"] != resource_success.pk for f in failures)
 
+        harvesting_session.refresh_from_db()
+        assert harvesting_session.records_done == 1
+        assert harvesting_session.records_failed == 1
+        assert list(harvesting_session.events.values_list("harvestable_resource_id", "status")) == [
+            (resource_fail.pk, models.HarvestingEvent.STATUS_FAILED),
+            (resource_success.pk, models.HarvestingEvent.STATUS_SUCCESS),
+        ]
+
+        tasks._finish_harvesting(harvesting_session.pk, execution_id)
+        exec_req.refresh_from_db()
+        assert [f["resource_id"] for f in exec_req.output_params["failures"]] == [resource_fail.pk]
+        assert "Fail Resource" in exec_req.log
+
+    def test_harvest_resources_batch_fetches_the_resources_at_once(self):
+        execution_id = str(uuid.uuid4())
+        succeeded, missing, failed = models.HarvestableResource.objects.filter(harvester=self.harvester).order_by("pk")
+        mock_worker = mock.MagicMock()
+        mock_worker.get_resources.return_value = {
+            succeeded.pk: "fake_gotten_resource",
+            missing.pk: None,
+            failed.pk: RuntimeError("remote error"),
+        }
+
+        with mock.patch.object(models.Harvester, "get_harvester_worker", return_value=mock_worker):
+            results = tasks._harvest_resources_batch(
+                [succeeded.pk, missing.pk, failed.pk, 0], self.harvesting_session.pk, execution_id
+            )
+
+        mock_worker.get_resources.assert_called_once()
+        self.assertEqual(
+            [harvestable_resource.pk for harvestable_resource in mock_worker.get_resources.call_args.args[0]],
+            [succeeded.pk, missing.pk, failed.pk],
+        )
+        mock_worker.update_geonode_resource.assert_called_once()
+        self.assertEqual(
+            {result["resource_id"]: result["status"] for result in results},
+            {succeeded.pk: "success", missing.pk: "failed", failed.pk: "failed", 0: "failed"},
+        )
+        self.harvesting_session.refresh_from_db()
+        self.assertEqual(self.harvesting_session.records_done, 1)
+        self.assertEqual(self.harvesting_session.records_failed, 3)
+        self.assertEqual(
+            sorted(failure["resource_id"] for failure in tasks.get_execution_failures(execution_id)),
+            [0, missing.pk, failed.pk],
+        )
+
+    def test_get_harvesting_signatures_batches_the_resources(self):
+        self.assertEqual(
+            [sig.task for sig in tasks.get_harvesting_signatures([1, 2, 3], 1, "exec", 60)],
+            [tasks._harvest_resource.name] * 3,
+        )
+        with override_settings(HARVESTING_BATCH_SIZE=2):
+            signatures = tasks.get_harvesting_signatures([1, 2, 3], 1, "exec", 60)
+        self.assertEqual([sig.task for sig in signatures], [tasks._harvest_resources_batch.name] * 2)
+        self.assertEqual([sig.args[0] for sig in signatures], [[1, 2], [3]])
+
     @mock.patch("geonode.harvesting.tasks.logger")
     @mock.patch("geonode.harvesting.tasks.models.AsynchronousHarvestingSession.objects.get")
     def test_finish_harvesting_handles_exception(self, mock_get_session, mock_logger):
@@ -639,13 +770,16 @@ class TasksTestCase(GeoNodeBaseTestSupport):
 
         # Prepare mock execution request
         mock_exec_req = mock.MagicMock()
-        mock_exec_req.output_params = {
-            "failures": [
-                {"resource_id": 1, "status": "failed"},
-                {"resource_id": 2, "status": "failed"},
-            ]
-        }
+        mock_exec_req.output_params = {}
         mock_exec_req.log = ""
+        for resource_id, status in ((1, "failed"), (2, "failed"), (3, "success")):
+            models.HarvestingEvent.objects.create(
+                session=self.harvesting_session,
+                execution_id=execution_id,
+                harvestable_resource_id=resource_id,
+                status=status,
+                message=f"resource {resource_id}",
+            )
         mock_get_exec_req.return_value = mock_exec_req
 
         # Run the task
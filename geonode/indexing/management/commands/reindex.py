@@ -19,8 +19,11 @@
 #########################################################################
 
 import logging
+import multiprocessing
+import time
 
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from geonode.base.management import command_utils
 from geonode.base.models import ResourceBase
@@ -29,6 +32,34 @@ from geonode.metadata.manager import metadata_manager
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 500
+
+
+def _reindex_batch(args):
+    """
+    Rebuild the indexes for a batch of resource ids.
+    Runs in the worker processes, so it must be a module level function.
+    Returns a tuple (processed ids, failed ids).
+    """
+    resource_ids, dry_run = args
+    resources = list(ResourceBase.objects.filter(id__in=resource_ids))
+    jsoninstances = metadata_manager.build_schema_instances(resources)
+    failed = [resource.id for resource in resources if resource.id not in jsoninstances]
+
+    if not dry_run:
+        try:
+            index_manager.bulk_update_index(jsoninstances)
+        except Exception as e:
+            logger.error(f"Error writing indexes for batch {resource_ids[0]}..{resource_ids[-1]}: {e}", exc_info=e)
+            failed.extend(jsoninstances.keys())
+
+    return resource_ids, failed
+
+
+def _init_worker():
+    # db connections must not be shared with the parent process
+    connections.close_all()
+
 
 class Command(BaseCommand):
     help = "Re-create tsvector indexes"
@@ -53,6 +84,25 @@ class Command(BaseCommand):
             dest="dry-run",
             action='store_true',
             help="Do not actually perform any change")
+        parser.add_argument(
+            '-b',
+            '--bulk',
+            dest="bulk",
+            action='store_true',
+            help="Rebuild the indexes in bulk, with set-based statements over batches of resources")
+        parser.add_argument(
+            '--batch-size',
+            dest="batch_size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of resources in a bulk batch (default {DEFAULT_BATCH_SIZE})")
+        parser.add_argument(
+            '-w',
+            '--workers',
+            dest="workers",
+            type=int,
+            default=1,
+            help="Number of worker processes running the bulk batches")
         parser.add_argument(
             '--debug',
             dest="debug",
@@ -79,6 +129,10 @@ class Command(BaseCommand):
         qs_resources = ResourceBase.objects
         tot = qs_resources.count()
         logger.info(f"Total resources in GeoNode: {tot}")
+
+        if options.get('bulk'):
+            return self.handle_bulk(
+                logger, requested_uuids, dry_run, options.get('batch_size'), options.get('workers'))
         i = 0
         cnt_ok = 0
         cnt_bad = 0
@@ -115,3 +169,42 @@ class Command(BaseCommand):
         logger.info(f"- Index regenerated : {cnt_ok}")
         logger.info(f"- Errors            : {cnt_bad}")
         logger.info(f"- Resources skipped : {cnt_skip}")
+
+    def handle_bulk(self, logger, requested_uuids, dry_run, batch_size, workers):
+        qs_ids = ResourceBase.objects.order_by("id")
+        if requested_uuids:
+            qs_ids = qs_ids.filter(uuid__in=requested_uuids)
+        ids = list(qs_ids.values_list("id", flat=True))
+        tot = len(ids)
+        batches = [(ids[i:i + batch_size], dry_run) for i in range(0, tot, batch_size)]
+        logger.info(f"Processing {tot} resources in {len(batches)} batches with {workers} worker(s)")
+
+        cnt_done = 0
+        cnt_bad = 0
+        start = time.monotonic()
+
+        if workers > 1:
+            connections.close_all()
+            with multiprocessing.Pool(processes=workers, initializer=_init_worker) as pool:
+                results = pool.imap_unordered(_reindex_batch, batches)
+                for batch_ids, failed in results:
+                    cnt_done, cnt_bad = self._log_progress(logger, tot, start, cnt_done, cnt_bad, batch_ids, failed)
+        else:
+            for batch in batches:
+                batch_ids, failed = _reindex_batch(batch)
+                cnt_done, cnt_bad = self._log_progress(logger, tot, start, cnt_done, cnt_bad, batch_ids, failed)
+
+        elapsed = time.monotonic() - start
+        logger.info("Work completed" + (" [DRYRUN]" if dry_run else ""))
+        logger.info(f"- Index regenerated : {cnt_done - cnt_bad}")
+        logger.info(f"- Errors            : {cnt_bad}")
+        logger.info(f"- Elapsed           : {elapsed:.1f}s ({cnt_done / elapsed if elapsed else 0:.1f} resources/s)")
+
+    @staticmethod
+    def _log_progress(logger, tot, start, cnt_done, cnt_bad, batch_ids, failed):
+        cnt_done += len(batch_ids)
+        cnt_bad += len(failed)
+        elapsed = time.monotonic() - start
+        rate = cnt_done / elapsed if elapsed else 0
+        logger.info(f"- {cnt_done}/{tot} resources processed ({rate:.1f} resources/s, {len(failed)} errors in batch)")
+        return cnt_done, cnt_bad
@@ -1,13 +1,21 @@
 import logging
+import operator
+from functools import reduce
 
-from django.db.models import Func, Value
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, Func, Q, Value
 from django.conf import settings
+from django.utils import timezone
 
-from geonode.indexing.models import ResourceIndex
+from geonode.indexing.models import ResourceIndex, ResourceIndexRequest
 import geonode.metadata.multilang.utils as multi
 
 logger = logging.getLogger(__name__)
 
+INDEXING_TASK_SCHEDULED_KEY = "indexing:task_scheduled"
+INDEXING_QUEUE_LAG_KEY = "indexing:queue_lag"
+
 
 class TSVectorIndexManager:
 
@@ -44,58 +52,237 @@ class TSVectorIndexManager:
 
         return non_ml_fields, ml_fields
 
-    def update_index(self, resource_id, jsoninstance: dict):
-
+    def _get_index_entries(self, jsoninstance: dict):
+        """
+        Compute the index entries for a resource.
+        Returns a tuple:
+        - list of (lang, index name, pg language, text to be indexed) tuples
+        - list of (index name, localized) tuples, telling which kind of entries are to be removed
+        """
         non_ml_fields, ml_fields = self._gather_fields_values(jsoninstance)
 
+        entries = []
+        stale = []
+
         # 3rd loop: create indexes
         for index_name, index_fields in settings.METADATA_INDEXES.items():
 
             if all(field in non_ml_fields for field in index_fields):
                 # this index is not localized
-                pg_lang = multi.get_pg_language(None)
-                logger.debug(
-                    f"Creating non localized index - resource:{resource_id} index name:{index_name} default lang:{pg_lang}"
-                )
                 index_text = " ".join(filter(None, (str(non_ml_fields[f]) for f in index_fields)))
-                vector = Func(
-                    Value(index_text), function="to_tsvector", template=f"%(function)s('{pg_lang}', %(expressions)s)"
-                )
-
-                ResourceIndex.objects.update_or_create(
-                    defaults={"vector": vector}, resource_id=resource_id, lang=None, name=index_name
-                )
+                entries.append((None, index_name, multi.get_pg_language(None), index_text))
                 # remove all localized indexes if any
-                ResourceIndex.objects.filter(
-                    resource_id=resource_id,
-                    lang__isnull=False,
-                    name=index_name,
-                ).delete()
+                stale.append((index_name, True))
 
             else:  # some indexed fields are multilang
                 # gather all non localized fields
                 non_ml_text = " ".join(filter(None, (non_ml_fields[f] for f in index_fields if f in non_ml_fields)))
 
                 for lang in self.LANGUAGES:
-                    logger.debug(f"Creating localized index {index_name} for resource {resource_id}")
-
                     ml_text = " ".join(filter(None, (ml_fields[f][lang] for f in index_fields if f in ml_fields)))
-                    vector = Func(
-                        Value(" ".join(filter(None, [ml_text, non_ml_text]))),
-                        function="to_tsvector",
-                        template=f"%(function)s('{multi.get_pg_language(lang)}', %(expressions)s)",
-                    )
-
-                    ResourceIndex.objects.update_or_create(
-                        resource_id=resource_id, lang=lang, name=index_name, defaults={"vector": vector}
+                    entries.append(
+                        (lang, index_name, multi.get_pg_language(lang), " ".join(filter(None, [ml_text, non_ml_text])))
                     )
 
                 # remove all non-localized indexes entries
-                ResourceIndex.objects.filter(
-                    resource_id=resource_id,
-                    lang__isnull=True,
-                    name=index_name,
-                ).delete()
+                stale.append((index_name, False))
+
+        return entries, stale
+
+    def update_index(self, resource_id, jsoninstance: dict):
+
+        entries, stale = self._get_index_entries(jsoninstance)
+
+        for lang, index_name, pg_lang, index_text in entries:
+            logger.debug(f"Creating index - resource:{resource_id} index name:{index_name} lang:{lang}/{pg_lang}")
+            vector = Func(
+                Value(index_text), function="to_tsvector", template=f"%(function)s('{pg_lang}', %(expressions)s)"
+            )
+            ResourceIndex.objects.update_or_create(
+                resource_id=resource_id, lang=lang, name=index_name, defaults={"vector": vector}
+            )
+
+        for index_name, localized in stale:
+            ResourceIndex.objects.filter(
+                resource_id=resource_id,
+                lang__isnull=not localized,
+                name=index_name,
+            ).delete()
+
+    def bulk_update_index(self, jsoninstances: dict):
+        """
+        Recreate the indexes of many resources with a couple of set-based statements.
+        The tsvectors are computed server side.
+
+        :param jsoninstances: a dict resource id -> json instance
+        :return: the number of index entries written
+        """
+        if not jsoninstances:
+            return 0
+
+        resource_ids, langs, names, pg_langs, texts = [], [], [], [], []
+        for resource_id, jsoninstance in jsoninstances.items():
+            entries, _ = self._get_index_entries(jsoninstance)
+            for lang, index_name, pg_lang, index_text in entries:
+                resource_ids.append(resource_id)
+                langs.append(lang)
+                names.append(index_name)
+                pg_langs.append(pg_lang)
+                texts.append(index_text)
+
+        table = ResourceIndex._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE resource_id = ANY(%s)", [list(jsoninstances.keys())])
+            cursor.execute(
+                f"INSERT INTO {table} (resource_id, lang, name, vector) "
+                "SELECT e.resource_id, e.lang, e.name, to_tsvector(e.pg_lang::regconfig, e.text) "
+                "FROM unnest(%s::integer[], %s::varchar[], %s::varchar[], %s::varchar[], %s::text[]) "
+                "AS e(resource_id, lang, name, pg_lang, text)",
+                [resource_ids, langs, names, pg_langs, texts],
+            )
+        return len(resource_ids)
+
+    def request_update(self, resource_id, jsoninstance: dict):
+        """
+        Update the indexes of a resource, either immediately or, if METADATA_INDEXING_ASYNC is set,
+        by queueing the request for the debounced indexing task.
+        """
+        if getattr(settings, "METADATA_INDEXING_ASYNC", False):
+            self.queue_update(resource_id)
+        else:
+            self.update_index(resource_id, jsoninstance)
+
+    def request_bulk_update(self, jsoninstances: dict):
+        """
+        Update the indexes of many resources, either immediately in a single pass or, if METADATA_INDEXING_ASYNC
+        is set, by queueing the requests for the debounced indexing task.
+
+        :param jsoninstances: a dict resource id -> json instance
+        """
+        if not jsoninstances:
+            return
+        if getattr(settings, "METADATA_INDEXING_ASYNC", False):
+            ResourceIndexRequest.objects.bulk_create(
+                [ResourceIndexRequest(resource_id=resource_id) for resource_id in jsoninstances],
+                update_conflicts=True,
+                unique_fields=["resource"],
+                update_fields=["requested_at", "attempts"],
+            )
+            self.schedule_queue_processing()
+        else:
+            self.bulk_update_index(jsoninstances)
+
+    def queue_update(self, resource_id):
+        """
+        Queue an index update for the resource.
+        All the requests collected within the debounce window are processed by a single task.
+        """
+        # a request being processed or parked is renewed, so that it is processed again
+        ResourceIndexRequest.objects.update_or_create(
+            resource_id=resource_id, defaults={"requested_at": timezone.now(), "attempts": 0}
+        )
+        self.schedule_queue_processing()
+
+    def schedule_queue_processing(self, countdown: int = None):
+        """
+        Schedule the indexing task at the end of the debounce window, or after `countdown` seconds,
+        unless it has already been scheduled.
+        """
+        if countdown is None:
+            countdown = getattr(settings, "METADATA_INDEXING_DEBOUNCE", 5)
+        # cache.add is atomic: only the first request in the debounce window schedules the task
+        if cache.add(INDEXING_TASK_SCHEDULED_KEY, True, timeout=countdown):
+            from geonode.indexing.tasks import update_queued_indexes
+
+            transaction.on_commit(lambda: update_queued_indexes.apply_async(countdown=countdown))
+
+    @staticmethod
+    def get_pending_requests():
+        """The queued requests which are not parked"""
+        return ResourceIndexRequest.objects.filter(attempts__lt=getattr(settings, "METADATA_INDEXING_MAX_ATTEMPTS", 5))
+
+    def process_queue(self, batch_size: int):
+        """
+        Take a batch of pending requests and update the related indexes in bulk.
+        Returns a tuple (number of resources processed, number of resources failed, queue lag in seconds).
+
+        The requests are only removed once their indexes have been written; the requests renewed in the meantime
+        are kept as well. When the bulk update fails, the indexes are updated one resource at a time, so that
+        a single failing resource does not hold back the whole batch. The failed requests are tried again by
+        the next runs, after the ones never tried, and parked after METADATA_INDEXING_MAX_ATTEMPTS failures.
+        The resources that cannot be serialized are logged and their requests removed, since retrying them
+        would not help.
+        """
+        from geonode.base.models import ResourceBase
+        from geonode.metadata.manager import metadata_manager
+
+        claimed = list(
+            self.get_pending_requests()
+            .order_by("attempts", "requested_at")
+            .values_list("id", "resource_id", "requested_at")[:batch_size]
+        )
+        if not claimed:
+            return 0, 0, 0
+
+        lag = (timezone.now() - min(c[2] for c in claimed)).total_seconds()
+        cache.set(INDEXING_QUEUE_LAG_KEY, lag, timeout=None)
+        logger.info(f"Indexing {len(claimed)} queued resources, queue lag {lag:.1f}s")
+
+        try:
+            jsoninstances = metadata_manager.build_schema_instances(
+                list(ResourceBase.objects.filter(id__in=[c[1] for c in claimed]))
+            )
+            failed = self._update_indexes(jsoninstances)
+        except Exception as e:
+            logger.exception(f"Error updating the indexes of {len(claimed)} queued resources: {e}")
+            failed = {c[1] for c in claimed}
+
+        # the requests renewed in the meantime have a different timestamp
+        def _match(requests):
+            return reduce(operator.or_, (Q(id=id, requested_at=requested_at) for id, _, requested_at in requests))
+
+        done = [c for c in claimed if c[1] not in failed]
+        if done:
+            ResourceIndexRequest.objects.filter(_match(done)).delete()
+        if failed:
+            ResourceIndexRequest.objects.filter(_match([c for c in claimed if c[1] in failed])).update(
+                attempts=F("attempts") + 1
+            )
+        return len(claimed), len(failed), lag
+
+    def _update_indexes(self, jsoninstances: dict) -> set:
+        """
+        Update the indexes in bulk, falling back to one resource at a time if the bulk update fails.
+        Returns the ids of the resources whose indexes could not be updated.
+        """
+        try:
+            self.bulk_update_index(jsoninstances)
+            return set()
+        except Exception as e:
+            logger.warning(f"Bulk update of {len(jsoninstances)} indexes failed, updating them one by one: {e}")
+
+        failed = set()
+        for resource_id, jsoninstance in jsoninstances.items():
+            try:
+                self.bulk_update_index({resource_id: jsoninstance})
+            except Exception as e:
+                logger.error(f"Error updating the indexes of resource {resource_id}: {e}")
+                failed.add(resource_id)
+        return failed
+
+    def get_queue_stats(self) -> dict:
+        """
+        Return the number of pending and parked index requests, the age in seconds of the oldest pending one
+        and the queue lag measured by the last indexing run.
+        """
+        pending = self.get_pending_requests()
+        oldest = pending.order_by("requested_at").values_list("requested_at", flat=True).first()
+        return {
+            "pending": pending.count(),
+            "parked": ResourceIndexRequest.objects.count() - pending.count(),
+            "oldest_age": (timezone.now() - oldest).total_seconds() if oldest else 0,
+            "last_lag": cache.get(INDEXING_QUEUE_LAG_KEY, 0),
+        }
 
 
 index_manager = TSVectorIndexManager()
@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0100_migrate_extrametadata_to_sparsefields"),
+        ("indexing", "0002_reindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResourceIndexRequest",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("requested_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                (
+                    "resource",
+                    models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to="base.resourcebase"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("indexing", "0003_resourceindexrequest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourceindexrequest",
+            name="attempts",
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+    ]
@@ -30,3 +30,18 @@ class ResourceIndex(models.Model):
             GinIndex(fields=("vector",)),
             # no index on lang or name because they will usually be very few
         ]
+
+
+class ResourceIndexRequest(models.Model):
+    """
+    A pending request for updating the indexes of a resource.
+    Requests are collapsed by resource and processed in batches by the indexing task.
+    """
+
+    resource = models.OneToOneField(ResourceBase, on_delete=models.CASCADE, null=False)
+    requested_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # failed indexing runs, the request is parked after METADATA_INDEXING_MAX_ATTEMPTS
+    attempts = models.PositiveIntegerField(default=0, db_index=True)
+
+    def __str__(self):
+        return f"{self.resource_id}@{self.requested_at}"
@@ -0,0 +1,60 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+"""celery tasks for geonode.indexing."""
+from django.conf import settings
+from django.db.models import Max
+from celery.utils.log import get_task_logger
+
+from geonode.celery_app import app
+from geonode.indexing.manager import index_manager
+
+logger = get_task_logger(__name__)
+
+
+@app.task(
+    bind=True,
+    name="geonode.indexing.tasks.update_queued_indexes",
+    queue="update",
+    acks_late=False,
+    ignore_result=True,
+)
+def update_queued_indexes(self):
+    """
+    Update the indexes of the resources queued by index_manager.queue_update().
+    """
+    batch_size = getattr(settings, "METADATA_INDEXING_BATCH_SIZE", 500)
+    tot = 0
+    failures = 0
+    try:
+        while True:
+            processed, failed, lag = index_manager.process_queue(batch_size)
+            tot += processed - failed
+            failures += failed
+            # the failed requests are taken after the other ones, stop when only they are left
+            if processed == failed:
+                break
+        logger.info(f"Indexes updated for {tot} resources")
+    finally:
+        # requests queued while the task was running may have found the task still flagged as scheduled,
+        # and the failed requests are still pending: back off while the runs keep failing
+        attempts = index_manager.get_pending_requests().aggregate(attempts=Max("attempts"))["attempts"]
+        if attempts is not None:
+            debounce = getattr(settings, "METADATA_INDEXING_DEBOUNCE", 5)
+            index_manager.schedule_queue_processing(countdown=debounce * 2**attempts if failures else debounce)
@@ -20,13 +20,17 @@
 import os
 import logging
 from types import SimpleNamespace
+from uuid import uuid4
 
 from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import override_settings
 
 from geonode.base.i18n import i18nCache
 from geonode.base.models import ResourceBase
+from geonode.indexing.manager import index_manager, INDEXING_TASK_SCHEDULED_KEY
 from geonode.metadata.handlers.multilang import MultiLangHandler
 from geonode.metadata.handlers.sparse import SparseHandler, SparseFieldRegistry
 from geonode.metadata.manager import MetadataManager
@@ -86,3 +90,98 @@ class IndexingInvocationTests(GeoNodeBaseTestSupport):
             mm.update_schema_instance(resource, fake_req)
 
             mock_update_index.assert_called_once()
+
+    @patch("geonode.indexing.tasks.update_queued_indexes.apply_async")
+    @patch("geonode.indexing.manager.TSVectorIndexManager.bulk_update_index")
+    @patch("geonode.indexing.manager.TSVectorIndexManager.update_index")
+    def test_async_indexing_is_debounced(self, mock_update_index, mock_bulk_update_index, mock_apply_async):
+        """
+        With async indexing, a burst of updates should be collapsed into a single task and a single bulk update
+        """
+        cache.delete(INDEXING_TASK_SCHEDULED_KEY)
+        owner = get_user_model().objects.first()
+        resources = [ResourceBase.objects.create(title=f"r{i}", uuid=str(uuid4()), owner=owner) for i in range(3)]
+
+        with override_settings(METADATA_INDEXING_ASYNC=True, METADATA_INDEXING_DEBOUNCE=30):
+            with self.captureOnCommitCallbacks(execute=True):
+                for resource in resources + resources:
+                    index_manager.request_update(resource.id, {})
+
+            mock_update_index.assert_not_called()
+            mock_apply_async.assert_called_once_with(countdown=30)
+            self.assertEqual(3, index_manager.get_queue_stats()["pending"])
+
+            with patch(
+                "geonode.metadata.manager.metadata_manager.build_schema_instances",
+                side_effect=lambda resources: {r.id: {} for r in resources},
+            ):
+                processed, failed, _ = index_manager.process_queue(batch_size=10)
+
+            self.assertEqual(3, processed)
+            self.assertEqual(0, failed)
+            mock_bulk_update_index.assert_called_once_with({r.id: {} for r in resources})
+            self.assertEqual(0, index_manager.get_queue_stats()["pending"])
+
+    @patch("geonode.indexing.manager.TSVectorIndexManager.schedule_queue_processing")
+    @patch("geonode.indexing.manager.TSVectorIndexManager.bulk_update_index")
+    def test_failed_async_indexing_is_retried(self, mock_bulk_update_index, mock_schedule):
+        """
+        The queued requests are only removed once the indexes are written, unless they are renewed meanwhile
+        """
+        owner = get_user_model().objects.first()
+        resources = [ResourceBase.objects.create(title=f"r{i}", uuid=str(uuid4()), owner=owner) for i in range(2)]
+        for resource in resources:
+            index_manager.queue_update(resource.id)
+
+        with patch(
+            "geonode.metadata.manager.metadata_manager.build_schema_instances",
+            side_effect=lambda resources: {r.id: {} for r in resources},
+        ):
+            # a single failing resource does not hold back the others
+            def bulk_update_index(jsoninstances):
+                if resources[0].id in jsoninstances:
+                    raise Exception("database error")
+
+            mock_bulk_update_index.side_effect = bulk_update_index
+            processed, failed, _ = index_manager.process_queue(batch_size=10)
+            self.assertEqual((2, 1), (processed, failed))
+            self.assertEqual(1, index_manager.get_queue_stats()["pending"])
+
+            # a request renewed while the indexes are written is processed again
+            mock_bulk_update_index.side_effect = lambda jsoninstances: index_manager.queue_update(resources[0].id)
+            processed, failed, _ = index_manager.process_queue(batch_size=10)
+            self.assertEqual((1, 0), (processed, failed))
+            self.assertEqual(1, index_manager.get_queue_stats()["pending"])
+
+    @override_settings(METADATA_INDEXING_MAX_ATTEMPTS=3, METADATA_INDEXING_DEBOUNCE=5)
+    @patch("geonode.indexing.manager.TSVectorIndexManager.schedule_queue_processing")
+    @patch("geonode.indexing.manager.TSVectorIndexManager.bulk_update_index", side_effect=Exception("database error"))
+    def test_failing_async_indexing_is_parked(self, mock_bulk_update_index, mock_schedule):
+        """
+        The requests which keep failing are retried with a growing countdown, then parked
+        """
+        from geonode.indexing.tasks import update_queued_indexes
+
+        owner = get_user_model().objects.first()
+        resource = ResourceBase.objects.create(title="poison", uuid=str(uuid4()), owner=owner)
+        index_manager.queue_update(resource.id)
+        mock_schedule.reset_mock()
+
+        with patch(
+            "geonode.metadata.manager.metadata_manager.build_schema_instances",
+            side_effect=lambda resources: {r.id: {} for r in resources},
+        ):
+            for countdown in (10, 20):
+                update_queued_indexes()
+                mock_schedule.assert_called_once_with(countdown=countdown)
+                mock_schedule.reset_mock()
+
+            update_queued_indexes()
+            mock_schedule.assert_not_called()
+
+        stats = index_manager.get_queue_stats()
+        self.assertEqual((0, 1), (stats["pending"], stats["parked"]))
+
+        # the request is taken again once the resource is updated
+        index_manager.queue_update(resource.id)
+        self.assertEqual(1, index_manager.get_queue_stats()["pending"])
@@ -18,13 +18,17 @@
 #########################################################################
 
 import logging
+from uuid import uuid4
 
 from unittest.mock import patch, ANY
 
+from django.contrib.auth import get_user_model
 from django.test import override_settings
 
 from geonode.base.i18n import i18nCache
+from geonode.base.models import ResourceBase
 from geonode.indexing.manager import TSVectorIndexManager
+from geonode.indexing.models import ResourceIndex
 from geonode.tests.base import GeoNodeBaseTestSupport
 
 
@@ -200,6 +204,42 @@ class IndexingTests(GeoNodeBaseTestSupport):
 
             self._run_index_test(instance, mock_uoc, expected_calls)
 
+    def test_bulk_update_index(self):
+        """
+        The bulk path should write the same entries as the per-resource one
+        """
+        with override_settings(
+            LANGUAGE_CODE="en",
+            LANGUAGES=[("en", "English"), ("it", "Italiano")],
+            MULTILANG_FIELDS=["title"],
+            METADATA_INDEXES={
+                "idx1": ["title"],
+                "idx2": ["abstract"],
+            },
+        ):
+            r1 = ResourceBase.objects.create(title="r1", uuid=str(uuid4()), owner=get_user_model().objects.first())
+            r2 = ResourceBase.objects.create(title="r2", uuid=str(uuid4()), owner=get_user_model().objects.first())
+            instances = {
+                r1.id: {"title_multilang_en": "TheTitle", "title_multilang_it": "IlTitolo", "abstract": "abs"},
+                r2.id: {"title_multilang_en": "Other", "title_multilang_it": "Altro", "abstract": "abs2"},
+            }
+
+            im = TSVectorIndexManager()
+            im.update_index(r1.id, instances[r1.id])
+            expected = set(ResourceIndex.objects.filter(resource=r1).values_list("lang", "name", "vector"))
+            # stale entries should be replaced
+            ResourceIndex.objects.create(resource=r2, lang=None, name="idx1", vector="stale")
+
+            self.assertEqual(6, im.bulk_update_index(instances))
+
+            self.assertSetEqual(
+                expected, set(ResourceIndex.objects.filter(resource=r1).values_list("lang", "name", "vector"))
+            )
+            self.assertSetEqual(
+                {("en", "idx1"), ("it", "idx1"), (None, "idx2")},
+                set(ResourceIndex.objects.filter(resource=r2).values_list("lang", "name")),
+            )
+
     def _run_index_test(self, instance, mock_uoc, expected_calls):
         """
         Test the calls to update_or_create
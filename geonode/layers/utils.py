@@ -48,7 +48,7 @@ from geonode.utils import check_ogc_backend
 from geonode import GeoNodeException, geoserver
 from geonode.layers.models import cov_exts, Dataset
 from geonode.security.registry import permissions_registry
-from geonode.utils import HttpClient
+from geonode.utils import http_client
 from urllib.parse import urlencode
 from geonode.base.auth import get_or_create_token
 
@@ -398,5 +398,4 @@ def download_from_wfs(resource, download_format, user):
 
     _wfs_url = f"{settings.OGC_SERVER['default']['LOCATION']}ows?{urlencode(_wfs_params)}"
 
-    client = HttpClient()
-    return client.request(url=_wfs_url, method="get")
+    return http_client.request(url=_wfs_url, method="get")
@@ -19,11 +19,12 @@
 import logging
 
 from dal import autocomplete
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.viewsets import ViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import JsonResponse
@@ -103,7 +104,7 @@ class MetadataViewSet(ViewSet):
             lang = request.query_params.get("lang", get_language_from_request(request)[:2])
 
             if request.method == "GET":
-                schema_instance = metadata_manager.build_schema_instance(resource, lang)
+                schema_instance = metadata_manager.get_schema_instance(resource, lang)
                 return JsonResponse(
                     schema_instance, content_type="application/schema-instance+json", json_dumps_params={"indent": 3}
                 )
@@ -147,6 +148,82 @@ class MetadataViewSet(ViewSet):
             result = {"message": "The dataset was not found"}
             return Response(result, status=404)
 
+    # Apply the same partial instance to many resources
+    @action(
+        detail=False,
+        methods=["patch"],
+        url_path=r"instances",
+        url_name="schema_instances",
+        permission_classes=[IsAuthenticated],
+    )
+    def schema_instances(self, request):
+        lang = request.query_params.get("lang", get_language_from_request(request)[:2])
+        resource_ids = request.data.get("resources", None)
+        json_instance = request.data.get("instance", None)
+
+        if (
+            not isinstance(resource_ids, list)
+            or not all(isinstance(pk, int) for pk in resource_ids)
+            or not isinstance(json_instance, dict)
+        ):
+            return Response(
+                {"message": "The payload must contain a 'resources' list of ids and an 'instance' object."},
+                status=400,
+            )
+        max_resources = settings.METADATA_BULK_UPDATE_MAX_RESOURCES
+        if len(resource_ids) > max_resources:
+            return Response({"message": f"At most {max_resources} resources can be updated at once."}, status=400)
+
+        errors = {}
+        resources = []
+        found = {resource.pk: resource for resource in ResourceBase.objects.filter(pk__in=resource_ids)}
+        for pk in dict.fromkeys(resource_ids):
+            resource = found.get(pk, None)
+            # as for the sparse fields, don't reveal whether a resource the user can't see exists
+            if not resource or not permissions_registry.user_has_perm(request.user, resource, "view_resourcebase"):
+                MetadataHandler._set_error(errors, [str(pk)], "The resource was not found")
+            elif not permissions_registry.user_has_perm(request.user, resource, "change_resourcebase_metadata"):
+                MetadataHandler._set_error(errors, [str(pk)], "You don't have permission to edit this resource")
+            else:
+                resources.append(resource)
+
+        try:
+            for pk, res_errors in metadata_manager.update_schema_instances_partial(
+                resources, json_instance, request.user, lang
+            ).items():
+                errors[str(pk)] = res_errors
+        except Exception as e:
+            logger.warning(f"Error while updating schema instances: {e}")
+            for resource in resources:
+                MetadataHandler._set_error(
+                    errors, [str(resource.pk)], MetadataHandler.localize_message({}, "metadata_error_save", {"exc": e})
+                )
+
+        for resource in resources:
+            try:
+                resource.refresh_from_db()
+                resource.save()  # we want to trigger all the post_save signals
+            except Exception as e:
+                logger.warning(f"Error while saving resource {resource.pk}: {e}")
+                MetadataHandler._set_error(
+                    errors, [str(resource.pk)], MetadataHandler.localize_message({}, "metadata_error_save", {"exc": e})
+                )
+
+        msg_t = (
+            ("m_metadata_update_error", "Some errors were found while updating the resource")
+            if errors
+            else ("m_metadata_update_ok", "The resource was updated successfully")
+        )
+        msg = get_localized_label(lang, msg_t[0]) or msg_t[1]
+
+        response = {
+            "message": msg,
+            "updated": [resource.pk for resource in resources if str(resource.pk) not in errors],
+            "extraErrors": errors,
+        }
+
+        return Response(response, status=422 if errors else 200)
+
     @action(
         detail=False,
         methods=["get", "put", "delete"],
@@ -1,6 +1,9 @@
 import logging
+import threading
 
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 from django.utils.module_loading import import_string
 
 logger = logging.getLogger(__name__)
@@ -17,7 +20,12 @@ class MetadataConfig(AppConfig):
 
 
 def run_setup_hooks(*args, **kwargs):
+    from geonode.metadata.signals import connect_signals
+
     setup_metadata_handlers()
+    connect_signals()
+    if settings.I18N_CACHE_PREWARM:
+        request_started.connect(prewarm_schemas, weak=False, dispatch_uid="metadata_prewarm_schemas")
 
 
 def setup_metadata_handlers():
@@ -33,3 +41,27 @@ def setup_metadata_handlers():
     metadata_manager.post_init()
 
     logger.info(f"Metadata handlers from config: {', '.join(METADATA_HANDLERS)}")
+
+
+_prewarm_lock = threading.Lock()
+
+
+def prewarm_schemas(*args, **kwargs):
+    """
+    Build the schemas for all the languages in the background, when a process serves its first request,
+    so that the following requests do not wait for them
+    """
+    from django.db import connections
+    from geonode.metadata.manager import metadata_manager
+
+    with _prewarm_lock:
+        if not request_started.disconnect(dispatch_uid="metadata_prewarm_schemas"):
+            return
+
+    def _prewarm():
+        try:
+            metadata_manager.prewarm_schemas()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=_prewarm, name="metadata-prewarm-schemas", daemon=True).start()
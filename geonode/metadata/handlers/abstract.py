@@ -23,6 +23,8 @@ from collections import defaultdict
 
 from typing_extensions import deprecated
 
+from django.db.models import prefetch_related_objects
+
 from geonode.base.models import ResourceBase
 from geonode.base.i18n import OVR_SUFFIX, labelResolver
 
@@ -75,6 +77,31 @@ class MetadataHandler(metaclass=ABCMeta):
         """
         pass
 
+    def update_resources(
+        self, resources: list, field_name: str, json_instances: dict, contexts: dict, errors: dict, **kwargs
+    ):
+        """
+        Called when persisting the field `field_name` on many resources at once.
+        json_instances, contexts and errors are dicts keyed by resource id.
+        The default implementation calls update_resource on each resource: handlers may override it
+        in order to batch their DB work across the whole set.
+        """
+        for resource in resources:
+            try:
+                self.update_resource(
+                    resource, field_name, json_instances[resource.id], contexts[resource.id], errors[resource.id]
+                )
+            except Exception as e:
+                self._set_error(
+                    errors[resource.id],
+                    [],
+                    self.localize_message(
+                        contexts[resource.id],
+                        "metadata_error_update",
+                        {"fieldname": field_name, "handler": self.__class__.__name__, "exc": e},
+                    ),
+                )
+
     def pre_save(self, resource: ResourceBase, json_instance: dict, context: dict, errors: dict, **kwargs):
         """
         Called just after all the calls to update_resource, and just before ResourceBase.save()
@@ -93,6 +120,13 @@ class MetadataHandler(metaclass=ABCMeta):
         """
         pass
 
+    def load_batch_serialization_context(self, resources: list, jsonschema: dict, context: dict):
+        """
+        Called once before serializing many resources, in order to prefetch the data of the whole set.
+        The context is then copied and passed to load_serialization_context for each resource.
+        """
+        pass
+
     def post_serialization(self, resource: ResourceBase, jsonschema: dict, instance: dict, context: dict):
         """
         Called after calls to get_jsonschema_instance in order to fixup instance values
@@ -149,6 +183,53 @@ class MetadataHandler(metaclass=ABCMeta):
 
         jsonschema["properties"] = ret_properties
 
+    @staticmethod
+    def _prefetch_related(resources: list, *lookups):
+        """
+        Prefetch the lookups on the resources, grouping them by model since they may be of different types
+        """
+        by_model = defaultdict(list)
+        for resource in resources:
+            by_model[type(resource)].append(resource)
+        for group in by_model.values():
+            prefetch_related_objects(group, *lookups)
+
+    @staticmethod
+    def _bulk_set_m2m(through, source: str, target: str, related_ids: dict):
+        """
+        Replace the related objects of many resources, as calling `set()` on each of them would do,
+        with a query for reading the current relations, one for deleting and one for inserting.
+        No m2m_changed signal is sent.
+
+        :param through: the intermediate model of the relation
+        :param source: the name of the column pointing to the resource
+        :param target: the name of the column pointing to the related object
+        :param related_ids: a dict resource id -> set of related object ids
+        """
+        if not related_ids:
+            return
+
+        current = defaultdict(set)
+        stale = []
+        for row_id, resource_id, related_id in through.objects.filter(
+            **{f"{source}__in": list(related_ids.keys())}
+        ).values_list("id", source, target):
+            if related_id in related_ids[resource_id]:
+                current[resource_id].add(related_id)
+            else:
+                stale.append(row_id)
+
+        if stale:
+            through.objects.filter(id__in=stale).delete()
+        through.objects.bulk_create(
+            [
+                through(**{source: resource_id, target: related_id})
+                for resource_id, ids in related_ids.items()
+                for related_id in ids - current[resource_id]
+            ],
+            ignore_conflicts=True,
+        )
+
     @staticmethod
     def _set_error(errors: dict, path: list, msg: str):
         logger.info(f"Setting error: {'/'.join(path)}: {msg}")
@@ -22,9 +22,10 @@ import logging
 from datetime import datetime
 
 from rest_framework.reverse import reverse
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import gettext as _
 
-from geonode.base.models import TopicCategory, License, RestrictionCodeType, SpatialRepresentationType
+from geonode.base.models import ResourceBase, TopicCategory, License, RestrictionCodeType, SpatialRepresentationType
 from geonode.metadata.handlers.abstract import MetadataHandler
 from geonode.metadata.settings import JSONSCHEMA_BASE
 from geonode.base.enumerations import ALL_LANGUAGES, UPDATE_FREQUENCIES
@@ -206,6 +207,19 @@ class BaseHandler(MetadataHandler):
 
         return jsonschema
 
+    def load_batch_serialization_context(self, resources, jsonschema, context):
+        # load the related objects (category, license, ...) of the whole set at once
+        related = []
+        for property_name, subschema in jsonschema["properties"].items():
+            if subschema.get("geonode:handler", None) != "base":
+                continue
+            try:
+                if ResourceBase._meta.get_field(property_name).is_relation:
+                    related.append(property_name)
+            except FieldDoesNotExist:
+                pass
+        self._prefetch_related(resources, *related)
+
     def get_jsonschema_instance(self, resource, field_name, context, errors, lang=None):
         field_value = getattr(resource, field_name)
 
@@ -18,6 +18,8 @@
 #########################################################################
 
 import logging
+from collections import defaultdict
+
 from rest_framework.reverse import reverse
 
 from django.conf import settings
@@ -25,6 +27,7 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
 
 from geonode.base.i18n import labelResolver
+from geonode.base.models import ContactRole
 from geonode.metadata.handlers.abstract import MetadataHandler
 from geonode.people import Roles
 from geonode.resource.registry import resource_manager_registry
@@ -48,6 +51,8 @@ ROLE_NAMES_MAP = {
 
 NAMES_ROLE_MAP = {v: k for k, v in ROLE_NAMES_MAP.items()}
 
+CONTEXT_ID = "contacts"
+
 
 class ContactHandler(MetadataHandler):
     """
@@ -119,19 +124,42 @@ class ContactHandler(MetadataHandler):
 
         return jsonschema
 
+    @staticmethod
+    def _load_contacts(resources):
+        contacts = defaultdict(list)
+        for contact_role in ContactRole.objects.filter(resource__in=[r.id for r in resources]).select_related(
+            "contact"
+        ):
+            contacts[(contact_role.resource_id, contact_role.role)].append(contact_role.contact)
+        return contacts
+
+    def load_batch_serialization_context(self, resources, jsonschema, context):
+        self._prefetch_related(resources, "owner")
+        context[CONTEXT_ID] = self._load_contacts(resources)
+
+    def load_serialization_context(self, resource, jsonschema, context):
+        # read all the roles in a single query, unless they have been loaded for a batch
+        if CONTEXT_ID not in context:
+            context[CONTEXT_ID] = self._load_contacts([resource])
+
     def get_jsonschema_instance(self, resource, field_name, context, errors, lang=None):
         def __create_user_entry(user):
             names = [n for n in (user.first_name, user.last_name) if n]
             postfix = f" ({' '.join(names)})" if names else ""
             return {"id": str(user.id), "label": f"{user.username}{postfix}"}
 
+        def __get_users(rolename):
+            if CONTEXT_ID in context:
+                return context[CONTEXT_ID].get((resource.id, rolename), [])
+            return resource.__get_contact_role_elements__(rolename)
+
         contacts = {}
         for role in Roles:
             rolename = ROLE_NAMES_MAP[role]
             if role.is_multivalue:
-                content = [__create_user_entry(user) for user in resource.__get_contact_role_elements__(rolename) or []]
+                content = [__create_user_entry(user) for user in __get_users(rolename) or []]
             else:
-                users = resource.__get_contact_role_elements__(rolename)
+                users = __get_users(rolename)
                 if not users and role == Roles.OWNER:
                     users = [resource.owner]
                 content = __create_user_entry(users[0]) if users else None
@@ -20,8 +20,11 @@
 import logging
 from rest_framework.reverse import reverse
 
+from django.db import transaction
+from django.utils.html import escape
 from django.utils.translation import gettext as _
 
+from geonode.base.models import HierarchicalKeyword, TaggedContentItem
 from geonode.metadata.handlers.abstract import MetadataHandler
 from geonode.resource.utils import KeywordHandler
 
@@ -51,6 +54,9 @@ class HKeywordHandler(MetadataHandler):
         self._add_subschema(jsonschema, "hkeywords", subschema, after_what="tkeywords")
         return jsonschema
 
+    def load_batch_serialization_context(self, resources, jsonschema, context):
+        self._prefetch_related(resources, "keywords")
+
     def get_jsonschema_instance(self, resource, field_name, context, errors, lang=None):
         return [keyword.name for keyword in resource.keywords.all()]
 
@@ -60,3 +66,37 @@ class HKeywordHandler(MetadataHandler):
         cleaned = [k for k in hkeywords if k]
         logger.debug(f"hkeywords: {hkeywords} --> {cleaned}")
         KeywordHandler(resource, cleaned).set_keywords()
+
+    def update_resources(self, resources, field_name, json_instances, contexts, errors, **kwargs):
+        # as in KeywordHandler, an empty list leaves the current keywords untouched
+        requested = {}
+        for resource in resources:
+            if cleaned := {k for k in json_instances[resource.id]["hkeywords"] if k}:
+                requested[resource.id] = cleaned
+
+        all_names = set().union(*requested.values())
+        kw_ids = dict(HierarchicalKeyword.objects.filter(name__in=all_names).values_list("name", "id"))
+        # create the missing keywords once for the whole set
+        for name in all_names - kw_ids.keys():
+            escaped = escape(name)
+            keyword = None
+            try:
+                with transaction.atomic():
+                    keyword = HierarchicalKeyword.add_root(name=escaped)
+            except Exception as e:
+                logger.exception(e)
+            keyword = keyword or HierarchicalKeyword.objects.filter(name=escaped).first()
+            if keyword:
+                kw_ids[name] = keyword.id
+            else:
+                logger.error(f"Error during the keyword creation for keyword: {name}")
+
+        self._bulk_set_m2m(
+            TaggedContentItem,
+            "content_object_id",
+            "tag_id",
+            {
+                resource_id: {kw_ids[name] for name in names if name in kw_ids}
+                for resource_id, names in requested.items()
+            },
+        )
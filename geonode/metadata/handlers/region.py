@@ -22,7 +22,7 @@ from rest_framework.reverse import reverse
 
 from django.utils.translation import gettext as _
 
-from geonode.base.models import Region
+from geonode.base.models import Region, ResourceBase
 from geonode.metadata.handlers.abstract import MetadataHandler
 
 logger = logging.getLogger(__name__)
@@ -57,6 +57,9 @@ class RegionHandler(MetadataHandler):
 
         return jsonschema
 
+    def load_batch_serialization_context(self, resources, jsonschema, context):
+        self._prefetch_related(resources, "regions")
+
     def get_jsonschema_instance(self, resource, field_name, context, errors, lang=None):
         return [{"id": str(r.id), "label": r.name} for r in resource.regions.all()]
 
@@ -67,3 +70,23 @@ class RegionHandler(MetadataHandler):
 
         regions = Region.objects.filter(id__in=new_ids)
         resource.regions.set(regions)
+
+    def update_resources(self, resources, field_name, json_instances, contexts, errors, **kwargs):
+        requested = {
+            resource.id: {str(item["id"]) for item in json_instances[resource.id][field_name]} for resource in resources
+        }
+
+        # only keep the existing regions, reading them in a single query
+        existing = {
+            str(region_id)
+            for region_id in Region.objects.filter(
+                id__in=[region_id for ids in requested.values() for region_id in ids if region_id.isdigit()]
+            ).values_list("id", flat=True)
+        }
+
+        self._bulk_set_m2m(
+            ResourceBase.regions.through,
+            "resourcebase_id",
+            "region_id",
+            {resource_id: {int(i) for i in ids if i in existing} for resource_id, ids in requested.items()},
+        )
@@ -19,6 +19,7 @@
 import copy
 import json
 import logging
+from collections import defaultdict
 
 from rest_framework.reverse import reverse
 
@@ -31,6 +32,7 @@ from geonode.base.i18n import get_localized_tkeywords, labelResolver
 logger = logging.getLogger(__name__)
 
 CONTEXT_ID = "sparse"
+BATCH_CONTEXT_ID = "sparse_batch"
 
 
 class SparseFieldRegistry:
@@ -123,10 +125,25 @@ class SparseHandler(MetadataHandler):
 
         return jsonschema
 
+    def load_batch_serialization_context(self, resources, jsonschema: dict, context: dict):
+        logger.debug(f"Preloading sparse fields {self.registry.fields().keys()} for {len(resources)} resources")
+        qs = SparseField.objects.filter(resource__in=[r.id for r in resources])
+        # same filtering as SparseField.get_fields
+        if names := self.registry.fields().keys():
+            qs = qs.filter(name__in=names)
+        fields = defaultdict(dict)
+        for f in qs:
+            fields[f.resource_id][f.name] = f.value
+        context[BATCH_CONTEXT_ID] = fields
+
     def load_serialization_context(self, resource, jsonschema: dict, context: dict):
-        logger.debug(f"Preloading sparse fields {self.registry.fields().keys()}")
+        if BATCH_CONTEXT_ID in context:
+            fields = dict(context[BATCH_CONTEXT_ID].get(resource.id, {}))
+        else:
+            logger.debug(f"Preloading sparse fields {self.registry.fields().keys()}")
+            fields = {f.name: f.value for f in SparseField.get_fields(resource, names=self.registry.fields().keys())}
         context[CONTEXT_ID] = {
-            "fields": {f.name: f.value for f in SparseField.get_fields(resource, names=self.registry.fields().keys())},
+            "fields": fields,
             "schema": jsonschema,
         }
 
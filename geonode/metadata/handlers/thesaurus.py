@@ -21,10 +21,10 @@ import logging
 
 from rest_framework.reverse import reverse
 
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.utils.translation import gettext as _
 
-from geonode.base.models import Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
+from geonode.base.models import ResourceBase, Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
 from geonode.metadata.handlers.abstract import MetadataHandler
 
 
@@ -32,6 +32,7 @@ logger = logging.getLogger(__name__)
 
 
 TKEYWORDS = "tkeywords"
+CONTEXT_LABELS = "tkeywords_labels"
 
 
 class TKeywordsHandler(MetadataHandler):
@@ -137,19 +138,37 @@ class TKeywordsHandler(MetadataHandler):
 
         return jsonschema
 
+    def load_batch_serialization_context(self, resources, jsonschema, context):
+        self._prefetch_related(
+            resources, Prefetch("tkeywords", queryset=ThesaurusKeyword.objects.select_related("thesaurus"))
+        )
+        kw_ids = {tk.id for resource in resources for tk in resource.tkeywords.all()}
+        # the labels of the keywords of the whole set, read in a single query
+        context[CONTEXT_LABELS] = dict(
+            ThesaurusKeywordLabel.objects.filter(keyword__id__in=kw_ids, lang=context.get("lang", None)).values_list(
+                "keyword_id", "label"
+            )
+        )
+
     def get_jsonschema_instance(self, resource, field_name, context, errors, lang=None):
         tks = {}
         for tk in resource.tkeywords.all():
             tks[tk.id] = tk
-        tkls = ThesaurusKeywordLabel.objects.filter(
-            keyword__id__in=tks.keys(), lang=lang
-        )  # read all entries in a single query
+        if CONTEXT_LABELS in context:
+            tkls = [(tks[kw_id], label) for kw_id, label in context[CONTEXT_LABELS].items() if kw_id in tks]
+        else:
+            tkls = [
+                (tkl.keyword, tkl.label)
+                for tkl in ThesaurusKeywordLabel.objects.filter(keyword__id__in=tks.keys(), lang=lang).select_related(
+                    "keyword__thesaurus"
+                )
+            ]  # read all entries in a single query
 
         ret = {}
-        for tkl in tkls:
-            keywords = ret.setdefault(tkl.keyword.thesaurus.identifier, [])
-            keywords.append({"id": tkl.keyword.about, "label": tkl.label})
-            del tks[tkl.keyword.id]
+        for tk, label in tkls:
+            keywords = ret.setdefault(tk.thesaurus.identifier, [])
+            keywords.append({"id": tk.about, "label": label})
+            del tks[tk.id]
 
         if tks:
             logger.info(f"Returning untranslated '{lang}' keywords: {tks}")
@@ -168,3 +187,28 @@ class TKeywordsHandler(MetadataHandler):
 
         kw_requested = ThesaurusKeyword.objects.filter(about__in=kids)
         resource.tkeywords.set(kw_requested)
+
+    def update_resources(self, resources, field_name, json_instances, contexts, errors, **kwargs):
+        abouts = {}
+        for resource in resources:
+            abouts[resource.id] = {
+                keyword["id"]
+                for keywords in json_instances[resource.id].get(TKEYWORDS, {}).values()
+                for keyword in keywords
+            }
+
+        # resolve the keywords of the whole set in a single query
+        kw_ids = {}
+        all_abouts = set().union(*abouts.values())
+        for about, kw_id in ThesaurusKeyword.objects.filter(about__in=all_abouts).values_list("about", "id"):
+            kw_ids.setdefault(about, set()).add(kw_id)
+
+        self._bulk_set_m2m(
+            ResourceBase.tkeywords.through,
+            "resourcebase_id",
+            "thesauruskeyword_id",
+            {
+                resource_id: {kw_id for about in res_abouts for kw_id in kw_ids.get(about, ())}
+                for resource_id, res_abouts in abouts.items()
+            },
+        )
@@ -21,6 +21,8 @@ import logging
 import copy
 from types import SimpleNamespace
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import gettext as _
 
 from geonode.base.models import ResourceBase
@@ -33,6 +35,7 @@ from geonode.metadata.settings import MODEL_SCHEMA
 logger = logging.getLogger(__name__)
 
 CACHE_KEY_SCHEMA = "schema"
+CACHE_KEY_INSTANCE = "metadata_instance"
 
 
 class MetadataManager:
@@ -92,11 +95,44 @@ class MetadataManager:
             i18nCache.set(lang, CACHE_KEY_SCHEMA, schema, thesaurus_date)
         return schema
 
+    def prewarm_schemas(self, langs=None):
+        """
+        Build and cache the schema for the given languages, all the configured ones by default
+        """
+        langs = langs or list(dict.fromkeys(code.split("-")[0] for code, _name in settings.LANGUAGES))
+        for lang in langs:
+            try:
+                self.get_schema(lang)
+            except Exception as e:
+                logger.warning(f"Could not prewarm the schema for {lang}: {e}")
+        logger.info(f"Schemas prewarmed for languages {', '.join(langs)}")
+
     def build_schema_instance(self, resource, lang=None):
         schema = self.get_schema(lang)
-
         context = self._init_schema_context(lang)
+        return self._build_schema_instance(resource, schema, context, lang)
 
+    def build_schema_instances(self, resources, lang=None) -> dict:
+        """
+        Build the instances of many resources, sharing the schema and the data the handlers
+        prefetch for the whole set.
+        Returns a dict resource id -> instance; the resources that could not be serialized are logged and skipped.
+        """
+        schema = self.get_schema(lang)
+        batch_context = self._init_schema_context(lang)
+
+        for handler in self.handlers.values():
+            handler.load_batch_serialization_context(resources, schema, batch_context)
+
+        instances = {}
+        for resource in resources:
+            try:
+                instances[resource.id] = self._build_schema_instance(resource, schema, dict(batch_context), lang)
+            except Exception as e:
+                logger.error(f"Error building the metadata instance for {resource.id}: {e}", exc_info=e)
+        return instances
+
+    def _build_schema_instance(self, resource, schema, context, lang=None):
         for handler in self.handlers.values():
             handler.load_serialization_context(resource, schema, context)
 
@@ -128,6 +164,85 @@ class MetadataManager:
 
         return instance
 
+    @staticmethod
+    def _get_instance_cache_key(resource_id, lang):
+        return f"{CACHE_KEY_INSTANCE}:{resource_id}:{lang}"
+
+    @staticmethod
+    def _get_instance_cache_langs():
+        return ["None"] + list(dict.fromkeys(code.split("-")[0] for code, _name in settings.LANGUAGES))
+
+    @staticmethod
+    def _get_instance_cache_stamp(resource, schema_version):
+        # the cached instance is valid as long as the resource and the schema are not updated
+        last_updated = resource.last_updated.isoformat() if resource.last_updated else None
+        return last_updated, schema_version
+
+    def get_schema_instance(self, resource, lang=None):
+        """
+        Return the instance of the resource from the cache, building it if missing or stale
+        """
+        return self.get_schema_instances([resource], lang)[resource.id]
+
+    def get_schema_instances(self, resources, lang=None) -> dict:
+        """
+        Return the instances of many resources from the cache, building the missing or stale ones in a batch.
+        Returns a dict resource id -> instance; the resources that could not be serialized are skipped.
+        """
+        timeout = settings.METADATA_INSTANCE_CACHE_TIMEOUT
+        if not timeout or str(lang) not in self._get_instance_cache_langs():
+            return (
+                {resource.id: self.build_schema_instance(resource, lang) for resource in resources}
+                if len(resources) == 1
+                else self.build_schema_instances(resources, lang)
+            )
+
+        keys = {resource.id: self._get_instance_cache_key(resource.id, lang) for resource in resources}
+        cached = cache.get_many(keys.values())
+
+        schema_version = str(i18nCache.get_version())
+        instances = {}
+        missing = []
+        for resource in resources:
+            stamp = self._get_instance_cache_stamp(resource, schema_version)
+            entry = cached.get(keys[resource.id], None)
+            if entry and entry[0] == stamp:
+                instances[resource.id] = entry[1]
+            else:
+                missing.append((resource, stamp))
+
+        if missing:
+            logger.debug(f"Building {len(missing)} metadata instances for lang {lang}")
+            built = (
+                {missing[0][0].id: self.build_schema_instance(missing[0][0], lang)}
+                if len(missing) == 1
+                else self.build_schema_instances([resource for resource, _stamp in missing], lang)
+            )
+            cache.set_many(
+                {
+                    keys[resource.id]: (stamp, built[resource.id])
+                    for resource, stamp in missing
+                    # the instances carrying errors are not cached
+                    if resource.id in built and "extraErrors" not in built[resource.id]
+                },
+                timeout=timeout,
+            )
+            instances.update(built)
+
+        return instances
+
+    def invalidate_schema_instances(self, resource_ids):
+        """
+        Drop the cached instances of the resources, in all the languages
+        """
+        cache.delete_many(
+            [
+                self._get_instance_cache_key(resource_id, lang)
+                for resource_id in resource_ids
+                for lang in self._get_instance_cache_langs()
+            ]
+        )
+
     def update_schema_instance(self, resource, request_obj, lang=None, partial=None) -> dict:
         # Definition of the json instance
         json_instance = request_obj.data
@@ -203,8 +318,10 @@ class MetadataManager:
                     ),
                 )
 
+        self.invalidate_schema_instances([resource.id])
+
         try:
-            index_manager.update_index(resource.id, json_instance)
+            index_manager.request_update(resource.id, json_instance)
         except Exception as e:
             logger.error("Error while indexing", exc_info=e)
             MetadataHandler._set_error(
@@ -229,6 +346,159 @@ class MetadataManager:
         fake_req = SimpleNamespace(data=old_instance, user=user)
         return self.update_schema_instance(resource, fake_req, lang, partial=set(json_instance.keys()))
 
+    def update_schema_instances_partial(self, resources, json_instance, user, lang=None) -> dict:
+        """
+        Apply the same partial instance to many resources.
+        The schema is loaded once, each field is persisted on the whole set by the handler's update_resources,
+        the base fields are written with one update for each distinct set of values and the indexes are
+        updated in a single pass at the end.
+        Returns a dict resource id -> errors, only containing the resources with errors.
+        """
+        if not json_instance or not resources:
+            return {}
+
+        resources = [resource.get_real_instance() for resource in resources]
+        schema = self.get_schema()
+
+        # as in update_schema_instance_partial, the handlers are given the whole merged instance
+        old_instances = self.build_schema_instances(resources, lang)
+        for resource in resources:
+            # the handlers must not read the relations prefetched for the serialization, which they are updating
+            resource.__dict__.pop("_prefetched_objects_cache", None)
+        failed = [resource for resource in resources if resource.id not in old_instances]
+        resources = [resource for resource in resources if resource.id in old_instances]
+
+        instances, contexts, errors, partials = {}, {}, {}, {}
+        for resource in failed:
+            MetadataHandler._set_error(
+                errors.setdefault(resource.id, {}),
+                [],
+                MetadataHandler.localize_message(
+                    self._init_schema_context(lang), "metadata_error_save", {"exc": "the metadata could not be read"}
+                ),
+            )
+
+        for resource in resources:
+            instance = old_instances[resource.id]
+            instance.update(copy.deepcopy(json_instance))
+
+            context = self._init_schema_context(lang)
+            context["user"] = user
+            for handler in self.handlers.values():
+                handler.load_deserialization_context(resource, schema, context)
+            context["errors"] = errors[resource.id] = {}
+
+            partial = set(json_instance.keys())
+            for handler in self.handlers.values():
+                handler.pre_deserialization(resource, schema, instance, partial, context)
+
+            instances[resource.id] = instance
+            contexts[resource.id] = context
+            partials[resource.id] = partial
+
+        for fieldname, subschema in schema["properties"].items():
+            targets = [resource for resource in resources if fieldname in partials[resource.id]]
+            if not targets:
+                continue
+            logger.debug(f"Storing partial field {fieldname} on {len(targets)} resources")
+            handler = self.handlers[subschema["geonode:handler"]]
+            try:
+                handler.update_resources(targets, fieldname, instances, contexts, errors)
+            except Exception as e:
+                for resource in targets:
+                    MetadataHandler._set_error(
+                        errors[resource.id],
+                        [],
+                        MetadataHandler.localize_message(
+                            contexts[resource.id],
+                            "metadata_error_update",
+                            {"fieldname": fieldname, "handler": handler.__class__.__name__, "exc": e},
+                        ),
+                    )
+
+        for resource in resources:
+            for handler in self.handlers.values():
+                try:
+                    handler.pre_save(resource, instances[resource.id], contexts[resource.id], errors[resource.id])
+                except Exception as e:
+                    logger.error(f"Error in pre_save: handler {handler.__class__.__name__}", exc_info=e)
+                    MetadataHandler._set_error(
+                        errors[resource.id],
+                        [],
+                        MetadataHandler.localize_message(
+                            contexts[resource.id],
+                            "metadata_error_pre_save",
+                            {"handler": handler.__class__.__name__, "exc": e},
+                        ),
+                    )
+
+        self._bulk_update_base_fields(resources, contexts, errors)
+
+        for resource in resources:
+            for handler in self.handlers.values():
+                try:
+                    handler.post_save(resource, instances[resource.id], contexts[resource.id], errors[resource.id])
+                except Exception as e:
+                    logger.error(f"Error in post_save: handler {handler.__class__.__name__}", exc_info=e)
+                    MetadataHandler._set_error(
+                        errors[resource.id],
+                        [],
+                        MetadataHandler.localize_message(
+                            contexts[resource.id],
+                            "metadata_error_post_save",
+                            {"handler": handler.__class__.__name__, "exc": e},
+                        ),
+                    )
+
+        self.invalidate_schema_instances(instances.keys())
+
+        try:
+            index_manager.request_bulk_update(instances)
+        except Exception as e:
+            logger.error("Error while indexing", exc_info=e)
+            for resource in resources:
+                MetadataHandler._set_error(
+                    errors[resource.id],
+                    [],
+                    MetadataHandler.localize_message(contexts[resource.id], "metadata_error_indexing", {"exc": e}),
+                )
+
+        return {resource_id: res_errors for resource_id, res_errors in errors.items() if res_errors}
+
+    @staticmethod
+    def _bulk_update_base_fields(resources, contexts, errors):
+        """
+        Write the base fields collected by the handlers, grouping the resources sharing the same values.
+        The values are already set on the in-memory resources, so they are not reloaded from the db.
+        """
+        groups = {}
+        for resource in resources:
+            if basefields := contexts[resource.id].get("base", None):
+                try:
+                    key = tuple(sorted(basefields.items()))
+                    hash(key)
+                except TypeError:
+                    # unhashable values: the resource gets its own update
+                    key = resource.id
+                groups.setdefault(key, (basefields, []))[1].append(resource)
+
+        for basefields, group in groups.values():
+            try:
+                ResourceBase.objects.filter(id__in=[r.id for r in group]).update(**basefields)
+                concrete_ids = {}
+                for resource in group:
+                    concrete_ids.setdefault(resource.get_real_concrete_instance_class(), []).append(resource.id)
+                for concrete_class, ids in concrete_ids.items():
+                    concrete_class.objects.filter(id__in=ids).update(**basefields)
+            except Exception as e:
+                logger.warning(f"Error while updating schema instances: {e}", exc_info=e)
+                for resource in group:
+                    MetadataHandler._set_error(
+                        errors[resource.id],
+                        [],
+                        MetadataHandler.localize_message(contexts[resource.id], "metadata_error_save", {"exc": e}),
+                    )
+
 
 def _create_test_errors(schema, errors, path, msg_template, create_message=True):
     if create_message:
@@ -0,0 +1,55 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from geonode.base.models import ContactRole, LinkedResource, ResourceBase
+
+logger = logging.getLogger(__name__)
+
+
+def connect_signals():
+    """
+    Drop the cached metadata instances depending on data saved without updating their resource
+    """
+    logger.debug("Connecting metadata instance cache signals...")
+    for signal in (post_save, post_delete):
+        signal.connect(linkedresource_changed, sender=LinkedResource, weak=False, dispatch_uid="metadata_instance_lr")
+        signal.connect(contactrole_changed, sender=ContactRole, weak=False, dispatch_uid="metadata_instance_cr")
+    # the subclasses of ResourceBase send their own signals
+    post_save.connect(resource_changed, weak=False, dispatch_uid="metadata_instance_rb")
+    post_save.connect(profile_changed, sender=get_user_model(), weak=False, dispatch_uid="metadata_instance_user")
+    logger.debug("Metadata instance cache signals connected")
+
+
+def _invalidate(resource_ids):
+    from geonode.metadata.manager import metadata_manager
+
+    if resource_ids:
+        metadata_manager.invalidate_schema_instances(set(resource_ids))
+
+
+def linkedresource_changed(sender, instance, **kwargs):
+    if settings.METADATA_INSTANCE_CACHE_TIMEOUT:
+        _invalidate([instance.source_id])
+
+
+def contactrole_changed(sender, instance, **kwargs):
+    if settings.METADATA_INSTANCE_CACHE_TIMEOUT:
+        _invalidate([instance.resource_id])
+
+
+def resource_changed(sender, instance, **kwargs):
+    # the instances of the resources linking to this one hold its title
+    if isinstance(instance, ResourceBase) and settings.METADATA_INSTANCE_CACHE_TIMEOUT:
+        _invalidate(LinkedResource.objects.filter(target_id=instance.pk).values_list("source_id", flat=True))
+
+
+def profile_changed(sender, instance, **kwargs):
+    # the instances of the resources owned by the user, or having the user as a contact, hold the user's names
+    if settings.METADATA_INSTANCE_CACHE_TIMEOUT:
+        _invalidate(
+            list(ResourceBase.objects.filter(owner=instance).values_list("id", flat=True))
+            + list(ContactRole.objects.filter(contact=instance).values_list("resource_id", flat=True))
+        )
@@ -32,6 +32,7 @@ from geonode.people import Roles
 
 from geonode.base.i18n import i18nCache
 from geonode.base.models import (
+    HierarchicalKeyword,
     ResourceBase,
     TopicCategory,
     RestrictionCodeType,
@@ -972,6 +973,33 @@ class HandlersTests(GeoNodeBaseTestSupport):
             sorted([updated_region_1, updated_region_2, region_3], key=lambda region: region.name),
         )
 
+    def test_region_handler_update_resources(self):
+        """
+        The regions of many resources are replaced at once, ignoring the missing ones
+        """
+        region_1 = Region.objects.get(code="GLO")
+        region_2 = Region.objects.get(code="ITA")
+        region_3 = Region.objects.get(code="GRC")
+        self.resource.regions.add(region_1, region_2)
+        self.extra_resource_1.regions.add(region_1)
+
+        resources = [self.resource, self.extra_resource_1, self.extra_resource_2]
+        json_instances = {
+            self.resource.id: {"regions": [{"id": str(region_2.id)}, {"id": str(region_3.id)}]},
+            self.extra_resource_1.id: {"regions": [{"id": str(region_3.id)}, {"id": "999999"}]},
+            self.extra_resource_2.id: {"regions": []},
+        }
+        errors = {r.id: {} for r in resources}
+
+        self.region_handler.update_resources(
+            resources, "regions", json_instances, {r.id: self.context for r in resources}, errors
+        )
+
+        self.assertCountEqual(self.resource.regions.all(), [region_2, region_3])
+        self.assertCountEqual(self.extra_resource_1.regions.all(), [region_3])
+        self.assertEqual(self.extra_resource_2.regions.count(), 0)
+        self.assertEqual(errors, {r.id: {} for r in resources})
+
     # Tests for the linkedresource handler
 
     @patch("geonode.metadata.handlers.linkedresource.reverse")
@@ -1237,6 +1265,34 @@ class HandlersTests(GeoNodeBaseTestSupport):
         expected_keywords = ["valid keyword"]
         self.assertCountEqual(keyword_names, expected_keywords)
 
+    def test_hkeywords_handler_update_resources(self):
+        """
+        The keywords of many resources are set at once, creating the missing ones only once
+        """
+        KeywordHandler(self.extra_resource_1, ["old keyword"]).set_keywords()
+        KeywordHandler(self.extra_resource_2, ["old keyword"]).set_keywords()
+
+        resources = [self.resource, self.extra_resource_1, self.extra_resource_2]
+        json_instances = {
+            self.resource.id: {"hkeywords": ["shared keyword", "new keyword"]},
+            self.extra_resource_1.id: {"hkeywords": ["shared keyword", None]},
+            self.extra_resource_2.id: {"hkeywords": []},
+        }
+
+        self.hkeyword_handler.update_resources(
+            resources,
+            "hkeywords",
+            json_instances,
+            {r.id: self.context for r in resources},
+            {r.id: {} for r in resources},
+        )
+
+        self.assertCountEqual([k.name for k in self.resource.keywords.all()], ["shared keyword", "new keyword"])
+        self.assertCountEqual([k.name for k in self.extra_resource_1.keywords.all()], ["shared keyword"])
+        # as in update_resource, an empty list leaves the keywords untouched
+        self.assertCountEqual([k.name for k in self.extra_resource_2.keywords.all()], ["old keyword"])
+        self.assertEqual(HierarchicalKeyword.objects.filter(name="shared keyword").count(), 1)
+
     # Tests for contact handler
     @patch("geonode.metadata.handlers.contact.reverse")
     def test_contact_handler_update_schema(self, mock_reverse):
@@ -1308,6 +1364,29 @@ class HandlersTests(GeoNodeBaseTestSupport):
         self.assertEqual(author_entry[0]["id"], str(author_role.id))
         self.assertEqual(author_entry[0]["label"], f"{author_role.username}")
 
+    def test_contact_handler_batch_serialization(self):
+        """
+        The contacts loaded for a batch are the same as the ones read for each resource
+        """
+        author = get_user_model().objects.create_user("author_role", "author_role@fakemail.com", is_active=True)
+        ContactRole.objects.create(resource=self.resource, role=ROLE_NAMES_MAP[Roles.METADATA_AUTHOR], contact=author)
+        ContactRole.objects.create(resource=self.extra_resource_1, role=ROLE_NAMES_MAP[Roles.POC], contact=author)
+        resources = [self.resource, self.extra_resource_1]
+
+        expected = {
+            r.id: self.contact_handler.get_jsonschema_instance(r, "contacts", {}, self.errors, self.lang)
+            for r in resources
+        }
+
+        context = {}
+        self.contact_handler.load_batch_serialization_context(resources, self.fake_schema, context)
+        with self.assertNumQueries(0):
+            result = {
+                r.id: self.contact_handler.get_jsonschema_instance(r, "contacts", dict(context), self.errors, self.lang)
+                for r in resources
+            }
+        self.assertEqual(result, expected)
+
     def test_contact_handler_update_resource(self):
 
         field_name = "contacts"
@@ -1499,6 +1578,33 @@ class HandlersTests(GeoNodeBaseTestSupport):
         self.assertEqual(len(inspire_themes_keywords), 1)
         self.assertEqual(inspire_themes_keywords, [{"id": "http://example.com/keyword2", "label": "Alt Label 2"}])
 
+    def test_tkeywords_handler_batch_serialization(self):
+        """
+        The keywords and labels loaded for a batch are the same as the ones read for each resource
+        """
+        ThesaurusKeywordLabel.objects.create(keyword=self.keyword1, lang="en", label="Localized Label 1")
+        self.resource.tkeywords.add(self.keyword1, self.keyword2)
+        self.extra_resource_1.tkeywords.add(self.keyword1)
+        resources = [self.resource, self.extra_resource_1, self.extra_resource_2]
+
+        expected = {
+            r.id: self.tkeywords_handler.get_jsonschema_instance(r, "tkeywords", {"lang": "en"}, self.errors, "en")
+            for r in resources
+        }
+
+        context = {"lang": "en"}
+        self.tkeywords_handler.load_batch_serialization_context(resources, self.fake_schema, context)
+        with self.assertNumQueries(0):
+            result = {
+                r.id: self.tkeywords_handler.get_jsonschema_instance(r, "tkeywords", dict(context), self.errors, "en")
+                for r in resources
+            }
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            result[self.resource.id]["3-2-4-3-spatialscope"],
+            [{"id": "http://example.com/keyword1", "label": "Localized Label 1"}],
+        )
+
     def test_tkeywords_handler_update_resource(self):
         """
         Ensures that the method will import the keyword1 and
@@ -1544,6 +1650,39 @@ class HandlersTests(GeoNodeBaseTestSupport):
         # Ensure that only the keyword1 and keyword2 are stored in the database
         self.assertEqual(len(updated_keywords), 2)
 
+    def test_tkeywords_handler_update_resources(self):
+        """
+        The thesaurus keywords of many resources are replaced with a few queries
+        """
+        self.resource.tkeywords.add(self.keyword1)
+        self.extra_resource_1.tkeywords.add(self.keyword1, self.keyword2)
+
+        resources = [self.resource, self.extra_resource_1, self.extra_resource_2]
+        json_instances = {
+            self.resource.id: {"tkeywords": {"thes-1": [{"id": "http://example.com/keyword1"}]}},
+            self.extra_resource_1.id: {"tkeywords": {"thes-2": [{"id": "http://example.com/keyword2"}]}},
+            self.extra_resource_2.id: {
+                "tkeywords": {
+                    "thes-1": [{"id": "http://example.com/keyword1"}],
+                    "thes-2": [{"id": "http://example.com/keyword2"}, {"id": "http://example.com/keyword3"}],
+                }
+            },
+        }
+
+        # read the keywords, read the relations, delete the stale ones, insert the new ones
+        with self.assertNumQueries(4):
+            self.tkeywords_handler.update_resources(
+                resources,
+                "tkeywords",
+                json_instances,
+                {r.id: self.context for r in resources},
+                {r.id: {} for r in resources},
+            )
+
+        self.assertCountEqual(self.resource.tkeywords.all(), [self.keyword1])
+        self.assertCountEqual(self.extra_resource_1.tkeywords.all(), [self.keyword2])
+        self.assertCountEqual(self.extra_resource_2.tkeywords.all(), [self.keyword1, self.keyword2])
+
     # Tests for the sparse handler
 
     def test_sparse_handler_update_schema(self):
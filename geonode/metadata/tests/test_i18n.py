@@ -17,13 +17,14 @@
 #
 #########################################################################
 import logging
+from unittest.mock import patch
 
 from geonode.tests.base import GeoNodeBaseTestSupport
 
 from geonode.metadata.handlers.sparse import SparseHandler, SparseFieldRegistry
-from geonode.metadata.manager import MetadataManager
+from geonode.metadata.manager import CACHE_KEY_SCHEMA, MetadataManager
 
-from geonode.base.i18n import I18N_THESAURUS_IDENTIFIER, i18nCache, labelResolver
+from geonode.base.i18n import I18N_THESAURUS_IDENTIFIER, I18nCache, i18nCache, labelResolver
 from geonode.base.models import (
     ThesaurusKeyword,
     ThesaurusKeywordLabel,
@@ -183,3 +184,30 @@ class MetadataI18NTests(GeoNodeBaseTestSupport):
 
         self.assertEqual("key1_en_v2", labels_en.get("key1"))
         self.assertEqual("key1_it_v2", labels_it.get("key1"))
+
+    @patch.object(I18nCache, "CHECK_INTERVAL", 0)
+    def test_i18n_cache_version_is_shared(self):
+        """
+        Ensure the processes share the cache version, and drop their data when a new one is published
+        """
+        other_process_cache = I18nCache()
+        version = other_process_cache.get_version()
+        self.assertTrue(other_process_cache.set("en", "key", "data", version))
+
+        # the version is read from the shared cache, not from the DB
+        with self.assertNumQueries(0):
+            self.assertEqual((version, "data"), other_process_cache.get_entry("en", "key"))
+
+        I18nCache.publish_version("2030-01-01T00:00:00")
+        with self.assertNumQueries(0):
+            self.assertEqual(("2030-01-01T00:00:00", None), other_process_cache.get_entry("en", "key"))
+        # data built for the previous version are not cached
+        self.assertFalse(other_process_cache.set("en", "key", "data", version))
+
+    def test_prewarm_schemas(self):
+        self.sparse_registry.register("field1", {"type": "number"})
+        self.mm.prewarm_schemas(["en", "it"])
+
+        for lang in ("en", "it"):
+            _, schema = i18nCache.get_entry(lang, CACHE_KEY_SCHEMA)
+            self.assertIn("field1", schema["properties"])
@@ -47,6 +47,8 @@ from geonode.base.models import ResourceBase
 from geonode.settings import PROJECT_ROOT
 from geonode.base.i18n import I18nCache, i18nCache
 from geonode.base.models import (
+    ContactRole,
+    LinkedResource,
     TopicCategory,
     License,
     Region,
@@ -292,6 +294,47 @@ class MetadataApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertJSONEqual(response.content, {"message": "The dataset was not found"})
 
+    @patch("geonode.metadata.manager.metadata_manager.update_schema_instances_partial")
+    @patch("geonode.security.registry.PermissionsHandlerRegistry.user_has_perm")
+    def test_patch_schema_instances(self, mock_perm, mock_update_schema_instances):
+        """
+        Test the bulk update of the schema instances, skipping the missing and the read only resources
+        """
+        mock_perm.side_effect = lambda user, resource, perm, *args, **kwargs: (
+            perm == "view_resourcebase" or resource.pk == self.resource.pk
+        )
+        mock_update_schema_instances.return_value = {}
+        self.client.force_authenticate(user=self.test_user_1)
+
+        url = reverse("metadata-schema_instances")
+        payload = {"resources": [self.resource.pk, self.other_resource.pk, 1000], "instance": {"field": "value"}}
+        response = self.client.patch(f"{url}?lang=en", data=payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json()["updated"], [self.resource.pk])
+        self.assertEqual(set(response.json()["extraErrors"].keys()), {str(self.other_resource.pk), "1000"})
+        mock_update_schema_instances.assert_called_once_with([self.resource], {"field": "value"}, ANY, "en")
+
+    def test_patch_schema_instances_with_bad_payload(self):
+        """
+        Test the bulk update with invalid payloads
+        """
+        self.client.force_authenticate(user=self.test_user_1)
+        url = reverse("metadata-schema_instances")
+
+        for payload in (
+            {"resources": [self.resource.pk]},
+            {"resources": "all", "instance": {"field": "value"}},
+            {"resources": [str(self.resource.pk)], "instance": {"field": "value"}},
+        ):
+            response = self.client.patch(url, data=payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(METADATA_BULK_UPDATE_MAX_RESOURCES=1):
+            payload = {"resources": [self.resource.pk, self.other_resource.pk], "instance": {"field": "value"}}
+            response = self.client.patch(url, data=payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # Tests for categories autocomplete
     def test_categories_autocomplete_no_query(self):
         """
@@ -984,6 +1027,170 @@ class MetadataApiTests(APITestCase):
             self.handler2.update_resource.assert_called()
             self.handler3.update_resource.assert_called()
 
+    @patch("geonode.metadata.manager.index_manager.request_bulk_update")
+    @patch("geonode.metadata.manager.metadata_manager.build_schema_instances")
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    def test_update_schema_instances_partial(self, mock_get_schema, mock_build_schema_instances, mock_bulk_update):
+        mock_get_schema.return_value = self.fake_schema
+        mock_build_schema_instances.side_effect = lambda resources, lang: {
+            r.id: {"field1": "old", "field2": r.title} for r in resources
+        }
+        resources = [self.resource, self.other_resource]
+
+        with patch.dict(metadata_manager.handlers, self.fake_handlers, clear=True):
+            errors = metadata_manager.update_schema_instances_partial(resources, {"field1": "new"}, self.test_user_1)
+
+            # the patched field is stored once for the whole set
+            self.handler1.update_resources.assert_called_once()
+            args = self.handler1.update_resources.call_args.args
+            self.assertEqual(args[0], resources)
+            self.assertEqual(args[1], "field1")
+            self.assertEqual(args[2][self.other_resource.id], {"field1": "new", "field2": "Test other Resource"})
+            self.handler2.update_resources.assert_not_called()
+            self.handler3.update_resources.assert_not_called()
+            self.assertEqual(self.handler1.pre_save.call_count, 2)
+            self.assertEqual(self.handler1.post_save.call_count, 2)
+
+        # the indexes are updated in a single pass
+        mock_bulk_update.assert_called_once()
+        self.assertEqual(set(mock_bulk_update.call_args.args[0].keys()), {r.id for r in resources})
+        self.assertEqual(errors, {})
+
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    def test_update_schema_instances_partial_base_fields(self, mock_get_schema):
+        """
+        The base fields are written with a query for each distinct set of values
+        """
+        mock_get_schema.return_value = self.fake_schema
+
+        def update_resources(resources, field_name, json_instances, contexts, errors):
+            for resource in resources:
+                contexts[resource.id].setdefault("base", {})["abstract"] = json_instances[resource.id][field_name]
+
+        with (
+            patch.dict(metadata_manager.handlers, self.fake_handlers, clear=True),
+            patch(
+                "geonode.metadata.manager.metadata_manager.build_schema_instances",
+                side_effect=lambda resources, lang: {r.id: {} for r in resources},
+            ),
+            patch("geonode.metadata.manager.index_manager.request_bulk_update"),
+        ):
+            self.handler1.update_resources.side_effect = update_resources
+            errors = metadata_manager.update_schema_instances_partial(
+                [self.resource, self.other_resource], {"field1": "shared abstract"}, self.test_user_1
+            )
+
+        self.assertEqual(errors, {})
+        self.assertEqual(
+            set(
+                ResourceBase.objects.filter(id__in=[self.resource.id, self.other_resource.id]).values_list(
+                    "abstract", flat=True
+                )
+            ),
+            {"shared abstract"},
+        )
+
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    def test_build_schema_instances(self, mock_get_schema):
+        mock_get_schema.return_value = self.fake_schema
+        resources = [self.resource, self.other_resource]
+
+        with patch.dict(metadata_manager.handlers, self.fake_handlers, clear=True):
+            self.handler1.get_jsonschema_instance.side_effect = lambda resource, *args: resource.title
+            self.handler2.get_jsonschema_instance.side_effect = Exception("broken")
+            self.handler3.get_jsonschema_instance.return_value = "data from fake handler 3"
+
+            with self.assertRaises(Exception):
+                metadata_manager.build_schema_instance(self.resource, "en")
+
+            self.handler2.get_jsonschema_instance.side_effect = lambda resource, *args: (
+                1 / 0 if resource == self.other_resource else "data from fake handler 2"
+            )
+            instances = metadata_manager.build_schema_instances(resources, "en")
+
+            # the data for the whole set is loaded once
+            self.handler1.load_batch_serialization_context.assert_called_once_with(resources, self.fake_schema, ANY)
+            self.assertEqual(self.handler1.load_serialization_context.call_count, 3)
+
+        # the resources that can't be serialized are skipped
+        self.assertEqual(
+            instances,
+            {
+                self.resource.id: {
+                    "field1": "Test Resource",
+                    "field2": "data from fake handler 2",
+                    "field3": "data from fake handler 3",
+                }
+            },
+        )
+
+    @override_settings(METADATA_INSTANCE_CACHE_TIMEOUT=60)
+    @patch("geonode.metadata.manager.metadata_manager.build_schema_instances")
+    @patch("geonode.metadata.manager.metadata_manager.build_schema_instance")
+    def test_schema_instance_cache(self, mock_build_schema_instance, mock_build_schema_instances):
+        mock_build_schema_instance.side_effect = lambda resource, lang: {"title": resource.title}
+        mock_build_schema_instances.side_effect = lambda resources, lang: {r.id: {"title": r.title} for r in resources}
+        metadata_manager.invalidate_schema_instances([self.resource.id, self.other_resource.id])
+
+        self.assertEqual(metadata_manager.get_schema_instance(self.resource, "en"), {"title": "Test Resource"})
+        self.assertEqual(metadata_manager.get_schema_instance(self.resource, "en"), {"title": "Test Resource"})
+        self.assertEqual(mock_build_schema_instance.call_count, 1)
+
+        # the missing instances are built in a batch
+        instances = metadata_manager.get_schema_instances([self.resource, self.other_resource], "en")
+        self.assertEqual(instances[self.other_resource.id], {"title": "Test other Resource"})
+        mock_build_schema_instances.assert_called_once_with([self.other_resource], "en")
+
+        # the entries are stale once the resource is saved
+        self.resource.title = "Updated Resource"
+        self.resource.save()
+        self.assertEqual(metadata_manager.get_schema_instance(self.resource, "en"), {"title": "Updated Resource"})
+        self.assertEqual(mock_build_schema_instance.call_count, 2)
+
+        # and they are dropped when the metadata are updated
+        metadata_manager.invalidate_schema_instances([self.resource.id])
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 3)
+
+        # unknown languages are not cached
+        metadata_manager.get_schema_instance(self.resource, "xx")
+        metadata_manager.get_schema_instance(self.resource, "xx")
+        self.assertEqual(mock_build_schema_instance.call_count, 5)
+
+    @override_settings(METADATA_INSTANCE_CACHE_TIMEOUT=60)
+    @patch("geonode.metadata.manager.metadata_manager.build_schema_instance")
+    def test_schema_instance_cache_invalidation(self, mock_build_schema_instance):
+        mock_build_schema_instance.side_effect = lambda resource, lang: {"title": resource.title}
+        metadata_manager.invalidate_schema_instances([self.resource.id])
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 1)
+
+        # the linked resources, the contacts and the users are saved without updating the resource
+        link = LinkedResource.objects.create(source=self.resource, target=self.other_resource)
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 2)
+
+        self.other_resource.title = "Updated other Resource"
+        self.other_resource.save()
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 3)
+
+        link.delete()
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 4)
+
+        ContactRole.objects.create(resource=self.resource, contact=self.test_user_2, role="author")
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 5)
+
+        self.test_user_2.first_name = "Updated"
+        self.test_user_2.save()
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 6)
+
+        metadata_manager.get_schema_instance(self.resource, "en")
+        self.assertEqual(mock_build_schema_instance.call_count, 6)
+
 
 class SparseFieldApiTests(APITestCase):
     """Tests for the sparse field GET/PUT endpoints"""
@@ -250,6 +250,71 @@ class ProxyTest(TestCase):
         }
         self.assertTrue(expected_subset.items() <= dict(response.headers.copy()).items())
 
+    @override_settings(PROXY_STREAMING_ENABLED=True)
+    @patch("geonode.proxy.views.proxy_urls_registry", ProxyUrlsRegistry().set(["example.org"]))
+    def test_proxy_streaming(self):
+        """The streaming mode passes the upstream chunks through, still compressed."""
+        import gzip
+        import geonode.proxy.views
+
+        body = gzip.compress(b"<wfs:FeatureCollection/>" * 1000)
+
+        class Raw:
+            def stream(self, chunk_size, decode_content=True):
+                assert not decode_content
+                for i in range(0, len(body), 1024):
+                    yield body[i : i + 1024]
+
+        class Response:
+            status_code = 200
+            raw = Raw()
+            headers = {"Content-Type": "text/xml; subtype=gml/3.1.1", "Content-Encoding": "gzip"}
+
+            @property
+            def content(self):
+                raise AssertionError("The body must not be read in memory")
+
+            def close(self):
+                pass
+
+        request_mock = MagicMock()
+        request_mock.return_value = (Response(), None)
+
+        geonode.proxy.views.http_client.request = request_mock
+        url = "http://example.org/geoserver/wfs?request=GetFeature"
+
+        response = self.client.get(f"{self.proxy_url}?url={url}", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(b"".join(response.streaming_content), body)
+        self.assertTrue(request_mock.call_args[1]["stream"])
+        self.assertEqual(request_mock.call_args[1]["headers"]["Accept-Encoding"], "gzip")
+
+    @override_settings(PROXY_STREAMING_ENABLED=True)
+    @patch("geonode.proxy.views.proxy_urls_registry", ProxyUrlsRegistry().set(["example.org"]))
+    def test_proxy_streaming_buffers_for_callbacks(self):
+        """The body is buffered only when the response callback needs it."""
+        from geonode.proxy.views import proxy
+
+        class Response:
+            status_code = 200
+            content = b"Hello World"
+            headers = {"Content-Type": "text/plain"}
+
+        callback = MagicMock(return_value="callback response")
+        request = RequestFactory().get(f"{self.proxy_url}?url=http://example.org/index.txt")
+        request.user = self.admin
+        with patch("geonode.proxy.views.http_client.request", return_value=(Response(), None)):
+            proxy(request, response_callback=callback, buffer_content=lambda content_type: "text" in content_type)
+            self.assertEqual(callback.call_args[1]["content"], "Hello World")
+
+            Response.headers = {"Content-Type": "image/png"}
+            Response.raw = MagicMock()
+            Response.close = MagicMock()
+            proxy(request, response_callback=callback, buffer_content=lambda content_type: "text" in content_type)
+            self.assertIsNone(callback.call_args[1]["content"])
+            self.assertIsNotNone(callback.call_args[1]["streaming_content"])
+
     @patch("geonode.proxy.views.is_safe_url", return_value=True)
     def test_proxy_url_forgery(self, _mock_is_safe_url):
         import geonode.proxy.views
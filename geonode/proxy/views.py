@@ -77,8 +77,21 @@ def proxy(
     allowed_hosts=[],
     headers=None,
     access_token=None,
+    stream=None,
+    buffer_content=None,
     **kwargs,
 ):
+    """
+    Proxies the request to ``url``.
+
+    In streaming mode (``stream``, by default ``PROXY_STREAMING_ENABLED``) the upstream body is passed through
+    chunk by chunk, still compressed, instead of being read in memory and decoded. The body is only buffered for the
+    errors, the redirects and when the ``response_callback`` needs it: ``buffer_content`` is a callable telling it from
+    the upstream content type, if not provided every callback gets the whole body. The callbacks which do not need
+    the body get a ``streaming_content`` iterator and ``content=None``, see ``get_streaming_response``.
+    """
+    if stream is None:
+        stream = getattr(settings, "PROXY_STREAMING_ENABLED", False)
 
     if not timeout:
         timeout = getattr(ogc_server_settings, "TIMEOUT", TIMEOUT)
@@ -163,13 +176,44 @@ def proxy(
         _url = _url.replace(f"{settings.SITEURL}geoserver", ogc_server_settings.LOCATION.rstrip("/"))
         _data = _data.replace(f"{settings.SITEURL}geoserver", ogc_server_settings.LOCATION.rstrip("/"))
 
+    if stream:
+        # the body is passed through as is, the upstream must only use the encodings accepted by the client
+        headers = dict(headers)
+        headers["Accept-Encoding"] = request.headers.get("Accept-Encoding") or "identity"
+
     response, content = http_client.request(
-        _url, method=request.method, data=_data.encode("utf-8"), headers=headers, timeout=timeout, user=user
+        _url,
+        method=request.method,
+        data=_data.encode("utf-8"),
+        headers=headers,
+        timeout=timeout,
+        user=user,
+        stream=stream,
     )
     if response is None:
         logger.error(f"Proxy request failed: {content}")
         return HttpResponse(content="Proxy request failed.", status=500, content_type="text/plain")
 
+    if stream:
+        content_type = response.headers.get("Content-Type")
+        needs_content = response_callback and (buffer_content is None or buffer_content(content_type))
+        if response.status_code < 300 and not needs_content:
+            streaming_content = iter_upstream_content(response)
+            if response_callback:
+                kwargs = {} if not kwargs else kwargs
+                kwargs.update(
+                    {
+                        "response": response,
+                        "content": None,
+                        "streaming_content": streaming_content,
+                        "status": response.status_code,
+                        "response_headers": response.headers,
+                        "content_type": content_type,
+                    }
+                )
+                return response_callback(**kwargs)
+            return get_streaming_response(streaming_content, response.status_code, content_type, response.headers)
+
     content = response.content or response.reason
     status = response.status_code
     response_headers = response.headers
@@ -380,6 +424,26 @@ _hoppish = {
 }.__contains__
 
 
+def iter_upstream_content(response, chunk_size=BUFFER_CHUNK_SIZE):
+    """Yields the raw upstream body, without decoding its Content-Encoding, and releases the connection at the end"""
+    try:
+        yield from response.raw.stream(chunk_size, decode_content=False)
+    finally:
+        response.close()
+
+
+def get_streaming_response(streaming_content, status, content_type, response_headers):
+    """
+    Returns a StreamingHttpResponse passing the upstream chunks through.
+    The body is not decoded, so the upstream Content-Encoding and Content-Length are preserved.
+    """
+    _response = StreamingHttpResponse(streaming_content, status=status, content_type=content_type)
+    for _header in ("Content-Encoding", "Content-Length"):
+        if response_headers and response_headers.get(_header):
+            _response[_header] = response_headers.get(_header)
+    return fetch_response_headers(_response, response_headers)
+
+
 def is_hop_by_hop(header_name):
     """Return true if 'header_name' is an HTTP/1.1 "Hop-by-Hop" header"""
     return _hoppish(header_name.lower())
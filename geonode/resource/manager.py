@@ -53,6 +53,7 @@ from geonode.security.utils import (
     skip_registered_members_common_group,
 )
 from geonode.security.registry import permissions_registry
+from geonode.security.visibility import visibility_index
 from django.contrib.gis.geos import Polygon
 from geonode.base.api.exceptions import InvalidResourceException
 from geonode.base.api.serializers import api_bbox_settable_resource_models
@@ -635,6 +636,7 @@ class BaseResourceManager(ResourceManagerInterface):
                         content_type=ContentType.objects.get_for_model(_resource.get_self_resource()),
                         object_pk=_resource.id,
                     ).delete()
+                    visibility_index.refresh(_resource.pk)
                     if is_remote_resource(_resource):
                         # Remote resources live on external GeoServers, no GeoFence rules to remove
                         logger.debug("Skipping remove_permissions for remote resource %s", _resource)
@@ -920,6 +922,9 @@ class BaseResourceManager(ResourceManagerInterface):
                             _resource.uuid, instance=_resource
                         )
 
+                    # Realign the materialized visibility of the resource
+                    visibility_index.refresh(_resource.pk)
+
                     # Fixup GIS Backend Security Rules Accordingly
                     if is_remote_resource(_resource):
                         # Remote resources live on external GeoServers, no GeoFence sync needed
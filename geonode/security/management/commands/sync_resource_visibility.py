@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from geonode.base.management import command_utils
+from geonode.security.visibility import visibility_index
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Rebuild or check the materialized resource visibility table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--check",
+            dest="check",
+            action="store_true",
+            help="Only check the consistency of the visibility table against the guardian permissions",
+        )
+        parser.add_argument(
+            "--fix",
+            dest="fix",
+            action="store_true",
+            help="Together with --check, realign the inconsistent resources",
+        )
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=visibility_index.DEFAULT_BATCH_SIZE,
+            help="Number of resources processed in a single batch",
+        )
+        parser.add_argument(
+            "--skip-logger-setup",
+            action="store_false",
+            dest="setup_logger",
+            help="Skips setup of the logger",
+        )
+        parser.add_argument("--debug", dest="debug", action="store_true", help="Set log level to debug")
+
+    def handle(self, **options):
+        logger = logging.getLogger(__name__)
+        if options.get("setup_logger"):
+            level = logging.DEBUG if options.get("debug") else logging.INFO
+            logger = command_utils.setup_logger(level=level)
+            import geonode.security.visibility as v
+
+            command_utils.setup_logger(v.__name__, level=level)
+
+        batch_size = options.get("batch_size")
+
+        logger.info(f"==== Running command {__name__}")
+        logger.info(f"{self.help}")
+        logger.info("")
+
+        if options.get("check"):
+            missing, extra = visibility_index.check(batch_size=batch_size, fix=options.get("fix"))
+            for resource_id, user_id, group_id in sorted(missing, key=str):
+                logger.warning(f"- Missing visibility: resource:{resource_id} user:{user_id} group:{group_id}")
+            for resource_id, user_id, group_id in sorted(extra, key=str):
+                logger.warning(f"- Extra visibility  : resource:{resource_id} user:{user_id} group:{group_id}")
+
+            logger.info("Check completed" + (" [FIXED]" if options.get("fix") and (missing or extra) else ""))
+            logger.info(f"- Missing rows : {len(missing)}")
+            logger.info(f"- Extra rows   : {len(extra)}")
+        else:
+            tot = visibility_index.rebuild(batch_size=batch_size)
+            logger.info("Work completed")
+            logger.info(f"- Resources processed : {tot}")
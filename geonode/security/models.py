@@ -506,3 +506,39 @@ class URLPatternAuthConfig(models.Model):
 
     def __str__(self):
         return self.pattern
+
+
+class ResourceVisibility(models.Model):
+    """
+    Materialized set of the principals allowed to see a resource.
+
+    Each row grants visibility of ``resource`` either to a single ``user`` or to
+    every member of ``group`` (the "anonymous" group covers anonymous access).
+    Rows mirror the guardian ``view_resourcebase``/``change_resourcebase`` object
+    permissions and are maintained by ``geonode.security.visibility``.
+    """
+
+    resource = models.ForeignKey("base.ResourceBase", on_delete=models.CASCADE, related_name="+")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, related_name="+"
+    )
+    group = models.ForeignKey(Group, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        verbose_name = "Resource Visibility"
+        verbose_name_plural = "Resource Visibilities"
+        indexes = [
+            models.Index(fields=["user", "resource"], name="resource_visibility_user_idx"),
+            models.Index(fields=["group", "resource"], name="resource_visibility_group_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resource", "user"], condition=Q(user__isnull=False), name="unique_resource_visibility_user"
+            ),
+            models.UniqueConstraint(
+                fields=["resource", "group"], condition=Q(group__isnull=False), name="unique_resource_visibility_group"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.resource_id}:{f'user:{self.user_id}' if self.user_id else f'group:{self.group_id}'}"
@@ -198,6 +198,25 @@ class PermissionsHandlerRegistry:
             **kwargs,
         )
 
+    def get_perms_for_resources(self, resources, user):
+        """
+        Return the permissions of the user on many resources, as a dict resource pk -> permissions list.
+        The cached permissions are fetched with a single cache call; the missing ones are computed and cached.
+        """
+        if isinstance(user, DjangoAnonymousUser):
+            user = get_anonymous_user()
+
+        cache_keys = {resource.pk: self._get_cache_key([resource.pk], [user]) for resource in resources}
+        cached = cache.get_many(list(cache_keys.values()))
+
+        perms = {}
+        for resource in resources:
+            _perms = cached.get(cache_keys[resource.pk])
+            if _perms is None:
+                _perms = self.get_perms(instance=resource, user=user, use_cache=True)
+            perms[resource.pk] = _perms
+        return perms
+
     def get_visible_resources(
         self,
         queryset,
@@ -212,6 +231,7 @@ class PermissionsHandlerRegistry:
         # Get the list of objects the user has access to
         from geonode.groups.models import GroupProfile
         from geonode.security.utils import AdvancedSecurityWorkflowManager
+        from geonode.security.visibility import visibility_index
 
         is_admin = user.is_superuser if user and user.is_authenticated else False
         anonymous_group = None
@@ -239,10 +259,15 @@ class PermissionsHandlerRegistry:
 
         if not is_admin:
             if user:
-                _allowed_resources = get_objects_for_user(
-                    user, ["base.view_resourcebase", "base.change_resourcebase"], any_perm=True
-                )
-                queryset = queryset.filter(id__in=_allowed_resources.values("id"))
+                if visibility_index.enabled:
+                    _visible_ids = visibility_index.get_visible_resource_ids(user)
+                    if _visible_ids is not None:
+                        queryset = queryset.filter(id__in=_visible_ids)
+                else:
+                    _allowed_resources = get_objects_for_user(
+                        user, ["base.view_resourcebase", "base.change_resourcebase"], any_perm=True
+                    )
+                    queryset = queryset.filter(id__in=_allowed_resources.values("id"))
 
             if admin_approval_required and not AdvancedSecurityWorkflowManager.is_simplified_workflow():
                 if not user or not user.is_authenticated or user.is_anonymous:
@@ -319,9 +344,11 @@ class PermissionsHandlerRegistry:
         Returns resources a user has access to.
         """
         from geonode.security.utils import get_geoapp_subtypes
+        from geonode.security.visibility import visibility_index
         from geonode.base.models import ResourceBase
 
-        if settings.SKIP_PERMS_FILTER:
+        if settings.SKIP_PERMS_FILTER or (visibility_index.enabled and not shortcut_kwargs):
+            # with the visibility index enabled, the perms filtering is applied by get_visible_resources
             resources = ResourceBase.objects.all()
         else:
             resources = get_objects_for_user(
@@ -365,8 +392,10 @@ class PermissionsHandlerRegistry:
 
         from geonode.base.models import ResourceBase
         from geonode.people.models import Profile
+        from geonode.security.visibility import visibility_index
 
         if isinstance(instance, ResourceBase):
+            visibility_index.refresh(instance.pk)
             permissions = self.get_perms(instance=instance)
             users = Profile.objects.filter(
                 Q(groups__in=permissions["groups"].keys()) | Q(id__in=[x.id for x in permissions["users"].keys()])
@@ -4163,6 +4163,57 @@ class TestPermissionsCaching(GeoNodeBaseTestSupport):
             config.save()
 
 
+@override_settings(RESOURCE_VISIBILITY_INDEX_ENABLED=True)
+class TestResourceVisibilityIndex(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        self.owner = get_user_model().objects.create_user(username=f"vis_owner_{uuid4()}", password="testpass123")
+        self.viewer = get_user_model().objects.create_user(username=f"vis_viewer_{uuid4()}", password="testpass123")
+        self.outsider = get_user_model().objects.create_user(username=f"vis_outsider_{uuid4()}", password="testpass123")
+        self.group, _ = Group.objects.get_or_create(name=f"vis_group_{uuid4()}")
+        self.group.user_set.add(self.outsider)
+        self.resource = ResourceBase.objects.create(
+            title="visibility_resource", uuid=str(uuid4()), owner=self.owner, is_approved=True, is_published=True
+        )
+        self.resource.set_permissions({"users": {self.viewer.username: ["view_resourcebase"]}, "groups": {}})
+
+    def _visible(self, user):
+        return get_visible_resources(ResourceBase.objects.filter(id=self.resource.id), user, metadata_only=None)
+
+    def test_visibility_follows_permission_changes(self):
+        self.assertTrue(self._visible(self.viewer).exists())
+        self.assertTrue(self._visible(self.owner).exists())
+        self.assertFalse(self._visible(self.outsider).exists())
+        self.assertFalse(self._visible(AnonymousUser()).exists())
+
+        self.resource.set_permissions(
+            {"users": {}, "groups": {self.group.name: ["view_resourcebase"], "anonymous": ["view_resourcebase"]}}
+        )
+        self.assertTrue(self._visible(self.outsider).exists())
+        self.assertTrue(self._visible(AnonymousUser()).exists())
+
+        self.resource.set_permissions({"users": {}, "groups": {}})
+        self.assertTrue(self._visible(self.owner).exists())
+        self.assertFalse(self._visible(self.viewer).exists())
+        self.assertFalse(self._visible(self.outsider).exists())
+        self.assertFalse(self._visible(AnonymousUser()).exists())
+
+    def test_check_and_rebuild(self):
+        from geonode.security.models import ResourceVisibility
+        from geonode.security.visibility import visibility_index
+
+        ResourceVisibility.objects.filter(resource=self.resource).delete()
+        self.assertFalse(self._visible(self.viewer).exists())
+
+        missing, extra = visibility_index.check()
+        self.assertIn((self.resource.id, self.viewer.id, None), missing)
+        self.assertSetEqual(extra, set())
+
+        visibility_index.rebuild()
+        self.assertTrue(self._visible(self.viewer).exists())
+        self.assertEqual(visibility_index.check(), (set(), set()))
+
+
 class TestSpecialGroupsPermissionsHandler(GeoNodeBaseTestSupport):
     @override_settings(DEFAULT_ANONYMOUS_PERMISSIONS="view", DEFAULT_REGISTERED_MEMBERS_PERMISSIONS="download")
     def test_handler_sets_default_groups_on_create(self):
@@ -0,0 +1,170 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.contrib.auth.models import AnonymousUser as DjangoAnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from guardian.models import UserObjectPermission, GroupObjectPermission
+from guardian.shortcuts import get_anonymous_user
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceVisibilityIndex:
+    """
+    Maintains the materialized "visible resources per principal" table (``ResourceVisibility``).
+
+    The table mirrors the guardian object permissions which make a resource visible
+    (see ``VISIBILITY_PERMISSIONS``) with integer keys, so that the catalogue can filter
+    the resources with a plain indexed join instead of running ``get_objects_for_user``
+    on every request.
+    """
+
+    VISIBILITY_PERMISSIONS = ("view_resourcebase", "change_resourcebase")
+    DEFAULT_BATCH_SIZE = 1000
+
+    @property
+    def enabled(self):
+        return getattr(settings, "RESOURCE_VISIBILITY_INDEX_ENABLED", False)
+
+    def get_visible_resource_ids(self, user):
+        """
+        Returns a values queryset with the ids of the resources visible to the user,
+        or None if the user can see every resource (superusers and global permissions).
+        """
+        from geonode.security.models import ResourceVisibility
+
+        if user is None or isinstance(user, DjangoAnonymousUser) or user.is_anonymous:
+            user = get_anonymous_user()
+
+        if user.is_superuser or any(user.has_perm(f"base.{perm}") for perm in self.VISIBILITY_PERMISSIONS):
+            return None
+
+        return ResourceVisibility.objects.filter(Q(user_id=user.pk) | Q(group_id__in=user.groups.values("id"))).values(
+            "resource_id"
+        )
+
+    def compute(self, resource_ids):
+        """
+        Computes the visibility rows of the given resources out of the guardian tables.
+        Returns a set of (resource_id, user_id, group_id) tuples.
+        """
+        from geonode.base.models import ResourceBase
+
+        ctype = ContentType.objects.get_for_model(ResourceBase)
+        object_pks = [str(_id) for _id in resource_ids]
+        _filter = {
+            "content_type": ctype,
+            "permission__codename__in": self.VISIBILITY_PERMISSIONS,
+            "object_pk__in": object_pks,
+        }
+
+        rows = set()
+        for object_pk, user_id in UserObjectPermission.objects.filter(**_filter).values_list("object_pk", "user_id"):
+            rows.add((int(object_pk), user_id, None))
+        for object_pk, group_id in GroupObjectPermission.objects.filter(**_filter).values_list("object_pk", "group_id"):
+            rows.add((int(object_pk), None, group_id))
+        return rows
+
+    def stored(self, resource_ids):
+        """
+        Returns the visibility rows currently materialized for the given resources.
+        """
+        from geonode.security.models import ResourceVisibility
+
+        return set(
+            ResourceVisibility.objects.filter(resource_id__in=resource_ids).values_list(
+                "resource_id", "user_id", "group_id"
+            )
+        )
+
+    def refresh(self, resource_ids):
+        """
+        Realigns the visibility rows of the given resources with the guardian permissions.
+        It is a no-op if the visibility index is not enabled.
+        """
+        if not self.enabled:
+            return
+        if isinstance(resource_ids, int):
+            resource_ids = [resource_ids]
+        self._replace(list(resource_ids))
+
+    def rebuild(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Recreates the whole visibility table, processing the resources in batches.
+        Each batch is replaced atomically, so the table stays usable while rebuilding.
+        Returns the number of resources processed.
+        """
+        tot = 0
+        for batch in self._iter_resource_ids(batch_size):
+            self._replace(batch)
+            tot += len(batch)
+            logger.debug(f"Visibility index rebuilt for {tot} resources")
+        return tot
+
+    def check(self, batch_size=DEFAULT_BATCH_SIZE, fix=False):
+        """
+        Compares the materialized rows against the guardian permissions.
+        Returns a tuple (missing, extra) with the sets of rows which differ.
+        When ``fix`` is set, the inconsistent resources are realigned.
+        """
+        missing = set()
+        extra = set()
+        for batch in self._iter_resource_ids(batch_size):
+            expected = self.compute(batch)
+            current = self.stored(batch)
+            _missing = expected - current
+            _extra = current - expected
+            if fix and (_missing or _extra):
+                self._replace({row[0] for row in _missing | _extra})
+            missing |= _missing
+            extra |= _extra
+        return missing, extra
+
+    def _replace(self, resource_ids):
+        from geonode.security.models import ResourceVisibility
+
+        rows = self.compute(resource_ids)
+        with transaction.atomic():
+            ResourceVisibility.objects.filter(resource_id__in=resource_ids).delete()
+            ResourceVisibility.objects.bulk_create(
+                [
+                    ResourceVisibility(resource_id=resource_id, user_id=user_id, group_id=group_id)
+                    for resource_id, user_id, group_id in rows
+                ]
+            )
+
+    def _iter_resource_ids(self, batch_size):
+        from geonode.base.models import ResourceBase
+
+        last_id = 0
+        while True:
+            batch = list(
+                ResourceBase.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1]
+
+
+visibility_index = ResourceVisibilityIndex()
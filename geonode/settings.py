@@ -559,6 +559,9 @@ REST_FRAMEWORK_EXTENSIONS = {
 REST_API_DEFAULT_PAGE = os.getenv("REST_API_DEFAULT_PAGE", 1)
 REST_API_DEFAULT_PAGE_SIZE = os.getenv("REST_API_DEFAULT_PAGE_SIZE", 10)
 REST_API_DEFAULT_PAGE_QUERY_PARAM = os.getenv("REST_API_DEFAULT_PAGE_QUERY_PARAM", "page_size")
+REST_API_DEFAULT_CURSOR_TOTAL = os.getenv("REST_API_DEFAULT_CURSOR_TOTAL", "exact")
+# cache timeout of the resource counts of keywords, regions, categories and owners (0 disables the cache)
+RESOURCE_COUNT_CACHE_TIMEOUT = int(os.getenv("RESOURCE_COUNT_CACHE_TIMEOUT", 0))
 
 REST_API_PRESETS = {
     "bare": {"exclude[]": ["*"], "include[]": ["pk", "title"]},
@@ -1003,11 +1006,17 @@ PROXY_ALLOWED_PATH_NEEDLES = ast.literal_eval(os.getenv("PROXY_ALLOWED_PATH_NEED
 
 # The proxy to use when making cross origin requests.
 PROXY_URL = os.environ.get("PROXY_URL", "/proxy/?url=")
+# Stream the proxied responses chunk by chunk, still compressed, instead of reading them in memory
+PROXY_STREAMING_ENABLED = ast.literal_eval(os.getenv("PROXY_STREAMING_ENABLED", "False"))
 SAFE_URL_CHECK_ENABLED = ast.literal_eval(os.getenv("SAFE_URL_CHECK_ENABLED", "True"))
 
 # Avoid permissions prefiltering
 SKIP_PERMS_FILTER = ast.literal_eval(os.getenv("SKIP_PERMS_FILTER", "False"))
 
+# Filter the visible resources through the materialized visibility table instead of the guardian tables.
+# The table must be populated with "python manage.py sync_resource_visibility" before enabling it.
+RESOURCE_VISIBILITY_INDEX_ENABLED = ast.literal_eval(os.getenv("RESOURCE_VISIBILITY_INDEX_ENABLED", "False"))
+
 # Number of items returned by the apis 0 equals no limit
 API_LIMIT_PER_PAGE = int(os.getenv("API_LIMIT_PER_PAGE", "200"))
 API_INCLUDE_REGIONS_COUNT = ast.literal_eval(os.getenv("API_INCLUDE_REGIONS_COUNT", "False"))
@@ -1073,6 +1082,15 @@ GEOFENCE_SECURITY_ENABLED = (
     False if TEST and not INTEGRATION else ast.literal_eval(os.getenv("GEOFENCE_SECURITY_ENABLED", "True"))
 )
 
+# Maximum number of rule operations sent to GeoFence in a single batch when synching the resources permissions
+GEOFENCE_SYNC_BATCH_SIZE = int(os.getenv("GEOFENCE_SYNC_BATCH_SIZE", "500"))
+# Number of rules per page when fetching the current GeoFence rules
+GEOFENCE_SYNC_PAGE_SIZE = int(os.getenv("GEOFENCE_SYNC_PAGE_SIZE", "1000"))
+# Keep a copy of the GeoFence rules in the DB, serving rule lookups and priority allocation from it.
+# Rules edited outside GeoNode are picked up when the copy is reconciled, every GEOFENCE_RULES_MIRROR_TTL seconds
+GEOFENCE_RULES_MIRROR_ENABLED = ast.literal_eval(os.getenv("GEOFENCE_RULES_MIRROR_ENABLED", "False"))
+GEOFENCE_RULES_MIRROR_TTL = int(os.getenv("GEOFENCE_RULES_MIRROR_TTL", "3600"))
+
 # OGC (WMS/WFS/WCS) Server Settings
 # OGC (WMS/WFS/WCS) Server Settings
 OGC_SERVER = {
@@ -1106,6 +1124,7 @@ OGC_SERVER = {
         "BACKOFF_FACTOR": float(os.getenv("OGC_REQUEST_BACKOFF_FACTOR", "0.3")),
         "POOL_MAXSIZE": int(os.getenv("OGC_REQUEST_POOL_MAXSIZE", "10")),
         "POOL_CONNECTIONS": int(os.getenv("OGC_REQUEST_POOL_CONNECTIONS", "10")),
+        "TOKEN_CACHE_TTL": int(os.getenv("OGC_REQUEST_TOKEN_CACHE_TTL", "60")),
     }
 }
 
@@ -1584,6 +1603,13 @@ CHUNK_SIZE = os.environ.get("CHUNK_SIZE", 100)
 MAX_PARALLEL_QUEUE_CHUNKS = os.environ.get("MAX_PARALLEL_QUEUE_CHUNKS", 2)
 HARVESTING_MONITOR_ENABLED = ast.literal_eval(os.environ.get("HARVESTING_MONITOR_ENABLED", "True"))
 HARVESTING_MONITOR_DELAY = int(os.environ.get("HARVESTING_MONITOR_DELAY", 60))
+# Maximum number of tasks listing the remote resources of a harvester in parallel, each one walks a range of pages
+HARVESTING_DISCOVERY_MAX_TASKS = int(os.environ.get("HARVESTING_DISCOVERY_MAX_TASKS", 8))
+# Number of resources harvested by every task, fetched concurrently from the remote service (1 disables the batches)
+HARVESTING_BATCH_SIZE = int(os.environ.get("HARVESTING_BATCH_SIZE", 1))
+# Maximum number of concurrent fetches towards a remote service and how many may start every second (0 for no limit)
+HARVESTING_FETCH_MAX_WORKERS = int(os.environ.get("HARVESTING_FETCH_MAX_WORKERS", 4))
+HARVESTING_FETCH_RATE_LIMIT = float(os.environ.get("HARVESTING_FETCH_RATE_LIMIT", 0))
 
 # Set Tasks Queues
 # CELERY_TASK_DEFAULT_QUEUE = "default"
@@ -2089,6 +2115,21 @@ THUMBNAIL_BACKGROUND = {
     # },
 }
 
+# Number of tiles of a thumbnail background fetched concurrently
+THUMBNAIL_TILES_MAX_WORKERS = int(os.getenv("THUMBNAIL_TILES_MAX_WORKERS", 4))
+# Size in bytes of the in-memory background tiles cache, shared by the thumbnails of the same process (0 disables it)
+THUMBNAIL_TILES_CACHE_SIZE = int(os.getenv("THUMBNAIL_TILES_CACHE_SIZE", 32 * 1024 * 1024))
+# Optional folder where to cache the background tiles, shared by all the processes
+THUMBNAIL_TILES_CACHE_DIR = os.getenv("THUMBNAIL_TILES_CACHE_DIR", None)
+# Maximum size in bytes of the background tiles folder, the least recently used tiles are evicted first
+THUMBNAIL_TILES_CACHE_DIR_SIZE = int(os.getenv("THUMBNAIL_TILES_CACHE_DIR_SIZE", 512 * 1024 * 1024))
+
+# Bulk thumbnails regeneration: resources processed together, concurrent GetMap requests per OGC server
+# and number of processes composing the images
+THUMBNAIL_BULK_BATCH_SIZE = int(os.getenv("THUMBNAIL_BULK_BATCH_SIZE", 100))
+THUMBNAIL_BULK_MAX_WORKERS = int(os.getenv("THUMBNAIL_BULK_MAX_WORKERS", 4))
+THUMBNAIL_BULK_PROCESSES = int(os.getenv("THUMBNAIL_BULK_PROCESSES", 1))
+
 # Keywords thesauri
 # e.g. THESAURUS = {'name':'inspire_themes', 'required':True, 'filter':True}
 # Required: (boolean, optional, default false) mandatory while editing metadata (not implemented yet)
@@ -2105,6 +2146,12 @@ TOPICCATEGORY_MANDATORY = ast.literal_eval(os.environ.get("TOPICCATEGORY_MANDATO
 
 CATALOG_METADATA_TEMPLATE = os.getenv("CATALOG_METADATA_TEMPLATE", "catalogue/full_metadata.xml")
 
+# Seconds the i18n cache version, read from the "labels-i18n" thesaurus, is kept in the default cache.
+# Changes made through the models are published right away, the others are picked up when it expires
+I18N_CACHE_VERSION_TIMEOUT = int(os.getenv("I18N_CACHE_VERSION_TIMEOUT", "5"))
+# Build the metadata schemas for all the LANGUAGES when a process serves its first request
+I18N_CACHE_PREWARM = False if TEST else ast.literal_eval(os.getenv("I18N_CACHE_PREWARM", "True"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 for deprecated_env_key in (
@@ -2147,6 +2194,21 @@ METADATA_INDEXES = {
     "all": ["title", "abstract", "supplemental_information"],
 }
 
+# Update the indexes asynchronously: the requests are collected for METADATA_INDEXING_DEBOUNCE seconds
+# and then processed by a single celery task, in batches of METADATA_INDEXING_BATCH_SIZE resources
+METADATA_INDEXING_ASYNC = ast.literal_eval(os.getenv("METADATA_INDEXING_ASYNC", "False"))
+METADATA_INDEXING_DEBOUNCE = int(os.getenv("METADATA_INDEXING_DEBOUNCE", 5))
+METADATA_INDEXING_BATCH_SIZE = int(os.getenv("METADATA_INDEXING_BATCH_SIZE", 500))
+# Failed indexing runs after which a queued request is parked, until the resource is updated again
+METADATA_INDEXING_MAX_ATTEMPTS = int(os.getenv("METADATA_INDEXING_MAX_ATTEMPTS", 5))
+
+# Max number of resources that can be updated with a single request to the bulk metadata API
+METADATA_BULK_UPDATE_MAX_RESOURCES = int(os.getenv("METADATA_BULK_UPDATE_MAX_RESOURCES", 1000))
+
+# Seconds the serialized metadata instances are kept in the default cache, 0 disables the cache.
+# Only enable it with a cache shared by all the processes, since the entries are dropped from it on changes
+METADATA_INSTANCE_CACHE_TIMEOUT = int(os.getenv("METADATA_INSTANCE_CACHE_TIMEOUT", 0))
+
 # you can get the language names in psql using "\dF"
 MULTILANG_POSTGRES_LANGS = {
     None: "simple",
@@ -2195,6 +2257,12 @@ FILE_UPLOAD_HANDLERS = [
 # 100MB
 DEFAULT_MAX_UPLOAD_SIZE = int(os.getenv("DEFAULT_MAX_UPLOAD_SIZE") or 100 * 1024 * 1024)
 DEFAULT_BUFFER_CHUNK_SIZE = int(os.getenv("DEFAULT_BUFFER_CHUNK_SIZE", 64 * 1024))
+# Number of files, or parts of a large remote file, transferred concurrently by the DataRetriever
+DATA_RETRIEVER_MAX_WORKERS = int(os.getenv("DATA_RETRIEVER_MAX_WORKERS", 4))
+# Remote files larger than this are downloaded in parts of this size, when their storage allows seeking
+DATA_RETRIEVER_RANGE_PART_SIZE = int(os.getenv("DATA_RETRIEVER_RANGE_PART_SIZE", 64 * 1024 * 1024))
+# Number of times an interrupted remote transfer is resumed
+DATA_RETRIEVER_MAX_RETRIES = int(os.getenv("DATA_RETRIEVER_MAX_RETRIES", 3))
 DEFAULT_MAX_PARALLEL_UPLOADS_PER_USER = int(os.getenv("DEFAULT_MAX_PARALLEL_UPLOADS_PER_USER", 5))
 
 # This controls if tastypie search on resourches is performed only with titles
@@ -2255,6 +2323,11 @@ FACET_PROVIDERS = [
     {"class": "geonode.facets.providers.thesaurus.ThesaurusFacetProvider", "config": {"type": "select"}},
 ]
 
+# Max number of facet providers queried concurrently when listing the facets with their topics; 1 disables the threads
+FACETS_MAX_WORKERS = int(os.getenv("FACETS_MAX_WORKERS", 4))
+# Seconds the computed facet topics are cached per filters/user visibility; 0 disables the cache
+FACETS_CACHE_TIMEOUT = 0 if TEST else int(os.getenv("FACETS_CACHE_TIMEOUT", 60))
+
 DEFAULT_DATASET_DOWNLOAD_HANDLER = "geonode.layers.download_handler.DatasetDownloadHandler"
 
 DATASET_DOWNLOAD_HANDLERS = ast.literal_eval(os.getenv("DATASET_DOWNLOAD_HANDLERS", "[]"))
@@ -2273,6 +2346,8 @@ FEATURE_VALIDATORS = [
 UPSERT_CHUNK_SIZE = ast.literal_eval(os.getenv("UPSERT_CHUNK_SIZE", "1000"))
 UPSERT_LIMIT_ERROR_LOG = ast.literal_eval(os.getenv("UPSERT_LIMIT_ERROR_LOG", "1000"))
 UPSERT_LOG_LOCATION = os.getenv("UPSERT_LOG_LOCATION", "/tmp")
+# validate and load the upserted features in a single pass through a staging table (PostgreSQL only)
+UPSERT_STREAMING_ENABLED = ast.literal_eval(os.getenv("UPSERT_STREAMING_ENABLED", "False"))
 
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o777
 FILE_UPLOAD_PERMISSIONS = 0o777
@@ -19,6 +19,7 @@
 
 from geonode.storage.manager import StorageManagerInterface
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 
 class AwsStorageManager(StorageManagerInterface):
@@ -46,6 +47,15 @@ class AwsStorageManager(StorageManagerInterface):
     def save(self, name, content, max_length=None):
         return self._aws.save(name, content)
 
+    def copy_file(self, name, new_name):
+        """
+        Server side copy of the object, done in parts by S3 for the large ones
+        """
+        new_name = self._aws.get_available_name(new_name)
+        source = {"Bucket": self._aws.bucket_name, "Key": self._aws._normalize_name(clean_name(name))}
+        self._aws.bucket.copy(source, self._aws._normalize_name(clean_name(new_name)))
+        return new_name
+
     def url(self, name):
         return self._drx.url(name)
 
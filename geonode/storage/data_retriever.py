@@ -19,17 +19,21 @@
 
 import io
 import os
+import json
+import time
 import shutil
 import logging
 import zipfile
+import threading
 import smart_open
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Mapping
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 
 from geonode.storage.exceptions import DataRetrieverExcepion
-from geonode.storage.utils import organize_files_by_ext
+from geonode.storage.utils import clone_file, organize_files_by_ext
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,7 @@ class DataItemRetriever(object):
     def __init__(self, _file):
         self.temporary_folder = None
         self.file_path = None
+        self.transfer_stats = None
 
         self._is_django_form_file = False
         self._django_form_file = None
@@ -84,47 +89,127 @@ class DataItemRetriever(object):
             return self._original_file_uri
         return self.file_path
 
-    def transfer_remote_file(self, temporary_folder=None):
-        from geonode.utils import mkdtemp
-
-        def file_chunks_iterable(file, chunk_size=None):
-            """
-            Read the file and yield chunks of ``chunk_size`` bytes (defaults to
-            ``DEFAULT_BUFFER_CHUNK_SIZE``).
-            """
-            chunk_size = chunk_size or settings.DEFAULT_BUFFER_CHUNK_SIZE
-            try:
-                file.seek(0)
-            except (AttributeError, io.UnsupportedOperation):
-                pass
+    def transfer_remote_file(self, temporary_folder=None, max_workers=None):
+        """
+        Transfer the file into the temporary folder.
 
-            while True:
-                data = file.read(chunk_size)
-                if not data:
-                    break
-                yield data
+        Remote objects larger than DATA_RETRIEVER_RANGE_PART_SIZE are downloaded in parts by ``max_workers``
+        threads, when their storage allows seeking. Interrupted transfers are resumed, up to
+        DATA_RETRIEVER_MAX_RETRIES times and when transferring again into the same folder.
+        """
+        from geonode.utils import mkdtemp
 
         try:
             self.temporary_folder = temporary_folder or mkdtemp()
             self.file_path = os.path.join(self.temporary_folder, self.name)
+            started = time.monotonic()
 
             if self._is_django_form_file:
                 with open(self.file_path, "wb") as tmp_file:
                     for chunk in self._django_form_file.chunks():
                         tmp_file.write(chunk)
+            elif self._smart_open_uri.scheme == "file":
+                clone_file(self._smart_open_uri.uri_path, self.file_path)
             else:
-                with (
-                    open(self.file_path, "wb") as tmp_file,
-                    smart_open.open(uri=self._original_file_uri, mode="rb") as original_file,
-                ):
-                    for chunk in file_chunks_iterable(original_file):
-                        tmp_file.write(chunk)
+                self._download(self.file_path, max_workers or settings.DATA_RETRIEVER_MAX_WORKERS)
 
+            self.transfer_stats = {
+                "bytes": os.path.getsize(self.file_path),
+                "seconds": round(time.monotonic() - started, 3),
+            }
         except Exception as e:
             logger.error(e)
             raise DataRetrieverExcepion(detail=e)
         return self.file_path
 
+    def _download(self, file_path, max_workers):
+        part_path = f"{file_path}.part"
+        for attempt in range(settings.DATA_RETRIEVER_MAX_RETRIES + 1):
+            try:
+                with smart_open.open(uri=self._original_file_uri, mode="rb") as original_file:
+                    size = self._get_remote_size(original_file)
+                    if size is not None and size > settings.DATA_RETRIEVER_RANGE_PART_SIZE and max_workers > 1:
+                        self._download_ranges(part_path, size, max_workers)
+                    else:
+                        self._download_stream(original_file, part_path, size)
+                break
+            except Exception as e:
+                if attempt == settings.DATA_RETRIEVER_MAX_RETRIES:
+                    raise
+                logger.warning(f"Transfer of {self._original_file_uri} interrupted, resuming it: {e}")
+        os.replace(part_path, file_path)
+
+    @staticmethod
+    def _get_remote_size(original_file):
+        try:
+            if not original_file.seekable():
+                return None
+            size = original_file.seek(0, io.SEEK_END)
+            original_file.seek(0)
+            return size
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
+
+    def _download_stream(self, original_file, part_path, size=None):
+        """Copy the remote file sequentially, resuming a previous partial transfer when possible"""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset and (size is None or offset > size):
+            offset = 0
+        if offset:
+            original_file.seek(offset)
+        with open(part_path, "ab" if offset else "wb") as tmp_file:
+            while True:
+                data = original_file.read(settings.DEFAULT_BUFFER_CHUNK_SIZE)
+                if not data:
+                    break
+                tmp_file.write(data)
+
+    def _download_ranges(self, part_path, size, max_workers):
+        """
+        Download the remote file in parts of DATA_RETRIEVER_RANGE_PART_SIZE bytes, concurrently.
+        The completed parts are tracked in a file next to the partial one, so that they are not transferred again.
+        """
+        part_size = settings.DATA_RETRIEVER_RANGE_PART_SIZE
+        progress_path = f"{part_path}.json"
+        progress = {"uri": self._original_file_uri, "size": size, "done": []}
+        if os.path.exists(part_path) and os.path.exists(progress_path):
+            with open(progress_path) as progress_file:
+                previous = json.load(progress_file)
+            if previous.get("uri") == progress["uri"] and previous.get("size") == size:
+                progress = previous
+        done = set(progress["done"])
+        if not done:
+            with open(part_path, "wb") as tmp_file:
+                tmp_file.truncate(size)
+
+        lock = threading.Lock()
+        fd = os.open(part_path, os.O_WRONLY)
+
+        def _download_part(index):
+            offset = index * part_size
+            end = min(offset + part_size, size)
+            with smart_open.open(uri=self._original_file_uri, mode="rb") as original_file:
+                original_file.seek(offset)
+                while offset < end:
+                    data = original_file.read(min(settings.DEFAULT_BUFFER_CHUNK_SIZE, end - offset))
+                    if not data:
+                        raise DataRetrieverExcepion(detail=f"Unexpected end of {self._original_file_uri}")
+                    os.pwrite(fd, data, offset)
+                    offset += len(data)
+            with lock:
+                done.add(index)
+                with open(progress_path, "w") as progress_file:
+                    json.dump(dict(progress, done=sorted(done)), progress_file)
+
+        try:
+            parts = [index for index in range(-(-size // part_size)) if index not in done]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # consume the results to raise the first error
+                list(executor.map(_download_part, parts))
+        finally:
+            os.close(fd)
+        os.remove(progress_path)
+
     @property
     def size(self):
         if self.file_path:
@@ -148,28 +233,48 @@ class DataRetriever(object):
     def __init__(self, files, tranfer_at_creation=False):
         self.temporary_folder = None
         self.file_paths = {}
+        self.transfer_stats = None
 
         self.data_items = {name: DataItemRetriever(file) for name, file in files.items() if file}
         if tranfer_at_creation:
             self.transfer_remote_files()
 
-    def transfer_remote_files(self, cloning_directory=None, prefix=None, create_tempdir=True, unzip=True):
+    def transfer_remote_files(
+        self, cloning_directory=None, prefix=None, create_tempdir=True, unzip=True, max_workers=None
+    ):
         from geonode.utils import mkdtemp
 
+        max_workers = max_workers or settings.DATA_RETRIEVER_MAX_WORKERS
         self.temporary_folder = cloning_directory or settings.MEDIA_ROOT
         if create_tempdir:
             self.temporary_folder = mkdtemp(cloning_directory or settings.MEDIA_ROOT, prefix=prefix)
-        for name, data_item_retriever in self.data_items.items():
-            file_path = data_item_retriever.transfer_remote_file(self.temporary_folder)
-            self.file_paths[name] = Path(file_path)
+
+        started = time.monotonic()
+        zip_name = None
+
+        def _transfer(name, data_item_retriever):
+            file_path = data_item_retriever.transfer_remote_file(self.temporary_folder, max_workers=max_workers)
             if settings.FILE_UPLOAD_PERMISSIONS is not None:
                 os.chmod(file_path, settings.FILE_UPLOAD_PERMISSIONS)
-        """
-        Is more usefull to have always unzipped file than the zip file
-        So in case is a zip_file, we unzip it and than delete it
-        """
-        if unzip and zipfile.is_zipfile(self.file_paths.get("base_file", "not_zip")):
-            self._unzip(zip_name=self.file_paths.get("base_file"))
+            """
+            Is more usefull to have always unzipped file than the zip file
+            So in case is a zip_file, we unzip it while the other files are transferred
+            """
+            if unzip and name == "base_file" and zipfile.is_zipfile(file_path):
+                with zipfile.ZipFile(file_path, allowZip64=True) as the_zip:
+                    the_zip.extractall(self.temporary_folder)
+                return name, file_path, True
+            return name, file_path, False
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(self.data_items)))) as executor:
+            for name, file_path, extracted in executor.map(lambda item: _transfer(*item), self.data_items.items()):
+                self.file_paths[name] = Path(file_path)
+                if extracted:
+                    zip_name = file_path
+
+        self.transfer_stats = self._get_transfer_stats(time.monotonic() - started)
+        if zip_name:
+            self._organize_unzipped(zip_name)
 
         if settings.FILE_UPLOAD_DIRECTORY_PERMISSIONS is not None:
             # value is always set by default as None
@@ -177,6 +282,20 @@ class DataRetriever(object):
             os.chmod(self.temporary_folder, settings.FILE_UPLOAD_DIRECTORY_PERMISSIONS)
         return self.file_paths
 
+    def _get_transfer_stats(self, seconds):
+        files = {
+            name: item.transfer_stats for name, item in self.data_items.items() if getattr(item, "transfer_stats", None)
+        }
+        transferred = sum(stats["bytes"] for stats in files.values())
+        stats = {
+            "files": files,
+            "bytes": transferred,
+            "seconds": round(seconds, 3),
+            "throughput": round(transferred / seconds) if seconds else None,
+        }
+        logger.info(f"Transferred {transferred} bytes in {seconds:.2f}s")
+        return stats
+
     def get_paths(self, allow_transfer=False, cloning_directory=None, prefix=None, create_tempdir=True, unzip=True):
         if not self.file_paths:
             if allow_transfer:
@@ -212,7 +331,9 @@ class DataRetriever(object):
         zip_file = self.file_paths["base_file"]
         with zipfile.ZipFile(zip_file, allowZip64=True) as the_zip:
             the_zip.extractall(self.temporary_folder)
+        self._organize_unzipped(zip_name)
 
+    def _organize_unzipped(self, zip_name: str):
         self.file_paths = organize_files_by_ext(self.temporary_folder)
 
         tmp = self.file_paths.copy()
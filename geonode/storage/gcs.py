@@ -19,6 +19,7 @@
 
 from geonode.storage.manager import StorageManagerInterface
 from storages.backends.gcloud import GoogleCloudStorage
+from storages.utils import clean_name
 
 
 class GoogleStorageManager(StorageManagerInterface):
@@ -46,6 +47,18 @@ class GoogleStorageManager(StorageManagerInterface):
     def save(self, name, content, max_length=None):
         return self._gcp.save(name, content)
 
+    def copy_file(self, name, new_name):
+        """
+        Server side copy of the object, large objects are rewritten by Google Cloud Storage in several calls
+        """
+        new_name = self._gcp.get_available_name(new_name)
+        source = self._gcp.bucket.blob(self._gcp._normalize_name(clean_name(name)))
+        target = self._gcp.bucket.blob(self._gcp._normalize_name(clean_name(new_name)))
+        token, _, _ = target.rewrite(source)
+        while token is not None:
+            token, _, _ = target.rewrite(source, token=token)
+        return new_name
+
     def url(self, name):
         return self._gcp.url(name)
 
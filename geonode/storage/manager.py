@@ -32,6 +32,7 @@ from django.utils.module_loading import import_string
 from django.core.exceptions import SuspiciousFileOperation
 
 from geonode.storage.data_retriever import DataItemRetriever, DataRetriever
+from geonode.storage.utils import clone_file
 
 from . import settings as sm_settings
 
@@ -109,6 +110,14 @@ class StorageManagerInterface(metaclass=ABCMeta):
     def generate_filename(self, filename):
         pass
 
+    def copy_file(self, name, new_name):
+        """
+        Copy a stored file, returns the name of the copy.
+        Storages able to copy the files without transferring them through GeoNode override this.
+        """
+        with self.open(name, "rb") as open_file:
+            return self.save(new_name, open_file)
+
     def replace(self, resource, files: Union[list, BinaryIO]):
         pass
 
@@ -166,6 +175,14 @@ class StorageManager(StorageManagerInterface):
     def url(self, name):
         return self._concrete_storage_manager.url(name)
 
+    def copy_file(self, name, new_name):
+        try:
+            return self._concrete_storage_manager.copy_file(name, new_name)
+        except Exception as e:
+            logger.debug(f"Could not copy {name} within the storage, streaming it: {e}")
+            with self.open(name, "rb") as open_file:
+                return self.save(new_name, open_file)
+
     def replace(self, resource, files: Union[list, BinaryIO]):
         updated_files = {}
         if isinstance(files, list):
@@ -194,17 +211,15 @@ class StorageManager(StorageManagerInterface):
             os.chmod(new_path, settings.FILE_UPLOAD_DIRECTORY_PERMISSIONS)
         _new_path = None
         for f in files:
-            with self.open(f, "rb+") as open_file:
-                old_file_name, _ = os.path.splitext(os.path.basename(f))
-                _, ext = os.path.splitext(open_file.name)
-                # path = os.path.join(old_path, random_suffix)
-                if re.match(r".*_\w{7}$", old_file_name):
-                    suffixed_name = re.sub(r"_\w{7}$", f"_{random_suffix}", old_file_name)
-                    new_file = f"{new_path}/{suffixed_name}{ext}"
-                else:
-                    new_file = f"{new_path}/{old_file_name}_{random_suffix}{ext}"
-                _new_path = self.copy_single_file(open_file, new_file)
-                out.append(_new_path)
+            old_file_name, ext = os.path.splitext(os.path.basename(f))
+            # path = os.path.join(old_path, random_suffix)
+            if re.match(r".*_\w{7}$", old_file_name):
+                suffixed_name = re.sub(r"_\w{7}$", f"_{random_suffix}", old_file_name)
+                new_file = f"{new_path}/{suffixed_name}{ext}"
+            else:
+                new_file = f"{new_path}/{old_file_name}_{random_suffix}{ext}"
+            _new_path = self.path(self.copy_file(f, new_file))
+            out.append(_new_path)
             if _new_path and settings.FILE_UPLOAD_PERMISSIONS is not None:
                 os.chmod(_new_path, settings.FILE_UPLOAD_PERMISSIONS)
         return out
@@ -309,6 +324,24 @@ class FileSystemStorageManager(StorageManagerInterface):
     def url(self, name):
         return self._fsm.url(name)
 
+    def copy_file(self, name, new_name):
+        src = self._get_local_path(name)
+        dst = self._get_local_path(new_name)
+        if os.path.exists(dst):
+            root, ext = os.path.splitext(dst)
+            dst = f"{root}_{uuid1().hex[:7]}{ext}"
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        clone_file(src, dst)
+        if self._fsm.file_permissions_mode is not None:
+            os.chmod(dst, self._fsm.file_permissions_mode)
+        return dst
+
+    def _get_local_path(self, name):
+        try:
+            return self._fsm.path(name)
+        except SuspiciousFileOperation:
+            return os.path.abspath(name)
+
     def generate_filename(self, filename):
         return self._fsm.generate_filename(filename)
 
@@ -18,18 +18,22 @@
 #########################################################################
 import io
 import os
+import errno
+import json
 import shutil
 from django.test import override_settings
 import gisdata
-from unittest.mock import patch
+from unittest.mock import patch, PropertyMock
 
 from django.test.testcases import SimpleTestCase, TestCase
 
 from geonode.utils import mkdtemp
 from geonode.storage.aws import AwsStorageManager
 from geonode.storage.exceptions import DataRetrieverExcepion
+from geonode.storage.data_retriever import DataItemRetriever
 from geonode.storage.manager import StorageManager
 from geonode.storage.gcs import GoogleStorageManager
+from geonode.storage.utils import clone_file, clone_tree
 from geonode.base.populate_test_data import create_single_dataset
 from geonode.tests.base import GeoNodeBaseTestSupport
 
@@ -195,6 +199,17 @@ class TestAwsStorageManager(SimpleTestCase):
         self.assertEqual(1, output)
         aws.assert_called_once_with("name")
 
+    @patch("storages.backends.s3boto3.S3Boto3Storage.bucket", new_callable=PropertyMock)
+    def test_aws_copy_file(self, bucket):
+        """
+        Will test that the object is copied within the bucket
+        """
+        output = self.sut().copy_file("layers/file.tif", "layers/copy/file.tif")
+        self.assertEqual("layers/copy/file.tif", output)
+        bucket.return_value.copy.assert_called_once_with(
+            {"Bucket": "my-bucket-name", "Key": "layers/file.tif"}, "layers/copy/file.tif"
+        )
+
 
 class TestStorageManager(GeoNodeBaseTestSupport):
     def setUp(self):
@@ -278,6 +293,24 @@ class TestStorageManager(GeoNodeBaseTestSupport):
         self.assertEqual(1, output)
         strg.assert_called_once_with("name")
 
+    def test_storage_manager_copy_files_list(self):
+        """
+        Will test that the files are copied into a new folder, with a new suffix
+        """
+        files = [
+            os.path.join(f"{self.project_root}", "tests/data/test_sld.sld"),
+            os.path.join(f"{self.project_root}", "tests/data/test_data.json"),
+        ]
+        _tmpdir = mkdtemp()
+        self.addCleanup(shutil.rmtree, _tmpdir, ignore_errors=True)
+        output = self.sut().copy_files_list(files, dir=_tmpdir)
+        self.assertEqual(2, len(output))
+        for _file, _copy in zip(files, output):
+            self.assertTrue(_copy.startswith(_tmpdir))
+            self.assertTrue(os.path.basename(_copy).startswith(os.path.splitext(os.path.basename(_file))[0]))
+            with open(_file, "rb") as f1, open(_copy, "rb") as f2:
+                self.assertEqual(f1.read(), f2.read())
+
     # @patch('django.core.files.storage.FileSystemStorage.save')
     # @patch('django.core.files.storage.FileSystemStorage.path')
     def test_storage_manager_replace_files_list(self):  # , path, strg):
@@ -506,3 +539,89 @@ class TestDataRetriever(TestCase):
         self.assertIsNotNone(storage_manager.data_retriever.temporary_folder)
         _files = storage_manager.get_retrieved_paths()
         self.assertTrue("single_point.shp" in _files.get("base_file"))
+
+
+class TestCloneFile(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.src = os.path.join(self.tmpdir, "raster.tif")
+        with open(self.src, "wb") as f:
+            f.write(os.urandom(1024 * 1024))
+        os.chmod(self.src, 0o640)
+
+    def _assert_copied(self, dst):
+        with open(self.src, "rb") as f1, open(dst, "rb") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(os.stat(self.src).st_mode, os.stat(dst).st_mode)
+
+    def test_clone_file(self):
+        dst = clone_file(self.src, os.path.join(self.tmpdir, "copy.tif"))
+        self._assert_copied(dst)
+
+    @patch("geonode.storage.utils.fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "not supported"))
+    @patch("geonode.storage.utils.os.copy_file_range", side_effect=OSError(errno.EXDEV, "cross device"), create=True)
+    def test_clone_file_falls_back_to_a_plain_copy(self, copy_file_range, ioctl):
+        dst = clone_file(self.src, self.tmpdir + "/copy.tif")
+        self._assert_copied(dst)
+        self.assertTrue(ioctl.called)
+        self.assertTrue(copy_file_range.called)
+
+    def test_clone_file_into_itself(self):
+        with self.assertRaises(shutil.SameFileError):
+            clone_file(self.src, self.tmpdir)
+
+    def test_clone_tree(self):
+        os.makedirs(os.path.join(self.tmpdir, "tree", "sub"))
+        shutil.move(self.src, os.path.join(self.tmpdir, "tree", "sub"))
+        self.src = os.path.join(self.tmpdir, "tree", "sub", "raster.tif")
+        clone_tree(os.path.join(self.tmpdir, "tree"), os.path.join(self.tmpdir, "cloned"))
+        self._assert_copied(os.path.join(self.tmpdir, "cloned", "sub", "raster.tif"))
+
+
+@override_settings(DATA_RETRIEVER_RANGE_PART_SIZE=1000, DEFAULT_BUFFER_CHUNK_SIZE=256)
+class TestDataItemRetrieverTransfer(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.data = os.urandom(4500)
+        self.opened = 0
+
+    def _open(self, uri, mode):
+        self.opened += 1
+        return io.BytesIO(self.data)
+
+    def test_large_remote_files_are_downloaded_in_parts(self):
+        with patch("geonode.storage.data_retriever.smart_open.open", side_effect=self._open):
+            retriever = DataItemRetriever("s3://bucket/raster.tif")
+            file_path = retriever.transfer_remote_file(self.tmpdir, max_workers=3)
+
+        with open(file_path, "rb") as f:
+            self.assertEqual(self.data, f.read())
+        # one to get the size, one per part
+        self.assertEqual(6, self.opened)
+        self.assertEqual(4500, retriever.transfer_stats["bytes"])
+        self.assertEqual(["raster.tif"], os.listdir(self.tmpdir))
+
+    def test_partial_transfers_are_resumed(self):
+        part_path = os.path.join(self.tmpdir, "raster.tif.part")
+        with open(part_path, "wb") as f:
+            f.write(self.data[:2000] + bytes(2500))
+        with open(f"{part_path}.json", "w") as f:
+            json.dump({"uri": "s3://bucket/raster.tif", "size": 4500, "done": [0, 1]}, f)
+
+        with patch("geonode.storage.data_retriever.smart_open.open", side_effect=self._open):
+            file_path = DataItemRetriever("s3://bucket/raster.tif").transfer_remote_file(self.tmpdir, max_workers=2)
+
+        with open(file_path, "rb") as f:
+            self.assertEqual(self.data, f.read())
+        self.assertEqual(4, self.opened)
+
+    def test_small_remote_files_are_streamed(self):
+        self.data = self.data[:800]
+        with patch("geonode.storage.data_retriever.smart_open.open", side_effect=self._open):
+            file_path = DataItemRetriever("s3://bucket/style.sld").transfer_remote_file(self.tmpdir)
+
+        with open(file_path, "rb") as f:
+            self.assertEqual(self.data, f.read())
+        self.assertEqual(1, self.opened)
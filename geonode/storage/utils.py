@@ -1,7 +1,22 @@
 import os
+import errno
+import shutil
+import logging
 from pathlib import Path
 import zipfile
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl cloning a whole file into another one on copy-on-write filesystems (btrfs, XFS, ...), from linux/fs.h
+FICLONE = 0x40049409
+# errors meaning that the kernel or the filesystem cannot copy the file in place, a plain copy is needed
+_CLONE_UNSUPPORTED_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.EBADF}
+
 
 def organize_files_by_ext(input_data):
     file_paths = {}
@@ -29,3 +44,67 @@ def organize_files_by_ext(input_data):
             else:
                 file_paths[f"{ext}_file"] = Path(str(_file))
     return file_paths
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno in _CLONE_UNSUPPORTED_ERRORS or e.errno == errno.EPERM:
+            return False
+        raise
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    copied = 0
+    try:
+        while copied < size:
+            sent = os.copy_file_range(src_fd, dst_fd, min(size - copied, 1 << 30))
+            if not sent:
+                break
+            copied += sent
+    except OSError as e:
+        if not copied and e.errno in _CLONE_UNSUPPORTED_ERRORS:
+            return False
+        raise
+    return True
+
+
+def clone_file(src, dst, *, follow_symlinks=True):
+    """
+    Copy a file along with its metadata, like shutil.copy2, without reading it through userspace when possible.
+
+    The file is cloned with a reflink on copy-on-write filesystems, then copied with copy_file_range,
+    which lets the kernel or a network filesystem (NFS, SMB) copy it server side.
+    Otherwise it falls back to shutil.copyfile, which uses sendfile where available.
+    It can be used as copy_function of shutil.copytree.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if not follow_symlinks and os.path.islink(src):
+        return shutil.copy2(src, dst, follow_symlinks=False)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    method = "copy"
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+        if _reflink(src_fd, dst_fd):
+            method = "reflink"
+        elif _copy_file_range(src_fd, dst_fd, os.fstat(src_fd).st_size):
+            method = "copy_file_range"
+    if method == "copy":
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    logger.debug(f"Copied {src} into {dst} with {method}")
+    return dst
+
+
+def clone_tree(src, dst, dirs_exist_ok=False):
+    """Copy a directory tree like shutil.copytree, cloning the files with clone_file"""
+    return shutil.copytree(src, dst, copy_function=clone_file, dirs_exist_ok=dirs_exist_ok)
@@ -32,7 +32,7 @@ from geonode.layers.models import Attribute
 from geonode.geoserver.helpers import set_attributes
 from geonode.tests.base import GeoNodeBaseTestSupport
 from geonode.br.management.commands.utils.utils import ignore_time
-from geonode.utils import copy_tree, bbox_to_wkt, is_safe_url, is_safe_url_with_redirects
+from geonode.utils import copy_tree, bbox_to_wkt, is_safe_url, is_safe_url_with_redirects, HttpClient
 from unittest.mock import MagicMock
 
 
@@ -380,3 +380,63 @@ class TestIsSafeURL(djangoTestCase):
 
         self.assertTrue(result)
         self.assertIsNone(blocked_url)
+
+
+class TestHttpClient(TestCase):
+    def test_sessions_are_pooled_per_host(self):
+        client = HttpClient()
+        session = client._get_session("http://localhost:8080/geoserver/rest", 1)
+        self.assertIs(session, client._get_session("http://localhost:8080/geoserver/wms?request=GetMap", 1))
+        self.assertIsNot(session, client._get_session("http://example.com/", 1))
+        self.assertIsNot(session, client._get_session("http://localhost:8080/geoserver/rest", 3))
+        self.assertEqual(client.get_pool_stats()["sessions"], 3)
+
+        # sessions are dropped in a forked process
+        client._pid = -1
+        self.assertIsNot(session, client._get_session("http://localhost:8080/geoserver/rest", 1))
+
+    def test_request_does_not_alter_headers(self):
+        client = HttpClient()
+        session = client._get_session("http://localhost:8080/", client.retries)
+        headers = {"Accept": "application/json"}
+        with patch.object(session, "get") as mocked_get:
+            mocked_get.return_value = MagicMock(status_code=200, content=b"ok")
+            client.request("http://localhost:8080/", headers=headers)
+        self.assertDictEqual(headers, {"Accept": "application/json"})
+        self.assertEqual(mocked_get.call_args.kwargs["headers"]["User-Agent"], "GeoNode")
+
+    def test_access_tokens_are_cached(self):
+        client = HttpClient()
+        token = MagicMock(token="abc", expires=datetime.now() + timedelta(hours=1))
+        token.is_expired.return_value = False
+        user = MagicMock(username="bobby")
+        with (
+            patch("geonode.utils.get_or_create_token", return_value=token) as mocked_token,
+            patch("geonode.utils.timezone.now", return_value=datetime.now()),
+        ):
+            self.assertEqual(client._get_access_token(user), ("abc", False))
+            self.assertEqual(client._get_access_token(user), ("abc", True))
+            self.assertEqual(mocked_token.call_count, 1)
+            client._invalidate_access_token(user)
+            self.assertEqual(client._get_access_token(user), ("abc", False))
+            self.assertEqual(mocked_token.call_count, 2)
+
+    def test_revoked_cached_tokens_are_refreshed(self):
+        client = HttpClient()
+        session = client._get_session("http://localhost:8080/", client.retries)
+        unauthorized = MagicMock(status_code=401)
+        streamed = MagicMock(status_code=200)
+        with (
+            patch.object(client, "_get_access_token", side_effect=[("abc", True), ("def", False)]),
+            patch.object(client, "_invalidate_access_token") as invalidate,
+            patch.object(session, "get", side_effect=[unauthorized, streamed]) as mocked_get,
+        ):
+            response, content = client.request("http://localhost:8080/", stream=True, user=MagicMock())
+
+        self.assertIs(response, streamed)
+        self.assertIs(content, streamed.raw)
+        invalidate.assert_called_once()
+        self.assertEqual(mocked_get.call_args.kwargs["headers"]["Authorization"], "Bearer def")
+        # the connection of the first response is released to the pool
+        unauthorized.close.assert_called_once()
+        streamed.close.assert_not_called()
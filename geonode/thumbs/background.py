@@ -17,7 +17,6 @@
 #
 #########################################################################
 
-import time
 import ast
 import typing
 import logging
@@ -33,15 +32,27 @@ from PIL import Image, UnidentifiedImageError
 from owslib.wmts import WebMapTileService
 
 from django.conf import settings
-from django.utils.html import strip_tags
 
 from geonode.thumbs import utils
 from geonode.utils import http_client
+from geonode.thumbs.tiles import tile_engine
 from geonode.thumbs.exceptions import ThumbnailError
 
 logger = logging.getLogger(__name__)
 
 
+def _download_tile(url):
+    resp, content = http_client.request(url)
+    if resp is None:
+        raise Exception(content)
+    return resp.status_code, content
+
+
+def _download_wmts_tile(url):
+    resp = requests.get(url)
+    return resp.status_code, resp.content
+
+
 class BaseThumbBackground(ABC):
     def __init__(self, thumbnail_width: int, thumbnail_height: int, max_retries: int = 3, retry_delay: int = 1):
         """
@@ -342,31 +353,22 @@ class GenericXYZBackground(BaseThumbBackground):
             (250, 250, 250),
         )
 
+        tiles = {}
+        for x in tiles_rows:
+            for y in tiles_cols:
+                _y = (2**zoom) - y - 1 if self.tms else y
+                tiles[(x, y, zoom)] = self.url.format(x=x, y=_y, z=zoom)
+
+        # the same tile may appear many times when the BBOX spans several worlds, it is fetched only once
+        contents = tile_engine.fetch(
+            self.url, tiles, _download_tile, max_retries=self.max_retries, retry_delay=self.retry_delay
+        )
+
         for offset_x, x in enumerate(tiles_rows):
             for offset_y, y in enumerate(tiles_cols):
-                if self.tms:
-                    y = (2**zoom) - y - 1
-                imgurl = self.url.format(x=x, y=y, z=zoom)
-
-                im = None
-                for retries in range(self.max_retries):
-                    try:
-                        resp, content = http_client.request(imgurl)
-                        if resp.status_code > 400:
-                            retries = self.max_retries - 1
-                            raise Exception(f"{strip_tags(content)}")
-                        im = BytesIO(content)
-                        Image.open(im).verify()  # verify that it is, in fact an image
-                        break
-                    except Exception as e:
-                        logger.error(f"Thumbnail background fetching from {imgurl} failed {retries} time(s) with: {e}")
-                        if retries + 1 == self.max_retries:
-                            raise e
-                        time.sleep(self.retry_delay)
-                        continue
-
-                if im:
-                    image = Image.open(im)  # "re-open" the file (required after running verify method)
+                content = contents.get((x, y, zoom))
+                if content:
+                    image = Image.open(BytesIO(content))
 
                     # add the fetched tile to the background image, placing it under proper coordinates
                     background.paste(image, (offset_x * self.tile_size, offset_y * self.tile_size + fixed_top_offset))
@@ -510,22 +512,20 @@ class GenericWMTSBackground(BaseThumbBackground):
 
         background = Image.new("RGB", (tiles_width, tiles_height), (250, 250, 250))
 
+        tiles = {
+            (tile_coord[0], tile_coord[1], zoom): self.build_request([tile_coord[0], tile_coord[1], zoom])
+            for tile_coord in tile_rowcols
+        }
+        # the tiles which cannot be fetched are left blank
+        contents = tile_engine.fetch(self.get_provider(), tiles, _download_wmts_tile, fail_silently=True)
+
         for tile_coord in tile_rowcols:
-            try:
-                im = None
-                imgurl = self.build_request([tile_coord[0], tile_coord[1], zoom])
-                resp = requests.get(imgurl)
-                if resp.status_code > 400:
-                    raise Exception(f"{strip_tags(resp.content)}")
-                im = BytesIO(resp.content)
-                Image.open(im).verify()
-                if im:
-                    offsetx = (tile_coord[0] - tiles_mincol) * tilewidth
-                    offsety = (tile_coord[1] - tiles_minrow) * tileheight
-                    image = Image.open(im)
-                    background.paste(image, (offsetx, offsety))
-            except Exception as e:
-                logger.error(f"Error fetching {imgurl} for thumbnail: {e}")
+            content = contents.get((tile_coord[0], tile_coord[1], zoom))
+            if content:
+                offsetx = (tile_coord[0] - tiles_mincol) * tilewidth
+                offsety = (tile_coord[1] - tiles_minrow) * tileheight
+                image = Image.open(BytesIO(content))
+                background.paste(image, (offsetx, offsety))
 
         left = abs(tiles_minx - bbox[0]) / pixelspan
         right = left + self.thumbnail_width
@@ -541,6 +541,11 @@ class GenericWMTSBackground(BaseThumbBackground):
 
         return background
 
+    def get_provider(self):
+        return "|".join(
+            str(self.options.get(key)) for key in ("url", "layer", "style", "tilematrixset", "requestencoding")
+        )
+
     def build_kvp_request(self, baseurl, layer, style, xyz):
         return f"{baseurl}?&Service=WMTS&Request=GetTile&Version=1.0.0&Format=image/png&layer={layer}&style={style}\
 &tilematrixset={self.options['tilematrixset']}&TileMatrix={xyz[2]}&TileRow={xyz[1]}&TileCol={xyz[0]}"
@@ -0,0 +1,277 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import json
+import time
+import hashlib
+import logging
+import multiprocessing
+
+from itertools import islice
+from threading import BoundedSemaphore
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from geonode.base.models import ThumbnailSignature
+from geonode.layers.models import Dataset
+from geonode.maps.models import Map
+from geonode.thumbs import utils
+from geonode.thumbs.thumbnails import (
+    _fetch_background,
+    _fetch_partial_thumb,
+    _generate_thumbnail_name,
+    _prepare_thumbnail,
+    compose_thumbnail,
+)
+from geonode.thumbs.exceptions import ThumbnailError
+from geonode.utils import is_monochromatic_image
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("prepare", "getmap", "background", "compose", "save")
+
+
+class ThumbnailJob:
+    def __init__(self, instance, name, bbox, locations, styles, is_map_with_datasets, signature):
+        self.instance = instance
+        self.name = name
+        self.bbox = bbox
+        self.locations = locations
+        self.styles = styles
+        self.is_map_with_datasets = is_map_with_datasets
+        self.signature = signature
+        self.partial_thumbs = [None] * len(locations)
+        self.background = None
+        self.content = None
+
+
+class BulkThumbnailPipeline:
+    """
+    Regenerates the thumbnails of many Datasets and Maps in stages, a batch of resources at a time.
+
+    - prepare: the BBOX, datasets locations and styles of every resource are computed
+      and hashed together with the datasets versions; resources whose hash did not change since
+      their last thumbnail are skipped, unless ``force`` is set
+    - getmap: the GetMap requests of the whole batch are grouped by OGC server and run concurrently,
+      with at most ``THUMBNAIL_BULK_MAX_WORKERS`` requests at a time per server
+    - background: the backgrounds are fetched concurrently
+    - compose: every image is decoded once and composed in a pool of ``THUMBNAIL_BULK_PROCESSES`` processes
+    - save: the thumbnails are stored and the hashes recorded
+
+    The time spent in every stage is reported by ``run()``.
+    """
+
+    def __init__(self, force=False, batch_size=None, max_workers=None, processes=None):
+        self.force = force
+        self.batch_size = batch_size or getattr(settings, "THUMBNAIL_BULK_BATCH_SIZE", 100)
+        self.max_workers = max(1, max_workers or getattr(settings, "THUMBNAIL_BULK_MAX_WORKERS", 4))
+        self.processes = max(1, processes or getattr(settings, "THUMBNAIL_BULK_PROCESSES", 1))
+        self.wms_version = settings.OGC_SERVER["default"].get("WMS_VERSION") or "1.3.0"
+        self.width = settings.THUMBNAIL_SIZE["width"]
+        self.height = settings.THUMBNAIL_SIZE["height"]
+        self.report = {
+            "processed": 0,
+            "created": 0,
+            "skipped": 0,
+            "missing": 0,
+            "failed": 0,
+            "timings": {stage: 0.0 for stage in STAGES},
+        }
+
+    def run(self, queryset):
+        """
+        Regenerates the thumbnails of the Datasets and Maps of the queryset and returns the report
+        """
+        resources = queryset.order_by("pk").iterator(chunk_size=self.batch_size)
+        while batch := list(islice(resources, self.batch_size)):
+            self.run_batch(batch)
+            logger.info(f"Thumbnails: {self.report}")
+        return self.report
+
+    def run_batch(self, resources):
+        with self._stage("prepare"):
+            jobs = [job for job in (self._prepare(resource) for resource in resources) if job]
+        if not jobs:
+            return
+        with self._stage("getmap"):
+            self._fetch_partial_thumbs(jobs)
+
+        failed = [job for job in jobs if job.is_map_with_datasets and not any(job.partial_thumbs)]
+        for job in failed:
+            logger.error(f"Thumbnail generation failed for {job.instance} - no image retrieved from WMS services.")
+            utils.assign_missing_thumbnail(job.instance)
+            self.report["failed"] += 1
+        jobs = [job for job in jobs if job not in failed]
+
+        with self._stage("background"):
+            self._map_in_threads(
+                lambda job: setattr(
+                    job, "background", _fetch_background(job.bbox, self.width, self.height) if job.bbox else None
+                ),
+                jobs,
+                self.max_workers,
+            )
+        with self._stage("compose"):
+            self._compose(jobs)
+        with self._stage("save"):
+            for job in jobs:
+                try:
+                    if job.instance.thumbnail_url and is_monochromatic_image(None, job.content):
+                        # save_thumbnail keeps the current thumbnail in place of a blank one
+                        logger.debug(f"Thumbnail of {job.instance} is blank, keeping the current one")
+                        self._set_signature(job.instance, job.signature)
+                        self.report["skipped"] += 1
+                        continue
+                    thumbnail_path = job.instance.thumbnail_path
+                    job.instance.save_thumbnail(job.name, image=job.content)
+                    # save_thumbnail logs its errors, every stored thumbnail gets a new unique path
+                    if not job.instance.thumbnail_path or job.instance.thumbnail_path == thumbnail_path:
+                        raise ThumbnailError("the thumbnail was not stored")
+                    self._set_signature(job.instance, job.signature)
+                    self.report["created"] += 1
+                except Exception as e:
+                    logger.exception(f"Error saving the thumbnail of {job.instance}: {e}")
+                    self.report["failed"] += 1
+
+    def get_signature(self, instance, bbox, locations, styles):
+        """
+        Returns a hash of everything the thumbnail depends on
+        """
+        layers = [alternate for location in locations for alternate in location[1]]
+        versions = sorted(
+            (alternate, str(last_updated))
+            for alternate, last_updated in Dataset.objects.filter(alternate__in=layers).values_list(
+                "alternate", "last_updated"
+            )
+        )
+        style_bodies = []
+        if isinstance(instance, Dataset) and instance.default_style:
+            style_bodies.append(instance.default_style.sld_body or "")
+        payload = {
+            "bbox": [str(coord) for coord in bbox] if bbox else None,
+            "locations": [[location[0], location[1], location[2]] for location in locations],
+            "styles": styles,
+            "style_bodies": [hashlib.md5(body.encode("utf-8")).hexdigest() for body in style_bodies],
+            "versions": versions,
+            "size": [self.width, self.height],
+            "background": settings.THUMBNAIL_BACKGROUND,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _prepare(self, resource):
+        self.report["processed"] += 1
+        instance = resource.get_real_instance()
+        if not isinstance(instance, (Dataset, Map)):
+            logger.debug(f"Thumbnail generation of {instance} is not supported, skipping it")
+            self.report["skipped"] += 1
+            return None
+        try:
+            name = _generate_thumbnail_name(instance)
+            if name is None:
+                # Map without datasets
+                utils.assign_missing_thumbnail(instance)
+                self.report["missing"] += 1
+                return None
+            bbox, locations, styles, is_map_with_datasets = _prepare_thumbnail(instance)
+            signature = self.get_signature(instance, bbox, locations, styles)
+        except ThumbnailError as e:
+            logger.error(f"Thumbnail generation failed for {instance}: {e}")
+            self.report["failed"] += 1
+            return None
+
+        if not self.force and instance.thumbnail_url and self._get_signature(instance) == signature:
+            logger.debug(f"Thumbnail of {instance} is up to date, skipping it")
+            self.report["skipped"] += 1
+            return None
+        return ThumbnailJob(instance, name, bbox, locations, styles, is_map_with_datasets, signature)
+
+    def _fetch_partial_thumbs(self, jobs):
+        requests = [(job, index) for job in jobs for index in range(len(job.locations))]
+        semaphores = defaultdict(lambda: BoundedSemaphore(self.max_workers))
+        for job, index in requests:
+            # create them upfront, the defaultdict is not thread safe
+            semaphores[job.locations[index][0]]
+
+        def _fetch(request):
+            job, index = request
+            ogc_server, datasets, location_styles, auth = job.locations[index]
+            with semaphores[ogc_server]:
+                job.partial_thumbs[index] = _fetch_partial_thumb(
+                    job.instance,
+                    ogc_server,
+                    datasets,
+                    location_styles,
+                    auth,
+                    job.bbox,
+                    job.styles,
+                    self.wms_version,
+                    "image/png",
+                    self.width,
+                    self.height,
+                )
+
+        self._map_in_threads(_fetch, requests, self.max_workers * len(semaphores))
+
+    def _compose(self, jobs):
+        args = [(job.partial_thumbs, job.background, self.width, self.height) for job in jobs]
+        # the processes of a pool (e.g. the celery workers) cannot start other processes
+        if self.processes > 1 and len(jobs) > 1 and not multiprocessing.current_process().daemon:
+            with ProcessPoolExecutor(max_workers=min(self.processes, len(jobs))) as executor:
+                contents = list(executor.map(compose_thumbnail, *zip(*args)))
+        else:
+            contents = [compose_thumbnail(*_args) for _args in args]
+        for job, content in zip(jobs, contents):
+            job.content = content
+            # release the images as soon as possible
+            job.partial_thumbs = job.background = None
+
+    @staticmethod
+    def _map_in_threads(func, items, max_workers):
+        def _run(item):
+            try:
+                return func(item)
+            finally:
+                # every thread opens its own db connections
+                connections.close_all()
+
+        if len(items) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+                list(executor.map(_run, items))
+        else:
+            for item in items:
+                func(item)
+
+    @contextmanager
+    def _stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.report["timings"][stage] += time.perf_counter() - start
+
+    @staticmethod
+    def _get_signature(instance):
+        return ThumbnailSignature.objects.filter(resource_id=instance.pk).values_list("signature", flat=True).first()
+
+    @staticmethod
+    def _set_signature(instance, signature):
+        ThumbnailSignature.objects.update_or_create(resource_id=instance.pk, defaults={"signature": signature})
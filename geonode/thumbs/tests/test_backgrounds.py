@@ -17,16 +17,20 @@
 #
 #########################################################################
 import os
+import time
 import logging
-from unittest.mock import patch
+import tempfile
+from io import BytesIO
+from unittest.mock import patch, MagicMock
 
 from pixelmatch.contrib.PIL import pixelmatch
 from PIL import Image
 
 from django.test import override_settings
 
-from geonode.tests.base import GeoNodeBaseTestSupport
+from geonode.tests.base import GeoNodeBaseTestSupport, GeoNodeBaseSimpleTestSupport
 from geonode.thumbs.background import GenericWMTSBackground
+from geonode.thumbs.tiles import BackgroundTileEngine, TileCache
 
 logger = logging.getLogger(__name__)
 
@@ -369,3 +373,66 @@ layer=Hosted_basemap_inforac_3857&style=default&tilematrixset=default028mm&TileM
                 mismatch < expected_image.size[0] * expected_image.size[1] * 0.01,
                 "Expected test and pre-generated backgrounds to differ up to 1%",
             )
+
+
+class BackgroundTileEngineTest(GeoNodeBaseSimpleTestSupport):
+    @staticmethod
+    def _tile(color):
+        content = BytesIO()
+        Image.new("RGB", (8, 8), color).save(content, format="PNG")
+        return content.getvalue()
+
+    def test_tile_cache_evicts_least_recently_used(self):
+        tiles = {color: self._tile(color) for color in ("red", "green", "blue")}
+        cache = TileCache(max_size=len(tiles["red"]) + len(tiles["green"]))
+        for color, content in tiles.items():
+            if color == "blue":
+                # "red" is used again, "green" becomes the least recently used
+                self.assertEqual(tiles["red"], cache.get("red"))
+            cache.set(color, content)
+        self.assertIsNone(cache.get("green"))
+        self.assertEqual(tiles["blue"], cache.get("blue"))
+
+    def test_tile_cache_on_disk(self):
+        content = self._tile("red")
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TileCache(max_size=0, directory=directory, max_dir_size=len(content) * 2)
+            keys = [TileCache.get_key("provider", 1, x, 0) for x in range(3)]
+            for key in keys:
+                cache.set(key, content)
+                # the file system timestamps may be coarse
+                time.sleep(0.05)
+            # shared with a fresh cache, e.g. of another process, but the oldest tile is evicted
+            cache = TileCache(max_size=0, directory=directory, max_dir_size=len(content) * 2)
+            self.assertEqual(content, cache.get(keys[-1]))
+            self.assertIsNone(cache.get(keys[0]))
+
+    @override_settings(THUMBNAIL_TILES_MAX_WORKERS=4, THUMBNAIL_TILES_CACHE_SIZE=1024 * 1024)
+    def test_fetch_tiles_concurrently_once(self):
+        content = self._tile("red")
+        download = MagicMock(return_value=(200, content))
+        tiles = {(x, y, 2): f"https://tiles.example.org/2/{x}/{y}.png" for x in range(4) for y in range(2)}
+
+        engine = BackgroundTileEngine()
+        results = engine.fetch("https://tiles.example.org/{z}/{x}/{y}.png", tiles, download)
+        self.assertEqual(set(tiles), set(results))
+        self.assertEqual(len(tiles), download.call_count)
+
+        # the tiles are now served from the cache
+        results = engine.fetch("https://tiles.example.org/{z}/{x}/{y}.png", tiles, download)
+        self.assertEqual(set(tiles), set(results))
+        self.assertEqual(len(tiles), download.call_count)
+
+    @override_settings(THUMBNAIL_TILES_MAX_WORKERS=2, THUMBNAIL_TILES_CACHE_SIZE=0)
+    def test_fetch_tiles_errors(self):
+        content = self._tile("red")
+        tiles = {(0, 0, 1): "https://tiles.example.org/ok.png", (1, 0, 1): "https://tiles.example.org/ko.png"}
+
+        def download(url):
+            return (200, content) if url.endswith("ok.png") else (404, "Not found")
+
+        engine = BackgroundTileEngine()
+        results = engine.fetch("provider", tiles, download, fail_silently=True)
+        self.assertListEqual([(0, 0, 1)], list(results))
+        with self.assertRaises(Exception):
+            engine.fetch("provider", tiles, download, max_retries=3, retry_delay=0)
@@ -20,22 +20,27 @@
 import re
 import uuid
 
+from io import BytesIO
+from PIL import Image
+
 from unittest.mock import patch, PropertyMock, MagicMock
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import Polygon
-from geonode.base.models import ResourceBase
+from geonode.base.models import ResourceBase, ThumbnailSignature
 from geonode.documents.models import Document
 from geonode.geoapps.models import GeoApp
 from geonode.resource.registry import resource_manager_registry, document_manager, geoapp_manager
 
 from geonode.thumbs import utils
 from geonode.thumbs import thumbnails
+from geonode.thumbs.bulk import BulkThumbnailPipeline, STAGES
 from geonode.layers.models import Dataset
 from geonode.security.auth_handlers import BasicAuthHandler
 from geonode.security.auth_registry import auth_handler_registry
 from geonode.utils import DisableDjangoSignals
 from geonode.maps.models import Map, MapLayer
+from geonode.metadata.models import SparseField
 from geonode.tests.base import GeoNodeBaseTestSupport, GeoNodeBaseSimpleTestSupport
 
 FIXTURES_DIR = "geonode/thumbs/tests/fixtures/"
@@ -308,3 +313,84 @@ class ThumbnailsUnitTest(GeoNodeBaseTestSupport):
             map.save()
             thumbnails.create_thumbnail(map, overwrite=True)
             _mck.assert_called_with(map, compute_bbox=False, target_crs="EPSG:3857")
+
+
+class BulkThumbnailPipelineTest(GeoNodeBaseTestSupport):
+    fixtures = ThumbnailsUnitTest.fixtures
+
+    @classmethod
+    def setUpClass(cls):
+        with DisableDjangoSignals():
+            super().setUpClass()
+
+    @staticmethod
+    def _image(monochromatic=False):
+        size = (settings.THUMBNAIL_SIZE["width"], settings.THUMBNAIL_SIZE["height"])
+        image = Image.new("RGBA", size, (255, 0, 0, 255))
+        if not monochromatic:
+            image.paste((0, 0, 255, 255), (0, 0, size[0] // 2, size[1]))
+        with BytesIO() as output:
+            image.save(output, format="PNG")
+            return output.getvalue()
+
+    @staticmethod
+    def _save_thumbnail(instance, filename, image):
+        instance.thumbnail_path = utils.get_unique_upload_path(filename)
+
+    @patch("geonode.thumbs.bulk._fetch_background", return_value=None)
+    @patch.object(ResourceBase, "save_thumbnail", autospec=True, side_effect=_save_thumbnail)
+    def test_bulk_thumbnails_skip_unchanged(self, save_thumbnail, *args):
+        datasets = ResourceBase.objects.filter(resource_type="dataset")
+        ResourceBase.objects.filter(pk__in=datasets.values("pk")).update(thumbnail_url="http://localhost/thumb.png")
+        with patch("geonode.thumbs.bulk._fetch_partial_thumb", return_value=self._image()) as fetch:
+            report = BulkThumbnailPipeline(batch_size=2, max_workers=2).run(datasets)
+            self.assertEqual(datasets.count(), report["created"])
+            self.assertEqual(datasets.count(), fetch.call_count)
+            self.assertEqual(datasets.count(), save_thumbnail.call_count)
+            for stage in STAGES:
+                self.assertIn(stage, report["timings"])
+
+            # nothing changed, the thumbnails are not generated again
+            report = BulkThumbnailPipeline(batch_size=2).run(datasets)
+            self.assertEqual(0, report["created"])
+            self.assertEqual(datasets.count(), report["skipped"])
+            self.assertEqual(datasets.count(), fetch.call_count)
+
+            # unless forced
+            report = BulkThumbnailPipeline(force=True).run(datasets)
+            self.assertEqual(datasets.count(), report["created"])
+
+    @patch("geonode.thumbs.bulk._fetch_background", return_value=None)
+    @patch.object(ResourceBase, "save_thumbnail")
+    def test_bulk_thumbnails_not_stored_are_failed(self, save_thumbnail, *args):
+        # save_thumbnail logs its errors without raising them
+        datasets = ResourceBase.objects.filter(resource_type="dataset")
+        with patch("geonode.thumbs.bulk._fetch_partial_thumb", return_value=self._image()):
+            report = BulkThumbnailPipeline().run(datasets)
+            self.assertEqual(0, report["created"])
+            self.assertEqual(datasets.count(), report["failed"])
+
+            # the thumbnails are generated again on the next run
+            report = BulkThumbnailPipeline().run(datasets)
+            self.assertEqual(0, report["skipped"])
+            self.assertEqual(datasets.count(), report["failed"])
+
+    @patch("geonode.thumbs.bulk._fetch_background", return_value=None)
+    @patch.object(ResourceBase, "save_thumbnail")
+    def test_bulk_thumbnails_blank_keep_the_current_one(self, save_thumbnail, *args):
+        # save_thumbnail does not replace an existing thumbnail with a blank one
+        datasets = ResourceBase.objects.filter(resource_type="dataset")
+        ResourceBase.objects.filter(pk__in=datasets.values("pk")).update(thumbnail_url="http://localhost/thumb.png")
+        with patch("geonode.thumbs.bulk._fetch_partial_thumb", return_value=self._image(monochromatic=True)) as fetch:
+            report = BulkThumbnailPipeline().run(datasets)
+            self.assertEqual(0, report["created"])
+            self.assertEqual(0, report["failed"])
+            self.assertEqual(datasets.count(), report["skipped"])
+            save_thumbnail.assert_not_called()
+            self.assertEqual(datasets.count(), ThumbnailSignature.objects.filter(resource__in=datasets).count())
+
+            # the resources are unchanged on the next run
+            report = BulkThumbnailPipeline().run(datasets)
+            self.assertEqual(datasets.count(), report["skipped"])
+            self.assertEqual(datasets.count(), fetch.call_count)
+        self.assertFalse(SparseField.objects.filter(resource__in=datasets).exists())
@@ -117,6 +117,47 @@ def create_thumbnail(
         logger.debug(f"Thumbnail for {instance.name} already exists. Skipping thumbnail generation.")
         return
 
+    bbox, locations, styles, is_map_with_datasets = _prepare_thumbnail(
+        instance, bbox=bbox, forced_crs=forced_crs, styles=styles, map_thumb_from_bbox=map_thumb_from_bbox
+    )
+
+    # --- fetch WMS datasets ---
+    partial_thumbs = []
+
+    for ogc_server, datasets, _styles, auth in locations:
+        partial_thumb = _fetch_partial_thumb(
+            instance, ogc_server, datasets, _styles, auth, bbox, styles, wms_version, mime_type, width, height
+        )
+        partial_thumbs.append(partial_thumb)
+
+    if not partial_thumbs and is_map_with_datasets:
+        utils.assign_missing_thumbnail(instance)
+        raise ThumbnailError("Thumbnail generation failed - no image retrieved from WMS services.")
+
+    # --- fetch background image ---
+    background = _fetch_background(bbox, width, height, background_zoom)
+
+    content = compose_thumbnail(partial_thumbs, background, width, height)
+
+    # save thumbnail
+    instance.save_thumbnail(default_thumbnail_name, image=content)
+    return instance.thumbnail_url
+
+
+def _prepare_thumbnail(
+    instance: Union[Dataset, Map],
+    bbox: Optional[Union[List, Tuple]] = None,
+    forced_crs: Optional[str] = None,
+    styles: Optional[List] = None,
+    map_thumb_from_bbox: bool = False,
+) -> Tuple[Optional[List], List[List], Optional[List], bool]:
+    """
+    Function determining what a thumbnail is composed of: its BBOX (expanded to the thumbnail's ratio),
+    the locations of the instance's datasets and the styles to use.
+
+    :return: a tuple (bbox, locations, styles, is_map_with_datasets)
+    :raises ThumbnailError: if the BBOX of a Map with datasets cannot be determined
+    """
     # --- determine target CRS and bbox ---
     target_crs = forced_crs.upper() if forced_crs is not None else "EPSG:3857"
 
@@ -153,62 +194,68 @@ def create_thumbnail(
         if instance.default_style:
             styles = [instance.default_style.name]
 
-    # --- fetch WMS datasets ---
-    partial_thumbs = []
+    return bbox, locations, styles, is_map_with_datasets
 
-    for ogc_server, datasets, _styles, auth in locations:
-        if isinstance(instance, Map):
-            styles = []
-            if len(datasets) == len(_styles):
-                styles = _styles
-        try:
-            partial_thumbs.append(
-                utils.get_map(
-                    ogc_server,
-                    datasets,
-                    wms_version=wms_version,
-                    bbox=bbox,
-                    mime_type=mime_type,
-                    styles=styles,
-                    width=width,
-                    height=height,
-                    instance=instance,
-                    auth=auth,
-                )
-            )
-        except Exception as e:
-            logger.error(f"Exception occurred while fetching partial thumbnail for {instance.title}.")
-            logger.exception(e)
 
-    if not partial_thumbs and is_map_with_datasets:
-        utils.assign_missing_thumbnail(instance)
-        raise ThumbnailError("Thumbnail generation failed - no image retrieved from WMS services.")
+def _fetch_partial_thumb(
+    instance, ogc_server, datasets, location_styles, auth, bbox, styles, wms_version, mime_type, width, height
+) -> Optional[bytes]:
+    """
+    Function fetching the image of the datasets of a single OGC location, returns None on error.
+    """
+    if isinstance(instance, Map):
+        styles = []
+        if len(datasets) == len(location_styles):
+            styles = location_styles
+    try:
+        return utils.get_map(
+            ogc_server,
+            datasets,
+            wms_version=wms_version,
+            bbox=bbox,
+            mime_type=mime_type,
+            styles=styles,
+            width=width,
+            height=height,
+            instance=instance,
+            auth=auth,
+        )
+    except Exception as e:
+        logger.error(f"Exception occurred while fetching partial thumbnail for {instance.title}.")
+        logger.exception(e)
+
+
+def _fetch_background(bbox, width: int, height: int, background_zoom: Optional[int] = None) -> Optional[Image.Image]:
+    try:
+        BackgroundGenerator = import_string(settings.THUMBNAIL_BACKGROUND["class"])
+        return BackgroundGenerator(width, height).fetch(bbox, background_zoom) if bbox else None
+    except Exception as e:
+        logger.error(f"Thumbnail generation. Error occurred while fetching background image: {e}")
+        logger.exception(e)
 
+
+def compose_thumbnail(partial_thumbs: List[bytes], background: Optional[Image.Image], width: int, height: int) -> bytes:
+    """
+    Function merging the images retrieved from the WMS services over the background image.
+    It does not access the database, so that it can run in a separate process.
+
+    :return: the thumbnail as PNG
+    """
     # --- merge retrieved WMS images ---
     merged_partial_thumbs = Image.new("RGBA", (width, height), (255, 255, 255, 0))
 
     for image in partial_thumbs:
         if image:
-            content = BytesIO(image)
             try:
-                img = Image.open(content)
-                img.verify()  # verify that it is, in fact an image
-                img = Image.open(BytesIO(image))  # "re-open" the file (required after running verify method)
+                # decoding the image validates it as well
+                img = Image.open(BytesIO(image))
+                img.load()
                 # merged_partial_thumbs.paste(img, mask=img.convert("RGBA").split()[-1])
                 merged_partial_thumbs = Image.alpha_composite(merged_partial_thumbs, img.convert("RGBA"))
-            except UnidentifiedImageError as e:
+            except (UnidentifiedImageError, OSError) as e:
                 logger.error(f"Thumbnail generation. Error occurred while fetching dataset image: {image}")
                 logger.exception(e)
 
-    # --- fetch background image ---
-    try:
-        BackgroundGenerator = import_string(settings.THUMBNAIL_BACKGROUND["class"])
-        background = BackgroundGenerator(width, height).fetch(bbox, background_zoom) if bbox else None
-    except Exception as e:
-        logger.error(f"Thumbnail generation. Error occurred while fetching background image: {e}")
-        logger.exception(e)
-        background = None
-
     # --- overlay image with background ---
     thumbnail = Image.new("RGBA", (width, height), (250, 250, 250))
 
@@ -220,11 +267,7 @@ def create_thumbnail(
     # convert image to the format required by save_thumbnail
     with BytesIO() as output:
         thumbnail.save(output, format="PNG")
-        content = output.getvalue()
-
-    # save thumbnail
-    instance.save_thumbnail(default_thumbnail_name, image=content)
-    return instance.thumbnail_url
+        return output.getvalue()
 
 
 def _generate_thumbnail_name(instance: Union[Dataset, Map, Document, GeoApp, ResourceBase]) -> Optional[str]:
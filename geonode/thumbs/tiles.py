@@ -0,0 +1,288 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+import os
+import time
+import typing
+import hashlib
+import logging
+import tempfile
+
+from io import BytesIO
+from threading import Lock
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+from django.conf import settings
+from django.db import connections
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+TILE_FILE_SUFFIX = ".tile"
+
+
+class TileCache:
+    """
+    Cache of the background tiles keyed by (provider, z, x, y).
+
+    The tiles are kept in a process wide LRU bounded by the total size of the tiles in bytes and,
+    when a directory is configured, on disk so that they are shared among processes and restarts.
+    The disk cache is bounded by size as well, the least recently used tiles are evicted first.
+    """
+
+    def __init__(self, max_size: int = 0, directory: str = None, max_dir_size: int = 0):
+        self.max_size = max_size
+        self.directory = directory
+        self.max_dir_size = max_dir_size
+        self._tiles = OrderedDict()
+        self._size = 0
+        self._dir_size = None
+        self._lock = Lock()
+
+    @staticmethod
+    def get_key(provider: str, z: int, x: int, y: int) -> str:
+        return hashlib.sha1(f"{provider}|{z}|{x}|{y}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> typing.Optional[bytes]:
+        with self._lock:
+            content = self._tiles.get(key)
+            if content is not None:
+                self._tiles.move_to_end(key)
+                return content
+
+        content = self._read(key)
+        if content is not None:
+            self._remember(key, content)
+        return content
+
+    def set(self, key: str, content: bytes):
+        self._remember(key, content)
+        self._write(key, content)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._size = 0
+        if self.directory and os.path.isdir(self.directory):
+            for path, _, _ in self._list_files():
+                self._remove(path)
+            self._dir_size = 0
+
+    def _remember(self, key, content):
+        if len(content) > self.max_size:
+            return
+        with self._lock:
+            previous = self._tiles.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._tiles[key] = content
+            self._size += len(content)
+            while self._size > self.max_size:
+                _, evicted = self._tiles.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _get_path(self, key):
+        # two levels of sub-folders to keep the folders small
+        return os.path.join(self.directory, key[:2], f"{key}{TILE_FILE_SUFFIX}")
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            # the modification time tracks the last access for the eviction
+            os.utime(path)
+            return content
+        except OSError:
+            return None
+
+    def _write(self, key, content):
+        if not self.directory or len(content) > self.max_dir_size:
+            return
+        path = self._get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write and rename, other processes never read partial tiles
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store the background tile {key} on disk: {e}")
+            return
+
+        with self._lock:
+            if self._dir_size is None:
+                self._dir_size = sum(size for _, size, _ in self._list_files())
+            else:
+                self._dir_size += len(content)
+            evict = self._dir_size > self.max_dir_size
+        if evict:
+            self._evict()
+
+    def _evict(self):
+        # the directory may be shared with other processes, the actual size is computed again
+        files = sorted(self._list_files(), key=lambda f: f[2])
+        dir_size = sum(size for _, size, _ in files)
+        # evict down to 90% of the limit, to not scan the directory at every write
+        target = self.max_dir_size * 0.9
+        for path, size, _ in files:
+            if dir_size <= target:
+                break
+            if self._remove(path):
+                dir_size -= size
+        with self._lock:
+            self._dir_size = dir_size
+
+    def _list_files(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(TILE_FILE_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime_ns))
+        return files
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class BackgroundTileEngine:
+    """
+    Fetches the tiles composing a thumbnail background concurrently,
+    on a bounded thread pool (``THUMBNAIL_TILES_MAX_WORKERS``), going through the shared tile cache
+    (``THUMBNAIL_TILES_CACHE_SIZE``, ``THUMBNAIL_TILES_CACHE_DIR`` and ``THUMBNAIL_TILES_CACHE_DIR_SIZE``).
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._cache_config = None
+        self._lock = Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, getattr(settings, "THUMBNAIL_TILES_MAX_WORKERS", 1))
+
+    @property
+    def cache(self) -> TileCache:
+        config = (
+            getattr(settings, "THUMBNAIL_TILES_CACHE_SIZE", 0),
+            getattr(settings, "THUMBNAIL_TILES_CACHE_DIR", None),
+            getattr(settings, "THUMBNAIL_TILES_CACHE_DIR_SIZE", 0),
+        )
+        with self._lock:
+            if self._cache is None or self._cache_config != config:
+                self._cache = TileCache(*config)
+                self._cache_config = config
+            return self._cache
+
+    def fetch(
+        self,
+        provider: str,
+        tiles: typing.Dict[typing.Tuple[int, int, int], str],
+        download: typing.Callable,
+        max_retries: int = 1,
+        retry_delay: int = 0,
+        fail_silently: bool = False,
+    ) -> typing.Dict[typing.Tuple[int, int, int], bytes]:
+        """
+        Returns the content of the tiles, as a dict (x, y, z) -> image bytes.
+
+        :param provider: a string identifying the tiles provider, e.g. its url template
+        :param tiles: a dict (x, y, z) -> url of the tile
+        :param download: a callable taking the url of a tile and returning the tuple (status_code, content)
+        :param max_retries: maximum number of attempts for every tile
+        :param retry_delay: number of seconds waited between consecutive attempts
+        :param fail_silently: if set the tiles which could not be fetched are missing from the result,
+            otherwise the first error is raised
+        """
+        cache = self.cache
+        results = {}
+        missing = []
+        for xyz, url in tiles.items():
+            content = cache.get(cache.get_key(provider, xyz[2], xyz[0], xyz[1]))
+            if content is not None:
+                results[xyz] = content
+            else:
+                missing.append((xyz, url))
+        logger.debug(f"Found {len(results)} cached background tiles out of {len(tiles)}")
+
+        def _fetch(tile):
+            xyz, url = tile
+            try:
+                content = self._fetch_tile(url, download, max_retries, retry_delay)
+                cache.set(cache.get_key(provider, xyz[2], xyz[0], xyz[1]), content)
+                return xyz, content, None
+            except Exception as e:
+                return xyz, None, e
+
+        if len(missing) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = list(executor.map(lambda tile: self._run_in_thread(_fetch, tile), missing))
+        else:
+            fetched = [_fetch(tile) for tile in missing]
+
+        for xyz, content, error in fetched:
+            if error is not None:
+                if not fail_silently:
+                    raise error
+                continue
+            results[xyz] = content
+        return results
+
+    @staticmethod
+    def _run_in_thread(func, *args):
+        try:
+            return func(*args)
+        finally:
+            # every thread opens its own db connections, e.g. to look up the access tokens
+            connections.close_all()
+
+    @staticmethod
+    def _fetch_tile(url, download, max_retries, retry_delay):
+        for retries in range(max_retries):
+            try:
+                status_code, content = download(url)
+                if status_code > 400:
+                    retries = max_retries - 1
+                    raise Exception(f"{strip_tags(content)}")
+                Image.open(BytesIO(content)).verify()  # verify that it is, in fact an image
+                return content
+            except Exception as e:
+                logger.error(f"Thumbnail background fetching from {url} failed {retries + 1} time(s) with: {e}")
+                if retries + 1 >= max_retries:
+                    raise e
+                time.sleep(retry_delay)
+
+
+tile_engine = BackgroundTileEngine()
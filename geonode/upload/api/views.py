@@ -183,6 +183,8 @@ class ImporterViewSet(DynamicModelViewSet):
                     **{"temporary_files": _files},
                     **extracted_params,
                 }
+                if storage_manager and storage_manager.data_retriever.transfer_stats:
+                    input_params["transfer_stats"] = storage_manager.data_retriever.transfer_stats
 
                 action = input_params.get("action")
                 execution_id = orchestrator.create_execution_request(
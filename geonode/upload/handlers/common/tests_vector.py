@@ -22,6 +22,7 @@ import uuid
 from celery.canvas import Signature
 from celery import group
 from django.conf import settings
+from django.db import connections
 from django.test import TestCase
 from django.urls import reverse
 from mock import MagicMock, patch
@@ -36,7 +37,7 @@ from geonode.upload.orchestrator import orchestrator
 from geonode.base.populate_test_data import create_single_dataset
 from geonode.resource.models import ExecutionRequest
 from dynamic_models.models import ModelSchema
-from osgeo import ogr
+from osgeo import ogr, osr
 from django.test.utils import override_settings
 from geoserver.catalog import Catalog
 
@@ -673,3 +674,242 @@ class TestUpsertBaseVectorHandler(TransactionImporterBaseTestSupport):
             str(exp.exception),
             "Error found during the upsert process. Errors are reported inside a CSV file that can be found inside the assets panel.",
         )
+
+
+class TestVectorUpsertEngine(TestCase):
+    """
+    Tests for the single pass upsert engine, without touching the datastore
+    """
+
+    def _get_layer(self):
+        driver = ogr.GetDriverByName("MEM") or ogr.GetDriverByName("Memory")
+        self.datasource = driver.CreateDataSource("upsert")
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(4326)
+        layer = self.datasource.CreateLayer("upsert", srs, ogr.wkbPolygon)
+        layer.CreateField(ogr.FieldDefn("fid", ogr.OFTInteger))
+        layer.CreateField(ogr.FieldDefn("Name Label", ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn("day", ogr.OFTDate))
+        layer.CreateField(ogr.FieldDefn("not_in_schema", ogr.OFTString))
+        for fid, name, day in ((1, "first, quoted", "2024/01/31"), (2, None, None)):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField("fid", fid)
+            if name:
+                feature.SetField("Name Label", name)
+            if day:
+                feature.SetField("day", day)
+            feature.SetGeometry(ogr.CreateGeometryFromWkt("POLYGON ((0 0, 0 1, 1 1, 0 0))"))
+            layer.CreateFeature(feature)
+        return layer
+
+    def _get_engine(self):
+        from geonode.upload.handlers.common.upsert import VectorUpsertEngine
+
+        model = MagicMock()
+        model.objects.db = "default"
+        model._meta.concrete_fields = []
+        for name in ("fid", "name_label", "day", "geom"):
+            field = MagicMock(column=name, srid=3857, geom_type="MULTIPOLYGON")
+            field.name = name
+            model._meta.concrete_fields.append(field)
+        return VectorUpsertEngine(GeoJsonFileHandler(), model, "fid")
+
+    def test_plan_is_decided_once_per_layer(self):
+        layer = self._get_layer()
+        engine = self._get_engine()
+        plan = engine._get_plan(layer)
+        self.assertListEqual(plan["columns"], [(0, "fid", False), (1, "name_label", False), (2, "day", True)])
+        self.assertEqual(plan["key_column"], "fid")
+        self.assertDictEqual(
+            plan["geometry"], {"column": "geom", "srid": 4326, "target_srid": 3857, "target_type": "MULTIPOLYGON"}
+        )
+        self.assertEqual(
+            engine._get_geometry_expression(), 'ST_Multi(ST_Transform(ST_GeomFromWKB("geom", 4326), 3857))'
+        )
+
+    def test_plan_without_spatial_reference_uses_the_target_srid(self):
+        layer = self._get_layer()
+        engine = self._get_engine()
+        with patch.object(layer, "GetSpatialRef", return_value=None):
+            engine.plan = engine._get_plan(layer)
+        self.assertDictEqual(
+            engine.plan["geometry"],
+            {"column": "geom", "srid": 3857, "target_srid": 3857, "target_type": "MULTIPOLYGON"},
+        )
+        self.assertEqual(engine._get_geometry_expression(), 'ST_Multi(ST_GeomFromWKB("geom", 3857))')
+
+    def test_plan_without_any_srid_is_rejected(self):
+        layer = self._get_layer()
+        engine = self._get_engine()
+        for field in engine.model_instance._meta.concrete_fields:
+            field.srid = None
+        with patch.object(layer, "GetSpatialRef", return_value=None):
+            with self.assertRaises(UpsertException):
+                engine._get_plan(layer)
+
+    def test_features_are_copied_as_csv(self):
+        layer = self._get_layer()
+        engine = self._get_engine()
+        engine.plan = engine._get_plan(layer)
+        engine.staging_columns = ["fid", "name_label", "day", "geom"]
+        cursor = MagicMock()
+        engine._copy_chunk(cursor, list(layer))
+
+        sql, buffer = cursor.copy_expert.call_args.args
+        self.assertIn('("fid", "name_label", "day", "geom")', sql)
+        rows = buffer.getvalue().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[0].startswith('"1","first, quoted","2024-01-31","\\x'))
+        # only the null values are left unquoted
+        self.assertTrue(rows[1].startswith('"2",,,"\\x'))
+
+    def test_error_log_is_created_out_of_the_transaction(self):
+        layer = self._get_layer()
+        engine = self._get_engine()
+        engine.exec_obj, engine.layers = MagicMock(), [layer]
+        engine.handler.real_instance = MagicMock()
+        events = []
+        atomic = MagicMock()
+        atomic.return_value.__exit__.side_effect = lambda *args: events.append("exit")
+
+        def create_error_log(exec_obj, layers, errors):
+            events.append("error_log")
+            raise UpsertException("errors found")
+
+        with (
+            patch("geonode.upload.handlers.common.upsert.transaction.atomic", atomic),
+            patch("geonode.upload.handlers.common.upsert.transaction.set_rollback") as set_rollback,
+            patch("geonode.upload.handlers.common.upsert.feature_validators_registry") as registry,
+            patch.object(engine, "_create_staging_table"),
+            patch.object(engine, "_copy_chunk") as copy_chunk,
+            patch.object(engine.handler, "_validate_feature", return_value=[{"error": "invalid"}]),
+            patch.object(engine.handler, "_create_error_log", side_effect=create_error_log),
+        ):
+            registry.HANDLERS = ["validator"]
+            with self.assertRaises(UpsertException):
+                engine.run(layer)
+
+        self.assertListEqual(events, ["exit", "error_log"])
+        set_rollback.assert_called_once_with(True, using="default")
+        copy_chunk.assert_not_called()
+
+
+class TestVectorUpsertEngineDatastore(TestCase):
+    """
+    Tests for the single pass upsert engine against a dynamic model table of the datastore
+    """
+
+    databases = ("default", "datastore")
+
+    def setUp(self):
+        from dynamic_models.models import FieldSchema
+
+        super().setUp()
+        name = f"upsert_engine_{uuid.uuid4().hex}"
+        self.schema = ModelSchema.objects.create(name=name, db_name="datastore", managed=True, db_table_name=name)
+        for field_name, class_name, kwargs in (
+            ("fid", "django.db.models.IntegerField", {"null": True, "unique": True}),
+            ("name_label", "django.db.models.CharField", {"null": True, "max_length": 255}),
+            ("day", "django.db.models.DateField", {"null": True}),
+            ("geom", "django.contrib.gis.db.models.fields.MultiPolygonField", {"null": True, "srid": 3857}),
+        ):
+            FieldSchema.objects.create(name=field_name, class_name=class_name, model_schema=self.schema, kwargs=kwargs)
+        self.model = self.schema.as_model()
+        self.handler = GeoJsonFileHandler()
+        self.handler.real_instance = None
+        # the GeoServer validator is not involved
+        registry = patch("geonode.upload.handlers.common.upsert.feature_validators_registry")
+        self.registry = registry.start()
+        self.registry.HANDLERS = []
+        self.addCleanup(registry.stop)
+
+    def _get_layer(self, features, epsg=3857, geometry=True):
+        driver = ogr.GetDriverByName("MEM") or ogr.GetDriverByName("Memory")
+        self.datasource = driver.CreateDataSource("upsert")
+        srs = None
+        if epsg:
+            srs = osr.SpatialReference()
+            srs.ImportFromEPSG(epsg)
+        layer = self.datasource.CreateLayer("upsert", srs, ogr.wkbPolygon if geometry else ogr.wkbNone)
+        layer.CreateField(ogr.FieldDefn("fid", ogr.OFTInteger))
+        if geometry:
+            layer.CreateField(ogr.FieldDefn("Name Label", ogr.OFTString))
+        for fid, name in features:
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField("fid", fid)
+            if geometry:
+                if name is not None:
+                    feature.SetField("Name Label", name)
+                feature.SetGeometry(ogr.CreateGeometryFromWkt("POLYGON ((0 0, 0 1, 1 1, 0 0))"))
+            layer.CreateFeature(feature)
+        return layer
+
+    def _run(self, layer):
+        from geonode.upload.handlers.common.upsert import VectorUpsertEngine
+
+        return VectorUpsertEngine(self.handler, self.model, "fid").run(layer)
+
+    def _get_names(self):
+        return dict(self.model.objects.values_list("fid", "name_label"))
+
+    def _staging_table_exists(self):
+        from geonode.upload.handlers.common.upsert import STAGING_TABLE
+
+        with connections["datastore"].cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [STAGING_TABLE])
+            return cursor.fetchone()[0] is not None
+
+    def test_run_counts_created_and_updated_features(self):
+        self.model.objects.create(fid=1, name_label="old")
+
+        created, updated = self._run(self._get_layer([(1, "updated"), (2, "new")]))
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertDictEqual(self._get_names(), {1: "updated", 2: "new"})
+        self.assertEqual(self.model.objects.get(fid=2).geom.geom_type, "MultiPolygon")
+        self.assertFalse(self._staging_table_exists())
+
+    def test_last_duplicate_key_wins(self):
+        created, updated = self._run(self._get_layer([(1, "first"), (2, "other"), (1, "last")]))
+
+        self.assertEqual((created, updated), (2, 0))
+        self.assertDictEqual(self._get_names(), {1: "last", 2: "other"})
+
+    def test_null_marker_strings_are_not_null(self):
+        self._run(self._get_layer([(1, "\\N"), (2, ""), (3, None)]))
+
+        self.assertDictEqual(self._get_names(), {1: "\\N", 2: "", 3: None})
+
+    def test_layer_without_spatial_reference_uses_the_target_srid(self):
+        self._run(self._get_layer([(1, "no srid")], epsg=None))
+
+        geom = self.model.objects.get(fid=1).geom
+        self.assertEqual(geom.srid, 3857)
+        self.assertEqual(geom.extent, (0.0, 0.0, 1.0, 1.0))
+
+    def test_only_key_columns_do_nothing_on_conflict(self):
+        self.model.objects.create(fid=1, name_label="old")
+
+        created, updated = self._run(self._get_layer([(1, None), (2, None)], geometry=False))
+
+        self.assertEqual((created, updated), (1, 0))
+        self.assertDictEqual(self._get_names(), {1: "old", 2: None})
+
+    def test_validation_errors_roll_back_and_create_the_error_log(self):
+        self.model.objects.create(fid=1, name_label="old")
+        self.registry.HANDLERS = ["validator"]
+        errors = [{"fid": 2, "error": "invalid"}]
+        layer = self._get_layer([(1, "updated"), (2, "invalid")])
+
+        with (
+            patch.object(self.handler, "_validate_feature", return_value=errors),
+            patch.object(
+                self.handler, "_create_error_log", side_effect=UpsertException("errors found")
+            ) as create_error_log,
+        ):
+            with self.assertRaises(UpsertException):
+                self._run(layer)
+
+        create_error_log.assert_called_once_with(None, None, errors)
+        self.assertDictEqual(self._get_names(), {1: "old"})
+        self.assertFalse(self._staging_table_exists())
@@ -0,0 +1,254 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import io
+import json
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, transaction
+from osgeo import ogr
+
+from geonode.upload.api.exceptions import UpsertException
+from geonode.upload.registry import feature_validators_registry
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "_geonode_upsert_stage"
+STAGING_ROW_COLUMN = "_upsert_row"
+
+
+class VectorUpsertEngine:
+    """
+    Single pass, set based upsert of an OGR layer into its dynamic model table.
+
+    The way every OGR field and the geometry are converted is decided once per layer.
+    The features are then read once: every chunk is validated and streamed with COPY
+    into a temporary staging table, which is finally merged into the target table
+    with a single ``INSERT ... ON CONFLICT (upsert_key) DO UPDATE``.
+    If any feature is not valid nothing is written, as in the default upsert.
+    Requires PostgreSQL/PostGIS as datastore.
+    """
+
+    def __init__(self, handler, model_instance, upsert_key, exec_obj=None, layers=None):
+        self.handler = handler
+        self.model_instance = model_instance
+        self.upsert_key = upsert_key
+        self.exec_obj = exec_obj
+        self.layers = layers
+        self.db = model_instance.objects.db
+        self.connection = connections[self.db]
+        self.chunk_size = settings.UPSERT_CHUNK_SIZE
+        # decided once per layer by run()
+        self.plan = None
+        self.staging_columns = []
+
+    @classmethod
+    def is_supported(cls, model_instance):
+        return connections[model_instance.objects.db].vendor == "postgresql"
+
+    def run(self, layer):
+        """
+        Upsert the features of the layer, returning the tuple (created, updated)
+        """
+        errors = []
+        chunk_index = 1
+        try:
+            self.plan = self._get_plan(layer)
+            self.staging_columns = self._get_staging_columns()
+            feature_validators_registry.init_handlers(self.handler.real_instance)
+            validate = bool(feature_validators_registry.HANDLERS)
+            with transaction.atomic(using=self.db), self.connection.cursor() as cursor:
+                self._create_staging_table(cursor)
+                layer_iterator = iter(layer)
+                while data_chunk := list(islice(layer_iterator, self.chunk_size)):
+                    if validate:
+                        errors = self.handler._validate_feature(
+                            data_chunk, model_instance=self.model_instance, upsert_key=self.upsert_key, errors=errors
+                        )
+                    # once an error is found nothing will be written, the features are only validated
+                    if not errors:
+                        self._copy_chunk(cursor, data_chunk)
+                    chunk_index += 1
+
+                if not errors:
+                    return self._merge(cursor)
+                # nothing is written, the staging table is dropped
+                transaction.set_rollback(True, using=self.db)
+
+            # out of the transaction, since the error log asset may be saved in the same DB;
+            # raises an UpsertException
+            self.handler._create_error_log(self.exec_obj, self.layers, errors)
+        except UpsertException:
+            raise
+        except Exception as e:
+            logger.exception("Error occurred during the streaming upsert")
+            msg = f"Error occurred during feature save in Batch {chunk_index} with error: {str(e)}"
+            if self.exec_obj and self.layers:
+                self.handler._create_error_log(self.exec_obj, self.layers, [{"error": msg}])
+            raise UpsertException(msg)
+
+    def _get_plan(self, layer):
+        """
+        Map the layer schema to the target table columns
+        """
+        layer = self.handler._extract_layer(layer)
+        defn = layer.GetLayerDefn()
+        fields = {f.name: f for f in self.model_instance._meta.concrete_fields}
+
+        columns = []
+        for index in range(defn.GetFieldCount()):
+            field_defn = defn.GetFieldDefn(index)
+            name = self.handler.fixup_name(field_defn.GetName())
+            if name not in fields:
+                logger.debug(f"Field {name} is not part of the target schema, skipping it")
+                continue
+            # the dates are written as OGR formats them, e.g. 2020-01-01 for 2020/01/01
+            is_date = field_defn.GetType() in (ogr.OFTDate, ogr.OFTDateTime)
+            columns.append((index, fields[name].column, is_date))
+
+        # DB drivers with FID columns hide the FID field from the schema, in that case the FID is the upsert key
+        use_fid = defn.GetFieldIndex(self.upsert_key) < 0
+        key_column = fields[self.upsert_key].column
+        if use_fid:
+            columns.insert(0, (None, key_column, False))
+
+        geometry_field = fields.get(self.handler.default_geometry_column_name)
+        geometry = None
+        if geometry_field is not None and defn.GetGeomFieldCount():
+            spatial_ref = layer.GetSpatialRef()
+            srid = int(spatial_ref.GetAuthorityCode(None) or 0) if spatial_ref else 0
+            target_srid = getattr(geometry_field, "srid", None) or srid
+            if not srid and not target_srid:
+                raise UpsertException("The spatial reference system of the layer is not known, upsert is aborted")
+            geometry = {
+                "column": geometry_field.column,
+                # without an authority code the geometries are taken as they are, as the default upsert does
+                "srid": srid or target_srid,
+                "target_srid": target_srid,
+                "target_type": getattr(geometry_field, "geom_type", "GEOMETRY").upper(),
+            }
+
+        return {"columns": columns, "key_column": key_column, "geometry": geometry}
+
+    def _get_staging_columns(self):
+        names = [column for _, column, _ in self.plan["columns"]]
+        if self.plan["geometry"]:
+            names.append(self.plan["geometry"]["column"])
+        return names
+
+    def _create_staging_table(self, cursor):
+        qn = self.connection.ops.quote_name
+        names = self.staging_columns
+        geometry = self.plan["geometry"]
+        cursor.execute(f"DROP TABLE IF EXISTS {qn(STAGING_TABLE)}")
+        # same types of the target columns, without any constraint
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {qn(STAGING_TABLE)} ON COMMIT DROP AS "
+            f"SELECT {', '.join(qn(n) for n in names)} FROM {qn(self.model_instance._meta.db_table)} WITH NO DATA"
+        )
+        if geometry:
+            # the geometries are loaded as plain WKB and converted while merging
+            cursor.execute(
+                f"ALTER TABLE {qn(STAGING_TABLE)} ALTER COLUMN {qn(geometry['column'])} TYPE bytea USING NULL"
+            )
+        cursor.execute(f"ALTER TABLE {qn(STAGING_TABLE)} ADD COLUMN {qn(STAGING_ROW_COLUMN)} bigserial")
+
+    @staticmethod
+    def _format_csv_row(row):
+        """
+        Every value is quoted, so that only the unquoted empty fields are loaded as NULL,
+        the default of the COPY CSV format
+        """
+        return ",".join("" if value is None else '"' + str(value).replace('"', '""') + '"' for value in row) + "\n"
+
+    def _copy_chunk(self, cursor, data_chunk):
+        buffer = io.StringIO()
+        columns = self.plan["columns"]
+        has_geometry = self.plan["geometry"] is not None
+        for feature in data_chunk:
+            row = []
+            for index, _, is_date in columns:
+                if index is None:
+                    row.append(feature.GetFID())
+                elif not feature.IsFieldSetAndNotNull(index):
+                    row.append(None)
+                elif is_date:
+                    row.append(feature.GetFieldAsString(index).replace("/", "-"))
+                else:
+                    value = feature.GetField(index)
+                    row.append(json.dumps(value) if isinstance(value, list) else value)
+            if has_geometry:
+                geom = feature.GetGeometryRef()
+                row.append(f"\\x{bytes(geom.ExportToWkb()).hex()}" if geom else None)
+            buffer.write(self._format_csv_row(row))
+        buffer.seek(0)
+
+        qn = self.connection.ops.quote_name
+        cursor.copy_expert(
+            f"COPY {qn(STAGING_TABLE)} ({', '.join(qn(n) for n in self.staging_columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+    def _get_geometry_expression(self):
+        geometry = self.plan["geometry"]
+        qn = self.connection.ops.quote_name
+        expression = f"ST_GeomFromWKB({qn(geometry['column'])}, {geometry['srid']})"
+        if geometry["srid"] and geometry["target_srid"] != geometry["srid"]:
+            expression = f"ST_Transform({expression}, {geometry['target_srid']})"
+        # simulate the "promote to multi" of the upload process, points are never converted
+        if geometry["target_type"] in ("MULTILINESTRING", "MULTIPOLYGON"):
+            expression = f"ST_Multi({expression})"
+        elif geometry["target_type"] == "GEOMETRY":
+            expression = (
+                f"CASE WHEN GeometryType({expression}) IN ('LINESTRING', 'POLYGON') "
+                f"THEN ST_Multi({expression}) ELSE {expression} END"
+            )
+        return expression
+
+    def _merge(self, cursor):
+        """
+        Merge the staging table into the target one, the last occurrence of a key wins.
+        Returns the tuple (created, updated)
+        """
+        qn = self.connection.ops.quote_name
+        key_column = self.plan["key_column"]
+        geometry = self.plan["geometry"]
+        select = []
+        for name in self.staging_columns:
+            if geometry and name == geometry["column"]:
+                select.append(f"{self._get_geometry_expression()} AS {qn(name)}")
+            else:
+                select.append(qn(name))
+        updates = [f"{qn(name)} = EXCLUDED.{qn(name)}" for name in self.staging_columns if name != key_column]
+        on_conflict = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+
+        cursor.execute(
+            f"WITH upserted AS ("
+            f"INSERT INTO {qn(self.model_instance._meta.db_table)} ({', '.join(qn(n) for n in self.staging_columns)}) "
+            f"SELECT DISTINCT ON ({qn(key_column)}) {', '.join(select)} FROM {qn(STAGING_TABLE)} "
+            f"ORDER BY {qn(key_column)}, {qn(STAGING_ROW_COLUMN)} DESC "
+            f"ON CONFLICT ({qn(key_column)}) {on_conflict} "
+            f"RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted"
+        )
+        created, updated = cursor.fetchone()
+        cursor.execute(f"DROP TABLE IF EXISTS {qn(STAGING_TABLE)}")
+        return created, updated
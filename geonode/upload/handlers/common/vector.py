@@ -76,6 +76,7 @@ from geonode.security.registry import permissions_registry
 from geonode.storage.manager import FileSystemStorageManager
 from geonode.upload.utils import create_vrt_file, has_incompatible_field_names
 from geonode.upload.registry import feature_validators_registry
+from geonode.upload.handlers.common.upsert import VectorUpsertEngine
 from django.core.exceptions import ValidationError
 
 
@@ -1340,11 +1341,16 @@ class BaseVectorFileHandler(BaseHandler):
             # if for any reason the key is not present, better to raise an error
             raise UpsertException("Was not possible to find the upsert key, upsert is aborted")
 
-        self._validate_single_feature(exec_obj, OriginalResource, upsert_key, layers, iter(layers[0]))
+        if settings.UPSERT_STREAMING_ENABLED and VectorUpsertEngine.is_supported(OriginalResource):
+            # validate and write the features in a single pass
+            engine = VectorUpsertEngine(self, OriginalResource, upsert_key, exec_obj=exec_obj, layers=layers)
+            valid_create, valid_update = engine.run(layers[0])
+        else:
+            self._validate_single_feature(exec_obj, OriginalResource, upsert_key, layers, iter(layers[0]))
 
-        valid_create, valid_update = self._commit_upsert(
-            model, OriginalResource, upsert_key, iter(layers[0]), exec_obj, layers
-        )
+            valid_create, valid_update = self._commit_upsert(
+                model, OriginalResource, upsert_key, iter(layers[0]), exec_obj, layers
+            )
 
         self.create_resourcehandlerinfo(
             handler_module_path=str(self), resource=original_resource, execution_id=exec_obj
@@ -36,9 +36,11 @@ from lxml import etree
 from osgeo import ogr
 from PIL import Image
 from urllib3 import Retry
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from http.cookiejar import DefaultCookiePolicy
 from io import BytesIO
 from decimal import Decimal
-from threading import local
+from threading import local, Lock
 from slugify import slugify
 from contextlib import closing
 from requests.exceptions import RetryError
@@ -51,6 +53,7 @@ from typing import List, Optional, Union
 
 from django.conf import settings
 from django.db.models import signals
+from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.apps import apps as django_apps
 from django.middleware.csrf import get_token
@@ -975,13 +978,95 @@ def check_ogc_backend(backend_package):
     return False
 
 
+class HttpPoolStats:
+    """
+    Counters of the pooled HTTP connections of the current process.
+
+    ``reuse_ratio`` is the fraction of requests served by an already open connection,
+    ``wait`` the time spent waiting for a connection to be available in the pool:
+    a low reuse ratio means ``POOL_MAXSIZE`` is too small for the concurrency of the process.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_get_connection(self, wait):
+        with self._lock:
+            self.requests += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def as_dict(self):
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+                "wait_avg": round(self.wait_total / self.requests, 6) if self.requests else None,
+                "wait_max": round(self.wait_max, 6),
+            }
+
+
+http_pool_stats = HttpPoolStats()
+
+
+class _StatsConnectionPoolMixin:
+    def _get_conn(self, timeout=None):
+        start = time.monotonic()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            http_pool_stats.record_get_connection(time.monotonic() - start)
+
+    def _new_conn(self):
+        http_pool_stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _StatsHTTPConnectionPool(_StatsConnectionPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _StatsHTTPSConnectionPool(_StatsConnectionPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _StatsHTTPAdapter(requests.adapters.HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _StatsHTTPConnectionPool, "https": _StatsHTTPSConnectionPool}
+
+
 class HttpClient:
+    """
+    HTTP client for the OGC backend and the other remote services.
+
+    The sessions are pooled per process, host and retries policy, so that consecutive requests
+    reuse the keep-alive connections; the pools are dropped in forked processes (e.g. Celery workers).
+    The sessions never store cookies, since they are shared among the requests of different users.
+    The OAuth2 access tokens are cached per user for ``TOKEN_CACHE_TTL`` seconds.
+    """
+
     def __init__(self):
         self.timeout = 5
         self.retries = 1
         self.pool_maxsize = 10
         self.backoff_factor = 0.3
         self.pool_connections = 10
+        self.token_cache_ttl = 60
         self.status_forcelist = (500, 502, 503, 504)
         self.username = "admin"
         self.password = "admin"
@@ -992,8 +1077,79 @@ class HttpClient:
             self.backoff_factor = ogc_server_settings.get("BACKOFF_FACTOR", 0.3)
             self.pool_maxsize = ogc_server_settings.get("POOL_MAXSIZE", 10)
             self.pool_connections = ogc_server_settings.get("POOL_CONNECTIONS", 10)
+            self.token_cache_ttl = ogc_server_settings.get("TOKEN_CACHE_TTL", 60)
             self.username = ogc_server_settings.get("USER", "admin")
             self.password = ogc_server_settings.get("PASSWORD", "geoserver")
+        self._lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        # the sockets of the parent process must not be shared with the forked ones
+        self._pid = os.getpid()
+        self._sessions = {}
+        self._tokens = {}
+
+    def _get_session(self, url, retries):
+        if self._pid != os.getpid():
+            # the process has been forked
+            self._reset()
+        scheme, netloc = urlsplit(url)[:2]
+        key = (scheme, netloc, retries)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    retry = Retry(
+                        total=retries,
+                        read=retries,
+                        connect=retries,
+                        backoff_factor=self.backoff_factor,
+                        status_forcelist=self.status_forcelist,
+                    )
+                    adapter = _StatsHTTPAdapter(
+                        max_retries=retry, pool_maxsize=self.pool_maxsize, pool_connections=self.pool_connections
+                    )
+                    session.mount(f"{scheme}://", adapter)
+                    session.verify = False
+                    self._sessions[key] = session
+        return session
+
+    def _get_access_token(self, user):
+        """
+        Returns a tuple (token, cached) with the access token of the user, or of the OGC backend admin
+        if user is None, looking it up in the database only when not cached yet
+        """
+        username = user if isinstance(user, str) else getattr(user, "username", None) or self.username
+        cached = self._tokens.get(username)
+        if cached and cached[1] > time.monotonic():
+            return cached[0], True
+
+        if user and isinstance(user, str):
+            user = get_user_model().objects.get(username=user)
+        _u = user or get_user_model().objects.get(username=self.username)
+        access_token = get_or_create_token(_u)
+        if not access_token or access_token.is_expired():
+            return None, False
+        if self.token_cache_ttl > 0:
+            # never keep the token beyond its expiration
+            ttl = min(self.token_cache_ttl, (access_token.expires - timezone.now()).total_seconds())
+            self._tokens[username] = (access_token.token, time.monotonic() + ttl)
+        return access_token.token, False
+
+    def _invalidate_access_token(self, user):
+        username = user if isinstance(user, str) else getattr(user, "username", None) or self.username
+        self._tokens.pop(username, None)
+
+    def get_pool_stats(self):
+        """
+        Returns the statistics of the connection pools of the current process
+        """
+        stats = http_pool_stats.as_dict()
+        stats.update({"sessions": len(self._sessions), "pool_maxsize": self.pool_maxsize, "pid": os.getpid()})
+        return stats
 
     def request(
         self,
@@ -1007,19 +1163,19 @@ class HttpClient:
         user=None,
         verify=False,
     ):
+        # never alter the caller (or default) headers
+        headers = dict(headers or {})
+        cached_token = False
         if (
             (user or self.username != "admin")
             and check_ogc_backend(geoserver.BACKEND_PACKAGE)
             and "Authorization" not in headers
         ):
-            if connection.cursor().db.vendor not in ("sqlite", "sqlite3", "spatialite"):
+            if connection.vendor not in ("sqlite", "sqlite3", "spatialite"):
                 try:
-                    if user and isinstance(user, str):
-                        user = get_user_model().objects.get(username=user)
-                    _u = user or get_user_model().objects.get(username=self.username)
-                    access_token = get_or_create_token(_u)
-                    if access_token and not access_token.is_expired():
-                        headers["Authorization"] = f"Bearer {access_token.token}"
+                    token, cached_token = self._get_access_token(user)
+                    if token:
+                        headers["Authorization"] = f"Bearer {token}"
                 except Exception:
                     tb = traceback.format_exc()
                     logger.debug(tb)
@@ -1030,25 +1186,23 @@ class HttpClient:
         headers["User-Agent"] = "GeoNode"
         response = None
         content = None
-        session = requests.Session()
-        retry = Retry(
-            total=retries or self.retries,
-            read=retries or self.retries,
-            connect=retries or self.retries,
-            backoff_factor=self.backoff_factor,
-            status_forcelist=self.status_forcelist,
-        )
-        adapter = requests.adapters.HTTPAdapter(
-            max_retries=retry, pool_maxsize=self.pool_maxsize, pool_connections=self.pool_connections
-        )
-        scheme = urlsplit(url).scheme
-        session.mount(f"{scheme}://", adapter)
-        session.verify = False
+        session = self._get_session(url, retries or self.retries)
         action = getattr(session, method.lower(), None)
         if action:
             _req_tout = timeout or self.timeout
             try:
                 response = action(url=url, data=data, headers=headers, timeout=_req_tout, stream=stream, verify=verify)
+                if cached_token and response.status_code == 401:
+                    # the cached token may have been revoked in the meanwhile
+                    self._invalidate_access_token(user)
+                    # a streamed response holds its connection until closed
+                    response.close()
+                    token, _ = self._get_access_token(user)
+                    if token:
+                        headers["Authorization"] = f"Bearer {token}"
+                        response = action(
+                            url=url, data=data, headers=headers, timeout=_req_tout, stream=stream, verify=verify
+                        )
             except (
                 requests.exceptions.ConnectTimeout,
                 requests.exceptions.RequestException,